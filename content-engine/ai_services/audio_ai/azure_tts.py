@@ -19,6 +19,7 @@ from datetime import datetime, timedelta
 import base64
 
 from .base_audio_ai import BaseAudioAI, AudioConfig, AudioResult
+from shared.utils.http_sessions import http_session
 
 class AzureTTSService(BaseAudioAI):
     """
@@ -148,7 +149,7 @@ class AzureTTSService(BaseAudioAI):
         try:
             await self._ensure_valid_token()
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.voices_url) as session:
                 headers = {
                     "Authorization": f"Bearer {self.access_token}",
                     "Content-Type": "application/json"
@@ -265,7 +266,7 @@ class AzureTTSService(BaseAudioAI):
             "Content-Length": "0"
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with http_session(self.token_url) as session:
             async with session.post(self.token_url, headers=headers) as response:
                 if response.status == 200:
                     self.access_token = await response.text()
@@ -399,7 +400,7 @@ class AzureTTSService(BaseAudioAI):
             "User-Agent": "AI-Content-Factory"
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with http_session(self.tts_url) as session:
             async with session.post(self.tts_url, headers=headers, data=ssml.encode('utf-8')) as response:
                 if response.status == 200:
                     return await response.read()
@@ -19,6 +19,7 @@ from datetime import datetime
 import base64
 
 from .base_audio_ai import BaseAudioAI, AudioConfig, AudioResult
+from shared.utils.http_sessions import http_session
 
 class ElevenLabsService(BaseAudioAI):
     """
@@ -178,7 +179,7 @@ class ElevenLabsService(BaseAudioAI):
                 "xi-api-key": self.api_key
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.base_url) as session:
                 async with session.get(f"{self.base_url}/voices", headers=headers) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -225,7 +226,7 @@ class ElevenLabsService(BaseAudioAI):
                 "xi-api-key": self.api_key
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.base_url) as session:
                 async with session.get(f"{self.base_url}/user", headers=headers) as response:
                     if response.status == 200:
                         self.is_available = True
@@ -352,7 +353,7 @@ class ElevenLabsService(BaseAudioAI):
         
         url = f"{self.base_url}/text-to-speech/{voice_id}"
         
-        async with aiohttp.ClientSession() as session:
+        async with http_session(self.base_url) as session:
             async with session.post(url, json=data, headers=headers) as response:
                 if response.status == 200:
                     audio_data = await response.read()
@@ -11,6 +11,7 @@ import os
 import json
 import uuid
 import time
+import hashlib
 from typing import Dict, Any, Optional, List, Union
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -27,6 +28,16 @@ from .base_image_ai import (
 from shared.models.quality_tier import QualityTier
 from shared.utils.logger import get_logger
 from shared.utils.error_handler import handle_errors, ImageGenerationError
+from shared.utils.job_poller import (
+    JobPoller,
+    JobState,
+    JobUpdate,
+    JobFailedError,
+    JobTimeoutError,
+    PollSchedule,
+    get_job_poller
+)
+from shared.utils.http_sessions import get_http_session
 
 
 class LeonardoConfig:
@@ -232,18 +243,20 @@ class LeonardoAI(BaseImageAI):
                 return key
         return None
 
+    def _auth_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.leonardo_config.api_key}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+
     async def _ensure_session(self):
-        """สร้าง HTTP session ถ้ายังไม่มี"""
+        """ใช้ HTTP session ที่แชร์ต่อ host (headers ส่งแยกต่อ request)"""
         
-        if not self.session:
-            headers = {
-                "Authorization": f"Bearer {self.leonardo_config.api_key}",
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-            
-            self.session = aiohttp.ClientSession(headers=headers)
-            
+        # ขอใหม่ทุกครั้ง: registry คืน session ของ event loop ปัจจุบัน
+        self.session = get_http_session(self.leonardo_config.api_endpoint)
+        
+        if self.user_info is None:
             # ตรวจสอบ API key และโหลด user info
             await self._load_user_info()
 
@@ -253,7 +266,7 @@ class LeonardoAI(BaseImageAI):
         try:
             url = urljoin(self.leonardo_config.api_endpoint, "/me")
             
-            async with self.session.get(url) as response:
+            async with self.session.get(url, headers=self._auth_headers()) as response:
                 if response.status == 401:
                     raise ImageGenerationError("Invalid Leonardo AI API key")
                 elif response.status != 200:
@@ -425,7 +438,7 @@ class LeonardoAI(BaseImageAI):
         url = urljoin(self.leonardo_config.api_endpoint, "/generations")
         
         try:
-            async with self.session.post(url, json=generation_request) as response:
+            async with self.session.post(url, json=generation_request, headers=self._auth_headers()) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     self.logger.error(f"Generation request failed: {response.status} - {error_text}")
@@ -451,65 +464,83 @@ class LeonardoAI(BaseImageAI):
         except aiohttp.ClientError as e:
             raise ImageGenerationError(f"Failed to submit generation: {e}")
 
-    async def _wait_for_generation(self, generation_id: str) -> List[str]:
-        """รอให้การสร้างภาพเสร็จและได้ URL ของภาพ"""
+    def _get_job_poller(self) -> JobPoller:
+        """poller ที่ใช้ร่วมกันทุก instance ของ API key เดียวกัน (session เดียว, loop เดียว)"""
+        
+        key_hash = hashlib.sha1(self.leonardo_config.api_key.encode()).hexdigest()[:12]
+        config = self.leonardo_config
+        
+        def create() -> JobPoller:
+            return JobPoller(
+                name="leonardo",
+                check=self._check_generation_status,
+                schedule=PollSchedule(
+                    initial_interval=min(2.0, config.polling_interval),
+                    max_interval=config.polling_interval * 3
+                ),
+                default_timeout=config.generation_timeout,
+                base_url=config.api_endpoint
+            )
+        
+        return get_job_poller(f"leonardo:{key_hash}", create)
+
+    async def _check_generation_status(self, session: aiohttp.ClientSession, generation_id: str) -> JobUpdate:
+        """ตรวจสอบสถานะ generation หนึ่งครั้ง (Leonardo ไม่มี endpoint แบบหลาย id)"""
         
         url = urljoin(self.leonardo_config.api_endpoint, f"/generations/{generation_id}")
         
-        start_time = time.time()
-        timeout = self.leonardo_config.generation_timeout
+        async with session.get(url, headers=self._auth_headers()) as response:
+            if response.status != 200:
+                return JobUpdate(JobState.FAILED, error=f"Failed to check generation status: {response.status}")
+            
+            data = await response.json()
         
-        while time.time() - start_time < timeout:
-            try:
-                async with self.session.get(url) as response:
-                    if response.status != 200:
-                        raise ImageGenerationError(f"Failed to check generation status: {response.status}")
-                    
-                    data = await response.json()
-                    generation_data = data.get("generations_by_pk", {})
-                    
-                    status = generation_data.get("status")
-                    
-                    if status == "COMPLETE":
-                        # ได้ URL ของภาพที่สร้างแล้ว
-                        generated_images = generation_data.get("generated_images", [])
-                        
-                        if not generated_images:
-                            raise ImageGenerationError("No images generated")
-                        
-                        image_urls = [img.get("url") for img in generated_images if img.get("url")]
-                        
-                        if not image_urls:
-                            raise ImageGenerationError("No valid image URLs")
-                        
-                        self.logger.info(f"Generation completed: {len(image_urls)} images")
-                        return image_urls
-                    
-                    elif status == "FAILED":
-                        raise ImageGenerationError("Generation failed on Leonardo AI")
-                    
-                    elif status in ["PENDING", "IN_PROGRESS"]:
-                        # ยังไม่เสร็จ รอต่อ
-                        await asyncio.sleep(self.leonardo_config.polling_interval)
-                        continue
-                    
-                    else:
-                        self.logger.warning(f"Unknown generation status: {status}")
-                        await asyncio.sleep(self.leonardo_config.polling_interval)
-                        continue
-                        
-            except aiohttp.ClientError as e:
-                self.logger.warning(f"Error checking generation status: {e}")
-                await asyncio.sleep(self.leonardo_config.polling_interval)
-                continue
+        generation_data = data.get("generations_by_pk", {})
+        status = generation_data.get("status")
         
-        raise ImageGenerationError("Generation timeout")
+        if status == "COMPLETE":
+            # ได้ URL ของภาพที่สร้างแล้ว
+            generated_images = generation_data.get("generated_images", [])
+            
+            if not generated_images:
+                return JobUpdate(JobState.FAILED, error="No images generated")
+            
+            image_urls = [img.get("url") for img in generated_images if img.get("url")]
+            
+            if not image_urls:
+                return JobUpdate(JobState.FAILED, error="No valid image URLs")
+            
+            return JobUpdate(JobState.COMPLETED, result=image_urls)
+        
+        elif status == "FAILED":
+            return JobUpdate(JobState.FAILED, error="Generation failed on Leonardo AI")
+        
+        elif status not in ["PENDING", "IN_PROGRESS"]:
+            self.logger.warning(f"Unknown generation status: {status}")
+        
+        # ยังไม่เสร็จ รอต่อ
+        return JobUpdate(JobState.PENDING)
+
+    async def _wait_for_generation(self, generation_id: str) -> List[str]:
+        """รอให้การสร้างภาพเสร็จและได้ URL ของภาพ"""
+        
+        try:
+            image_urls = await self._get_job_poller().wait(
+                generation_id, timeout=self.leonardo_config.generation_timeout
+            )
+        except JobFailedError as e:
+            raise ImageGenerationError(str(e))
+        except JobTimeoutError:
+            raise ImageGenerationError("Generation timeout")
+        
+        self.logger.info(f"Generation completed: {len(image_urls)} images")
+        return image_urls
 
     async def _download_generated_image(self, image_url: str, generation_id: str) -> str:
         """ดาวน์โหลดภาพที่สร้างแล้ว"""
         
         try:
-            async with self.session.get(image_url) as response:
+            async with get_http_session(image_url).get(image_url) as response:
                 if response.status != 200:
                     raise ImageGenerationError(f"Failed to download image: {response.status}")
                 
@@ -545,7 +576,7 @@ class LeonardoAI(BaseImageAI):
         url = urljoin(self.leonardo_config.api_endpoint, "/models")
         
         try:
-            async with self.session.get(url) as response:
+            async with self.session.get(url, headers=self._auth_headers()) as response:
                 if response.status != 200:
                     raise ImageGenerationError(f"Failed to fetch models: {response.status}")
                 
@@ -654,9 +685,8 @@ class LeonardoAI(BaseImageAI):
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        # session แชร์ทั้ง process ปิดตอน shutdown (close_http_sessions)
+        self.session = None
 
 
 # Utility functions สำหรับ Leonardo AI
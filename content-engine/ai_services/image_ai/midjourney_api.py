@@ -29,6 +29,15 @@ from .base_image_ai import (
 from shared.models.quality_tier import QualityTier
 from shared.utils.logger import get_logger
 from shared.utils.error_handler import handle_errors, ImageGenerationError
+from shared.utils.job_poller import (
+    JobPoller,
+    JobState,
+    JobUpdate,
+    JobFailedError,
+    JobTimeoutError,
+    PollSchedule
+)
+from shared.utils.http_sessions import get_http_session
 
 
 class MidjourneyConfig:
@@ -100,6 +109,7 @@ class MidjourneyAPI(BaseImageAI):
         self.session = None
         self.discord_session = None
         self.active_jobs: Dict[str, Dict] = {}
+        self.job_poller: Optional[JobPoller] = None
         
         # Midjourney-specific settings
         self.parameter_presets = self._load_parameter_presets()
@@ -231,16 +241,24 @@ class MidjourneyAPI(BaseImageAI):
     def _get_model_name(self) -> str:
         return f"Midjourney {self.midjourney_config.default_version}"
 
+    def _auth_headers(self) -> Dict[str, str]:
+        headers = {}
+        
+        if self.midjourney_config.api_key:
+            headers["Authorization"] = f"Bearer {self.midjourney_config.api_key}"
+        
+        return headers
+
+    def _discord_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bot {self.midjourney_config.discord_token}",
+            "Content-Type": "application/json"
+        }
+
     async def _ensure_session(self):
-        """สร้าง HTTP session ถ้ายังไม่มี"""
+        """ใช้ HTTP session ที่แชร์ต่อ host (headers ส่งแยกต่อ request)"""
         
-        if not self.session:
-            headers = {}
-            
-            if self.midjourney_config.api_key:
-                headers["Authorization"] = f"Bearer {self.midjourney_config.api_key}"
-            
-            self.session = aiohttp.ClientSession(headers=headers)
+        self.session = get_http_session(self.midjourney_config.api_endpoint)
 
     async def _generate_image_internal(self, request: ImageGenerationRequest) -> str:
         """สร้างภาพด้วย Midjourney"""
@@ -399,7 +417,7 @@ class MidjourneyAPI(BaseImageAI):
         }
         
         try:
-            async with self.session.post(url, json=payload) as response:
+            async with self.session.post(url, json=payload, headers=self._auth_headers()) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     raise ImageGenerationError(f"Midjourney API error: {response.status} - {error_text}")
@@ -422,11 +440,6 @@ class MidjourneyAPI(BaseImageAI):
         # Discord API integration
         discord_api = "https://discord.com/api/v10"
         
-        headers = {
-            "Authorization": f"Bot {self.midjourney_config.discord_token}",
-            "Content-Type": "application/json"
-        }
-        
         # Send message to Discord channel
         message_data = {
             "content": f"/imagine {prompt}",
@@ -436,10 +449,9 @@ class MidjourneyAPI(BaseImageAI):
         url = f"{discord_api}/channels/{self.midjourney_config.channel_id}/messages"
         
         try:
-            if not self.discord_session:
-                self.discord_session = aiohttp.ClientSession(headers=headers)
+            self.discord_session = get_http_session(discord_api)
             
-            async with self.discord_session.post(url, json=message_data) as response:
+            async with self.discord_session.post(url, json=message_data, headers=self._discord_headers()) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     raise ImageGenerationError(f"Discord API error: {response.status} - {error_text}")
@@ -473,42 +485,58 @@ class MidjourneyAPI(BaseImageAI):
         self.logger.info(f"Mock Midjourney job created: {job_id}")
         return job_id
 
+    def _get_job_poller(self) -> JobPoller:
+        """poller ของ instance นี้ (สถานะ job อ่านผ่าน session / active_jobs ของ instance)"""
+        
+        if self.job_poller is None or self.job_poller.is_bound_to_other_loop():
+            config = self.midjourney_config
+            self.job_poller = JobPoller(
+                name="midjourney",
+                check=self._poll_job_status,
+                schedule=PollSchedule(
+                    initial_interval=min(3.0, config.polling_interval),
+                    max_interval=config.polling_interval * 3
+                ),
+                max_concurrency=config.max_concurrent_jobs * 2,
+                default_timeout=config.generation_timeout,
+                base_url=config.api_endpoint
+            )
+        return self.job_poller
+
+    async def _poll_job_status(self, session: Optional[aiohttp.ClientSession], job_id: str) -> JobUpdate:
+        """แปลงผล _check_job_status เป็น JobUpdate"""
+        
+        status = await self._check_job_status(job_id)
+        
+        if status["status"] == "completed":
+            return JobUpdate(JobState.COMPLETED, result=status)
+        
+        elif status["status"] == "failed":
+            error_msg = status.get("error", "Unknown error")
+            return JobUpdate(JobState.FAILED, error=f"Midjourney generation failed: {error_msg}", result=status)
+        
+        elif status["status"] in ["submitted", "in_progress"]:
+            progress = status.get("progress", 0)
+            self.logger.debug(f"Job {job_id} progress: {progress}%")
+            return JobUpdate(JobState.PENDING, progress=progress)
+        
+        self.logger.warning(f"Unknown job status: {status['status']}")
+        return JobUpdate(JobState.PENDING)
+
     async def _wait_for_generation_complete(self, job_id: str) -> Dict[str, Any]:
         """รอให้การสร้างภาพเสร็จสมบูรณ์"""
         
-        start_time = time.time()
-        timeout = self.midjourney_config.generation_timeout
+        try:
+            status = await self._get_job_poller().wait(
+                job_id, timeout=self.midjourney_config.generation_timeout
+            )
+        except JobFailedError as e:
+            raise ImageGenerationError(str(e))
+        except JobTimeoutError:
+            raise ImageGenerationError(f"Midjourney generation timeout for job {job_id}")
         
-        while time.time() - start_time < timeout:
-            try:
-                status = await self._check_job_status(job_id)
-                
-                if status["status"] == "completed":
-                    self.logger.info(f"Midjourney job completed: {job_id}")
-                    return status
-                
-                elif status["status"] == "failed":
-                    error_msg = status.get("error", "Unknown error")
-                    raise ImageGenerationError(f"Midjourney generation failed: {error_msg}")
-                
-                elif status["status"] in ["submitted", "in_progress"]:
-                    progress = status.get("progress", 0)
-                    self.logger.debug(f"Job {job_id} progress: {progress}%")
-                    
-                    await asyncio.sleep(self.midjourney_config.polling_interval)
-                    continue
-                
-                else:
-                    self.logger.warning(f"Unknown job status: {status['status']}")
-                    await asyncio.sleep(self.midjourney_config.polling_interval)
-                    continue
-                    
-            except Exception as e:
-                self.logger.warning(f"Error checking job status: {e}")
-                await asyncio.sleep(self.midjourney_config.polling_interval)
-                continue
-        
-        raise ImageGenerationError(f"Midjourney generation timeout for job {job_id}")
+        self.logger.info(f"Midjourney job completed: {job_id}")
+        return status
 
     async def _check_job_status(self, job_id: str) -> Dict[str, Any]:
         """ตรวจสอบสถานะของ job"""
@@ -560,7 +588,7 @@ class MidjourneyAPI(BaseImageAI):
         url = urljoin(self.midjourney_config.api_endpoint, f"/v1/jobs/{job_id}")
         
         try:
-            async with self.session.get(url) as response:
+            async with self.session.get(url, headers=self._auth_headers()) as response:
                 if response.status != 200:
                     return {"status": "failed", "error": f"API error {response.status}"}
                 
@@ -590,7 +618,8 @@ class MidjourneyAPI(BaseImageAI):
         url = f"{discord_api}/channels/{self.midjourney_config.channel_id}/messages"
         
         try:
-            async with self.discord_session.get(url, params={"after": message_id, "limit": 50}) as response:
+            async with get_http_session(discord_api).get(url, params={"after": message_id, "limit": 50},
+                                                         headers=self._discord_headers()) as response:
                 if response.status != 200:
                     return {"status": "failed", "error": f"Discord API error {response.status}"}
                 
@@ -635,7 +664,7 @@ class MidjourneyAPI(BaseImageAI):
             return await self._create_mock_midjourney_image(image_url)
         
         try:
-            async with self.session.get(image_url) as response:
+            async with get_http_session(image_url).get(image_url) as response:
                 if response.status != 200:
                     raise ImageGenerationError(f"Failed to download image: {response.status}")
                 
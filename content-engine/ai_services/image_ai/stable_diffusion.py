@@ -29,6 +29,7 @@ from .base_image_ai import (
 from shared.models.quality_tier import QualityTier
 from shared.utils.logger import get_logger
 from shared.utils.error_handler import handle_errors, ImageGenerationError
+from shared.utils.http_sessions import get_http_session
 
 
 class StableDiffusionConfig:
@@ -446,7 +447,7 @@ print(output_path)
         
         try:
             if not self.session:
-                self.session = aiohttp.ClientSession()
+                self.session = get_http_session(self.sd_config.api_endpoint)
             
             # เตรียม payload
             payload = {
@@ -666,7 +667,7 @@ print(output_path)
         url = f"{self.sd_config.api_endpoint}/v1/generation/{self.sd_config.default_model}/image-to-image"
         
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = get_http_session(self.sd_config.api_endpoint)
         
         async with self.session.post(url, json=payload, headers=headers) as response:
             if response.status != 200:
@@ -723,14 +724,13 @@ print(output_path)
     async def __aenter__(self):
         """Async context manager entry"""
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = get_http_session(self.sd_config.api_endpoint)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        # session แชร์ทั้ง process ปิดตอน shutdown (close_http_sessions)
+        self.session = None
 
 
 # Utility functions สำหรับ Stable Diffusion
@@ -10,6 +10,12 @@ from datetime import datetime
 import openai
 from openai import AsyncOpenAI
 
+try:
+    from ..services.prompt_packing import PackingConfig, PackingStats, run_packed
+except ImportError:
+    from services.prompt_packing import PackingConfig, PackingStats, run_packed
+from shared.utils.http_sessions import get_http_session
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -40,14 +46,18 @@ class RealGroqService:
         self.base_url = "https://api.groq.com/openai/v1"
         self.model = "llama3-8b-8192"  # Fast and efficient model
         self.session = None
+        # context 8192 tokens: prompt + คำตอบของทั้ง pack ต้องไม่เกิน
+        self.packing_config = PackingConfig(max_items_per_request=10, max_prompt_tokens=2000,
+                                            max_output_tokens=4000, output_tokens_per_item=300)
+        self.packing_stats = PackingStats()
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = get_http_session(self.base_url)
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # session แชร์ทั้ง process ปิดตอน shutdown (close_http_sessions)
+        self.session = None
     
     async def analyze_trend_potential(self, 
                                     trend_topic: str, 
@@ -87,6 +97,124 @@ class RealGroqService:
         }}
         """
         
+        content = await self._chat(prompt, max_tokens=1000)
+        if content is None:
+            return None
+        
+        # Parse JSON response
+        try:
+            result_data = json.loads(content)
+            return self._to_analysis_result(trend_topic, result_data)
+            
+        except (json.JSONDecodeError, KeyError, TypeError):
+            logger.error(f"Failed to parse JSON response: {content}")
+            return None
+    
+    async def analyze_trends_packed(self, trends: List[Dict[str, Any]]) -> List[Optional[AIAnalysisResult]]:
+        """วิเคราะห์หลาย trends ใน request เดียวกัน (JSON array ตาม id)
+        
+        trends ที่ parse คำตอบไม่ได้จะถูกวิเคราะห์ใหม่ทีละตัวด้วย analyze_trend_potential
+        คืน list ตามลำดับ input (None ถ้าล้มเหลว)
+        """
+        
+        items = {f"t{i}": trend for i, trend in enumerate(trends)}
+        
+        def render_item(item_id: str, trend: Dict[str, Any]) -> str:
+            return json.dumps({
+                "id": item_id,
+                "topic": trend.get("topic", ""),
+                "popularity_score": trend.get("popularity_score", 50),
+                "growth_rate": trend.get("growth_rate", 0),
+                "keywords": (trend.get("keywords") or [])[:5]
+            }, ensure_ascii=False)
+        
+        def build_prompt(pack) -> str:
+            trend_lines = "\n".join(text for _, text in pack)
+            return f"""
+        Analyze each of these trending topics for content creation opportunities in Thailand market.
+        
+        Topics (one JSON object per line):
+        {trend_lines}
+        
+        For each topic rate from 1-10:
+        
+        1. Viral Potential: How likely is this trend to go viral?
+        2. Content Saturation: How saturated is this topic with existing content? (1=oversaturated, 10=blue ocean)
+        3. Audience Interest: How interested would Thai audiences be?
+        4. Monetization Opportunity: How easy is it to monetize content around this topic?
+        
+        Also suggest 3 unique content angles per topic.
+        
+        Respond with a JSON array only, one object per topic, keeping each topic's "id":
+        [
+            {{
+                "id": "t0",
+                "viral_potential": 1-10,
+                "content_saturation": 1-10,
+                "audience_interest": 1-10,
+                "monetization_opportunity": 1-10,
+                "content_angles": ["angle 1", "angle 2", "angle 3"],
+                "reasoning": "short explanation of your analysis"
+            }}
+        ]
+        """
+        
+        async def single(item_id: str, trend: Dict[str, Any]) -> Optional[AIAnalysisResult]:
+            return await self.analyze_trend_potential(
+                trend.get("topic", ""),
+                trend.get("popularity_score", 50),
+                trend.get("growth_rate", 0),
+                trend.get("keywords", [])
+            )
+        
+        def validate(item: Dict[str, Any]) -> bool:
+            try:
+                self._to_analysis_result("", item)
+                return True
+            except (KeyError, TypeError, ValueError):
+                return False
+        
+        packed, individual = await run_packed(
+            items, render_item, build_prompt,
+            call=lambda prompt, max_tokens: self._chat(prompt, max_tokens=max_tokens),
+            single=single,
+            config=self.packing_config,
+            validate=validate,
+            stats=self.packing_stats
+        )
+        
+        results = []
+        for item_id, trend in items.items():
+            if item_id in packed:
+                results.append(self._to_analysis_result(trend.get("topic", ""), packed[item_id]))
+            else:
+                results.append(individual.get(item_id))
+        return results
+    
+    def _to_analysis_result(self, trend_topic: str, result_data: Dict[str, Any]) -> AIAnalysisResult:
+        # Calculate overall score
+        overall_score = (
+            result_data["viral_potential"] +
+            result_data["content_saturation"] +
+            result_data["audience_interest"] +
+            result_data["monetization_opportunity"]
+        ) / 4.0
+        
+        return AIAnalysisResult(
+            trend_topic=trend_topic,
+            viral_potential=result_data["viral_potential"],
+            content_saturation=result_data["content_saturation"],
+            audience_interest=result_data["audience_interest"],
+            monetization_opportunity=result_data["monetization_opportunity"],
+            overall_score=overall_score,
+            content_angles=result_data["content_angles"],
+            reasoning=result_data["reasoning"],
+            timestamp=datetime.now()
+        )
+    
+    async def _chat(self, prompt: str, max_tokens: int = 1000) -> Optional[str]:
+        """เรียก Groq chat completions คืนข้อความคำตอบ (None ถ้าผิดพลาด)"""
+        
         try:
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
@@ -100,7 +228,7 @@ class RealGroqService:
                     {"role": "user", "content": prompt}
                 ],
                 "temperature": 0.3,
-                "max_tokens": 1000
+                "max_tokens": max_tokens
             }
             
             async with self.session.post(
@@ -111,36 +239,8 @@ class RealGroqService:
                 
                 if response.status == 200:
                     data = await response.json()
-                    content = data["choices"][0]["message"]["content"]
+                    return data["choices"][0]["message"]["content"]
                     
-                    # Parse JSON response
-                    try:
-                        result_data = json.loads(content)
-                        
-                        # Calculate overall score
-                        overall_score = (
-                            result_data["viral_potential"] +
-                            result_data["content_saturation"] +
-                            result_data["audience_interest"] +
-                            result_data["monetization_opportunity"]
-                        ) / 4.0
-                        
-                        return AIAnalysisResult(
-                            trend_topic=trend_topic,
-                            viral_potential=result_data["viral_potential"],
-                            content_saturation=result_data["content_saturation"],
-                            audience_interest=result_data["audience_interest"],
-                            monetization_opportunity=result_data["monetization_opportunity"],
-                            overall_score=overall_score,
-                            content_angles=result_data["content_angles"],
-                            reasoning=result_data["reasoning"],
-                            timestamp=datetime.now()
-                        )
-                        
-                    except json.JSONDecodeError:
-                        logger.error(f"Failed to parse JSON response: {content}")
-                        return None
-                        
                 else:
                     logger.error(f"Groq API error: {response.status}")
                     return None
@@ -302,15 +402,20 @@ class RealAIDirector:
                                      trend_topic: str,
                                      popularity_score: int,
                                      growth_rate: float,
-                                     related_keywords: List[str] = None) -> Dict[str, Any]:
-        """ครบวงจร: วิเคราะห์ trend + สร้าง content plan"""
+                                     related_keywords: List[str] = None,
+                                     analysis: Optional[AIAnalysisResult] = None) -> Dict[str, Any]:
+        """ครบวงจร: วิเคราะห์ trend + สร้าง content plan
+        
+        analysis: ผลวิเคราะห์ที่มีอยู่แล้ว (เช่นจาก analyze_trends_packed) จะข้ามการเรียก Groq
+        """
         
         logger.info(f"Starting AI analysis for: {trend_topic}")
         
         # Step 1: วิเคราะห์ trend ด้วย Groq
-        analysis = await self.groq_service.analyze_trend_potential(
-            trend_topic, popularity_score, growth_rate, related_keywords
-        )
+        if analysis is None:
+            analysis = await self.groq_service.analyze_trend_potential(
+                trend_topic, popularity_score, growth_rate, related_keywords
+            )
         
         if not analysis:
             logger.error("Failed to analyze trend")
@@ -349,18 +454,31 @@ class RealAIDirector:
             }
         }
     
-    async def batch_analyze_trends(self, trends: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """วิเคราะห์หลาย trends พร้อมกัน"""
+    async def batch_analyze_trends(self, trends: List[Dict[str, Any]], packed: bool = True) -> List[Dict[str, Any]]:
+        """วิเคราะห์หลาย trends พร้อมกัน
+        
+        packed: วิเคราะห์ trends ด้วย Groq หลายตัวต่อ request ก่อน แล้วจึงสร้าง content plans ทีละ trend
+        """
         
         results = []
         
-        for trend in trends:
+        analyses: List[Optional[AIAnalysisResult]] = [None] * len(trends)
+        if packed and len(trends) > 1:
+            analyses = await self.groq_service.analyze_trends_packed(trends)
+            logger.info(f"Packed trend analysis: {self.groq_service.packing_stats.to_dict()}")
+        
+        for trend, analysis in zip(trends, analyses):
+            if packed and len(trends) > 1 and analysis is None:
+                # ล้มเหลวทั้งแบบ pack และ retry ทีละตัวแล้ว
+                logger.error(f"Error analyzing trend {trend.get('topic')}: analysis failed")
+                continue
             try:
                 result = await self.analyze_and_plan_content(
                     trend_topic=trend.get("topic", ""),
                     popularity_score=trend.get("popularity_score", 50),
                     growth_rate=trend.get("growth_rate", 0),
-                    related_keywords=trend.get("keywords", [])
+                    related_keywords=trend.get("keywords", []),
+                    analysis=analysis
                 )
                 
                 result["original_trend"] = trend
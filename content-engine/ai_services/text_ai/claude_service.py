@@ -14,6 +14,7 @@ from datetime import datetime
 import base64
 
 from ..service_registry import BaseAIService
+from shared.utils.http_sessions import http_session
 
 logger = logging.getLogger(__name__)
 
@@ -450,7 +451,7 @@ BRIEF:
         
         for attempt in range(self.max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
+                async with http_session(self.base_url) as session:
                     async with session.post(
                         f"{self.base_url}/messages",
                         headers=headers,
@@ -15,6 +15,7 @@ import base64
 from io import BytesIO
 
 from ..service_registry import BaseAIService
+from shared.utils.http_sessions import http_session
 
 logger = logging.getLogger(__name__)
 
@@ -404,7 +405,7 @@ class OpenAIService(BaseAIService):
         
         for attempt in range(self.max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
+                async with http_session(self.base_url) as session:
                     async with session.post(
                         f"{self.base_url}/chat/completions",
                         headers=headers,
@@ -12,6 +12,7 @@ from dataclasses import asdict
 from trend_monitor.services.real_youtube_trends import RealYouTubeTrendsService, YouTubeTrendData
 from trend_monitor.services.real_google_trends import RealGoogleTrendsService, GoogleTrendData
 from content_engine.ai_services.real_ai_services import RealAIDirector, AIAnalysisResult
+from shared.utils.http_sessions import close_http_sessions
 
 # Database imports (existing)
 from database.repositories.trend_repository import TrendRepository
@@ -447,6 +448,7 @@ class RealDataAPI:
         """Shutdown the factory"""
         if self.factory:
             await self.factory.__aexit__(None, None, None)
+        await close_http_sessions()
     
     async def trigger_pipeline(self, region: str = "TH") -> Dict[str, Any]:
         """API endpoint to trigger pipeline"""
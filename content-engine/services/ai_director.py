@@ -4,19 +4,49 @@ import logging
 from ..ai_services.text_ai.groq_service import GroqService
 from ..models.quality_tier import QualityTier
 from ..models.content_plan import ContentPlan
+import asyncio
 import json
 import time
 
+try:
+    from ...shared.utils.async_helpers import SingleFlight, make_flight_key
+except ImportError:
+    from shared.utils.async_helpers import SingleFlight, make_flight_key
+
 logger = logging.getLogger(__name__)
 
 class AIDirector:
-    def __init__(self, quality_tier: QualityTier = QualityTier.BUDGET):
+    def __init__(self, quality_tier: QualityTier = QualityTier.BUDGET, flight_backend=None):
         self.quality_tier = quality_tier
         self.groq_service = GroqService()  # ใช้ Groq แทน OpenAI
+        # แผนของ request เดียวกันที่ถูกขอพร้อมกันเรียก Groq ครั้งเดียว (flight_backend: รวมข้าม process)
+        self.plan_flight = SingleFlight("content_plan", backend=flight_backend)
         logger.info(f"AIDirector initialized with Groq service and {quality_tier} tier")
         
     def create_content_plan(self, user_request: Dict) -> ContentPlan:
         """สร้างแผนการผลิตเนื้อหาแบบครบวงจร"""
+        return self.plan_flight.do_blocking(
+            self._plan_flight_key(user_request),
+            lambda: self._create_content_plan(user_request)
+        )
+    
+    async def create_content_plan_async(self, user_request: Dict) -> ContentPlan:
+        """create_content_plan สำหรับ async callers (ไม่ block event loop, รวม request ข้าม process ได้)"""
+        return await self.plan_flight.do(
+            self._plan_flight_key(user_request),
+            lambda: asyncio.to_thread(self._create_content_plan, user_request)
+        )
+    
+    def _plan_flight_key(self, user_request: Dict) -> str:
+        return make_flight_key(
+            str(self.quality_tier),
+            user_request.get('topic', ''),
+            user_request.get('platform', 'youtube'),
+            user_request.get('content_type', 'educational'),
+            user_request.get('target_audience', 'general')
+        )
+    
+    def _create_content_plan(self, user_request: Dict) -> ContentPlan:
         try:
             # Extract ข้อมูลจาก request
             topic = user_request.get('topic', '')
@@ -258,7 +288,8 @@ class AIDirector:
                 "last_test": time.strftime('%Y-%m-%d %H:%M:%S'),
                 "quality_tier": str(self.quality_tier),
                 "cost_per_request": "ฟรี (100 requests/day)",
-                "response_time": "~1-3 วินาที"
+                "response_time": "~1-3 วินาที",
+                "single_flight": self.plan_flight.get_stats()
             }
             
         except Exception as e:
@@ -267,7 +298,8 @@ class AIDirector:
                 "groq_service": "offline",
                 "error": str(e),
                 "last_test": time.strftime('%Y-%m-%d %H:%M:%S'),
-                "fallback_available": True
+                "fallback_available": True,
+                "single_flight": self.plan_flight.get_stats()
             }
     
     def estimate_production_cost(self, content_plan: ContentPlan) -> Dict:
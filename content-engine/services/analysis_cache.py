@@ -0,0 +1,234 @@
+# content-engine/services/analysis_cache.py
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+try:
+    from ...shared.utils.async_helpers import SingleFlight
+    from ...shared.utils.cache import CacheStrategy, MemoryCache, RedisCache, SmartCache
+except ImportError:
+    from shared.utils.async_helpers import SingleFlight
+    from shared.utils.cache import CacheStrategy, MemoryCache, RedisCache, SmartCache
+
+logger = logging.getLogger(__name__)
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+def momentum_key(momentum: Optional[Dict[str, Any]]) -> str:
+    """ส่วนของ cache key จากสัญญาณ momentum (เฉพาะค่าที่มีผลต่อผลวิเคราะห์)
+
+    ผลที่คำนวณด้วย momentum ต่างกันต้องไม่ใช้ entry เดียวกัน; observations มีผลแค่ช่วง < 4
+    """
+    if not momentum:
+        return "m-"
+    velocity = round(float(momentum.get("velocity", 0.0)), 2)
+    acceleration = round(float(momentum.get("acceleration", 0.0)), 2)
+    observations = min(int(momentum.get("observations", 1)), 4)
+    return f"m{velocity:+.2f}{acceleration:+.2f}o{observations}"
+
+class AnalysisResultCache:
+    """
+    Cache ผลวิเคราะห์แบบสองชั้น (memory LRU จำกัดจำนวน + Redis ใช้ร่วมกันระหว่าง replicas)
+
+    เก็บเป็น envelope {"stored_at", "data"} โดย data เป็น JSON string ของผลที่ serialise แล้ว
+    (ผู้เรียกได้ object ใหม่ทุกครั้ง แก้ไขได้โดยไม่กระทบ cache) อายุแบ่งเป็นสองช่วง:
+    - fresh (fresh_ttl): คืนค่าทันที
+    - stale (ถึง fresh_ttl + stale_ttl): คืนค่าเดิมทันทีแล้ว refresh เบื้องหลัง
+    หลังจากนั้นหมดอายุ (TTL ของทั้งสองชั้น) การคำนวณ key เดียวกันพร้อมกันจะรวมเป็นครั้งเดียว
+    (SingleFlight; ข้าม replicas ด้วย lock ใน Redis เมื่อเปิดใช้)
+    """
+
+    def __init__(self,
+                 serialize: Callable[[Any], Dict[str, Any]],
+                 deserialize: Callable[[Dict[str, Any]], Any],
+                 max_entries: int = 500,
+                 fresh_ttl: int = 6 * 3600,
+                 stale_ttl: int = 6 * 3600,
+                 redis_cache: Optional[RedisCache] = None,
+                 namespace: str = "trend_analysis"):
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self.max_entries = max_entries
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.redis_cache = redis_cache
+        self.namespace = namespace
+
+        self._cache: Optional[SmartCache] = None
+        self.flight = SingleFlight(
+            name=namespace,
+            backend=redis_cache,
+            encode=lambda value: json.dumps(serialize(value), ensure_ascii=False, default=str),
+            decode=lambda raw: deserialize(json.loads(raw))
+        )
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "fresh_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "computes": 0,
+            "background_refreshes": 0,
+            "compute_errors": 0,
+            "backend_errors": 0
+        }
+
+    @classmethod
+    def from_env(cls, serialize, deserialize, **kwargs) -> "AnalysisResultCache":
+        """ใช้ Redis ชั้นที่สองเมื่อมี REDIS_HOST (ไม่มีก็ใช้ memory อย่างเดียว)"""
+        redis_cache = None
+        if os.getenv("REDIS_HOST"):
+            redis_cache = RedisCache(
+                host=os.getenv("REDIS_HOST"),
+                port=int(os.getenv("REDIS_PORT", "6379")),
+                db=int(os.getenv("REDIS_DB", "0")),
+                password=os.getenv("REDIS_PASSWORD"),
+                prefix="ai_factory:"
+            )
+        return cls(serialize, deserialize, redis_cache=redis_cache, **kwargs)
+
+    @property
+    def max_age(self) -> int:
+        return self.fresh_ttl + self.stale_ttl
+
+    def expires_at(self, stored_at: Optional[float] = None) -> float:
+        """เวลาหมดอายุจริง (epoch) ของ entry ที่เก็บตอน stored_at"""
+        return (stored_at or time.time()) + self.max_age
+
+    def _backend(self) -> SmartCache:
+        # สร้างตอนใช้ครั้งแรก (ใน event loop) เพราะ MemoryCache เริ่ม cleanup task ตอนสร้าง
+        if self._cache is None:
+            self._cache = SmartCache(
+                memory_cache=MemoryCache(max_size=self.max_entries, default_ttl=self.max_age,
+                                         strategy=CacheStrategy.LRU),
+                redis_cache=self.redis_cache
+            )
+        return self._cache
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def lookup(self, key: str) -> Tuple[Optional[Any], str]:
+        """คืน (ค่า, fresh/stale/miss)"""
+        try:
+            envelope = await self._backend().get(self._key(key))
+        except Exception as e:
+            # Redis ล่มไม่ควรทำให้การวิเคราะห์ล้ม
+            self.stats["backend_errors"] += 1
+            logger.warning(f"Analysis cache read failed: {e}")
+            envelope = None
+
+        if not envelope:
+            return None, MISS
+
+        age = time.time() - envelope["stored_at"]
+        if age >= self.max_age:
+            return None, MISS
+
+        try:
+            value = self.deserialize(json.loads(envelope["data"]))
+        except Exception as e:
+            logger.warning(f"Dropping unreadable analysis cache entry {key}: {e}")
+            await self.delete(key)
+            return None, MISS
+
+        return value, FRESH if age < self.fresh_ttl else STALE
+
+    async def get(self, key: str) -> Optional[Any]:
+        """ค่าที่ยังไม่หมดอายุ (fresh หรือ stale)"""
+        value, _ = await self.lookup(key)
+        return value
+
+    async def put(self, key: str, value: Any) -> bool:
+        envelope = {"stored_at": time.time(),
+                    "data": json.dumps(self.serialize(value), ensure_ascii=False, default=str)}
+        try:
+            return await self._backend().set(self._key(key), envelope, ttl_seconds=self.max_age)
+        except Exception as e:
+            self.stats["backend_errors"] += 1
+            logger.warning(f"Analysis cache write failed: {e}")
+            return False
+
+    async def delete(self, key: str) -> bool:
+        try:
+            return await self._backend().delete(self._key(key))
+        except Exception as e:
+            self.stats["backend_errors"] += 1
+            logger.warning(f"Analysis cache delete failed: {e}")
+            return False
+
+    async def get_or_compute(self, key: str,
+                             compute: Callable[[], Awaitable[Any]],
+                             cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        คืนค่าจาก cache หรือคำนวณใหม่
+
+        stale: คืนค่าเดิมแล้ว refresh เบื้องหลัง (ครั้งเดียวต่อ key)
+        miss: ผู้เรียกพร้อมกันหลายรายรอผลการคำนวณเดียวกัน
+        cacheable(result) = False จะไม่เก็บผล (เช่นผล fallback)
+        """
+        value, state = await self.lookup(key)
+
+        if state == FRESH:
+            self.stats["fresh_hits"] += 1
+            return value
+
+        if state == STALE:
+            self.stats["stale_hits"] += 1
+            if key not in self._refreshing:
+                self.stats["background_refreshes"] += 1
+                task = asyncio.create_task(self._compute_shared(key, compute, cacheable))
+                self._refreshing[key] = task
+                task.add_done_callback(lambda t, k=key: self._finish_refresh(k, t))
+            return value
+
+        self.stats["misses"] += 1
+        return await self._compute_shared(key, compute, cacheable)
+
+    def _finish_refresh(self, key: str, task: asyncio.Task):
+        self._refreshing.pop(key, None)
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Background refresh of {key} failed: {task.exception()}")
+
+    async def _compute_shared(self, key: str, compute, cacheable) -> Any:
+        async def run():
+            self.stats["computes"] += 1
+            try:
+                result = await compute()
+            except Exception:
+                self.stats["compute_errors"] += 1
+                raise
+            if result is not None and (cacheable is None or cacheable(result)):
+                await self.put(key, result)
+            return result
+
+        return await self.flight.do(key, run)
+
+    async def purge_expired(self) -> int:
+        """ลบ entries ที่หมดอายุออกจากชั้น memory (Redis หมดอายุเองตาม TTL)"""
+        memory = self._backend().memory_cache
+        before = len(memory._cache)
+        await memory._cleanup_expired()
+        return before - len(memory._cache)
+
+    def __len__(self) -> int:
+        return len(self._cache.memory_cache._cache) if self._cache else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["fresh_hits"] + self.stats["stale_hits"] + self.stats["misses"]
+        hits = self.stats["fresh_hits"] + self.stats["stale_hits"]
+        return {
+            **self.stats,
+            "entries_in_memory": len(self),
+            "max_entries": self.max_entries,
+            "fresh_ttl_seconds": self.fresh_ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "redis_enabled": self.redis_cache is not None,
+            "single_flight": self.flight.get_stats(),
+            "hit_rate_percent": round(hits / lookups * 100, 2) if lookups else 0.0
+        }
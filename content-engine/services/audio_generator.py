@@ -11,6 +11,12 @@ import requests
 import base64
 import tempfile
 
+try:
+    from .audio_mixing_engine import StreamingAudioMixer, MixSettings
+except ImportError:
+    StreamingAudioMixer = None
+    MixSettings = None
+
 @dataclass
 class AudioComponents:
     voice_audio: bytes
@@ -316,12 +322,42 @@ class BackgroundMusicManager:
 class AudioMixer:
     """ผสมเสียงจากหลายแหล่ง"""
     
+    def __init__(self, use_streaming_engine: bool = True, mix_settings: Optional["MixSettings"] = None):
+        # ใช้ NumPy streaming engine เป็นหลัก, pydub เป็น fallback
+        self.streaming_mixer = None
+        if use_streaming_engine and StreamingAudioMixer is not None:
+            self.streaming_mixer = StreamingAudioMixer(mix_settings)
+
     async def mix_audio_components(self, 
                                  voice_audio: bytes,
                                  background_music: Optional[bytes] = None,
                                  sound_effects: List[Dict] = None) -> AudioComponents:
         """ผสมเสียงทั้งหมดเข้าด้วยกัน"""
         
+        if self.streaming_mixer is not None:
+            try:
+                final_mix, duration = await self.streaming_mixer.mix_async(
+                    voice_audio, background_music, sound_effects
+                )
+                return AudioComponents(
+                    voice_audio=voice_audio,
+                    background_music=background_music,
+                    sound_effects=[],
+                    final_mix=final_mix,
+                    duration_seconds=duration,
+                    voice_settings={}
+                )
+            except Exception as e:
+                print(f"Streaming mixer error, falling back to pydub: {e}")
+        
+        return await self._mix_with_pydub(voice_audio, background_music, sound_effects)
+
+    async def _mix_with_pydub(self,
+                              voice_audio: bytes,
+                              background_music: Optional[bytes] = None,
+                              sound_effects: List[Dict] = None) -> AudioComponents:
+        """ผสมเสียงด้วย pydub overlay (วิธีเดิม)"""
+        
         try:
             # โหลดเสียงหลัก
             voice = AudioSegment.from_mp3(io.BytesIO(voice_audio))
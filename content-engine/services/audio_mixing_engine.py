@@ -0,0 +1,498 @@
+# content-engine/services/audio_mixing_engine.py
+import asyncio
+import io
+import math
+import shutil
+import subprocess
+import threading
+import time
+import tracemalloc
+import wave
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+@dataclass
+class MixSettings:
+    sample_rate: int = 44100
+    channels: int = 2
+    block_seconds: float = 5.0          # ขนาด block ที่ประมวลผลต่อรอบ (memory คงที่)
+    background_gain_db: float = -20.0   # เท่ากับ AudioMixer._adjust_background_music
+    ducking_db: float = 0.0             # ลดเพลงพื้นหลังเพิ่มเติมขณะมีเสียงพูด (เช่น -8.0) ปิดไว้ให้ตรงกับ pydub path
+    duck_threshold_db: float = -40.0
+    duck_window_ms: int = 20
+    duck_hold_ms: int = 250
+    fade_ms: int = 1000
+    normalize_headroom_db: float = 0.1  # เท่ากับค่า default ของ pydub.effects.normalize
+    output_format: str = "mp3"
+    bitrate: str = "192k"
+
+def _db_to_gain(db: float) -> float:
+    return float(10 ** (db / 20.0))
+
+class PCMSource:
+    """อ่าน PCM เป็น block แบบ float32 (frames, channels)"""
+
+    def read(self, frames: int) -> np.ndarray:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class WavPCMSource(PCMSource):
+    """ถอดรหัส WAV 16-bit ด้วย wave module (ไม่ต้องใช้ ffmpeg)"""
+
+    def __init__(self, data: bytes, channels: int):
+        self._reader = wave.open(io.BytesIO(data), 'rb')
+        if self._reader.getsampwidth() != 2:
+            raise ValueError("Only 16-bit PCM WAV is supported")
+        self._source_channels = self._reader.getnchannels()
+        self._channels = channels
+        self.sample_rate = self._reader.getframerate()
+
+    def read(self, frames: int) -> np.ndarray:
+        raw = self._reader.readframes(frames)
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+        samples = samples.reshape(-1, self._source_channels)
+        return _convert_channels(samples, self._channels)
+
+    def close(self):
+        self._reader.close()
+
+class FFmpegPCMSource(PCMSource):
+    """ถอดรหัสไฟล์เสียงทุก format ผ่าน ffmpeg pipe แบบ streaming"""
+
+    def __init__(self, data: bytes, sample_rate: int, channels: int):
+        self._channels = channels
+        self._process = subprocess.Popen(
+            ['ffmpeg', '-loglevel', 'error', '-i', 'pipe:0',
+             '-f', 's16le', '-acodec', 'pcm_s16le',
+             '-ac', str(channels), '-ar', str(sample_rate), 'pipe:1'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        # ป้อน input ใน thread แยกเพื่อไม่ให้ pipe ติด deadlock
+        self._feeder = threading.Thread(target=self._feed, args=(data,), daemon=True)
+        self._feeder.start()
+
+    def _feed(self, data: bytes):
+        try:
+            self._process.stdin.write(data)
+        except (BrokenPipeError, ValueError):
+            pass
+        finally:
+            try:
+                self._process.stdin.close()
+            except (BrokenPipeError, ValueError):
+                pass
+
+    def read(self, frames: int) -> np.ndarray:
+        wanted = frames * self._channels * 2
+        chunks = []
+        remaining = wanted
+        while remaining > 0:
+            chunk = self._process.stdout.read(remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        raw = b''.join(chunks)
+        usable = len(raw) - len(raw) % (self._channels * 2)
+        samples = np.frombuffer(raw[:usable], dtype='<i2').astype(np.float32) / 32768.0
+        return samples.reshape(-1, self._channels)
+
+    def close(self):
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.stdout.close()
+        self._process.wait()
+
+class LoopingPCMSource(PCMSource):
+    """วนเพลงพื้นหลังซ้ำโดยเปิด stream ใหม่เมื่ออ่านจบ (แทนการ `bg_music * repeats`)"""
+
+    def __init__(self, factory: Callable[[], PCMSource], channels: int):
+        self._factory = factory
+        self._channels = channels
+        self._source = factory()
+        self._empty = False
+
+    def read(self, frames: int) -> np.ndarray:
+        out = np.zeros((frames, self._channels), dtype=np.float32)
+        filled = 0
+        restarted = False
+        while filled < frames and not self._empty:
+            block = self._source.read(frames - filled)
+            if len(block) == 0:
+                if restarted:
+                    # source ว่างเปล่า ป้องกัน loop ไม่รู้จบ
+                    self._empty = True
+                    break
+                self._source.close()
+                self._source = self._factory()
+                restarted = True
+                continue
+            restarted = False
+            out[filled:filled + len(block)] = block
+            filled += len(block)
+        return out
+
+    def close(self):
+        self._source.close()
+
+class PCMSink:
+    """รับ PCM int16 เป็น block แล้ว encode เป็นไฟล์ผลลัพธ์"""
+
+    def write(self, samples: np.ndarray):
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        raise NotImplementedError
+
+class WavPCMSink(PCMSink):
+    def __init__(self, sample_rate: int, channels: int):
+        self._buffer = io.BytesIO()
+        self._writer = wave.open(self._buffer, 'wb')
+        self._writer.setnchannels(channels)
+        self._writer.setsampwidth(2)
+        self._writer.setframerate(sample_rate)
+
+    def write(self, samples: np.ndarray):
+        self._writer.writeframesraw(samples.astype('<i2').tobytes())
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._buffer.getvalue()
+
+class FFmpegPCMSink(PCMSink):
+    """Encode ผ่าน ffmpeg (mp3/aac/...) โดยอ่าน output ใน thread แยก"""
+
+    def __init__(self, sample_rate: int, channels: int, output_format: str, bitrate: str):
+        self._process = subprocess.Popen(
+            ['ffmpeg', '-loglevel', 'error',
+             '-f', 's16le', '-ac', str(channels), '-ar', str(sample_rate), '-i', 'pipe:0',
+             '-b:a', bitrate, '-f', output_format, 'pipe:1'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        self._output = io.BytesIO()
+        self._drainer = threading.Thread(target=self._drain, daemon=True)
+        self._drainer.start()
+
+    def _drain(self):
+        for chunk in iter(lambda: self._process.stdout.read(65536), b''):
+            self._output.write(chunk)
+
+    def write(self, samples: np.ndarray):
+        self._process.stdin.write(samples.astype('<i2').tobytes())
+
+    def finish(self) -> bytes:
+        self._process.stdin.close()
+        self._drainer.join()
+        if self._process.wait() != 0:
+            raise RuntimeError("ffmpeg encoding failed")
+        return self._output.getvalue()
+
+def _convert_channels(samples: np.ndarray, channels: int) -> np.ndarray:
+    """แปลงจำนวน channel ด้วย numpy (mono <-> stereo)"""
+    if samples.shape[1] == channels:
+        return samples
+    mono = samples.mean(axis=1, keepdims=True)
+    return np.repeat(mono, channels, axis=1)
+
+def _ffmpeg_available() -> bool:
+    return shutil.which('ffmpeg') is not None
+
+class StreamingAudioMixer:
+    """ผสมเสียงด้วย NumPy แบบ block-by-block แทน pydub overlay
+
+    ถอดรหัส voice / background / effects เป็น buffer float32 แล้วปรับ gain,
+    ducking และ fade เป็น vector operation ทีละ block ขนาดคงที่ ทำให้ใช้
+    memory เท่าเดิมไม่ว่าวิดีโอจะยาวเท่าไร
+    """
+
+    def __init__(self, settings: Optional[MixSettings] = None):
+        self.settings = settings or MixSettings()
+
+    async def mix_async(self,
+                        voice_audio: bytes,
+                        background_music: Optional[bytes] = None,
+                        sound_effects: List[Dict] = None) -> Tuple[bytes, float]:
+        """รัน mix() ใน executor เพื่อไม่ให้ block event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self.mix, voice_audio, background_music, sound_effects or []
+        )
+
+    def mix(self,
+            voice_audio: bytes,
+            background_music: Optional[bytes] = None,
+            sound_effects: List[Dict] = None) -> Tuple[bytes, float]:
+        """ผสมเสียงแบบ synchronous คืนค่า (encoded bytes, duration_seconds)"""
+
+        s = self.settings
+        block_frames = max(1, int(s.block_seconds * s.sample_rate))
+
+        # Pass 1: หา peak และความยาวของเสียงพูด (สำหรับ normalize และ fade)
+        total_frames, voice_peak = self._analyze(voice_audio, block_frames)
+        if total_frames == 0:
+            raise ValueError("Voice audio contains no samples")
+        voice_gain = _db_to_gain(-s.normalize_headroom_db) / voice_peak if voice_peak > 0 else 1.0
+
+        effects = self._prepare_effects(sound_effects or [])
+
+        # Pass 2: หา peak ของ mix สุดท้าย แล้ว normalize ทั้ง mix (เหมือน normalize(mix) ของ pydub path)
+        mix_peak = 0.0
+        for block in self._render(voice_audio, background_music, effects, total_frames, block_frames, voice_gain):
+            mix_peak = max(mix_peak, float(np.abs(block).max()))
+        output_gain = _db_to_gain(-s.normalize_headroom_db) / mix_peak if mix_peak > 0 else 1.0
+
+        # Pass 3: render อีกรอบด้วย gain สุดท้ายแล้ว encode
+        sink = self._create_sink()
+        for block in self._render(voice_audio, background_music, effects, total_frames, block_frames, voice_gain):
+            block *= output_gain
+            np.clip(block, -1.0, 32767.0 / 32768.0, out=block)  # กันเฉพาะการปัดเศษ
+            sink.write(np.round(block * 32768.0).astype(np.int16))
+
+        return sink.finish(), total_frames / float(s.sample_rate)
+
+    def _render(self, voice_audio: bytes, background_music: Optional[bytes], effects: List[tuple],
+                total_frames: int, block_frames: int, voice_gain: float):
+        """Generator ของ block ที่ผสมแล้ว (float32 ก่อน normalize)
+
+        สถานะ ducking อยู่ใน local ของแต่ละรอบ render เพื่อให้ mix_async
+        หลายงานพร้อมกันบน mixer ตัวเดียวไม่ปนกัน
+        """
+        s = self.settings
+        voice = self._open(voice_audio)
+        background = None
+        if background_music:
+            background = LoopingPCMSource(lambda: self._open(background_music), s.channels)
+        duck_state = {'carry': np.zeros(self._duck_hold_windows(), dtype=bool), 'last_gain': 1.0}
+
+        try:
+            for start in range(0, total_frames, block_frames):
+                frames = min(block_frames, total_frames - start)
+                block = self._read_exact(voice, frames) * voice_gain
+
+                if background is not None:
+                    bg = background.read(frames)
+                    gain = (_db_to_gain(s.background_gain_db)
+                            * self._fade_envelope(start, frames, total_frames)
+                            * self._ducking_envelope(block, duck_state))
+                    block += bg * gain[:, None]
+
+                for position, effect in effects:
+                    self._add_effect(block, start, position, effect)
+
+                yield block
+        finally:
+            voice.close()
+            if background is not None:
+                background.close()
+
+    def _open(self, data: bytes) -> PCMSource:
+        s = self.settings
+        if data[:4] == b'RIFF' and data[8:12] == b'WAVE':
+            source = WavPCMSource(data, s.channels)
+            if source.sample_rate == s.sample_rate:
+                return source
+            source.close()
+        if not _ffmpeg_available():
+            raise RuntimeError("ffmpeg is required to decode non-WAV audio")
+        return FFmpegPCMSource(data, s.sample_rate, s.channels)
+
+    def _create_sink(self) -> PCMSink:
+        s = self.settings
+        if s.output_format == 'wav':
+            return WavPCMSink(s.sample_rate, s.channels)
+        return FFmpegPCMSink(s.sample_rate, s.channels, s.output_format, s.bitrate)
+
+    def _analyze(self, data: bytes, block_frames: int) -> tuple:
+        source = self._open(data)
+        total = 0
+        peak = 0.0
+        try:
+            while True:
+                block = source.read(block_frames)
+                if len(block) == 0:
+                    break
+                total += len(block)
+                peak = max(peak, float(np.abs(block).max()))
+        finally:
+            source.close()
+        return total, peak
+
+    def _read_exact(self, source: PCMSource, frames: int) -> np.ndarray:
+        block = source.read(frames)
+        if len(block) < frames:
+            padded = np.zeros((frames, self.settings.channels), dtype=np.float32)
+            padded[:len(block)] = block
+            return padded
+        return block
+
+    def _fade_envelope(self, start: int, frames: int, total_frames: int) -> np.ndarray:
+        """Fade in/out ของเพลงพื้นหลัง คำนวณจากตำแหน่ง absolute ของ block"""
+        fade_frames = int(self.settings.fade_ms * self.settings.sample_rate / 1000)
+        if fade_frames <= 0:
+            return np.ones(frames, dtype=np.float32)
+        idx = np.arange(start, start + frames, dtype=np.float32)
+        envelope = np.minimum(idx / fade_frames, (total_frames - idx) / fade_frames)
+        return np.clip(envelope, 0.0, 1.0)
+
+    def _duck_window(self) -> int:
+        return max(1, int(self.settings.duck_window_ms * self.settings.sample_rate / 1000))
+
+    def _duck_hold_windows(self) -> int:
+        return max(0, int(math.ceil(self.settings.duck_hold_ms / max(1, self.settings.duck_window_ms))))
+
+    def _ducking_envelope(self, voice_block: np.ndarray, state: Dict) -> np.ndarray:
+        """ลดเพลงพื้นหลังเมื่อมีเสียงพูด (RMS ต่อ window + hold + ramp เชิงเส้น)"""
+        s = self.settings
+        frames = len(voice_block)
+        if s.ducking_db == 0:
+            return np.ones(frames, dtype=np.float32)
+
+        window = self._duck_window()
+        n_windows = int(math.ceil(frames / window))
+        mono = np.zeros(n_windows * window, dtype=np.float32)
+        mono[:frames] = voice_block.mean(axis=1)
+        rms = np.sqrt(np.mean(mono.reshape(n_windows, window) ** 2, axis=1))
+        active = rms > _db_to_gain(s.duck_threshold_db)
+
+        # Hold: ต่อช่วง active ไปข้างหน้า รวมสถานะจาก block ก่อนหน้า
+        hold = len(state['carry'])
+        history = np.concatenate([state['carry'], active])
+        held = np.convolve(history, np.ones(hold + 1))[hold:hold + n_windows] > 0
+        if hold:
+            state['carry'] = history[-hold:]
+
+        window_gain = np.where(held, _db_to_gain(s.ducking_db), 1.0)
+        centres = np.arange(n_windows) * window + window / 2.0
+        gain = np.interp(
+            np.arange(frames),
+            np.concatenate([[-window / 2.0], centres]),
+            np.concatenate([[state['last_gain']], window_gain])
+        ).astype(np.float32)
+        state['last_gain'] = float(window_gain[-1])
+        return gain
+
+    def _prepare_effects(self, sound_effects: List[Dict]) -> List[tuple]:
+        """ถอดรหัส sound effects (สั้น) เต็มไฟล์ครั้งเดียว"""
+        s = self.settings
+        prepared = []
+        for config in sound_effects:
+            try:
+                if config.get('audio'):
+                    source = self._open(config['audio'])
+                    chunks = []
+                    while True:
+                        block = source.read(s.sample_rate)
+                        if len(block) == 0:
+                            break
+                        chunks.append(block)
+                    source.close()
+                    samples = np.concatenate(chunks) if chunks else np.zeros((0, s.channels), np.float32)
+                else:
+                    samples = self._mock_sound_effect(config.get('type', 'click'))
+
+                volume = config.get('volume', 0)
+                if volume:
+                    samples = samples * _db_to_gain(volume)
+                position = int(config.get('position_ms', 0) * s.sample_rate / 1000)
+                prepared.append((position, samples.astype(np.float32)))
+            except Exception as e:
+                print(f"Error preparing sound effect: {e}")
+        return prepared
+
+    def _mock_sound_effect(self, effect_type: str) -> np.ndarray:
+        """สร้าง sound effect แบบ mock (เสียงเดียวกับ AudioMixer._create_mock_sound_effect)"""
+        if effect_type == "click":
+            tones = [(800, 100)]
+        elif effect_type == "whoosh":
+            tones = [(2000, 150), (500, 150)]
+        else:
+            tones = [(440, 200)]
+
+        rate = self.settings.sample_rate
+        parts = []
+        for freq, duration_ms in tones:
+            t = np.arange(int(rate * duration_ms / 1000)) / rate
+            parts.append(np.sin(2 * np.pi * freq * t))
+        mono = np.concatenate(parts).astype(np.float32)
+        return np.repeat(mono[:, None], self.settings.channels, axis=1)
+
+    def _add_effect(self, block: np.ndarray, start: int, position: int, effect: np.ndarray):
+        end = start + len(block)
+        effect_end = position + len(effect)
+        if effect_end <= start or position >= end:
+            return
+        lo = max(start, position)
+        hi = min(end, effect_end)
+        block[lo - start:hi - start] += effect[lo - position:hi - position]
+
+def _synthetic_wav(duration_seconds: float, freq: float, sample_rate: int = 44100) -> bytes:
+    """สร้าง WAV mono สำหรับ benchmark"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        step = sample_rate * 10
+        total = int(duration_seconds * sample_rate)
+        for start in range(0, total, step):
+            t = np.arange(start, min(total, start + step)) / sample_rate
+            tone = 0.5 * np.sin(2 * np.pi * freq * t)
+            writer.writeframes((tone * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+def benchmark_mixers(durations_minutes: List[float] = (1, 10, 60)) -> List[Dict]:
+    """เปรียบเทียบ pydub AudioMixer path กับ StreamingAudioMixer
+
+    วัดเฉพาะขั้นตอนผสมเสียง (ทั้งสองฝั่ง output เป็น WAV) เพื่อไม่ให้เวลา
+    mp3 encode ของ ffmpeg มาบดบังผล
+    """
+    from pydub import AudioSegment
+    from pydub.effects import normalize
+    from pydub.generators import Sine
+
+    streaming = StreamingAudioMixer(MixSettings(output_format='wav'))
+    effects = [
+        {"type": "click", "position_ms": 5000, "volume": -10},
+        {"type": "whoosh", "position_ms": 15000, "volume": -5}
+    ]
+
+    results = []
+    for minutes in durations_minutes:
+        voice_wav = _synthetic_wav(minutes * 60, 220)
+        music_wav = _synthetic_wav(30, 440)
+
+        def run_legacy():
+            # ขั้นตอนเดียวกับ AudioMixer.mix_audio_components / _adjust_background_music
+            voice = normalize(AudioSegment.from_wav(io.BytesIO(voice_wav)))
+            bg = AudioSegment.from_wav(io.BytesIO(music_wav)) - 20
+            bg = (bg * (len(voice) // len(bg) + 1))[:len(voice)].fade_in(1000).fade_out(1000)
+            mix = voice.overlay(bg)
+            for effect in effects:
+                effect_audio = Sine(800).to_audio_segment(duration=100) + effect['volume']
+                mix = mix.overlay(effect_audio, position=effect['position_ms'])
+            out = io.BytesIO()
+            normalize(mix).export(out, format='wav')
+            return out.getvalue()
+
+        row = {"minutes": minutes}
+        for name, func in (("pydub", run_legacy),
+                           ("numpy_streaming", lambda: streaming.mix(voice_wav, music_wav, effects))):
+            tracemalloc.start()
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            row[f"{name}_seconds"] = round(elapsed, 3)
+            row[f"{name}_peak_mb"] = round(peak / (1024 * 1024), 1)
+        results.append(row)
+        print(f"{minutes:>4} min | pydub {row['pydub_seconds']}s / {row['pydub_peak_mb']} MB | "
+              f"numpy {row['numpy_streaming_seconds']}s / {row['numpy_streaming_peak_mb']} MB")
+    return results
+
+if __name__ == "__main__":
+    benchmark_mixers()
@@ -0,0 +1,117 @@
+# content-engine/services/batch_generation.py
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import (Any, AsyncIterator, Awaitable, Callable, Collection, Dict, Hashable, List,
+                    Optional, Sequence, Tuple)
+
+logger = logging.getLogger(__name__)
+
+# (index ในรายการที่ส่งเข้า, request)
+IndexedRequest = Tuple[int, Any]
+
+@dataclass
+class BatchGenerationItem:
+    """ผลของหนึ่งคำขอใน batch (index ตรงกับตำแหน่งในรายการที่ส่งเข้า)"""
+    index: int
+    request: Any
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.result is not None
+
+@dataclass
+class BatchPlan:
+    """การแบ่งคำขอใน batch: สร้างแยก / รวมเป็น call เดียว / ไม่รองรับ"""
+    singles: List[IndexedRequest] = field(default_factory=list)
+    groups: List[List[IndexedRequest]] = field(default_factory=list)
+    unsupported: List[BatchGenerationItem] = field(default_factory=list)
+
+def plan_batch(requests: Sequence[Any],
+               supported: Collection[str],
+               combinable: Collection[str] = (),
+               group_key: Optional[Callable[[Any], Optional[Hashable]]] = None) -> BatchPlan:
+    """
+    แบ่งคำขอโดยเก็บ index เดิมของทุกคำขอไว้ (รวมถึงประเภทที่ไม่รองรับ)
+
+    group_key(request): คีย์ของคำขอที่รวมกันได้ (None = สร้างแยก)
+    กลุ่มหนึ่งมีได้ประเภทละหนึ่งคำขอ และกลุ่มที่เหลือคำขอเดียวจะสร้างแยก
+    """
+    plan = BatchPlan()
+    groups: Dict[Hashable, List[IndexedRequest]] = {}
+
+    for index, request in enumerate(requests):
+        if request.content_type not in supported:
+            plan.unsupported.append(BatchGenerationItem(
+                index, request, error=f"Unsupported content type: {request.content_type}"
+            ))
+            continue
+
+        key = group_key(request) if group_key and request.content_type in combinable else None
+        if key is not None:
+            group = groups.setdefault(key, [])
+            if all(other.content_type != request.content_type for _, other in group):
+                group.append((index, request))
+                continue
+        plan.singles.append((index, request))
+
+    for group in groups.values():
+        if len(group) > 1:
+            plan.groups.append(group)
+        else:
+            plan.singles.extend(group)
+
+    return plan
+
+async def stream_batch(plan: BatchPlan,
+                       run_single: Callable[[int, Any], Awaitable[List[BatchGenerationItem]]],
+                       run_group: Callable[[List[IndexedRequest]], Awaitable[List[BatchGenerationItem]]]
+                       ) -> AsyncIterator[BatchGenerationItem]:
+    """
+    รันตาม plan แล้วคืน BatchGenerationItem ทีละรายการตามลำดับที่เสร็จ
+
+    คำขอที่ไม่รองรับถูกคืนก่อน ถ้าผู้เรียกหยุดอ่านกลางทาง งานที่ค้างอยู่จะถูกยกเลิก
+    """
+    tasks = [asyncio.ensure_future(run_single(index, request)) for index, request in plan.singles]
+    tasks.extend(asyncio.ensure_future(run_group(group)) for group in plan.groups)
+
+    try:
+        for item in plan.unsupported:
+            yield item
+
+        for next_done in asyncio.as_completed(tasks):
+            for item in await next_done:
+                yield item
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+def collect_batch_results(items: Sequence[BatchGenerationItem]) -> Tuple[List[Any], List[Dict[str, Any]]]:
+    """เรียงผลตาม index เดิม คืน (results ที่สำเร็จ, errors พร้อม request_index ที่ถูกต้อง)"""
+    results = []
+    errors = []
+
+    for item in sorted(items, key=lambda item: item.index):
+        if item.success:
+            results.append(item.result)
+        else:
+            errors.append({
+                "request_index": item.index,
+                "content_type": item.request.content_type,
+                "error": item.error
+            })
+
+    return results, errors
+
+def split_call_cost(call_cost: float, parts: int) -> List[float]:
+    """แบ่งต้นทุนของ LLM call เดียวให้แต่ละส่วน โดยผลรวมเท่ากับ call_cost พอดี"""
+    if parts <= 0:
+        return []
+    share = round(call_cost / parts, 2)
+    shares = [share] * (parts - 1)
+    shares.append(round(call_cost - share * (parts - 1), 2))
+    return shares
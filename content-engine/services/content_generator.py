@@ -5,11 +5,12 @@ Core logic สำหรับการสร้างเนื้อหาแต
 
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Optional, Union, Tuple, AsyncIterator
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 import json
 import re
+import time
 from pathlib import Path
 
 from shared.models.content_plan import ContentPlan
@@ -18,8 +19,20 @@ from shared.models.quality_tier import QualityTier
 from services.service_registry import ServiceRegistry
 from shared.utils.logger import get_logger
 from shared.utils.error_handler import handle_errors, ContentGenerationError
+from shared.utils.async_helpers import SingleFlight, make_flight_key
 from shared.constants.ai_prompts import PromptTemplates
 
+try:
+    from .speculative_generation import accepts_keyword, candidate_count, race_candidates
+except ImportError:
+    from speculative_generation import accepts_keyword, candidate_count, race_candidates
+try:
+    from .batch_generation import (BatchGenerationItem, plan_batch, stream_batch,
+                                   collect_batch_results, split_call_cost)
+except ImportError:
+    from batch_generation import (BatchGenerationItem, plan_batch, stream_batch,
+                                  collect_batch_results, split_call_cost)
+
 
 @dataclass
 class GenerationRequest:
@@ -50,7 +63,11 @@ class ContentGenerator:
     Core engine สำหรับการสร้างเนื้อหาด้วย AI Services
     """
     
-    def __init__(self, quality_tier: QualityTier = QualityTier.BUDGET):
+    # ประเภทที่ batch รวมเป็น LLM call เดียวต่อ opportunity ได้
+    COMBINABLE_TYPES = ("title", "description", "hashtags")
+    
+    def __init__(self, quality_tier: QualityTier = QualityTier.BUDGET,
+                 flight_backend: Any = None):
         self.quality_tier = quality_tier
         self.logger = get_logger(__name__)
         self.service_registry = ServiceRegistry()
@@ -71,8 +88,26 @@ class ContentGenerator:
             "successful_generations": 0,
             "failed_generations": 0,
             "total_cost": 0.0,
-            "average_quality": 0.0
+            "average_quality": 0.0,
+            "speculative_requests": 0,
+            "candidates_launched": 0,
+            "candidates_cancelled": 0,
+            "speculative_wasted_cost": 0.0,
+            "combined_calls": 0,
+            "combined_requests": 0
         }
+        
+        # Speculative QC: ยิงหลาย candidates พร้อมกันแทนการ retry ทีละรอบ
+        # ปิดเป็นค่าเริ่มต้นเพราะจ่ายค่า request ทุก candidate; เปิดที่นี่และ opt-in ต่อประเภทใน generation_settings
+        self.speculative_generation = False
+        
+        # Script เดียวกันที่ถูกขอพร้อมกัน (dashboard / n8n / API) เรียก AI ครั้งเดียว
+        # flight_backend (เช่น RedisCache) ใช้รวมข้าม process
+        self.script_flight = SingleFlight("content_script", backend=flight_backend)
+        
+        # Batch: จำนวนคำขอพร้อมกันต่อ provider และการรวม title/description/hashtags เป็น call เดียว
+        self.batch_concurrency = {"Groq": 4, "OpenAI GPT-3.5": 3, "Claude": 2, "default": 3}
+        self.combine_batch_metadata = True
 
     def _load_generation_settings(self) -> Dict:
         """โหลดการตั้งค่าการสร้างเนื้อหา"""
@@ -82,34 +117,39 @@ class ContentGenerator:
                 "min_word_count": 50,
                 "max_word_count": 2000,
                 "required_sections": ["hook", "main_content", "cta"],
-                "quality_checks": ["readability", "engagement", "structure"]
+                "quality_checks": ["readability", "engagement", "structure"],
+                "speculative": {"enabled": False, "candidates": 3, "temperatures": [0.7, 0.9, 0.5]}
             },
             "title": {
                 "max_retries": 2,
                 "min_length": 10,
                 "max_length": 100,
                 "variations_count": 5,
-                "seo_requirements": ["keyword_inclusion", "length_optimization"]
+                "seo_requirements": ["keyword_inclusion", "length_optimization"],
+                "speculative": {"enabled": False, "candidates": 2, "temperatures": [0.8, 1.0]}
             },
             "description": {
                 "max_retries": 2,
                 "min_length": 50,
                 "max_length": 500,
                 "platform_specific": True,
-                "include_keywords": True
+                "include_keywords": True,
+                "speculative": {"enabled": False, "candidates": 2, "temperatures": [0.7, 0.9]}
             },
             "hashtags": {
                 "max_retries": 1,
                 "min_count": 5,
                 "max_count": 30,
                 "trending_weight": 0.4,
-                "relevance_weight": 0.6
+                "relevance_weight": 0.6,
+                "speculative": {"enabled": False}  # ถูกและผ่านเกณฑ์แทบทุกครั้ง
             },
             "thumbnail_concept": {
                 "max_retries": 2,
                 "style_consistency": True,
                 "platform_optimization": True,
-                "color_psychology": True
+                "color_psychology": True,
+                "speculative": {"enabled": False, "candidates": 2, "temperatures": [0.8, 1.0]}
             }
         }
 
@@ -119,17 +159,20 @@ class ContentGenerator:
             QualityTier.BUDGET: {
                 "min_quality_score": 6.0,
                 "max_generation_time": 30.0,
-                "retry_threshold": 5.0
+                "retry_threshold": 5.0,
+                "max_parallel_candidates": 3
             },
             QualityTier.BALANCED: {
                 "min_quality_score": 7.5,
                 "max_generation_time": 60.0,
-                "retry_threshold": 6.5
+                "retry_threshold": 6.5,
+                "max_parallel_candidates": 2
             },
             QualityTier.PREMIUM: {
                 "min_quality_score": 8.5,
                 "max_generation_time": 120.0,
-                "retry_threshold": 7.5
+                "retry_threshold": 7.5,
+                "max_parallel_candidates": 2
             }
         }
 
@@ -191,7 +234,20 @@ class ContentGenerator:
             quality_tier=self.quality_tier
         )
         
-        return await self._generate_with_quality_control(request, self._generate_script_internal)
+        return await self.script_flight.do(
+            self._script_flight_key(opportunity, content_plan, request),
+            lambda: self._generate_with_quality_control(request, self._generate_script_internal)
+        )
+
+    def _script_flight_key(self, opportunity: ContentOpportunity, content_plan: ContentPlan,
+                           request: GenerationRequest) -> str:
+        """key ของ script request: prompt เดียวกันใน tier เดียวกันถือเป็น request เดียวกัน"""
+        
+        try:
+            prompt = self._build_script_prompt(opportunity, content_plan, request)
+        except Exception:
+            prompt = f"{id(opportunity)}:{id(content_plan)}"
+        return make_flight_key("script", request.quality_tier.value, prompt)
 
     async def _generate_script_internal(self, request: GenerationRequest) -> Dict[str, str]:
         """สร้าง script แบบละเอียด"""
@@ -206,7 +262,7 @@ class ContentGenerator:
         prompt = self._build_script_prompt(opportunity, content_plan, request)
         
         # Generate script
-        response = await text_ai.generate_content(prompt)
+        response = await self._call_text_ai(text_ai, prompt, request)
         
         # Parse และ validate
         script = self._parse_script_response(response)
@@ -484,7 +540,7 @@ Tone: {patterns}
         text_ai = self.service_registry.get_service("text_ai", request.quality_tier)
         
         prompt = self._build_title_prompt(opportunity, count)
-        response = await text_ai.generate_content(prompt)
+        response = await self._call_text_ai(text_ai, prompt, request)
         
         titles = self._parse_titles_response(response)
         titles = self._optimize_titles(titles, opportunity)
@@ -614,7 +670,7 @@ Keywords: {', '.join(opportunity.trend_data.keywords)}
         
         for platform in platforms:
             prompt = self._build_description_prompt(opportunity, platform)
-            response = await text_ai.generate_content(prompt)
+            response = await self._call_text_ai(text_ai, prompt, request)
             
             description = self._parse_description_response(response, platform)
             description = self._optimize_description(description, platform, opportunity)
@@ -791,7 +847,7 @@ Follow สำหรับเนื้อหาดีๆ ทุกวัน!
         text_ai = self.service_registry.get_service("text_ai", request.quality_tier)
         
         prompt = self._build_hashtags_prompt(opportunity, platform)
-        response = await text_ai.generate_content(prompt)
+        response = await self._call_text_ai(text_ai, prompt, request)
         
         hashtags = self._parse_hashtags_response(response)
         hashtags = self._optimize_hashtags(hashtags, platform, opportunity)
@@ -955,7 +1011,7 @@ Platform: {platform}
         text_ai = self.service_registry.get_service("text_ai", request.quality_tier)
         
         prompt = self._build_thumbnail_prompt(opportunity, style_prefs)
-        response = await text_ai.generate_content(prompt)
+        response = await self._call_text_ai(text_ai, prompt, request)
         
         concept = self._parse_thumbnail_response(response)
         concept = self._optimize_thumbnail_concept(concept, opportunity)
@@ -1164,6 +1220,13 @@ Trend: {opportunity.trend_data.topic}
         max_retries = settings.get("max_retries", 2)
         threshold = self.quality_thresholds[request.quality_tier]
         
+        speculative = settings.get("speculative", {})
+        candidates = candidate_count(speculative, threshold.get("max_parallel_candidates", 1))
+        if self.speculative_generation and candidates and self._supports_temperature(request):
+            return await self._generate_speculative(request, generator_func, candidates,
+                                                    speculative.get("temperatures") or [None],
+                                                    threshold, start_time)
+        
         best_result = None
         best_score = 0.0
         
@@ -1243,6 +1306,86 @@ Trend: {opportunity.trend_data.topic}
         self.generation_stats["failed_generations"] += 1
         raise ContentGenerationError("Failed to generate any usable content")
 
+    async def _generate_speculative(self, request: GenerationRequest, generator_func,
+                                    candidates: int, temperatures: List[Optional[float]],
+                                    threshold: Dict[str, Any], start_time: datetime) -> GenerationResult:
+        """
+        สร้าง candidates พร้อมกัน (temperature ต่างกัน) ประเมินทีละตัวที่เสร็จ
+        แล้วยกเลิกที่เหลือเมื่อมีตัวที่ผ่านเกณฑ์
+        
+        ต้นทุน: ทุก candidate ที่ส่งไปแล้วถูกคิดเงิน (รวมตัวที่ยกเลิก เพราะ provider คิดตาม request ที่ส่ง)
+        """
+        
+        min_score = threshold["min_quality_score"]
+        self.generation_stats["speculative_requests"] += 1
+        self.generation_stats["candidates_launched"] += candidates
+        
+        async def run_candidate(candidate: int, temperature: Optional[float]):
+            constraints = dict(request.constraints or {})
+            constraints.update({"temperature": temperature, "candidate": candidate})
+            candidate_request = replace(request, constraints=constraints)
+            content = await generator_func(candidate_request)
+            return content, self._evaluate_content_quality(content, candidate_request)
+        
+        outcome = await race_candidates(
+            run_candidate, candidates, temperatures, min_score,
+            cost_of=lambda seconds: self._calculate_generation_cost(request, seconds)
+        )
+        self.generation_stats["candidates_cancelled"] += outcome.cancelled
+        self.generation_stats["total_cost"] += outcome.total_cost
+        
+        chosen = outcome.chosen
+        if chosen is None:
+            self.generation_stats["failed_generations"] += 1
+            errors = outcome.errors
+            raise ContentGenerationError(
+                f"All {candidates} speculative candidates failed: {errors[-1] if errors else 'no result'}"
+            )
+        
+        quality_score, content, candidate, temperature = chosen
+        self.generation_stats["speculative_wasted_cost"] += round(outcome.total_cost - outcome.costs[candidate], 2)
+        
+        metadata = {
+            "mode": "speculative",
+            "attempt": candidate,
+            "candidates_launched": candidates,
+            "candidates_completed": outcome.completed,
+            "candidates_cancelled": outcome.cancelled,
+            "temperature": temperature,
+            "quality_threshold": min_score,
+            "candidate_costs": outcome.costs
+        }
+        if outcome.winner is None:
+            metadata["warning"] = "Quality below threshold but best available"
+        
+        self.generation_stats["successful_generations"] += 1
+        self._update_quality_average(quality_score)
+        
+        return GenerationResult(
+            content_type=request.content_type,
+            generated_content=content,
+            quality_score=quality_score,
+            generation_time=(datetime.now() - start_time).total_seconds(),
+            ai_service_used=self._get_ai_service_name(request.quality_tier),
+            cost_estimate=outcome.total_cost,
+            metadata=metadata,
+            created_at=datetime.now()
+        )
+
+    def _supports_temperature(self, request: GenerationRequest) -> bool:
+        """candidates ต่างกันแค่ temperature: ถ้า text AI รับ temperature ไม่ได้ทุกตัวจะเหมือนกัน (เสียเงินเปล่า)"""
+        
+        text_ai = self.service_registry.get_service("text_ai", request.quality_tier)
+        return accepts_keyword(getattr(text_ai, "generate_content", None), "temperature")
+
+    async def _call_text_ai(self, text_ai, prompt: str, request: GenerationRequest) -> str:
+        """เรียก text AI โดยส่ง temperature ของ candidate เฉพาะเมื่อ service รับ argument นี้"""
+        
+        temperature = (request.constraints or {}).get("temperature")
+        if temperature is None or not accepts_keyword(text_ai.generate_content, "temperature"):
+            return await text_ai.generate_content(prompt)
+        return await text_ai.generate_content(prompt, temperature=temperature)
+
     def _evaluate_content_quality(self, content: Any, request: GenerationRequest) -> float:
         """ประเมินคุณภาพเนื้อหา"""
         
@@ -1453,7 +1596,8 @@ Trend: {opportunity.trend_data.topic}
             "title": 0.5,
             "description": 1.0,
             "hashtags": 0.3,
-            "thumbnail_concept": 1.5
+            "thumbnail_concept": 1.5,
+            "combined_metadata": 1.8  # title + description + hashtags ใน call เดียว
         }
         
         multiplier = type_multipliers.get(request.content_type, 1.0)
@@ -1506,55 +1650,256 @@ Trend: {opportunity.trend_data.topic}
         stats["average_cost_per_generation"] = (
             round(stats["total_cost"] / max(stats["successful_generations"], 1), 2)
         )
+        stats["single_flight"] = self.script_flight.get_stats()
         
         return stats
 
-    async def batch_generate_content(self, requests: List[GenerationRequest]) -> List[GenerationResult]:
-        """สร้างเนื้อหาหลายรายการพร้อมกัน"""
+    async def batch_generate_content(self, requests: List[GenerationRequest],
+                                     max_concurrency: Optional[Dict[str, int]] = None,
+                                     combine: Optional[bool] = None) -> List[GenerationResult]:
+        """สร้างเนื้อหาหลายรายการพร้อมกัน (คืนผลที่สำเร็จตามลำดับของ requests)"""
+        
+        items = [item async for item in self.stream_batch_generate_content(requests, max_concurrency, combine)]
+        successful_results, errors = collect_batch_results(items)
+        
+        for error in errors:
+            self.logger.warning(
+                f"Batch request {error['request_index']} ({error['content_type']}) failed: {error['error']}"
+            )
+        if errors:
+            self.logger.warning(f"Batch generation completed with {len(errors)} errors")
+        
+        self.logger.info(f"Batch generation completed: {len(successful_results)} successful")
+        
+        return successful_results
+
+    async def stream_batch_generate_content(self, requests: List[GenerationRequest],
+                                            max_concurrency: Optional[Dict[str, int]] = None,
+                                            combine: Optional[bool] = None) -> AsyncIterator[BatchGenerationItem]:
+        """
+        สร้างเนื้อหาหลายรายการ คืนผลทีละรายการตามลำดับที่เสร็จ (async generator)
+        
+        - จำกัดจำนวนคำขอพร้อมกันต่อ provider (batch_concurrency หรือ max_concurrency)
+        - title/description/hashtags ของ opportunity เดียวกันรวมเป็น LLM call เดียว
+          ส่วนที่ parse ไม่ได้หรือคุณภาพไม่ผ่านจะสร้างแยกตามปกติ
+        - ทุกคำขอได้ BatchGenerationItem หนึ่งรายการ (result หรือ error) ที่มี index ของตัวเอง
+        
+        ใช้: async for item in generator.stream_batch_generate_content(requests): ...
+        """
         
         self.logger.info(f"Starting batch generation for {len(requests)} requests")
         
-        # สร้าง tasks
-        tasks = []
+        generators = {
+            "script": self._generate_script_internal,
+            "title": self._generate_titles_internal,
+            "description": self._generate_descriptions_internal,
+            "hashtags": self._generate_hashtags_internal,
+            "thumbnail_concept": self._generate_thumbnail_internal
+        }
+        limits = {**self.batch_concurrency, **(max_concurrency or {})}
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        
+        def semaphore_for(request: GenerationRequest) -> asyncio.Semaphore:
+            provider = self._get_ai_service_name(request.quality_tier)
+            if provider not in semaphores:
+                semaphores[provider] = asyncio.Semaphore(limits.get(provider, limits.get("default", 3)))
+            return semaphores[provider]
+        
+        async def run_single(index: int, request: GenerationRequest) -> List[BatchGenerationItem]:
+            try:
+                async with semaphore_for(request):
+                    result = await self._generate_with_quality_control(request, generators[request.content_type])
+                return [BatchGenerationItem(index, request, result=result)]
+            except Exception as e:
+                return [BatchGenerationItem(index, request, error=str(e))]
+        
+        async def run_combined(group: List[Tuple[int, GenerationRequest]]) -> List[BatchGenerationItem]:
+            try:
+                async with semaphore_for(group[0][1]):
+                    results = await self._generate_combined_metadata([request for _, request in group])
+            except Exception as e:
+                self.logger.warning(f"Combined metadata generation failed, falling back: {e}")
+                results = {}
+            
+            items = [BatchGenerationItem(index, request, result=results[index_in_group])
+                     for index_in_group, (index, request) in enumerate(group) if index_in_group in results]
+            fallbacks = [(index, request) for index_in_group, (index, request) in enumerate(group)
+                         if index_in_group not in results]
+            for done in await asyncio.gather(*(run_single(index, request) for index, request in fallbacks)):
+                items.extend(done)
+            return items
+        
+        def group_key(request: GenerationRequest):
+            opportunity = request.context.get("opportunity")
+            return None if opportunity is None else (id(opportunity), request.quality_tier)
+        
+        use_combined = self.combine_batch_metadata if combine is None else combine
+        plan = plan_batch(requests, generators, self.COMBINABLE_TYPES, group_key if use_combined else None)
+        
+        stream = stream_batch(plan, run_single, run_combined)
+        try:
+            async for item in stream:
+                yield item
+        finally:
+            # ผู้เรียกหยุดอ่านกลางทาง: ปิด stream เพื่อยกเลิกงานที่ยังค้าง
+            await stream.aclose()
+
+    async def _generate_combined_metadata(self, requests: List[GenerationRequest]) -> Dict[int, GenerationResult]:
+        """
+        สร้าง title/description/hashtags ของ opportunity เดียวกันด้วย LLM call เดียว
+        
+        คืน {ตำแหน่งใน requests: GenerationResult} เฉพาะส่วนที่ parse ได้และผ่านเกณฑ์คุณภาพ
+        """
+        
+        first = requests[0]
+        opportunity = first.context["opportunity"]
+        threshold = self.quality_thresholds[first.quality_tier]
+        start_time = datetime.now()
+        
+        text_ai = self.service_registry.get_service("text_ai", first.quality_tier)
+        prompt = self._build_combined_metadata_prompt(opportunity, requests)
+        response = await self._call_text_ai(text_ai, prompt, first)
+        data = self._parse_combined_response(response)
+        
+        generation_time = (datetime.now() - start_time).total_seconds()
+        content_types = [request.content_type for request in requests]
+        results = {}
+        
+        # คิดเงินครั้งเดียวต่อ call จริง (รวมส่วนที่ไม่ผ่านเกณฑ์และต้องสร้างแยกใหม่)
+        call_cost = self._calculate_generation_cost(replace(first, content_type="combined_metadata"),
+                                                    generation_time)
+        part_costs = split_call_cost(call_cost, len(requests))
+        self.generation_stats["combined_calls"] += 1
+        self.generation_stats["total_cost"] += call_cost
+        
+        for position, request in enumerate(requests):
+            content = self._extract_combined_part(data, request, opportunity)
+            if content is None:
+                continue
+            
+            quality_score = self._evaluate_content_quality(content, request)
+            if quality_score < threshold["min_quality_score"]:
+                continue
+            
+            cost = part_costs[position]
+            self.generation_stats["total_requests"] += 1
+            self.generation_stats["successful_generations"] += 1
+            self.generation_stats["combined_requests"] += 1
+            self._update_quality_average(quality_score)
+            
+            results[position] = GenerationResult(
+                content_type=request.content_type,
+                generated_content=content,
+                quality_score=quality_score,
+                generation_time=generation_time,
+                ai_service_used=self._get_ai_service_name(request.quality_tier),
+                cost_estimate=cost,
+                metadata={
+                    "mode": "combined",
+                    "attempt": 1,
+                    "combined_types": content_types,
+                    "combined_call_cost": call_cost,
+                    "quality_threshold": threshold["min_quality_score"]
+                },
+                created_at=datetime.now()
+            )
+        
+        return results
+
+    def _build_combined_metadata_prompt(self, opportunity: ContentOpportunity,
+                                        requests: List[GenerationRequest]) -> str:
+        """สร้าง prompt รวมสำหรับ title/description/hashtags"""
+        
+        parts = []
+        example = {}
+        
         for request in requests:
-            if request.content_type == "script":
-                task = self._generate_with_quality_control(request, self._generate_script_internal)
-            elif request.content_type == "title":
-                task = self._generate_with_quality_control(request, self._generate_titles_internal)
+            if request.content_type == "title":
+                count = request.context.get("variations_count", 5)
+                parts.append(f'- "titles": {count} titles ที่ดึงดูดความสนใจ มี keywords และไม่เกิน 100 ตัวอักษร')
+                example["titles"] = ["title 1", "title 2"]
             elif request.content_type == "description":
-                task = self._generate_with_quality_control(request, self._generate_descriptions_internal)
+                platforms = request.context.get("platforms", ["youtube"])
+                parts.append(f'- "descriptions": description ของแต่ละ platform ({", ".join(platforms)}) '
+                             f'ตามสไตล์ของ platform มี call-to-action และ keywords')
+                example["descriptions"] = {platform: "..." for platform in platforms}
             elif request.content_type == "hashtags":
-                task = self._generate_with_quality_control(request, self._generate_hashtags_internal)
-            elif request.content_type == "thumbnail_concept":
-                task = self._generate_with_quality_control(request, self._generate_thumbnail_internal)
-            else:
-                continue
-            
-            tasks.append(task)
-        
-        # รัน parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # แยก results และ errors
-        successful_results = []
-        errors = []
-        
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                errors.append({
-                    "request_index": i,
-                    "content_type": requests[i].content_type,
-                    "error": str(result)
-                })
-            else:
-                successful_results.append(result)
+                platform = request.context.get("platform", "general")
+                parts.append(f'- "hashtags": hashtags สำหรับ {platform} ทั้งภาษาไทยและอังกฤษ '
+                             f'(เฉพาะเนื้อหา, trending, platform-specific)')
+                example["hashtags"] = ["#hashtag1", "#hashtag2"]
         
-        if errors:
-            self.logger.warning(f"Batch generation completed with {len(errors)} errors")
+        prompt = f"""
+สร้าง metadata สำหรับเนื้อหาต่อไปนี้ในคำตอบเดียว:
+
+หัวข้อเดิม: {opportunity.content_idea.title}
+ประเภท: {opportunity.content_idea.content_type}
+Trend: {opportunity.trend_data.topic}
+Keywords: {', '.join(opportunity.trend_data.keywords)}
+กลุ่มเป้าหมาย: {opportunity.content_idea.target_audience}
+
+ส่วนที่ต้องการ:
+{chr(10).join(parts)}
+
+กรุณาตอบเป็น JSON object เท่านั้น:
+{json.dumps(example, ensure_ascii=False)}
+"""
         
-        self.logger.info(f"Batch generation completed: {len(successful_results)} successful")
+        return prompt.strip()
+
+    def _parse_combined_response(self, response: str) -> Dict[str, Any]:
+        """แยก JSON object จาก response ของ prompt รวม (รองรับ code fence / ข้อความรอบๆ)"""
         
-        return successful_results
+        text = re.sub(r'```(?:json)?', '', response or '').strip()
+        start, end = text.find('{'), text.rfind('}')
+        if start == -1 or end <= start:
+            return {}
+        
+        try:
+            data = json.loads(text[start:end + 1])
+        except json.JSONDecodeError as e:
+            self.logger.warning(f"Failed to parse combined metadata response: {e}")
+            return {}
+        
+        return data if isinstance(data, dict) else {}
+
+    def _extract_combined_part(self, data: Dict[str, Any], request: GenerationRequest,
+                               opportunity: ContentOpportunity) -> Any:
+        """ดึงส่วนของคำขอจากคำตอบรวม ผ่านขั้นตอน optimize เดียวกับการสร้างแยก (None = ใช้ไม่ได้)"""
+        
+        if request.content_type == "title":
+            raw = data.get("titles")
+            if not isinstance(raw, list):
+                return None
+            titles = [str(title).strip() for title in raw if str(title).strip()]
+            if not titles:
+                return None
+            count = request.context.get("variations_count", 5)
+            return self._optimize_titles(titles, opportunity)[:count]
+        
+        if request.content_type == "description":
+            raw = data.get("descriptions")
+            platforms = request.context.get("platforms", ["youtube"])
+            if not isinstance(raw, dict):
+                return None
+            descriptions = {}
+            for platform in platforms:
+                text = raw.get(platform)
+                if not isinstance(text, str) or not text.strip():
+                    return None
+                description = self._parse_description_response(text, platform)
+                descriptions[platform] = self._optimize_description(description, platform, opportunity)
+            return descriptions
+        
+        if request.content_type == "hashtags":
+            raw = data.get("hashtags")
+            if not isinstance(raw, list) or not raw:
+                return None
+            platform = request.context.get("platform", "general")
+            hashtags = self._parse_hashtags_response(json.dumps(raw, ensure_ascii=False))
+            return self._optimize_hashtags(hashtags, platform, opportunity)
+        
+        return None
 
     def reset_statistics(self):
         """รีเซ็ตสถิติ"""
@@ -1564,7 +1909,13 @@ Trend: {opportunity.trend_data.topic}
             "successful_generations": 0,
             "failed_generations": 0,
             "total_cost": 0.0,
-            "average_quality": 0.0
+            "average_quality": 0.0,
+            "speculative_requests": 0,
+            "candidates_launched": 0,
+            "candidates_cancelled": 0,
+            "speculative_wasted_cost": 0.0,
+            "combined_calls": 0,
+            "combined_requests": 0
         }
 
 
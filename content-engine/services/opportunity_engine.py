@@ -4,6 +4,7 @@ import logging
 from ..ai_services.text_ai.groq_service import GroqService
 from ..models.quality_tier import QualityTier
 from ..models.content_plan import ContentPlan
+from .opportunity_scoring import momentum_lifecycle, momentum_score, momentum_signal
 import json
 import time
 
@@ -216,8 +217,23 @@ class AIDirector:
         return content_plan
     
     def analyze_trend_opportunity(self, trend_data: Dict) -> Dict:
-        """วิเคราะห์โอกาสจาก trend โดยใช้ Groq"""
-        return self.groq_service.analyze_trend_potential(trend_data)
+        """วิเคราะห์โอกาสจาก trend โดยใช้ Groq
+        
+        ถ้า trend มีสัญญาณ momentum ที่วัดตอน ingest (raw_data["momentum"]) จะใช้แทน
+        viral_potential ที่ AI เดา และเพิ่ม growth_rate_daily / lifecycle_stage
+        """
+        analysis = self.groq_service.analyze_trend_potential(trend_data)
+        
+        signal = momentum_signal(trend_data)
+        if signal:
+            analysis["viral_potential"] = momentum_score(signal)
+            analysis["growth_rate_daily"] = float(signal.get("velocity", 0.0)) * 24
+            lifecycle = momentum_lifecycle(signal)
+            if lifecycle:
+                analysis["lifecycle_stage"] = lifecycle
+            analysis["momentum"] = signal
+        
+        return analysis
     
     def generate_content_variations(self, base_plan: ContentPlan, num_variations: int = 3) -> List[ContentPlan]:
         """สร้างเนื้อหาหลายรูปแบบจากแผนพื้นฐาน"""
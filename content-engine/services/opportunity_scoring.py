@@ -0,0 +1,309 @@
+# content-engine/services/opportunity_scoring.py
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# ค่าคูณตาม lifecycle / competition (ตรงกับ TrendAnalyzer เดิม) key เป็น enum value
+LIFECYCLE_MULTIPLIERS = {
+    "emerging": 1.5,
+    "growing": 1.2,
+    "peak": 0.8,
+    "declining": 0.3,
+    "stable": 1.0
+}
+
+COMPETITION_MULTIPLIERS = {
+    "low": 1.4,
+    "medium": 1.0,
+    "high": 0.7,
+    "saturated": 0.4
+}
+
+_LIFECYCLES = list(LIFECYCLE_MULTIPLIERS)
+_COMPETITIONS = list(COMPETITION_MULTIPLIERS)
+_LIFECYCLE_TABLE = np.array([LIFECYCLE_MULTIPLIERS[name] for name in _LIFECYCLES])
+_COMPETITION_TABLE = np.array([COMPETITION_MULTIPLIERS[name] for name in _COMPETITIONS])
+_MONETIZING_LIFECYCLES = np.isin(_LIFECYCLES, ["growing", "peak"])
+_OPEN_COMPETITION = np.isin(_COMPETITIONS, ["low", "medium"])
+_EMERGING = _LIFECYCLES.index("emerging")
+
+def _enum_value(value: Any) -> str:
+    return getattr(value, "value", value)
+
+def momentum_signal(trend: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """สัญญาณ momentum ที่วัดตอน ingest (trend["momentum"] หรือ raw_data["momentum"] จาก TrendRepository)"""
+    signal = trend.get("momentum")
+    if signal is None:
+        signal = (trend.get("raw_data") or {}).get("momentum")
+    return signal or None
+
+def momentum_score(signal: Dict[str, Any]) -> float:
+    """velocity (คะแนนต่อชั่วโมง) -> momentum_score 0-10; 5 = คงที่"""
+    velocity = float(signal.get("velocity", 0.0))
+    return min(10.0, max(0.0, 5.0 + velocity * 0.5))
+
+def momentum_lifecycle(signal: Dict[str, Any]) -> Optional[str]:
+    """lifecycle จาก velocity/acceleration ที่วัดได้ (None ถ้ายังมี snapshot ไม่พอ)"""
+    velocity = float(signal.get("velocity", 0.0))
+    acceleration = float(signal.get("acceleration", 0.0))
+    observations = int(signal.get("observations", 1))
+
+    if observations < 2:
+        return None
+    if observations < 4 and velocity > 0:
+        return "emerging"
+    if velocity > 0.5:
+        return "growing" if acceleration >= 0 else "peak"
+    if velocity < -0.5:
+        return "declining"
+    return "stable"
+
+@dataclass
+class TrendColumns:
+    """ตัวชี้วัดของ TrendAnalysisResult จำนวนมากในรูป column (NumPy arrays)"""
+    momentum: np.ndarray
+    engagement: np.ndarray
+    saturation: np.ndarray
+    lifecycle: np.ndarray        # index ใน _LIFECYCLES
+    competition: np.ndarray      # index ใน _COMPETITIONS
+    gap_count: np.ndarray
+    angle_count: np.ndarray
+    opportunity: np.ndarray      # opportunity_score ที่เก็บไว้
+    platforms: List[str]
+    platform_priority: np.ndarray  # (n, len(platforms)) ไม่มีค่า = NaN
+
+    def __len__(self) -> int:
+        return len(self.momentum)
+
+    @classmethod
+    def from_results(cls, results: Sequence[Any]) -> "TrendColumns":
+        """โหลดจาก TrendAnalysisResult (อ่านอย่างเดียว ไม่แก้ object ต้นทาง)"""
+        n = len(results)
+        lifecycle_index = {name: i for i, name in enumerate(_LIFECYCLES)}
+        competition_index = {name: i for i, name in enumerate(_COMPETITIONS)}
+
+        platforms: Dict[str, int] = {}
+        for result in results:
+            for platform in result.platform_priorities:
+                platforms.setdefault(platform, len(platforms))
+
+        momentum = np.empty(n)
+        engagement = np.empty(n)
+        saturation = np.empty(n)
+        lifecycle = np.empty(n, dtype=np.int8)
+        competition = np.empty(n, dtype=np.int8)
+        gap_count = np.empty(n, dtype=np.int32)
+        angle_count = np.empty(n, dtype=np.int32)
+        opportunity = np.empty(n)
+        priority = np.full((n, len(platforms)), np.nan)
+
+        for i, result in enumerate(results):
+            metrics = result.metrics
+            momentum[i] = metrics.momentum_score
+            engagement[i] = metrics.avg_engagement_rate
+            saturation[i] = metrics.content_saturation
+            lifecycle[i] = lifecycle_index.get(_enum_value(result.lifecycle_stage), lifecycle_index["stable"])
+            competition[i] = competition_index.get(_enum_value(result.competition_level), competition_index["medium"])
+            gap_count[i] = len(result.market_gaps)
+            angle_count[i] = len(result.recommended_content_angles)
+            opportunity[i] = result.opportunity_score
+            for platform, score in result.platform_priorities.items():
+                priority[i, platforms[platform]] = score
+
+        return cls(momentum, engagement, saturation, lifecycle, competition, gap_count,
+                   angle_count, opportunity, list(platforms), priority)
+
+class OpportunityScoringEngine:
+    """
+    คำนวณคะแนนโอกาสทั้ง batch ด้วย vector operations
+
+    สูตรเดียวกับ TrendAnalyzer._calculate_opportunity_scores และ
+    rank_trends_by_opportunity แต่คืนผลเป็น arrays แทนการแก้ object
+    """
+
+    def __init__(self, scoring_weights: Dict[str, float]):
+        # ใช้ dict เดียวกับ TrendAnalyzer เพื่อให้การเปลี่ยน weights มีผลทันที
+        self.scoring_weights = scoring_weights
+
+    def score(self, columns: TrendColumns,
+              weights: Optional[Dict[str, float]] = None) -> Dict[str, np.ndarray]:
+        """คืน viral_potential, content_gap_score, monetization_potential,
+        opportunity_score, success_probability, confidence_level"""
+        weights = weights or self.scoring_weights
+
+        base_viral = columns.momentum
+        base_engagement = columns.engagement * 10
+        penalty = columns.saturation
+        lifecycle_bonus = _LIFECYCLE_TABLE[columns.lifecycle]
+        competition_multiplier = _COMPETITION_TABLE[columns.competition]
+
+        viral = np.minimum(10.0, base_viral * lifecycle_bonus * competition_multiplier - penalty * 0.3)
+        gap = np.where(columns.gap_count > 0, np.minimum(10.0, columns.gap_count * 2.0), 5.0)
+        monetization = np.minimum(
+            10.0,
+            6.0 + 2.0 * _MONETIZING_LIFECYCLES[columns.lifecycle] + 1.0 * _OPEN_COMPETITION[columns.competition]
+        )
+
+        opportunity = (
+            viral * weights["viral_indicators"] +
+            base_engagement * weights["engagement_quality"] +
+            gap * weights["competition_gap"] +
+            (10 - penalty) * weights["timing_advantage"] +
+            monetization * weights["monetization_signals"] +
+            (base_viral * lifecycle_bonus) * weights["growth_momentum"]
+        ) / sum(weights.values())
+        opportunity = np.clip(opportunity, 0.0, 10.0)
+
+        success = (
+            opportunity / 10 +
+            lifecycle_bonus / 1.5 +
+            competition_multiplier +
+            (10 - penalty) / 10 +
+            np.minimum(1.0, columns.angle_count / 3)
+        ) / 5
+
+        return {
+            "viral_potential": viral,
+            "content_gap_score": gap,
+            "monetization_potential": monetization,
+            "opportunity_score": opportunity,
+            "success_probability": success,
+            "confidence_level": np.minimum(1.0, success * 1.1)
+        }
+
+    def adjust(self, columns: TrendColumns, opportunity: np.ndarray,
+               user_preferences: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """ปรับคะแนนตาม platform ที่ชอบและ risk tolerance (คืน array ใหม่)"""
+        if not user_preferences:
+            return opportunity
+
+        preferred = [columns.platforms.index(p) for p in user_preferences.get("preferred_platforms", [])
+                     if p in columns.platforms]
+        platform_bonus = np.nansum(columns.platform_priority[:, preferred], axis=1) * 0.1 \
+            if preferred else 0.0
+
+        risk_tolerance = user_preferences.get("risk_tolerance", "medium")
+        risk_multiplier = 1.0
+        if risk_tolerance == "low":
+            risk_multiplier = np.where(columns.lifecycle == _EMERGING, 0.8, 1.0)
+        elif risk_tolerance == "high":
+            risk_multiplier = np.where(columns.lifecycle == _EMERGING, 1.3, 1.0)
+
+        return np.minimum(10.0, opportunity * risk_multiplier + platform_bonus)
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+        """index ของ k คะแนนสูงสุด เรียงมากไปน้อย (argpartition แทนการ sort ทั้งหมด)"""
+        n = len(scores)
+        k = n if k is None else min(k, n)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        if k < n:
+            candidates = np.sort(np.argpartition(-scores, k - 1)[:k])
+        else:
+            candidates = np.arange(n)
+        # stable sort เพื่อให้คะแนนเท่ากันคงลำดับเดิมเหมือน list.sort
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def rank(self, columns: TrendColumns, k: Optional[int] = None,
+             user_preferences: Optional[Dict[str, Any]] = None,
+             weights: Optional[Dict[str, float]] = None) -> Dict[str, np.ndarray]:
+        """คืน indices และคะแนนของ top-K (คำนวณใหม่ถ้าให้ weights มา)"""
+        base = self.score(columns, weights)["opportunity_score"] if weights else columns.opportunity
+        adjusted = self.adjust(columns, base, user_preferences)
+        order = self.top_k(adjusted, k)
+        return {"indices": order, "scores": adjusted[order]}
+
+def _synthetic_results(n: int, seed: int = 7):
+    """TrendAnalysisResult ปลอมสำหรับ benchmark"""
+    from types import SimpleNamespace
+
+    rng = np.random.default_rng(seed)
+    results = []
+    for i in range(n):
+        results.append(SimpleNamespace(
+            metrics=SimpleNamespace(
+                momentum_score=float(rng.uniform(0, 10)),
+                avg_engagement_rate=float(rng.uniform(0, 1)),
+                content_saturation=float(rng.uniform(0, 10))
+            ),
+            lifecycle_stage=_LIFECYCLES[i % len(_LIFECYCLES)],
+            competition_level=_COMPETITIONS[i % len(_COMPETITIONS)],
+            market_gaps=["gap"] * int(rng.integers(0, 6)),
+            recommended_content_angles=[{}] * int(rng.integers(0, 5)),
+            platform_priorities={"TikTok": float(rng.uniform(0, 10)), "YouTube": float(rng.uniform(0, 10))},
+            opportunity_score=0.0
+        ))
+    return results
+
+def _score_one(result, weights: Dict[str, float]) -> float:
+    """opportunity_score ของ object เดียวแบบ Python ล้วน (สูตรเดิมของ TrendAnalyzer)"""
+    metrics = result.metrics
+    lifecycle = _enum_value(result.lifecycle_stage)
+    competition = _enum_value(result.competition_level)
+    lifecycle_bonus = LIFECYCLE_MULTIPLIERS.get(lifecycle, 1.0)
+    competition_multiplier = COMPETITION_MULTIPLIERS.get(competition, 1.0)
+    penalty = metrics.content_saturation
+
+    viral = min(10.0, metrics.momentum_score * lifecycle_bonus * competition_multiplier - penalty * 0.3)
+    gap = min(10.0, len(result.market_gaps) * 2.0) if result.market_gaps else 5.0
+    monetization = 6.0 + (2.0 if lifecycle in ("growing", "peak") else 0.0) + \
+        (1.0 if competition in ("low", "medium") else 0.0)
+
+    opportunity = (
+        viral * weights["viral_indicators"] +
+        metrics.avg_engagement_rate * 10 * weights["engagement_quality"] +
+        gap * weights["competition_gap"] +
+        (10 - penalty) * weights["timing_advantage"] +
+        min(10.0, monetization) * weights["monetization_signals"] +
+        metrics.momentum_score * lifecycle_bonus * weights["growth_momentum"]
+    ) / sum(weights.values())
+    return min(10.0, max(0.0, opportunity))
+
+def benchmark(n: int = 100_000, k: int = 50) -> Dict[str, float]:
+    """เทียบการคำนวณทีละ object (Python loop) กับ vector engine ที่ n trends"""
+    weights = {
+        "growth_momentum": 0.25,
+        "engagement_quality": 0.20,
+        "competition_gap": 0.20,
+        "viral_indicators": 0.15,
+        "monetization_signals": 0.10,
+        "timing_advantage": 0.10
+    }
+    engine = OpportunityScoringEngine(weights)
+    results = _synthetic_results(n)
+    preferences = {"preferred_platforms": ["TikTok"], "risk_tolerance": "high"}
+
+    # แบบเดิม: คำนวณทีละตัวใน Python แล้ว sort ทั้ง list
+    started = time.perf_counter()
+    scored = []
+    for result in results:
+        opportunity = _score_one(result, weights)
+        bonus = result.platform_priorities.get("TikTok", 0.0) * 0.1
+        multiplier = 1.3 if result.lifecycle_stage == "emerging" else 1.0
+        scored.append((min(10.0, opportunity * multiplier + bonus), result))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    per_object = time.perf_counter() - started
+
+    started = time.perf_counter()
+    columns = TrendColumns.from_results(results)
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ranked = engine.rank(columns, k=k, user_preferences=preferences, weights=weights)
+    rescore_seconds = time.perf_counter() - started
+
+    assert np.allclose(ranked["scores"], [score for score, _ in scored[:k]])
+
+    return {
+        "trends": n,
+        "per_object_seconds": round(per_object, 3),
+        "column_load_seconds": round(load_seconds, 3),
+        "vector_rescore_seconds": round(rescore_seconds, 4),
+        "rescore_speedup": round(per_object / rescore_seconds, 1) if rescore_seconds else 0.0
+    }
+
+if __name__ == "__main__":
+    print(benchmark())
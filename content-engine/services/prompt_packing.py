@@ -0,0 +1,245 @@
+# content-engine/services/prompt_packing.py
+
+import asyncio
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_CODE_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+def estimate_tokens(text: str) -> int:
+    """ประมาณจำนวน tokens แบบไม่ต้องใช้ tokenizer (ASCII ~4 ตัวอักษร/token, ไทย ~1 ตัวอักษร/token)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+@dataclass
+class PackingConfig:
+    """ขอบเขตการรวมหลายรายการไว้ใน request เดียว"""
+    enabled: bool = True
+    max_items_per_request: int = 8
+    max_prompt_tokens: int = 2500        # ส่วน input ทั้งหมด (instructions + รายการ)
+    max_output_tokens: int = 3500        # ต้องพอสำหรับคำตอบของทุกรายการใน pack
+    output_tokens_per_item: int = 350    # ขนาดคำตอบโดยประมาณต่อรายการ
+    max_concurrency: int = 3
+    retry_failed_individually: bool = True
+
+@dataclass
+class PackingStats:
+    items: int = 0
+    requests: int = 0
+    packed_requests: int = 0
+    packed_items_parsed: int = 0
+    individual_retries: int = 0
+    failed: int = 0
+    pack_sizes: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "requests": self.requests,
+            "packed_requests": self.packed_requests,
+            "packed_items_parsed": self.packed_items_parsed,
+            "individual_retries": self.individual_retries,
+            "failed": self.failed,
+            "avg_pack_size": round(sum(self.pack_sizes) / len(self.pack_sizes), 2) if self.pack_sizes else 0.0,
+            # เทียบกับการเรียกหนึ่งครั้งต่อรายการ
+            "calls_saved": max(0, self.items - self.requests)
+        }
+
+def pack_items(items: Sequence[Tuple[str, str]], overhead_tokens: int,
+               config: PackingConfig) -> List[List[Tuple[str, str]]]:
+    """แบ่ง (id, rendered_text) เป็นกลุ่มตามลำดับ ไม่ให้เกินจำนวนรายการ, token ของ prompt และของคำตอบ"""
+    packs: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    current_tokens = overhead_tokens
+
+    for item_id, text in items:
+        item_tokens = estimate_tokens(text)
+        too_many = len(current) >= config.max_items_per_request
+        too_long = current_tokens + item_tokens > config.max_prompt_tokens
+        too_much_output = (len(current) + 1) * config.output_tokens_per_item > config.max_output_tokens
+        if current and (too_many or too_long or too_much_output):
+            packs.append(current)
+            current = []
+            current_tokens = overhead_tokens
+        current.append((item_id, text))
+        current_tokens += item_tokens
+
+    if current:
+        packs.append(current)
+    return packs
+
+def _iter_json_objects(text: str):
+    """ดึง JSON objects ที่ parse ได้ทีละตัว ใช้เมื่อ array ทั้งก้อนเสีย (เช่นถูกตัดท้าย)"""
+    decoder = json.JSONDecoder()
+    position = text.find("{")
+    while position != -1:
+        try:
+            obj, end = decoder.raw_decode(text, position)
+        except json.JSONDecodeError:
+            position = text.find("{", position + 1)
+            continue
+        if isinstance(obj, dict):
+            yield obj
+        position = text.find("{", end)
+
+def _load_json(text: str) -> Any:
+    text = text.strip()
+    fenced = _CODE_FENCE.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    start, end = text.find("["), text.rfind("]")
+    if start != -1 and end > start:
+        try:
+            return json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            pass
+
+    return list(_iter_json_objects(text))
+
+def parse_packed_response(response: Any, expected_ids: Sequence[str],
+                          id_field: str = "id") -> Dict[str, Dict[str, Any]]:
+    """
+    แปลงคำตอบของ request แบบ pack เป็น {id: item}
+
+    รับได้ทั้ง string (มี code fence / ข้อความรอบๆ / ถูกตัดท้าย), list ของ objects ที่มี id,
+    dict ที่ key เป็น id หรือ dict ที่ห่อ list ไว้ใน "items"/"results"/"trends"
+    รายการที่ไม่มีในคำตอบหรือไม่ใช่ dict จะไม่อยู่ในผลลัพธ์
+    """
+    expected = set(expected_ids)
+    data = response
+
+    if isinstance(data, dict):
+        text = data.get("content") or data.get("text")
+        if isinstance(text, str) and not expected.intersection(data):
+            data = text
+    if isinstance(data, str):
+        data = _load_json(data)
+
+    if isinstance(data, dict):
+        for wrapper in ("items", "results", "trends", "analyses"):
+            if isinstance(data.get(wrapper), list):
+                data = data[wrapper]
+                break
+        else:
+            return {key: value for key, value in data.items()
+                    if key in expected and isinstance(value, dict)}
+
+    parsed: Dict[str, Dict[str, Any]] = {}
+    if isinstance(data, list):
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            item_id = str(item.get(id_field, ""))
+            if item_id in expected and item_id not in parsed:
+                parsed[item_id] = {k: v for k, v in item.items() if k != id_field}
+    return parsed
+
+def scores_in_range(scores: Any, required: Sequence[str],
+                    low: float = 0.0, high: float = 10.0) -> bool:
+    """ตรวจว่า scores เป็น dict ที่มีทุก key ใน required และทุกค่าเป็นตัวเลขใน [low, high]
+
+    ใช้เป็น validate ของ run_packed: คำตอบที่คะแนนหาย/เป็นข้อความ/เกินช่วงจะถูก retry ทีละรายการ
+    """
+    if not isinstance(scores, dict) or any(key not in scores for key in required):
+        return False
+    for value in scores.values():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        if not low <= value <= high:
+            return False
+    return True
+
+async def run_packed(items: Dict[str, Any],
+                     render_item: Callable[[str, Any], str],
+                     build_prompt: Callable[[List[Tuple[str, str]]], str],
+                     call: Callable[[str, int], Awaitable[Any]],
+                     single: Callable[[str, Any], Awaitable[Any]],
+                     config: Optional[PackingConfig] = None,
+                     validate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                     stats: Optional[PackingStats] = None) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+    """
+    วิเคราะห์หลายรายการโดยรวมไว้ใน request เดียวกันตาม token budget
+
+    items: {id: payload}
+    render_item(id, payload): ข้อความของรายการใน prompt
+    build_prompt(pack): prompt ทั้งก้อนของ pack [(id, rendered)]
+    call(prompt, max_output_tokens): เรียก LLM คืนคำตอบดิบ
+    single(id, payload): เส้นทางเดิมทีละรายการ ใช้ retry เฉพาะรายการที่ parse ไม่ได้
+
+    คืน (packed, individual): packed = {id: dict คำตอบจาก pack}, individual = {id: ค่าที่ single คืน}
+    รายการที่ล้มเหลวทั้งสองทางจะไม่อยู่ในทั้งสอง dict
+    """
+    config = config or PackingConfig()
+    stats = stats if stats is not None else PackingStats()
+    stats.items += len(items)
+    results: Dict[str, Dict[str, Any]] = {}
+    individual: Dict[str, Any] = {}
+    failed_ids: List[str] = []
+
+    if config.enabled and len(items) > 1:
+        rendered = [(item_id, render_item(item_id, payload)) for item_id, payload in items.items()]
+        overhead = estimate_tokens(build_prompt([]))
+        packs = pack_items(rendered, overhead, config)
+        semaphore = asyncio.Semaphore(config.max_concurrency)
+
+        async def run_pack(pack: List[Tuple[str, str]]):
+            ids = [item_id for item_id, _ in pack]
+            max_tokens = min(config.max_output_tokens, len(pack) * config.output_tokens_per_item + 200)
+            async with semaphore:
+                stats.requests += 1
+                stats.packed_requests += 1
+                stats.pack_sizes.append(len(pack))
+                try:
+                    response = await call(build_prompt(pack), max_tokens)
+                except Exception as e:
+                    logger.warning(f"Packed request of {len(pack)} items failed: {e}")
+                    return ids, {}
+            return ids, parse_packed_response(response, ids)
+
+        for ids, parsed in await asyncio.gather(*(run_pack(pack) for pack in packs)):
+            for item_id in ids:
+                item = parsed.get(item_id)
+                if item is not None and (validate is None or validate(item)):
+                    results[item_id] = item
+                    stats.packed_items_parsed += 1
+                else:
+                    failed_ids.append(item_id)
+    else:
+        failed_ids = list(items)
+
+    if failed_ids and (config.retry_failed_individually or not config.enabled or len(items) <= 1):
+        if config.enabled and len(items) > 1:
+            logger.info(f"Retrying {len(failed_ids)} unparsed items individually")
+        semaphore = asyncio.Semaphore(config.max_concurrency)
+
+        async def run_single(item_id: str):
+            async with semaphore:
+                stats.requests += 1
+                if config.enabled and len(items) > 1:
+                    stats.individual_retries += 1
+                try:
+                    return item_id, await single(item_id, items[item_id])
+                except Exception as e:
+                    logger.error(f"Individual analysis of {item_id} failed: {e}")
+                    return item_id, None
+
+        for item_id, value in await asyncio.gather(*(run_single(i) for i in failed_ids)):
+            if value is None:
+                stats.failed += 1
+            else:
+                individual[item_id] = value
+    else:
+        stats.failed += len(failed_ids)
+
+    return results, individual
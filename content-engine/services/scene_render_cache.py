@@ -0,0 +1,151 @@
+# content-engine/services/scene_render_cache.py
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+# เพิ่มเลขนี้เมื่อเปลี่ยนวิธี render scene เพื่อไม่ให้ใช้ segment เก่าที่ไม่ตรงกัน
+RENDER_VERSION = 1
+
+class SceneRenderCache:
+    """Cache ของ scene segment ที่ render แล้วบน disk
+
+    แต่ละ segment ถูกเก็บเป็นไฟล์ mp4 (video only) โดยใช้ content hash ของ
+    (scene spec, assets, template, platform specs) เป็นชื่อไฟล์ ทุก segment
+    encode ด้วย parameter เดียวกัน จึงต่อกันด้วย concat demuxer แบบ
+    stream copy ได้โดยไม่ต้อง re-encode
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 max_size_mb: int = 5120,
+                 fps: int = 30,
+                 codec: str = "libx264",
+                 preset: str = "veryfast"):
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "scene_render_cache")
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.fps = fps
+        self.codec = codec
+        self.preset = preset
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "segments_rendered": 0,
+            "render_seconds": 0.0
+        }
+
+    def segment_key(self, **parts: Any) -> str:
+        """Content hash ของทุกอย่างที่มีผลต่อภาพของ segment"""
+        payload = json.dumps(
+            {"render_version": RENDER_VERSION, "fps": self.fps, "codec": self.codec, **parts},
+            sort_keys=True, default=str, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _segment_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp4")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._segment_path(key)
+        if os.path.exists(path):
+            self.stats["hits"] += 1
+            os.utime(path, None)  # ใช้ mtime เป็น LRU
+            return path
+        self.stats["misses"] += 1
+        return None
+
+    def store(self, key: str, clip) -> str:
+        """Render MoviePy clip ลง cache (เขียนไฟล์ชั่วคราวแล้ว rename แบบ atomic)"""
+        path = self._segment_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp.mp4"
+        self._write_segment(clip, tmp_path)
+        os.replace(tmp_path, path)
+        self.prune()
+        return path
+
+    def render_uncached(self, clip) -> str:
+        """Render segment ด้วย parameter เดียวกันแต่ไม่เก็บลง cache (เช่น placeholder ของ render ที่ล้มเหลว)
+
+        ผู้เรียกต้องลบไฟล์เองหลัง concat
+        """
+        fd, path = tempfile.mkstemp(suffix=".mp4", prefix="segment_")
+        os.close(fd)
+        self._write_segment(clip, path)
+        return path
+
+    def _write_segment(self, clip, path: str):
+        started = time.perf_counter()
+        clip.write_videofile(
+            path,
+            codec=self.codec,
+            audio=False,
+            fps=self.fps,
+            preset=self.preset,
+            ffmpeg_params=["-pix_fmt", "yuv420p"],
+            verbose=False,
+            logger=None
+        )
+        self.stats["segments_rendered"] += 1
+        self.stats["render_seconds"] += time.perf_counter() - started
+
+    def concat(self, segment_paths: List[str], output_path: str,
+               audio_path: Optional[str] = None, max_duration: Optional[float] = None) -> str:
+        """ต่อ segments ด้วย stream copy และ mux audio (encode เฉพาะ audio)"""
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as list_file:
+            for segment in segment_paths:
+                escaped = os.path.abspath(segment).replace("'", "'\\''")
+                list_file.write(f"file '{escaped}'\n")
+            list_path = list_file.name
+
+        command = ["ffmpeg", "-y", "-loglevel", "error",
+                   "-f", "concat", "-safe", "0", "-i", list_path]
+        if audio_path:
+            # วน audio ถ้าสั้นกว่าวิดีโอ (เหมือน _add_audio_track)
+            command += ["-stream_loop", "-1", "-i", audio_path,
+                        "-map", "0:v", "-map", "1:a", "-c:a", "aac", "-shortest"]
+        command += ["-c:v", "copy", "-movflags", "+faststart"]
+        if max_duration:
+            command += ["-t", str(max_duration)]
+        command.append(output_path)
+
+        try:
+            result = subprocess.run(command, capture_output=True)
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.decode(errors="replace").strip() or "ffmpeg concat failed")
+        finally:
+            os.unlink(list_path)
+        return output_path
+
+    def prune(self):
+        """ลบ segment ที่ไม่ได้ใช้นานที่สุดเมื่อ cache ใหญ่เกินกำหนด"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".mp4") or ".tmp." in name:
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_size_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
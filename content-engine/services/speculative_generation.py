@@ -0,0 +1,101 @@
+# content-engine/services/speculative_generation.py
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (quality_score, content, candidate, temperature)
+CandidateEntry = Tuple[float, Any, int, Optional[float]]
+
+def accepts_keyword(func: Optional[Callable], name: str) -> bool:
+    """func รับ keyword argument ชื่อ name ได้หรือไม่ (รวม **kwargs)"""
+    if func is None:
+        return False
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any((p.name == name and p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)) or
+               p.kind == p.VAR_KEYWORD for p in parameters)
+
+def candidate_count(speculative: Dict[str, Any], max_parallel: int) -> int:
+    """จำนวน candidates ที่จะยิงพร้อมกัน (0 = ปิด; ต้อง opt-in ด้วย enabled ต่อประเภท)"""
+    if not speculative.get("enabled", False):
+        return 0
+    candidates = min(int(speculative.get("candidates", 2)), max_parallel)
+    return candidates if candidates > 1 else 0
+
+@dataclass
+class SpeculativeOutcome:
+    """ผลของการแข่ง candidates"""
+    winner: Optional[CandidateEntry] = None   # ตัวแรกๆ ที่ผ่านเกณฑ์ (คะแนนสูงสุดในรอบที่เสร็จพร้อมกัน)
+    best: Optional[CandidateEntry] = None     # คะแนนสูงสุดในตัวที่เสร็จ
+    costs: Dict[int, float] = field(default_factory=dict)
+    errors: List[BaseException] = field(default_factory=list)
+    completed: int = 0
+    cancelled: int = 0
+
+    @property
+    def chosen(self) -> Optional[CandidateEntry]:
+        return self.winner or self.best
+
+    @property
+    def total_cost(self) -> float:
+        return round(sum(self.costs.values()), 2)
+
+async def race_candidates(run_candidate: Callable[[int, Optional[float]], Awaitable[Tuple[Any, float]]],
+                          candidates: int,
+                          temperatures: Sequence[Optional[float]],
+                          min_score: float,
+                          cost_of: Callable[[float], float]) -> SpeculativeOutcome:
+    """
+    ยิง candidates พร้อมกัน ประเมินทีละตัวที่เสร็จ แล้วยกเลิกที่เหลือเมื่อมีตัวที่ผ่านเกณฑ์
+
+    run_candidate(candidate, temperature) คืน (content, quality_score)
+    cost_of(seconds): ต้นทุนของ candidate หนึ่งตัว ทุกตัวที่ส่งไปแล้วถูกคิดเงิน
+    (รวมตัวที่ยกเลิก เพราะ provider คิดตาม request ที่ส่ง)
+    """
+    temperatures = list(temperatures) or [None]
+    tasks = {}
+    for i in range(candidates):
+        temperature = temperatures[i % len(temperatures)]
+        task = asyncio.ensure_future(run_candidate(i + 1, temperature))
+        tasks[task] = (i + 1, temperature, time.perf_counter())
+
+    outcome = SpeculativeOutcome()
+    pending = set(tasks)
+    try:
+        while pending and outcome.winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                candidate, temperature, started = tasks[task]
+                outcome.costs[candidate] = cost_of(time.perf_counter() - started)
+                outcome.completed += 1
+
+                if task.exception() is not None:
+                    outcome.errors.append(task.exception())
+                    logger.warning(f"Speculative candidate {candidate} failed: {task.exception()}")
+                    continue
+
+                content, quality_score = task.result()
+                entry = (quality_score, content, candidate, temperature)
+                if outcome.best is None or quality_score > outcome.best[0]:
+                    outcome.best = entry
+                if quality_score >= min_score and (outcome.winner is None or quality_score > outcome.winner[0]):
+                    outcome.winner = entry
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task in pending:
+            candidate, _, started = tasks[task]
+            outcome.costs[candidate] = cost_of(time.perf_counter() - started)
+        outcome.cancelled = len(pending)
+
+    return outcome
@@ -0,0 +1,232 @@
+# content-engine/services/thumbnail_renderer.py
+import base64
+import io
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+@lru_cache(maxsize=256)
+def hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    """แปลง #RRGGBB เป็น tuple (parse ครั้งเดียวต่อสี)"""
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+
+@lru_cache(maxsize=64)
+def load_font(font_path: str, size: int) -> ImageFont.ImageFont:
+    """โหลด font ครั้งเดียวต่อ (path, size) แทนการเรียก truetype ทุกครั้ง"""
+    try:
+        return ImageFont.truetype(font_path, size)
+    except (OSError, ValueError):
+        try:
+            return ImageFont.load_default(size=size)
+        except TypeError:
+            # Pillow < 10.1 ไม่รองรับ size
+            return ImageFont.load_default()
+
+def render_gradient(canvas_size: Tuple[int, int], start_color: str, end_color: str) -> Image.Image:
+    """สร้าง vertical gradient ด้วย NumPy (ผลเท่ากับวาดทีละ scanline)"""
+    width, height = canvas_size
+    c1 = np.array(hex_to_rgb(start_color), dtype=np.float32)
+    c2 = np.array(hex_to_rgb(end_color), dtype=np.float32)
+    alpha = (np.arange(height, dtype=np.float32) / height)[:, None]
+    rows = (c1 + (c2 - c1) * alpha).astype(np.uint8)
+    pixels = np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (height, width, 3)))
+    return Image.fromarray(pixels, 'RGB')
+
+class ThumbnailRenderer:
+    """Render thumbnail จาก design พร้อม cache ของ font และ background
+
+    Background ที่ render แล้วถูก cache ต่อ (ขนาด, color scheme) ทั้งแบบ
+    Image และ PNG base64 ทำให้ A/B variants ของ title เดียวกันใช้พื้นหลัง
+    ร่วมกันได้โดยไม่ต้องวาดใหม่
+    """
+
+    def __init__(self,
+                 font_path: str = "assets/fonts/NotoSansThai-Bold.ttf",
+                 max_cached_backgrounds: int = 32,
+                 max_workers: int = 4):
+        self.font_path = font_path
+        self.max_cached_backgrounds = max_cached_backgrounds
+        self._backgrounds: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+        self._encoded_backgrounds: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def get_background(self, canvas_size: Tuple[int, int], color_scheme: Dict) -> Image.Image:
+        """คืน background gradient จาก cache (ห้ามแก้ไข Image ที่ได้ ให้ copy ก่อน)"""
+        key = (tuple(canvas_size), color_scheme["primary"], color_scheme["secondary"])
+        with self._lock:
+            image = self._backgrounds.get(key)
+            if image is not None:
+                self._backgrounds.move_to_end(key)
+                return image
+
+        image = render_gradient(canvas_size, color_scheme["primary"], color_scheme["secondary"])
+        with self._lock:
+            self._backgrounds[key] = image
+            self._evict(self._backgrounds)
+        return image
+
+    def get_background_base64(self, canvas_size: Tuple[int, int], color_scheme: Dict) -> str:
+        """PNG base64 ของ background (รูปแบบเดียวกับ ThumbnailDesign.background_image)"""
+        key = (tuple(canvas_size), color_scheme["primary"], color_scheme["secondary"])
+        with self._lock:
+            encoded = self._encoded_backgrounds.get(key)
+            if encoded is not None:
+                self._encoded_backgrounds.move_to_end(key)
+                return encoded
+
+        image = self.get_background(canvas_size, color_scheme)
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        encoded = base64.b64encode(buffer.getvalue()).decode()
+
+        with self._lock:
+            self._encoded_backgrounds[key] = encoded
+            self._evict(self._encoded_backgrounds)
+        return encoded
+
+    def _evict(self, cache: OrderedDict):
+        while len(cache) > self.max_cached_backgrounds:
+            cache.popitem(last=False)
+
+    def render(self,
+               title: str,
+               canvas_size: Tuple[int, int],
+               color_scheme: Dict,
+               text_layout: Optional[Dict] = None,
+               elements: Optional[List[Dict]] = None,
+               font_size: int = 72,
+               background: Optional[Image.Image] = None) -> Image.Image:
+        """Render thumbnail หนึ่งภาพ"""
+
+        base = background if background is not None else self.get_background(canvas_size, color_scheme)
+        image = base.copy()
+
+        if elements:
+            image = self._draw_elements(image, elements)
+
+        if title:
+            layout = text_layout or {
+                "title_pos": (canvas_size[0] // 2, canvas_size[1] // 2),
+                "title_align": "center"
+            }
+            self.draw_title(image, title, layout["title_pos"], font_size,
+                            align=layout.get("title_align", "center"))
+        return image
+
+    def draw_title(self,
+                   image: Image.Image,
+                   title: str,
+                   position: Tuple[float, float],
+                   font_size: int,
+                   align: str = "center",
+                   fill: str = "white",
+                   stroke_fill: str = "black",
+                   stroke_width: int = 2):
+        """วาดข้อความพร้อม outline ด้วย native stroke ของ Pillow (วาดครั้งเดียว)"""
+        draw = ImageDraw.Draw(image)
+        font = load_font(self.font_path, font_size)
+        x, y = position
+        if align == "center":
+            bbox = draw.textbbox((0, 0), title, font=font, stroke_width=stroke_width)
+            x -= (bbox[2] - bbox[0]) / 2
+            y -= (bbox[3] - bbox[1]) / 2
+        draw.text((x, y), title, fill=fill, font=font,
+                  stroke_width=stroke_width, stroke_fill=stroke_fill)
+
+    def _draw_elements(self, image: Image.Image, elements: List[Dict]) -> Image.Image:
+        """วาด decorative elements (รูปแบบเดียวกับ ThumbnailGenerator._generate_design_elements)"""
+        overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(overlay)
+
+        for element in elements:
+            rgba = hex_to_rgb(element["color"]) + (int(255 * element.get("opacity", 1.0)),)
+            element_type = element.get("type")
+
+            if element_type == "rectangle":
+                x, y = element["position"]
+                w, h = element["size"]
+                draw.rectangle([x, y, x + w, y + h], fill=rgba)
+            elif element_type == "circle":
+                x, y = element["position"]
+                r = element["radius"]
+                draw.ellipse([x - r, y - r, x + r, y + r], fill=rgba)
+            elif element_type == "triangle":
+                x, y = element["position"]
+                size = element["size"]
+                draw.polygon([(x, y - size), (x - size, y + size), (x + size, y + size)], fill=rgba)
+            elif element_type == "line":
+                draw.line([element["start"], element["end"]], fill=rgba, width=element.get("width", 1))
+
+        return Image.alpha_composite(image.convert('RGBA'), overlay).convert('RGB')
+
+    def render_variants(self,
+                        title: str,
+                        canvas_size: Tuple[int, int],
+                        color_scheme: Dict,
+                        variants: List[Dict],
+                        image_format: str = 'JPEG',
+                        quality: int = 90) -> List[bytes]:
+        """Render A/B variants ใน batch เดียว
+
+        แต่ละ variant เป็น dict ที่มี text_layout / elements / font_size
+        (ไม่ระบุใช้ค่า default) ทุก variant ใช้ background เดียวกันจาก cache
+        และ encode พร้อมกันใน thread pool
+        """
+        background = self.get_background(canvas_size, color_scheme)
+
+        def _render_one(variant: Dict) -> bytes:
+            image = self.render(
+                title,
+                canvas_size,
+                variant.get("color_scheme", color_scheme),
+                text_layout=variant.get("text_layout"),
+                elements=variant.get("elements"),
+                font_size=variant.get("font_size", 72),
+                background=background if "color_scheme" not in variant else None
+            )
+            buffer = io.BytesIO()
+            image.save(buffer, format=image_format, quality=quality)
+            return buffer.getvalue()
+
+        return list(self._executor.map(_render_one, variants))
+
+    def benchmark(self, count: int = 200, canvas_size: Tuple[int, int] = (1280, 720)) -> Dict:
+        """วัด throughput เป็น thumbnails ต่อวินาที"""
+        scheme = {"primary": "#00D4FF", "secondary": "#1A1A2E", "accent": "#16213E"}
+        variants = [
+            {"elements": [{"type": "rectangle", "color": scheme["accent"],
+                           "position": (50, 50), "size": (200, 10), "opacity": 0.8}]},
+            {"text_layout": {"title_pos": (128, 216), "title_align": "left"}},
+            {"font_size": 96}
+        ]
+
+        started = time.perf_counter()
+        produced = 0
+        while produced < count:
+            produced += len(self.render_variants(f"Benchmark {produced}", canvas_size, scheme, variants))
+        elapsed = time.perf_counter() - started
+
+        return {
+            "thumbnails": produced,
+            "seconds": round(elapsed, 3),
+            "thumbnails_per_second": round(produced / elapsed, 1) if elapsed else 0.0
+        }
+
+_default_renderer: Optional[ThumbnailRenderer] = None
+
+def get_thumbnail_renderer() -> ThumbnailRenderer:
+    """Renderer ที่ใช้ร่วมกันทั้ง process เพื่อให้ cache มีผล"""
+    global _default_renderer
+    if _default_renderer is None:
+        _default_renderer = ThumbnailRenderer()
+    return _default_renderer
+
+if __name__ == "__main__":
+    print(get_thumbnail_renderer().benchmark())
@@ -9,16 +9,22 @@ import json
 import logging
 from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace, asdict
 from enum import Enum
 import re
 import hashlib
 
 from .service_registry import ServiceRegistry, ServiceType, QualityTier, get_service_registry
 from .models.content_plan import ContentOpportunity, ContentMetrics
+from .opportunity_scoring import OpportunityScoringEngine, TrendColumns, momentum_lifecycle, momentum_score
+from .prompt_packing import PackingConfig, PackingStats, run_packed, scores_in_range
+from .analysis_cache import AnalysisResultCache, momentum_key
 
 logger = logging.getLogger(__name__)
 
+# คะแนนที่ _compile_analysis_result ใช้จากคำตอบ AI (สเกล 1-10)
+PACKED_SCORE_KEYS = ("viral_potential", "content_saturation", "audience_interest")
+
 class TrendLifecycle(Enum):
     """วงจรชีวิตเทรนด์"""
     EMERGING = "emerging"      # เพิ่งเกิดขึ้น, โอกาสสูง
@@ -133,6 +139,29 @@ class TrendAnalysisResult:
     data_sources: List[str] = field(default_factory=list)
     analysis_timestamp: datetime = field(default_factory=datetime.now)
     expires_at: Optional[datetime] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """แปลงเป็น dict ที่ JSON serialise ได้ (สำหรับ cache ข้าม process)"""
+        data = asdict(self)
+        for name in ("lifecycle_stage", "competition_level", "trend_origin"):
+            data[name] = getattr(self, name).value
+        for name in ("detected_at", "analysis_timestamp", "expires_at"):
+            value = getattr(self, name)
+            data[name] = value.isoformat() if value else None
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TrendAnalysisResult":
+        data = dict(data)
+        data["lifecycle_stage"] = TrendLifecycle(data["lifecycle_stage"])
+        data["competition_level"] = CompetitionLevel(data["competition_level"])
+        data["trend_origin"] = TrendOrigin(data["trend_origin"])
+        for name in ("detected_at", "analysis_timestamp", "expires_at"):
+            if data.get(name):
+                data[name] = datetime.fromisoformat(data[name])
+        data["metrics"] = TrendMetrics(**data["metrics"])
+        data["competitors"] = [CompetitorAnalysis(**c) for c in data.get("competitors", [])]
+        return cls(**data)
 
 class TrendAnalyzer:
     """
@@ -140,9 +169,13 @@ class TrendAnalyzer:
     ใช้ AI ร่วมกับ heuristics เพื่อวิเคราะห์โอกาสทางธุรกิจ
     """
     
-    def __init__(self, service_registry: Optional[ServiceRegistry] = None):
+    def __init__(self, service_registry: Optional[ServiceRegistry] = None,
+                 analysis_cache: Optional[AnalysisResultCache] = None):
         self.registry = service_registry or get_service_registry()
-        self.analysis_cache = {}  # Cache for expensive analyses
+        # Cache for expensive analyses: memory LRU + Redis (ถ้ามี REDIS_HOST), fresh 6h แล้ว stale อีก 6h
+        self.analysis_cache = analysis_cache or AnalysisResultCache.from_env(
+            TrendAnalysisResult.to_dict, TrendAnalysisResult.from_dict
+        )
         
         # Trend scoring weights
         self.scoring_weights = {
@@ -153,6 +186,11 @@ class TrendAnalyzer:
             "monetization_signals": 0.10,
             "timing_advantage": 0.10
         }
+        self.scoring_engine = OpportunityScoringEngine(self.scoring_weights)
+        
+        # Packed analysis: หลายเทรนด์ต่อหนึ่ง AI request (เฉพาะ basic/standard)
+        self.packing_config = PackingConfig()
+        self.packing_stats = PackingStats()
         
         # Platform characteristics
         self.platform_characteristics = {
@@ -178,64 +216,85 @@ class TrendAnalyzer:
     
     async def analyze_trend_comprehensive(self, trend_data: str, 
                                         target_platforms: List[str],
-                                        analysis_depth: str = "standard") -> TrendAnalysisResult:
-        """การวิเคราะห์เทรนด์แบบครอบคลุม"""
+                                        analysis_depth: str = "standard",
+                                        momentum: Optional[Dict[str, Any]] = None) -> TrendAnalysisResult:
+        """การวิเคราะห์เทรนด์แบบครอบคลุม
+
+        momentum: สัญญาณจาก trend_topic_state (velocity/acceleration ที่วัดจริง)
+        เช่นผลของ TrendRepository.get_topic_momentum
+        """
         
         logger.info(f"Starting comprehensive trend analysis: {trend_data[:50]}...")
         
-        # Generate unique trend ID
+        # Cache first: fresh คืนทันที, stale คืนทันทีแล้ว refresh เบื้องหลัง,
+        # การวิเคราะห์เทรนด์เดียวกันพร้อมกันจะเรียก AI ครั้งเดียว
+        cache_key = self._analysis_cache_key(trend_data, target_platforms, analysis_depth, momentum)
+        
+        async def analyze() -> TrendAnalysisResult:
+            try:
+                # Step 1: Basic AI Analysis
+                ai_analysis = await self._perform_ai_analysis(trend_data, target_platforms, analysis_depth)
+                
+                return await self._complete_analysis(trend_data, target_platforms, ai_analysis,
+                                                     analysis_depth, momentum)
+                
+            except Exception as e:
+                logger.error(f"Error in comprehensive trend analysis: {str(e)}")
+                return self._create_fallback_analysis(trend_data, target_platforms)
+        
+        return await self.analysis_cache.get_or_compute(
+            cache_key, analyze, cacheable=lambda result: result.analysis_quality != "fallback"
+        )
+    
+    def _analysis_cache_key(self, trend_data: str, target_platforms: List[str], analysis_depth: str,
+                            momentum: Optional[Dict[str, Any]] = None) -> str:
         trend_id = self._generate_trend_id(trend_data)
+        return f"{trend_id}_{analysis_depth}_{'_'.join(sorted(target_platforms))}_{momentum_key(momentum)}"
+    
+    async def _complete_analysis(self, trend_data: str, target_platforms: List[str],
+                                 ai_analysis: Dict[str, Any], analysis_depth: str,
+                                 momentum: Optional[Dict[str, Any]] = None) -> TrendAnalysisResult:
+        """ขั้นตอนหลังได้ผล AI analysis แล้ว (ใช้ร่วมกันระหว่างแบบทีละเทรนด์และแบบ packed)"""
         
-        # Check cache first
-        cache_key = f"{trend_id}_{analysis_depth}_{'_'.join(sorted(target_platforms))}"
-        if cache_key in self.analysis_cache:
-            cached_result = self.analysis_cache[cache_key]
-            if datetime.now() - cached_result.analysis_timestamp < timedelta(hours=6):
-                logger.info("Returning cached trend analysis")
-                return cached_result
+        trend_id = self._generate_trend_id(trend_data)
         
-        try:
-            # Step 1: Basic AI Analysis
-            ai_analysis = await self._perform_ai_analysis(trend_data, target_platforms, analysis_depth)
-            
-            # Step 2: Enhanced Analysis for higher tiers
-            if analysis_depth in ["premium", "enterprise"]:
-                competitive_analysis = await self._analyze_competitive_landscape(trend_data, target_platforms)
-                market_gaps = await self._identify_market_gaps(ai_analysis, competitive_analysis)
-                predictive_insights = await self._generate_predictive_insights(ai_analysis, trend_data)
-            else:
-                competitive_analysis = []
-                market_gaps = []
-                predictive_insights = {}
-            
-            # Step 3: Compile comprehensive result
-            result = await self._compile_analysis_result(
-                trend_id=trend_id,
-                trend_data=trend_data,
-                target_platforms=target_platforms,
-                ai_analysis=ai_analysis,
-                competitive_analysis=competitive_analysis,
-                market_gaps=market_gaps,
-                predictive_insights=predictive_insights,
-                analysis_depth=analysis_depth
-            )
-            
-            # Step 4: Calculate opportunity scores
-            result = self._calculate_opportunity_scores(result)
-            
-            # Step 5: Generate actionable recommendations
-            result = await self._generate_actionable_recommendations(result, target_platforms)
-            
-            # Cache the result
-            result.expires_at = datetime.now() + timedelta(hours=12)
-            self.analysis_cache[cache_key] = result
-            
-            logger.info(f"Trend analysis completed. Opportunity score: {result.opportunity_score:.1f}/10")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error in comprehensive trend analysis: {str(e)}")
-            return self._create_fallback_analysis(trend_data, target_platforms)
+        # Step 2: Enhanced Analysis for higher tiers
+        if analysis_depth in ["premium", "enterprise"]:
+            competitive_analysis = await self._analyze_competitive_landscape(trend_data, target_platforms)
+            market_gaps = await self._identify_market_gaps(ai_analysis, competitive_analysis)
+            predictive_insights = await self._generate_predictive_insights(ai_analysis, trend_data)
+        else:
+            competitive_analysis = []
+            market_gaps = []
+            predictive_insights = {}
+        
+        # Step 3: Compile comprehensive result
+        result = await self._compile_analysis_result(
+            trend_id=trend_id,
+            trend_data=trend_data,
+            target_platforms=target_platforms,
+            ai_analysis=ai_analysis,
+            competitive_analysis=competitive_analysis,
+            market_gaps=market_gaps,
+            predictive_insights=predictive_insights,
+            analysis_depth=analysis_depth
+        )
+        
+        # Step 3.5: Replace AI-guessed momentum with measured momentum
+        if momentum:
+            result = self._apply_momentum(result, momentum)
+        
+        # Step 4: Calculate opportunity scores
+        result = self._calculate_opportunity_scores(result)
+        
+        # Step 5: Generate actionable recommendations
+        result = await self._generate_actionable_recommendations(result, target_platforms)
+        
+        # Expiry of the cache entry (fresh + stale window)
+        result.expires_at = datetime.fromtimestamp(self.analysis_cache.expires_at())
+        
+        logger.info(f"Trend analysis completed. Opportunity score: {result.opportunity_score:.1f}/10")
+        return result
     
     async def _perform_ai_analysis(self, trend_data: str, platforms: List[str], depth: str) -> Dict[str, Any]:
         """การวิเคราะห์ด้วย AI"""
@@ -630,77 +689,32 @@ MARKET: Thailand
         
         return result
     
-    def _calculate_opportunity_scores(self, result: TrendAnalysisResult) -> TrendAnalysisResult:
-        """คำนวณคะแนนโอกาสต่างๆ"""
-        
-        # Base scores from metrics
-        base_viral = result.metrics.momentum_score
-        base_engagement = result.metrics.avg_engagement_rate * 10
-        competition_penalty = result.metrics.content_saturation
-        
-        # Lifecycle stage impact
-        lifecycle_multipliers = {
-            TrendLifecycle.EMERGING: 1.5,
-            TrendLifecycle.GROWING: 1.2,
-            TrendLifecycle.PEAK: 0.8,
-            TrendLifecycle.DECLINING: 0.3,
-            TrendLifecycle.STABLE: 1.0
-        }
+    def _apply_momentum(self, result: TrendAnalysisResult, momentum: Dict[str, Any]) -> TrendAnalysisResult:
+        """ใช้ velocity/acceleration จาก trend snapshots แทนค่าที่ AI ประเมิน"""
         
-        lifecycle_bonus = lifecycle_multipliers.get(result.lifecycle_stage, 1.0)
+        velocity = float(momentum.get("velocity", 0.0))  # คะแนนต่อชั่วโมง
+        result.metrics.growth_rate_daily = velocity * 24
+        result.metrics.momentum_score = momentum_score(momentum)
         
-        # Competition level impact
-        competition_multipliers = {
-            CompetitionLevel.LOW: 1.4,
-            CompetitionLevel.MEDIUM: 1.0,
-            CompetitionLevel.HIGH: 0.7,
-            CompetitionLevel.SATURATED: 0.4
-        }
-        
-        competition_multiplier = competition_multipliers.get(result.competition_level, 1.0)
+        lifecycle = momentum_lifecycle(momentum)
+        if lifecycle is None:
+            return result
+        result.lifecycle_stage = TrendLifecycle(lifecycle)
         
-        # Calculate viral potential (0-10)
-        result.viral_potential = min(10.0, 
-            (base_viral * lifecycle_bonus * competition_multiplier) - (competition_penalty * 0.3)
-        )
+        result.data_sources.append("trend_snapshots")
+        return result
+    
+    def _calculate_opportunity_scores(self, result: TrendAnalysisResult) -> TrendAnalysisResult:
+        """คำนวณคะแนนโอกาสต่างๆ (สูตรเดียวกับ scoring engine แบบ batch)"""
         
-        # Calculate content gap score based on market gaps
-        gap_score = min(10.0, len(result.market_gaps) * 2.0) if result.market_gaps else 5.0
-        result.content_gap_score = gap_score
-        
-        # Calculate monetization potential
-        monetization_base = 6.0  # Base score
-        if result.lifecycle_stage in [TrendLifecycle.GROWING, TrendLifecycle.PEAK]:
-            monetization_base += 2.0
-        if result.competition_level in [CompetitionLevel.LOW, CompetitionLevel.MEDIUM]:
-            monetization_base += 1.0
-        
-        result.monetization_potential = min(10.0, monetization_base)
-        
-        # Calculate overall opportunity score (weighted average)
-        weights = self.scoring_weights
-        result.opportunity_score = (
-            result.viral_potential * weights["viral_indicators"] +
-            base_engagement * weights["engagement_quality"] +
-            result.content_gap_score * weights["competition_gap"] +
-            (10 - competition_penalty) * weights["timing_advantage"] +
-            result.monetization_potential * weights["monetization_signals"] +
-            (base_viral * lifecycle_bonus) * weights["growth_momentum"]
-        ) / sum(weights.values())
-        
-        result.opportunity_score = min(10.0, max(0.0, result.opportunity_score))
-        
-        # Calculate success probability (0-1)
-        probability_factors = [
-            result.opportunity_score / 10,
-            lifecycle_bonus / 1.5,
-            competition_multiplier,
-            (10 - competition_penalty) / 10,
-            min(1.0, len(result.recommended_content_angles) / 3)
-        ]
+        scores = self.scoring_engine.score(TrendColumns.from_results([result]))
         
-        result.success_probability = sum(probability_factors) / len(probability_factors)
-        result.confidence_level = min(1.0, result.success_probability * 1.1)
+        result.viral_potential = float(scores["viral_potential"][0])
+        result.content_gap_score = float(scores["content_gap_score"][0])
+        result.monetization_potential = float(scores["monetization_potential"][0])
+        result.opportunity_score = float(scores["opportunity_score"][0])
+        result.success_probability = float(scores["success_probability"][0])
+        result.confidence_level = float(scores["confidence_level"][0])
         
         return result
     
@@ -860,15 +874,43 @@ MARKET: Thailand
         )
     
     async def batch_analyze_trends(self, trends: List[str], platforms: List[str], 
-                                 analysis_depth: str = "standard") -> List[TrendAnalysisResult]:
-        """วิเคราะห์หลายเทรนด์พร้อมกัน"""
+                                 analysis_depth: str = "standard",
+                                 packed: Optional[bool] = None,
+                                 momentum: Optional[Dict[str, Dict[str, Any]]] = None) -> List[TrendAnalysisResult]:
+        """วิเคราะห์หลายเทรนด์พร้อมกัน
+        
+        packed: รวมหลายเทรนด์ใน AI request เดียว (ค่าเริ่มต้นตาม packing_config, ใช้กับ basic/standard)
+        เทรนด์ที่ parse คำตอบไม่ได้จะถูกวิเคราะห์ใหม่ทีละเทรนด์ ผลลัพธ์มีรูปแบบเดียวกับแบบเดิม
+        momentum: {trend: สัญญาณ momentum} เช่น raw_data["momentum"] ของแต่ละ trend ที่บันทึกไว้
+        """
         
         logger.info(f"Starting batch analysis of {len(trends)} trends")
         
+        if packed is None:
+            packed = self.packing_config.enabled
+        
+        if packed and analysis_depth in ["basic", "standard"] and len(trends) > 1:
+            valid_results = await self._batch_analyze_packed(trends, platforms, analysis_depth, momentum or {})
+        else:
+            valid_results = await self._batch_analyze_individually(trends, platforms, analysis_depth, momentum or {})
+        
+        # Sort by opportunity score
+        valid_results = self.rank_trends_by_opportunity(valid_results)
+        
+        logger.info(f"Batch analysis completed. Top trend: {valid_results[0].trend_name} (score: {valid_results[0].opportunity_score:.1f})")
+        
+        return valid_results
+    
+    async def _batch_analyze_individually(self, trends: List[str], platforms: List[str],
+                                          analysis_depth: str,
+                                          momentum: Dict[str, Dict[str, Any]]) -> List[TrendAnalysisResult]:
+        """หนึ่ง AI request ต่อเทรนด์"""
+        
         # Create analysis tasks
         tasks = []
         for trend in trends:
-            task = self.analyze_trend_comprehensive(trend, platforms, analysis_depth)
+            task = self.analyze_trend_comprehensive(trend, platforms, analysis_depth,
+                                                    momentum=momentum.get(trend))
             tasks.append(task)
         
         # Execute with controlled concurrency
@@ -895,44 +937,165 @@ MARKET: Thailand
             else:
                 valid_results.append(result)
         
-        # Sort by opportunity score
-        valid_results.sort(key=lambda x: x.opportunity_score, reverse=True)
+        return valid_results
+    
+    async def _batch_analyze_packed(self, trends: List[str], platforms: List[str],
+                                    analysis_depth: str,
+                                    momentum: Dict[str, Dict[str, Any]]) -> List[TrendAnalysisResult]:
+        """หลายเทรนด์ต่อ AI request ตาม token budget แล้วประกอบผลด้วยขั้นตอนเดียวกับ analyze_trend_comprehensive"""
+        
+        results: List[Optional[TrendAnalysisResult]] = [None] * len(trends)
+        pending: Dict[str, str] = {}
+        for i, trend in enumerate(trends):
+            # stale ถือว่าต้องวิเคราะห์ใหม่ เพราะ pack request ถูกกว่าการ refresh ทีละเทรนด์
+            cached, state = await self.analysis_cache.lookup(
+                self._analysis_cache_key(trend, platforms, analysis_depth, momentum.get(trend))
+            )
+            if state == "fresh":
+                results[i] = cached
+            else:
+                pending[f"t{i}"] = trend
         
-        logger.info(f"Batch analysis completed. Top trend: {valid_results[0].trend_name} (score: {valid_results[0].opportunity_score:.1f})")
+        ai_tier = QualityTier.BUDGET if analysis_depth == "basic" else QualityTier.BALANCED
         
-        return valid_results
+        async def call(prompt: str, max_tokens: int) -> Any:
+            ai_result = await self.registry.process_with_best_service(
+                ServiceType.TEXT_AI,
+                prompt,
+                task_type="trend_analysis",
+                quality_tier=ai_tier,
+                context={
+                    "platforms": platforms,
+                    "analysis_depth": analysis_depth,
+                    "market": "Thailand",
+                    "max_tokens": max_tokens
+                }
+            )
+            if not ai_result.get("success", False):
+                raise RuntimeError(ai_result.get("error", "AI analysis failed"))
+            return ai_result.get("result")
+        
+        async def single(item_id: str, trend: str) -> TrendAnalysisResult:
+            return await self.analyze_trend_comprehensive(trend, platforms, analysis_depth,
+                                                          momentum=momentum.get(trend))
+        
+        packed_items, individual = await run_packed(
+            pending,
+            render_item=lambda item_id, trend: f'{{"id": "{item_id}", "trend": {json.dumps(trend, ensure_ascii=False)}}}',
+            build_prompt=lambda pack: self._create_packed_analysis_prompt(pack, platforms),
+            call=call,
+            single=single,
+            config=self.packing_config,
+            validate=lambda item: scores_in_range(item.get("scores"), PACKED_SCORE_KEYS),
+            stats=self.packing_stats
+        )
+        
+        for item_id, trend in pending.items():
+            index = int(item_id[1:])
+            try:
+                if item_id in packed_items:
+                    ai_analysis = self._create_basic_analysis(trend, platforms)
+                    ai_analysis.update(packed_items[item_id])
+                    results[index] = await self._complete_analysis(trend, platforms, ai_analysis, analysis_depth,
+                                                                   momentum.get(trend))
+                    await self.analysis_cache.put(
+                        self._analysis_cache_key(trend, platforms, analysis_depth, momentum.get(trend)),
+                        results[index]
+                    )
+                elif item_id in individual:
+                    results[index] = individual[item_id]
+            except Exception as e:
+                logger.error(f"Error analyzing trend '{trend}': {e}")
+            if results[index] is None:
+                results[index] = self._create_fallback_analysis(trend, platforms)
+        
+        return results
+    
+    def _create_packed_analysis_prompt(self, pack: List[Tuple[str, str]], platforms: List[str]) -> str:
+        """prompt สำหรับวิเคราะห์หลายเทรนด์ในครั้งเดียว (โครงสร้างต่อเทรนด์เหมือน standard prompt)"""
+        
+        trend_lines = "\n".join(text for _, text in pack)
+        return f"""
+วิเคราะห์เทรนด์ต่อไปนี้แต่ละรายการสำหรับการสร้างเนื้อหา
+แพลตฟอร์มเป้าหมาย: {', '.join(platforms)}
+
+เทรนด์ (JSON หนึ่งบรรทัดต่อรายการ):
+{trend_lines}
+
+ตอบเป็น JSON array เท่านั้น หนึ่ง object ต่อเทรนด์ ใช้ "id" เดิมของแต่ละเทรนด์:
+[
+  {{
+    "id": "t0",
+    "trend_name": "ชื่อเทรนด์",
+    "lifecycle_stage": "emerging/growing/peak/declining",
+    "scores": {{
+      "viral_potential": 8,
+      "content_saturation": 3,
+      "audience_interest": 9,
+      "monetization_opportunity": 7,
+      "competition_level": 5
+    }},
+    "content_angles": ["มุมมอง 1: ...", "มุมมอง 2: ...", "มุมมอง 3: ..."],
+    "platform_suitability": {{"TikTok": 8, "YouTube": 6, "Instagram": 7}},
+    "risks": ["ความเสี่ยง"],
+    "recommendations": ["คำแนะนำ"],
+    "optimal_timing": "เวลาที่เหมาะสม"
+  }}
+]
+"""
     
     def rank_trends_by_opportunity(self, analyses: List[TrendAnalysisResult], 
-                                  user_preferences: Dict[str, Any] = None) -> List[TrendAnalysisResult]:
-        """จัดอันดับเทรนด์ตามโอกาส"""
-        
-        if user_preferences:
-            # Apply user preference weights
-            preferred_platforms = user_preferences.get("preferred_platforms", [])
-            risk_tolerance = user_preferences.get("risk_tolerance", "medium")  # low, medium, high
-            content_types = user_preferences.get("preferred_content_types", [])
-            
-            for analysis in analyses:
-                # Platform preference bonus
-                platform_bonus = 0.0
-                for platform in preferred_platforms:
-                    if platform in analysis.platform_priorities:
-                        platform_bonus += analysis.platform_priorities[platform] * 0.1
-                
-                # Risk tolerance adjustment
-                risk_multiplier = 1.0
-                if risk_tolerance == "low" and analysis.lifecycle_stage == TrendLifecycle.EMERGING:
-                    risk_multiplier = 0.8  # Penalty for high-risk emerging trends
-                elif risk_tolerance == "high" and analysis.lifecycle_stage == TrendLifecycle.EMERGING:
-                    risk_multiplier = 1.3  # Bonus for risk-takers
-                
-                # Adjust opportunity score
-                analysis.opportunity_score = min(10.0, 
-                    (analysis.opportunity_score * risk_multiplier) + platform_bonus
-                )
+                                  user_preferences: Dict[str, Any] = None,
+                                  top_k: Optional[int] = None) -> List[TrendAnalysisResult]:
+        """จัดอันดับเทรนด์ตามโอกาส
+        
+        ไม่แก้ object ต้นทาง: ถ้ามี user_preferences จะคืนสำเนาที่มี opportunity_score ที่ปรับแล้ว
+        """
+        
+        if not analyses:
+            return []
         
-        # Sort by adjusted opportunity score
-        return sorted(analyses, key=lambda x: x.opportunity_score, reverse=True)
+        columns = TrendColumns.from_results(analyses)
+        ranked = self.scoring_engine.rank(columns, k=top_k, user_preferences=user_preferences)
+        
+        if not user_preferences:
+            return [analyses[i] for i in ranked["indices"]]
+        
+        return [
+            replace(analyses[i], opportunity_score=float(score))
+            for i, score in zip(ranked["indices"], ranked["scores"])
+        ]
+    
+    def rescore_trends(self, analyses: List[TrendAnalysisResult],
+                       scoring_weights: Optional[Dict[str, float]] = None,
+                       user_preferences: Optional[Dict[str, Any]] = None,
+                       top_k: int = 20,
+                       columns: Optional[TrendColumns] = None) -> List[TrendAnalysisResult]:
+        """คำนวณคะแนนใหม่ทั้งชุดด้วย weights ใหม่ แล้วคืนสำเนา top-K
+        
+        ส่ง columns (TrendColumns.from_results) ที่สร้างไว้แล้วมาได้ เพื่อ rescore ซ้ำหลายครั้งเร็วขึ้น
+        """
+        
+        if not analyses:
+            return []
+        
+        columns = columns or TrendColumns.from_results(analyses)
+        scores = self.scoring_engine.score(columns, scoring_weights)
+        adjusted = self.scoring_engine.adjust(columns, scores["opportunity_score"], user_preferences)
+        order = self.scoring_engine.top_k(adjusted, top_k)
+        
+        return [
+            replace(
+                analyses[i],
+                viral_potential=float(scores["viral_potential"][i]),
+                content_gap_score=float(scores["content_gap_score"][i]),
+                monetization_potential=float(scores["monetization_potential"][i]),
+                opportunity_score=float(adjusted[i]),
+                success_probability=float(scores["success_probability"][i]),
+                confidence_level=float(scores["confidence_level"][i])
+            )
+            for i in order
+        ]
     
     def get_analyzer_status(self) -> Dict[str, Any]:
         """สถานะของ Trend Analyzer"""
@@ -948,29 +1111,18 @@ MARKET: Thailand
                 "predictive_insights",
                 "actionable_recommendations"
             ],
-            "cache_stats": {
-                "total_cached": len(self.analysis_cache),
-                "valid_cache_entries": len([
-                    entry for entry in self.analysis_cache.values()
-                    if entry.expires_at and entry.expires_at > datetime.now()
-                ])
-            },
+            "cache_stats": self.analysis_cache.get_stats(),
+            "packing_stats": self.packing_stats.to_dict(),
             "last_updated": datetime.now().isoformat()
         }
     
-    def clear_expired_cache(self):
-        """ล้าง cache ที่หมดอายุ"""
-        
-        current_time = datetime.now()
-        expired_keys = [
-            key for key, analysis in self.analysis_cache.items()
-            if analysis.expires_at and analysis.expires_at <= current_time
-        ]
+    async def clear_expired_cache(self) -> int:
+        """ล้าง cache ที่หมดอายุ (ชั้น memory; Redis หมดอายุเองตาม TTL)"""
         
-        for key in expired_keys:
-            del self.analysis_cache[key]
+        removed = await self.analysis_cache.purge_expired()
         
-        logger.info(f"Cleared {len(expired_keys)} expired cache entries")
+        logger.info(f"Cleared {removed} expired cache entries")
+        return removed
     
     async def generate_trend_report(self, analyses: List[TrendAnalysisResult]) -> Dict[str, Any]:
         """สร้างรายงานสรุปเทรนด์"""
@@ -9,6 +9,11 @@ import io
 import base64
 import google.generativeai as genai
 
+try:
+    from .thumbnail_renderer import get_thumbnail_renderer
+except ImportError:
+    from thumbnail_renderer import get_thumbnail_renderer
+
 @dataclass
 class VisualPlan:
     scenes: List[Dict]
@@ -45,6 +50,9 @@ class ThumbnailGenerator:
             "entertainment": {"primary": "#FF7675", "secondary": "#FDCB6E", "accent": "#6C5CE7"},
             "business": {"primary": "#0984E3", "secondary": "#00B894", "accent": "#2D3436"}
         }
+        
+        # Renderer ที่ cache font และ background ต่อ color scheme
+        self.renderer = get_thumbnail_renderer()
 
     async def generate_thumbnail(self, 
                                title: str,
@@ -99,30 +107,31 @@ class ThumbnailGenerator:
         )
 
     def _create_gradient_background(self, canvas_size: Tuple[int, int], color_scheme: Dict) -> str:
-        """สร้าง background แบบ gradient"""
+        """สร้าง background แบบ gradient (NumPy + cache ต่อ color scheme)"""
         
-        width, height = canvas_size
-        image = Image.new('RGB', canvas_size, color=color_scheme["secondary"])
-        
-        # สร้าง gradient effect
-        draw = ImageDraw.Draw(image)
+        return self.renderer.get_background_base64(canvas_size, color_scheme)
+
+    async def render_thumbnails(self, thumbnails: Dict, image_format: str = 'JPEG') -> List[bytes]:
+        """Render ทุก design จาก generate_thumbnail() เป็นรูปจริงใน batch เดียว (A/B testing)"""
         
-        for i in range(height):
-            alpha = i / height
-            # Interpolate between primary and secondary colors
-            color = self._interpolate_color(
-                color_scheme["primary"], 
-                color_scheme["secondary"], 
-                alpha
-            )
-            draw.line([(0, i), (width, i)], fill=color)
+        canvas_size = thumbnails["canvas_size"]
+        color_scheme = thumbnails["color_scheme"]
+        designs = thumbnails["designs"]
+        title = designs[0].title_text if designs else ""
         
-        # Convert to base64 for easy storage
-        buffer = io.BytesIO()
-        image.save(buffer, format='PNG')
-        buffer.seek(0)
+        variants = [
+            {
+                "text_layout": self._calculate_text_layout(canvas_size, design.layout_type),
+                "elements": design.elements
+            }
+            for design in designs
+        ]
         
-        return base64.b64encode(buffer.getvalue()).decode()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: self.renderer.render_variants(title, canvas_size, color_scheme, variants, image_format)
+        )
 
     def _interpolate_color(self, color1: str, color2: str, t: float) -> str:
         """ผสมสีระหว่าง color1 และ color2"""
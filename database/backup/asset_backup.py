@@ -0,0 +1,650 @@
+#!/usr/bin/env python3
+"""
+Asset Backup Script for AI Content Factory
+สำรองไฟล์ media ที่ระบบสร้าง (รูปภาพ เสียง วิดีโอ) แบบ incremental พร้อม deduplication
+
+Files are split with content-defined chunking and every chunk is stored once,
+keyed by its SHA-256, in a local directory or an S3-compatible bucket. A backup
+is a small manifest listing the chunks of each file. Files whose size and mtime
+match the previous backup are not re-read, so nightly backup time and storage
+grow with new content rather than total content.
+"""
+
+import os
+import sys
+import json
+import gzip
+import zlib
+import bisect
+import hashlib
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set
+
+import yaml
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+except ImportError:
+    boto3 = None
+    ClientError = Exception
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+try:
+    from shared.utils.logger import setup_logger
+except ImportError:
+    setup_logger = None
+
+# Gear table for the rolling hash, derived from SHA-256 so chunk boundaries are
+# identical across runs, machines and the numpy/pure-Python code paths
+GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], 'little') for i in range(256)]
+
+# Bytes that influence the 32-bit gear hash at any position
+HASH_WINDOW = 32
+
+MEDIA_EXTENSIONS = [
+    '.png', '.jpg', '.jpeg', '.webp', '.gif',
+    '.mp3', '.wav', '.m4a', '.aac', '.ogg',
+    '.mp4', '.mov', '.webm', '.mkv',
+    '.json', '.srt', '.txt'
+]
+
+
+class ContentDefinedChunker:
+    """
+    Gear-hash content-defined chunking (FastCDC style)
+
+    A chunk ends after byte i when the hash of the 32 bytes ending at i falls
+    below a threshold, subject to min/max chunk sizes. Boundaries depend only
+    on local content, so inserting data into a file shifts the following
+    chunks instead of changing all of them.
+    """
+
+    def __init__(self, min_size: int = 256 * 1024, avg_size: int = 1024 * 1024,
+                 max_size: int = 4 * 1024 * 1024, read_size: int = 8 * 1024 * 1024):
+        if not HASH_WINDOW <= min_size < avg_size < max_size:
+            raise ValueError("Chunk sizes must satisfy 32 <= min_size < avg_size < max_size")
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+        self.read_size = max(read_size, max_size)
+        # Expected distance between boundaries past min_size is avg_size - min_size
+        self.threshold = (1 << 32) // (avg_size - min_size)
+
+    def chunks(self, stream: BinaryIO) -> Iterator[bytes]:
+        """Yield the chunks of a binary stream"""
+        pending = b''
+        eof = False
+        while not eof:
+            block = stream.read(self.read_size)
+            eof = not block
+            data = pending + block
+            position = 0
+            for cut in self._cut_points(data, eof):
+                yield data[position:cut]
+                position = cut
+            pending = data[position:]
+
+    def _cut_points(self, data: bytes, final: bool) -> Iterator[int]:
+        candidates = self._candidates(data)
+        position = 0
+        index = 0
+        while position < len(data):
+            # First and last byte index that may end a chunk starting at position
+            lowest = position + self.min_size - 1
+            highest = position + self.max_size - 1
+            index = bisect.bisect_left(candidates, lowest, index)
+            if index < len(candidates) and candidates[index] <= highest:
+                cut = int(candidates[index]) + 1
+            elif highest < len(data):
+                cut = highest + 1
+            elif final:
+                cut = len(data)
+            else:
+                # Boundary may lie in data that has not been read yet
+                return
+            yield cut
+            position = cut
+
+    def _candidates(self, data: bytes):
+        """Sorted byte indexes whose window hash is below the threshold"""
+        if np is None:
+            return self._candidates_python(data)
+
+        gear = np.asarray(GEAR, dtype=np.uint32)
+        hashes = gear[np.frombuffer(data, dtype=np.uint8)]
+        # Window sums by doubling: W2s[i] = Ws[i] + (Ws[i - s] << s), uint32 wraps like the scalar hash
+        span = 1
+        while span < HASH_WINDOW and span < len(hashes):
+            hashes[span:] += hashes[:-span] << np.uint32(span)
+            span *= 2
+        return np.flatnonzero(hashes < self.threshold)
+
+    def _candidates_python(self, data: bytes) -> List[int]:
+        candidates = []
+        value = 0
+        threshold = self.threshold
+        for index, byte in enumerate(data):
+            value = ((value << 1) + GEAR[byte]) & 0xFFFFFFFF
+            if value < threshold and index >= HASH_WINDOW - 1:
+                candidates.append(index)
+        return candidates
+
+
+def encode_chunk(data: bytes) -> bytes:
+    """Compress a chunk unless it is already compressed media (checked on a sample)"""
+    sample = data[:64 * 1024]
+    if len(zlib.compress(sample, 1)) < len(sample) * 0.9:
+        return b'Z' + zlib.compress(data, 6)
+    return b'R' + data
+
+
+def decode_chunk(blob: bytes) -> bytes:
+    if blob[:1] == b'Z':
+        return zlib.decompress(blob[1:])
+    return blob[1:]
+
+
+class LocalChunkStore:
+    """Chunk store in a local directory (second disk, NAS mount)"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(os.path.join(root, 'chunks'), exist_ok=True)
+        os.makedirs(os.path.join(root, 'manifests'), exist_ok=True)
+
+    def _chunk_path(self, chunk_id: str) -> str:
+        return os.path.join(self.root, 'chunks', chunk_id[:2], chunk_id)
+
+    def _manifest_path(self, backup_id: str) -> str:
+        return os.path.join(self.root, 'manifests', f"{backup_id}.json.gz")
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def has_chunk(self, chunk_id: str) -> bool:
+        return os.path.exists(self._chunk_path(chunk_id))
+
+    def put_chunk(self, chunk_id: str, blob: bytes):
+        self._atomic_write(self._chunk_path(chunk_id), blob)
+
+    def get_chunk(self, chunk_id: str) -> bytes:
+        with open(self._chunk_path(chunk_id), 'rb') as f:
+            return f.read()
+
+    def delete_chunk(self, chunk_id: str):
+        os.remove(self._chunk_path(chunk_id))
+
+    def list_chunks(self) -> Set[str]:
+        chunks = set()
+        for _, _, files in os.walk(os.path.join(self.root, 'chunks')):
+            chunks.update(name for name in files if not name.endswith('.tmp'))
+        return chunks
+
+    def put_manifest(self, backup_id: str, data: bytes):
+        self._atomic_write(self._manifest_path(backup_id), data)
+
+    def get_manifest(self, backup_id: str) -> bytes:
+        with open(self._manifest_path(backup_id), 'rb') as f:
+            return f.read()
+
+    def delete_manifest(self, backup_id: str):
+        os.remove(self._manifest_path(backup_id))
+
+    def list_manifests(self) -> List[str]:
+        names = os.listdir(os.path.join(self.root, 'manifests'))
+        return sorted(name[:-len('.json.gz')] for name in names if name.endswith('.json.gz'))
+
+
+class S3ChunkStore:
+    """Chunk store in Amazon S3 or an S3-compatible service (MinIO)"""
+
+    def __init__(self, s3_client, bucket: str, prefix: str = 'asset-backups', storage_class: str = 'STANDARD_IA'):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.storage_class = storage_class
+
+    def _chunk_key(self, chunk_id: str) -> str:
+        return f"{self.prefix}/chunks/{chunk_id[:2]}/{chunk_id}"
+
+    def _manifest_key(self, backup_id: str) -> str:
+        return f"{self.prefix}/manifests/{backup_id}.json.gz"
+
+    def _list_keys(self, prefix: str) -> Iterator[str]:
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get('Contents', []):
+                yield item['Key']
+
+    def has_chunk(self, chunk_id: str) -> bool:
+        try:
+            self.s3_client.head_object(Bucket=self.bucket, Key=self._chunk_key(chunk_id))
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def put_chunk(self, chunk_id: str, blob: bytes):
+        self.s3_client.put_object(
+            Bucket=self.bucket, Key=self._chunk_key(chunk_id), Body=blob, StorageClass=self.storage_class
+        )
+
+    def get_chunk(self, chunk_id: str) -> bytes:
+        return self.s3_client.get_object(Bucket=self.bucket, Key=self._chunk_key(chunk_id))['Body'].read()
+
+    def delete_chunk(self, chunk_id: str):
+        self.s3_client.delete_object(Bucket=self.bucket, Key=self._chunk_key(chunk_id))
+
+    def list_chunks(self) -> Set[str]:
+        return {key.rsplit('/', 1)[-1] for key in self._list_keys(f"{self.prefix}/chunks/")}
+
+    def put_manifest(self, backup_id: str, data: bytes):
+        self.s3_client.put_object(Bucket=self.bucket, Key=self._manifest_key(backup_id), Body=data)
+
+    def get_manifest(self, backup_id: str) -> bytes:
+        return self.s3_client.get_object(Bucket=self.bucket, Key=self._manifest_key(backup_id))['Body'].read()
+
+    def delete_manifest(self, backup_id: str):
+        self.s3_client.delete_object(Bucket=self.bucket, Key=self._manifest_key(backup_id))
+
+    def list_manifests(self) -> List[str]:
+        keys = self._list_keys(f"{self.prefix}/manifests/")
+        return sorted(key.rsplit('/', 1)[-1][:-len('.json.gz')] for key in keys if key.endswith('.json.gz'))
+
+
+class AssetBackup:
+    """Incremental, deduplicated backups of generated media"""
+
+    def __init__(self, config_path: str = None, store=None):
+        self.logger = setup_logger("asset_backup") if setup_logger else logging.getLogger("asset_backup")
+        self.config = self._load_config(config_path)
+        self.store = store or self._create_store()
+        settings = self.config['asset_backup_settings']
+        self.chunker = ContentDefinedChunker(
+            min_size=settings['min_chunk_kb'] * 1024,
+            avg_size=settings['avg_chunk_kb'] * 1024,
+            max_size=settings['max_chunk_kb'] * 1024
+        )
+
+    def _load_config(self, config_path: str) -> Dict[str, Any]:
+        """Load asset backup configuration"""
+        if config_path and os.path.exists(config_path):
+            with open(config_path, 'r', encoding='utf-8') as f:
+                return yaml.safe_load(f)
+
+        # Default configuration
+        return {
+            'asset_backup_settings': {
+                # Same default as PipelineConfig.output_directory
+                'source_dir': os.getenv('CONTENT_OUTPUT_DIR', './content_output'),
+                'store': os.getenv('ASSET_BACKUP_STORE', 'local'),  # local, s3
+                'local_store_dir': os.getenv('ASSET_BACKUP_DIR', 'database/backup/assets'),
+                'include_extensions': MEDIA_EXTENSIONS,  # Empty means all files
+                'min_chunk_kb': 256,
+                'avg_chunk_kb': 1024,
+                'max_chunk_kb': 4096,
+                'workers': 8,
+                'keep_backups': 14
+            },
+            's3_settings': {
+                'bucket_name': os.getenv('BACKUP_S3_BUCKET', ''),
+                'region': os.getenv('AWS_REGION', 'us-east-1'),
+                'access_key': os.getenv('AWS_ACCESS_KEY_ID', ''),
+                'secret_key': os.getenv('AWS_SECRET_ACCESS_KEY', ''),
+                'endpoint_url': os.getenv('BACKUP_S3_ENDPOINT_URL', ''),
+                'key_prefix': 'asset-backups',
+                'storage_class': 'STANDARD_IA'
+            }
+        }
+
+    def _create_store(self):
+        settings = self.config['asset_backup_settings']
+        if settings['store'] != 's3':
+            return LocalChunkStore(settings['local_store_dir'])
+
+        if boto3 is None:
+            raise RuntimeError("boto3 is required for the S3 asset backup store")
+        s3_config = self.config['s3_settings']
+        s3_client = boto3.client(
+            's3',
+            region_name=s3_config['region'],
+            aws_access_key_id=s3_config['access_key'],
+            aws_secret_access_key=s3_config['secret_key'],
+            endpoint_url=s3_config.get('endpoint_url') or None
+        )
+        return S3ChunkStore(s3_client, s3_config['bucket_name'], s3_config['key_prefix'], s3_config['storage_class'])
+
+    def _load_manifest(self, backup_id: str) -> Dict[str, Any]:
+        return json.loads(gzip.decompress(self.store.get_manifest(backup_id)))
+
+    def _iter_source_files(self, source_dir: str) -> Iterator[str]:
+        extensions = tuple(ext.lower() for ext in self.config['asset_backup_settings']['include_extensions'])
+        for root, dirs, files in os.walk(source_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if not extensions or name.lower().endswith(extensions):
+                    yield os.path.join(root, name)
+
+    def create_backup(self, source_dir: str = None) -> Dict[str, Any]:
+        """Back up new and changed files; unchanged files reuse the previous manifest entry"""
+        settings = self.config['asset_backup_settings']
+        source_dir = source_dir or settings['source_dir']
+        start_time = datetime.now()
+        backup_id = start_time.strftime('%Y%m%d_%H%M%S_%f')
+        result = {
+            'success': False,
+            'backup_id': backup_id,
+            'files_total': 0,
+            'files_changed': 0,
+            'bytes_total': 0,
+            'bytes_scanned': 0,
+            'chunks_new': 0,
+            'bytes_uploaded': 0,
+            'duration_seconds': 0,
+            'error_message': ''
+        }
+
+        try:
+            if not os.path.isdir(source_dir):
+                raise FileNotFoundError(f"Asset directory not found: {source_dir}")
+
+            self.logger.info(f"🚀 Starting asset backup of {source_dir}")
+            manifests = self.store.list_manifests()
+            previous_files = self._load_manifest(manifests[-1])['files'] if manifests else {}
+
+            # Chunks referenced by the previous backup are known to exist; anything
+            # else costs one existence check, so work scales with new content
+            known_chunks = {chunk_id for entry in previous_files.values() for chunk_id, _ in entry['chunks']}
+            workers = settings['workers']
+            slots = threading.BoundedSemaphore(workers * 2)
+            uploads = []
+
+            def upload(chunk_id: str, data: bytes):
+                try:
+                    if self.store.has_chunk(chunk_id):
+                        return 0
+                    blob = encode_chunk(data)
+                    self.store.put_chunk(chunk_id, blob)
+                    return len(blob)
+                finally:
+                    slots.release()
+
+            files = {}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for path in self._iter_source_files(source_dir):
+                    stat = os.stat(path)
+                    relative_path = os.path.relpath(path, source_dir).replace(os.sep, '/')
+                    result['files_total'] += 1
+                    result['bytes_total'] += stat.st_size
+
+                    previous = previous_files.get(relative_path)
+                    if previous and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+                        files[relative_path] = previous
+                        continue
+
+                    chunks = []
+                    with open(path, 'rb') as f:
+                        for data in self.chunker.chunks(f):
+                            chunk_id = hashlib.sha256(data).hexdigest()
+                            chunks.append([chunk_id, len(data)])
+                            if chunk_id in known_chunks:
+                                continue
+                            known_chunks.add(chunk_id)
+                            # Bounds chunks held in memory while uploads are in flight
+                            slots.acquire()
+                            uploads.append(executor.submit(upload, chunk_id, data))
+
+                    files[relative_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'chunks': chunks}
+                    result['files_changed'] += 1
+                    result['bytes_scanned'] += stat.st_size
+
+                for future in as_completed(uploads):
+                    uploaded = future.result()
+                    if uploaded:
+                        result['chunks_new'] += 1
+                        result['bytes_uploaded'] += uploaded
+
+            # The manifest is written last so it never references missing chunks
+            duration = (datetime.now() - start_time).total_seconds()
+            result['duration_seconds'] = round(duration, 1)
+            manifest = {
+                'backup_id': backup_id,
+                'created_at': start_time.isoformat(),
+                'source_dir': os.path.abspath(source_dir),
+                'chunking': {
+                    'min_size': self.chunker.min_size,
+                    'avg_size': self.chunker.avg_size,
+                    'max_size': self.chunker.max_size
+                },
+                'files': files,
+                'stats': {key: value for key, value in result.items() if key not in ('success', 'error_message')}
+            }
+            self.store.put_manifest(backup_id, gzip.compress(json.dumps(manifest).encode('utf-8')))
+
+            result['success'] = True
+            self.logger.info(
+                f"✅ Asset backup {backup_id} completed in {duration:.1f} seconds: "
+                f"{result['files_changed']}/{result['files_total']} files changed, "
+                f"{result['chunks_new']} new chunks ({result['bytes_uploaded'] / (1024 * 1024):.2f} MB uploaded)"
+            )
+
+        except Exception as e:
+            result['error_message'] = str(e)
+            self.logger.error(f"❌ Asset backup failed: {str(e)}")
+
+        return result
+
+    def restore_backup(self, target_dir: str, backup_id: str = None, paths: List[str] = None,
+                       workers: int = None) -> Dict[str, Any]:
+        """Restore a backup (latest by default), fetching chunks in parallel"""
+        workers = workers or self.config['asset_backup_settings']['workers']
+        start_time = datetime.now()
+        result = {
+            'success': False,
+            'backup_id': backup_id,
+            'files_restored': 0,
+            'bytes_restored': 0,
+            'chunks_fetched': 0,
+            'duration_seconds': 0,
+            'error_message': ''
+        }
+
+        try:
+            if not backup_id:
+                manifests = self.store.list_manifests()
+                if not manifests:
+                    raise FileNotFoundError("No asset backups found")
+                backup_id = manifests[-1]
+            result['backup_id'] = backup_id
+            manifest = self._load_manifest(backup_id)
+
+            files = {
+                relative_path: entry for relative_path, entry in manifest['files'].items()
+                if not paths or any(relative_path.startswith(prefix) for prefix in paths)
+            }
+            self.logger.info(f"🔄 Restoring {len(files)} files from asset backup {backup_id} to {target_dir}")
+
+            # Pre-size every file, then write chunks at their offsets from parallel workers
+            targets: Dict[str, List[tuple]] = {}
+            for relative_path, entry in files.items():
+                path = os.path.join(target_dir, *relative_path.split('/'))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.truncate(entry['size'])
+                offset = 0
+                for chunk_id, size in entry['chunks']:
+                    targets.setdefault(chunk_id, []).append((path, offset))
+                    offset += size
+
+            def restore_chunk(chunk_id: str, locations: List[tuple]) -> int:
+                data = decode_chunk(self.store.get_chunk(chunk_id))
+                if hashlib.sha256(data).hexdigest() != chunk_id:
+                    raise ValueError(f"Chunk {chunk_id} is corrupted")
+                for path, offset in locations:
+                    with open(path, 'r+b') as f:
+                        f.seek(offset)
+                        f.write(data)
+                return len(data) * len(locations)
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(restore_chunk, chunk_id, locations) for chunk_id, locations in targets.items()]
+                for future in as_completed(futures):
+                    result['bytes_restored'] += future.result()
+                    result['chunks_fetched'] += 1
+
+            for relative_path, entry in files.items():
+                path = os.path.join(target_dir, *relative_path.split('/'))
+                os.utime(path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+
+            duration = (datetime.now() - start_time).total_seconds()
+            result.update({
+                'success': True,
+                'files_restored': len(files),
+                'duration_seconds': round(duration, 1)
+            })
+            self.logger.info(f"✅ Asset restore completed in {duration:.1f} seconds")
+
+        except Exception as e:
+            result['error_message'] = str(e)
+            self.logger.error(f"❌ Asset restore failed: {str(e)}")
+
+        return result
+
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """List asset backups (newest first)"""
+        try:
+            backups = []
+            for backup_id in reversed(self.store.list_manifests()):
+                stats = self._load_manifest(backup_id).get('stats', {})
+                backups.append({
+                    'backup_id': backup_id,
+                    'files': stats.get('files_total', 0),
+                    'size_mb': round(stats.get('bytes_total', 0) / (1024 * 1024), 2),
+                    'uploaded_mb': round(stats.get('bytes_uploaded', 0) / (1024 * 1024), 2),
+                    'new_chunks': stats.get('chunks_new', 0)
+                })
+            return backups
+
+        except Exception as e:
+            self.logger.error(f"Failed to list asset backups: {str(e)}")
+            return []
+
+    def prune_backups(self, keep: int = None) -> Dict[str, int]:
+        """
+        Keep the newest backups and delete chunks no remaining backup references
+
+        Do not run while a backup is in progress: its new chunks are not yet
+        referenced by any manifest.
+        """
+        keep = keep or self.config['asset_backup_settings']['keep_backups']
+        try:
+            manifests = self.store.list_manifests()
+            expired = manifests[:-keep] if len(manifests) > keep else []
+            for backup_id in expired:
+                self.store.delete_manifest(backup_id)
+
+            referenced = set()
+            for backup_id in manifests[len(expired):]:
+                for entry in self._load_manifest(backup_id)['files'].values():
+                    referenced.update(chunk_id for chunk_id, _ in entry['chunks'])
+
+            unreferenced = self.store.list_chunks() - referenced
+            for chunk_id in unreferenced:
+                self.store.delete_chunk(chunk_id)
+
+            self.logger.info(f"Pruned {len(expired)} asset backups and {len(unreferenced)} unreferenced chunks")
+            return {'backups_deleted': len(expired), 'chunks_deleted': len(unreferenced)}
+
+        except Exception as e:
+            self.logger.error(f"Asset backup prune failed: {str(e)}")
+            return {'backups_deleted': 0, 'chunks_deleted': 0}
+
+
+def main():
+    """Main function with CLI interface"""
+    parser = argparse.ArgumentParser(description="AI Content Factory Asset Backup Tool")
+    parser.add_argument('action', choices=['backup', 'restore', 'list', 'prune'],
+                       help='Action to perform')
+    parser.add_argument('--config', '-c', help='Path to asset backup config file')
+    parser.add_argument('--source', '-s', help='Asset directory to back up (default: source_dir from config)')
+    parser.add_argument('--target', '-t', help='Directory to restore into (for restore)')
+    parser.add_argument('--backup-id', '-b', help='Backup to restore (default: latest)')
+    parser.add_argument('--path', '-p', action='append', help='Restore only files under this relative path')
+    parser.add_argument('--workers', '-w', type=int, help='Parallel restore workers')
+    parser.add_argument('--keep', type=int, help='Backups to keep (for prune)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='Enable verbose logging')
+
+    args = parser.parse_args()
+
+    # Setup logging
+    log_level = 'DEBUG' if args.verbose else 'INFO'
+    if setup_logger:
+        logger = setup_logger("asset_backup_main", level=log_level)
+    else:
+        logging.basicConfig(level=log_level)
+        logger = logging.getLogger("asset_backup_main")
+
+    asset_backup = AssetBackup(args.config)
+
+    try:
+        if args.action == 'backup':
+            result = asset_backup.create_backup(args.source)
+            if not result['success']:
+                logger.error("Asset backup failed! ❌")
+                sys.exit(1)
+            print(f"Backup: {result['backup_id']}")
+            print(f"Changed files: {result['files_changed']}/{result['files_total']}")
+            print(f"Uploaded: {result['bytes_uploaded'] / (1024 * 1024):.2f} MB in {result['chunks_new']} new chunks")
+
+        elif args.action == 'restore':
+            if not args.target:
+                logger.error("Target directory is required for restore")
+                sys.exit(1)
+            result = asset_backup.restore_backup(args.target, args.backup_id, args.path, args.workers)
+            if not result['success']:
+                logger.error("Asset restore failed! ❌")
+                sys.exit(1)
+            print(f"Restored {result['files_restored']} files from {result['backup_id']}")
+
+        elif args.action == 'list':
+            backups = asset_backup.list_backups()
+            if backups:
+                print("\n📋 Asset Backups:")
+                print("-" * 80)
+                print(f"{'Backup':<28} {'Files':<8} {'Size (MB)':<12} {'Uploaded (MB)':<14} {'New chunks':<10}")
+                print("-" * 80)
+                for backup in backups:
+                    print(f"{backup['backup_id']:<28} {backup['files']:<8} {backup['size_mb']:<12} "
+                          f"{backup['uploaded_mb']:<14} {backup['new_chunks']:<10}")
+            else:
+                print("No asset backups found")
+
+        elif args.action == 'prune':
+            result = asset_backup.prune_backups(args.keep)
+            logger.info(f"Prune completed: {result['backups_deleted']} backups, {result['chunks_deleted']} chunks deleted")
+
+    except Exception as e:
+        logger.error(f"Operation failed: {str(e)} ❌")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,19 @@ import os
 import sys
 import shutil
 import gzip
+import zlib
+import hashlib
 import logging
 import argparse
+import tempfile
+import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import psycopg2
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 import yaml
 import schedule
@@ -29,6 +35,108 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from shared.utils.logger import setup_logger
 from shared.utils.error_handler import ErrorHandler
 
+# Local backup files and directory dumps managed by list/cleanup
+BACKUP_EXTENSIONS = ['.sql', '.dump', '.tar', '.gz', '.zst', '.dir']
+
+# S3 rejects multipart parts smaller than 5 MB (except the last one)
+MIN_MULTIPART_CHUNK_SIZE = 5 * 1024 * 1024
+
+class S3MultipartUpload:
+    """Write-only stream that uploads to S3 (or any S3-compatible store) in parallel parts"""
+
+    def __init__(self, s3_client, bucket: str, key: str, chunk_size: int,
+                 max_concurrency: int = 4, extra_args: Optional[Dict[str, Any]] = None):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.chunk_size = max(chunk_size, MIN_MULTIPART_CHUNK_SIZE)
+        self.extra_args = extra_args or {}
+        self.bytes_uploaded = 0
+        self.upload_id = None
+        self._buffer = bytearray()
+        self._part_number = 0
+        self._parts: Dict[int, str] = {}
+        self._futures = []
+        # Bounds buffered parts in memory to max_concurrency uploads in flight
+        self._slots = threading.BoundedSemaphore(max(max_concurrency, 1))
+        self._executor = ThreadPoolExecutor(max_workers=max(max_concurrency, 1))
+
+    def __enter__(self):
+        response = self.s3_client.create_multipart_upload(Bucket=self.bucket, Key=self.key, **self.extra_args)
+        self.upload_id = response['UploadId']
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+            return False
+        try:
+            self.complete()
+        except Exception:
+            self.abort()
+            raise
+        return False
+
+    def write(self, data: bytes):
+        self._buffer.extend(data)
+        while len(self._buffer) >= self.chunk_size:
+            part = bytes(self._buffer[:self.chunk_size])
+            del self._buffer[:self.chunk_size]
+            self._submit(part)
+
+    def _submit(self, part: bytes):
+        self._raise_failed_parts()
+        self._slots.acquire()
+        self._part_number += 1
+        future = self._executor.submit(self._upload_part, self._part_number, part)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def _upload_part(self, part_number: int, data: bytes):
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=data
+        )
+        self._parts[part_number] = response['ETag']
+        self.bytes_uploaded += len(data)
+
+    def _raise_failed_parts(self):
+        for future in self._futures:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+    def complete(self):
+        """Flush the last part and wait for all parts before completing the upload"""
+        try:
+            if self._buffer or self._part_number == 0:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            for future in as_completed(self._futures):
+                future.result()
+        finally:
+            self._executor.shutdown(wait=True)
+
+        self.s3_client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={'Parts': [
+                {'PartNumber': number, 'ETag': self._parts[number]} for number in sorted(self._parts)
+            ]}
+        )
+
+    def abort(self):
+        """Drop all uploaded parts so failed backups don't leave billable fragments behind"""
+        self._executor.shutdown(wait=True)
+        if self.upload_id:
+            try:
+                self.s3_client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+            except Exception:
+                pass
+
 class DatabaseBackup:
     """Main class for database backup operations"""
     
@@ -62,7 +170,14 @@ class DatabaseBackup:
                 'backup_name_format': 'content_factory_backup_{timestamp}',
                 'include_tables': [],  # Empty means all tables
                 'exclude_tables': [],
-                'verify_backup': True
+                'verify_backup': True,
+                'backup_mode': 'file',  # file, streaming, directory
+                'compressor': 'auto',  # auto, zstd, pigz, gzip (used by streaming mode)
+                'compressor_threads': 0,  # 0 = all cores
+                'zstd_level': 3,
+                'parallel_jobs': 4,  # pg_dump --jobs for directory dumps
+                'restore_jobs': 1,  # pg_restore --jobs; 1 streams the restore, > 1 opts in to parallel restore
+                'stream_chunk_size_kb': 1024
             },
             's3_settings': {
                 'enabled': False,
@@ -71,7 +186,11 @@ class DatabaseBackup:
                 'access_key': os.getenv('AWS_ACCESS_KEY_ID', ''),
                 'secret_key': os.getenv('AWS_SECRET_ACCESS_KEY', ''),
                 'storage_class': 'STANDARD_IA',  # STANDARD, STANDARD_IA, GLACIER
-                'encryption': True
+                'encryption': True,
+                'endpoint_url': os.getenv('BACKUP_S3_ENDPOINT_URL', ''),  # MinIO or other S3-compatible storage
+                'key_prefix': 'database-backups',
+                'multipart_chunk_size_mb': 64,
+                'max_concurrency': 4
             },
             'notification_settings': {
                 'enabled': False,
@@ -100,7 +219,8 @@ class DatabaseBackup:
         os.makedirs(backup_dir, exist_ok=True)
         return backup_dir
     
-    def generate_backup_filename(self, backup_type: str = 'manual') -> str:
+    def generate_backup_filename(self, backup_type: str = 'manual', mode: str = 'file',
+                                 compression_ext: str = '') -> str:
         """Generate backup filename with timestamp"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         name_format = self.config['backup_settings']['backup_name_format']
@@ -111,6 +231,12 @@ class DatabaseBackup:
             date=datetime.now().strftime('%Y%m%d')
         )
         
+        # Streaming dumps are always custom format; directory dumps are a directory
+        if mode == 'streaming':
+            return filename + '.dump' + compression_ext
+        if mode == 'directory':
+            return filename + '.dir'
+        
         # Add appropriate extension based on format
         backup_format = self.config['backup_settings']['backup_format']
         if backup_format == 'custom':
@@ -122,54 +248,69 @@ class DatabaseBackup:
         
         return filename
     
+    def _pg_env(self) -> Dict[str, str]:
+        """Environment for pg_* tools with the database password"""
+        env = os.environ.copy()
+        env['PGPASSWORD'] = self.config['database']['password']
+        return env
+    
+    def _build_pg_dump_command(self, output_file: Optional[str] = None, backup_format: Optional[str] = None,
+                               compression_level: Optional[int] = None, jobs: Optional[int] = None) -> List[str]:
+        """Build pg_dump command; without output_file the dump is written to stdout"""
+        db_config = self.config['database']
+        backup_settings = self.config['backup_settings']
+        backup_format = backup_format or backup_settings['backup_format']
+        if compression_level is None:
+            compression_level = backup_settings['compression_level']
+        
+        cmd = [
+            'pg_dump',
+            f"--host={db_config['host']}",
+            f"--port={db_config['port']}",
+            f"--username={db_config['user']}",
+            f"--dbname={db_config['database']}",
+            '--no-password',
+            '--verbose',
+            '--clean',
+            '--no-acl',
+            '--no-owner'
+        ]
+        
+        # Add format option
+        if backup_format == 'custom':
+            cmd.extend(['--format=custom'])
+            cmd.extend([f"--compress={compression_level}"])
+        elif backup_format == 'directory':
+            cmd.extend(['--format=directory'])
+            cmd.extend([f"--compress={compression_level}"])
+            cmd.extend([f"--jobs={jobs or backup_settings.get('parallel_jobs', 1)}"])
+        elif backup_format == 'tar':
+            cmd.extend(['--format=tar'])
+        elif backup_format == 'plain':
+            cmd.extend(['--format=plain'])
+        
+        # Add table inclusion/exclusion
+        if backup_settings['include_tables']:
+            for table in backup_settings['include_tables']:
+                cmd.extend(['--table', table])
+        
+        for table in backup_settings['exclude_tables']:
+            cmd.extend(['--exclude-table', table])
+        
+        # Add output file
+        if output_file:
+            cmd.extend(['--file', output_file])
+        
+        return cmd
+    
     def create_pg_dump(self, output_file: str) -> bool:
         """Create PostgreSQL dump using pg_dump"""
         try:
-            db_config = self.config['database']
-            backup_settings = self.config['backup_settings']
-            
-            # Build pg_dump command
-            cmd = [
-                'pg_dump',
-                f"--host={db_config['host']}",
-                f"--port={db_config['port']}",
-                f"--username={db_config['user']}",
-                f"--dbname={db_config['database']}",
-                '--no-password',
-                '--verbose',
-                '--clean',
-                '--no-acl',
-                '--no-owner'
-            ]
-            
-            # Add format option
-            backup_format = backup_settings['backup_format']
-            if backup_format == 'custom':
-                cmd.extend(['--format=custom'])
-                cmd.extend([f"--compress={backup_settings['compression_level']}"])
-            elif backup_format == 'tar':
-                cmd.extend(['--format=tar'])
-            elif backup_format == 'plain':
-                cmd.extend(['--format=plain'])
-            
-            # Add table inclusion/exclusion
-            if backup_settings['include_tables']:
-                for table in backup_settings['include_tables']:
-                    cmd.extend(['--table', table])
-            
-            for table in backup_settings['exclude_tables']:
-                cmd.extend(['--exclude-table', table])
-            
-            # Add output file
-            cmd.extend(['--file', output_file])
-            
-            # Set environment variables
-            env = os.environ.copy()
-            env['PGPASSWORD'] = db_config['password']
+            cmd = self._build_pg_dump_command(output_file)
             
             # Run pg_dump
             self.logger.info(f"Starting database backup to {output_file}")
-            result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+            result = subprocess.run(cmd, env=self._pg_env(), capture_output=True, text=True)
             
             if result.returncode == 0:
                 # Get file size
@@ -184,6 +325,62 @@ class DatabaseBackup:
             self.logger.error(f"Backup creation failed: {str(e)}")
             return False
     
+    def create_directory_dump(self, output_dir: str, jobs: Optional[int] = None) -> bool:
+        """Create a directory-format dump with parallel pg_dump workers"""
+        try:
+            jobs = jobs or self.config['backup_settings'].get('parallel_jobs', 1)
+            cmd = self._build_pg_dump_command(output_dir, backup_format='directory', jobs=jobs)
+            
+            self.logger.info(f"Starting parallel database backup to {output_dir} ({jobs} jobs)")
+            result = subprocess.run(cmd, env=self._pg_env(), capture_output=True, text=True)
+            
+            if result.returncode == 0:
+                file_size = self._path_size(output_dir) / (1024 * 1024)
+                self.logger.info(f"Backup completed successfully. Size: {file_size:.2f} MB")
+                return True
+            else:
+                self.logger.error(f"pg_dump failed: {result.stderr}")
+                return False
+                
+        except Exception as e:
+            self.logger.error(f"Backup creation failed: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _path_size(path: str) -> int:
+        """Size of a backup file or directory dump in bytes"""
+        if os.path.isdir(path):
+            return sum(
+                os.path.getsize(os.path.join(root, name))
+                for root, _, files in os.walk(path) for name in files
+            )
+        return os.path.getsize(path)
+    
+    def select_compressor(self) -> Tuple[str, Optional[List[str]], str]:
+        """
+        Pick the streaming compressor: (name, command, file extension)
+        
+        zstd and pigz compress on all cores; without either binary the stream
+        is gzip-compressed in-process (command is None).
+        """
+        backup_settings = self.config['backup_settings']
+        preferred = backup_settings.get('compressor', 'auto')
+        threads = backup_settings.get('compressor_threads', 0)
+        
+        candidates = ['zstd', 'pigz', 'gzip'] if preferred == 'auto' else [preferred]
+        for name in candidates:
+            if name == 'zstd' and shutil.which('zstd'):
+                level = backup_settings.get('zstd_level', 3)
+                return 'zstd', ['zstd', f'-{level}', f'-T{threads}', '-q', '-c'], '.zst'
+            if name == 'pigz' and shutil.which('pigz'):
+                level = backup_settings['compression_level']
+                return 'pigz', ['pigz', f'-{level}', '-p', str(threads or os.cpu_count() or 1), '-c'], '.gz'
+            if name == 'gzip':
+                return 'gzip', None, '.gz'
+        
+        self.logger.warning(f"Compressor '{preferred}' is not installed, falling back to gzip")
+        return 'gzip', None, '.gz'
+    
     def compress_backup(self, backup_file: str) -> str:
         """Compress backup file using gzip"""
         try:
@@ -216,6 +413,16 @@ class DatabaseBackup:
         try:
             self.logger.info("Verifying backup integrity...")
             
+            # Directory dumps are verified by listing their table of contents
+            if os.path.isdir(backup_file):
+                result = subprocess.run(['pg_restore', '--list', backup_file], capture_output=True, text=True)
+                if result.returncode == 0:
+                    self.logger.info("✅ Backup verification successful")
+                    return True
+                else:
+                    self.logger.error(f"❌ Backup verification failed: {result.stderr}")
+                    return False
+            
             # For custom format, use pg_restore to verify
             if backup_file.endswith('.dump') or backup_file.endswith('.dump.gz'):
                 cmd = ['pg_restore', '--list']
@@ -258,8 +465,32 @@ class DatabaseBackup:
             self.logger.error(f"Backup verification failed: {str(e)}")
             return False
     
+    def _get_s3_client(self):
+        """S3 client; endpoint_url points it at MinIO or another S3-compatible store"""
+        s3_config = self.config['s3_settings']
+        return boto3.client(
+            's3',
+            region_name=s3_config['region'],
+            aws_access_key_id=s3_config['access_key'],
+            aws_secret_access_key=s3_config['secret_key'],
+            endpoint_url=s3_config.get('endpoint_url') or None
+        )
+    
+    def _s3_extra_args(self) -> Dict[str, str]:
+        s3_config = self.config['s3_settings']
+        extra_args = {
+            'StorageClass': s3_config['storage_class']
+        }
+        if s3_config['encryption']:
+            extra_args['ServerSideEncryption'] = 'AES256'
+        return extra_args
+    
+    def _s3_key(self, name: str) -> str:
+        prefix = self.config['s3_settings'].get('key_prefix', 'database-backups').strip('/')
+        return f"{prefix}/{name}" if prefix else name
+    
     def upload_to_s3(self, backup_file: str) -> bool:
-        """Upload backup to Amazon S3"""
+        """Upload backup file (or every file of a directory dump) to Amazon S3"""
         s3_config = self.config['s3_settings']
         
         if not s3_config['enabled']:
@@ -268,34 +499,39 @@ class DatabaseBackup:
         try:
             self.logger.info("Uploading backup to S3...")
             
-            # Initialize S3 client
-            s3_client = boto3.client(
-                's3',
-                region_name=s3_config['region'],
-                aws_access_key_id=s3_config['access_key'],
-                aws_secret_access_key=s3_config['secret_key']
+            s3_client = self._get_s3_client()
+            max_concurrency = s3_config.get('max_concurrency', 4)
+            transfer_config = TransferConfig(
+                multipart_chunksize=s3_config.get('multipart_chunk_size_mb', 64) * 1024 * 1024,
+                max_concurrency=max_concurrency
             )
             
-            # Prepare S3 key
-            s3_key = f"database-backups/{os.path.basename(backup_file)}"
-            
-            # Upload parameters
-            extra_args = {
-                'StorageClass': s3_config['storage_class']
-            }
-            
-            if s3_config['encryption']:
-                extra_args['ServerSideEncryption'] = 'AES256'
-            
-            # Upload file
-            s3_client.upload_file(
-                backup_file,
-                s3_config['bucket_name'],
-                s3_key,
-                ExtraArgs=extra_args
-            )
+            # Directory dumps upload one object per table file, in parallel
+            backup_name = os.path.basename(backup_file.rstrip(os.sep))
+            if os.path.isdir(backup_file):
+                uploads = [
+                    (os.path.join(backup_file, name), self._s3_key(f"{backup_name}/{name}"))
+                    for name in sorted(os.listdir(backup_file))
+                ]
+            else:
+                uploads = [(backup_file, self._s3_key(backup_name))]
+            
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                futures = [
+                    executor.submit(
+                        s3_client.upload_file,
+                        local_path,
+                        s3_config['bucket_name'],
+                        s3_key,
+                        ExtraArgs=self._s3_extra_args(),
+                        Config=transfer_config
+                    )
+                    for local_path, s3_key in uploads
+                ]
+                for future in as_completed(futures):
+                    future.result()
             
-            self.logger.info(f"✅ Backup uploaded to S3: s3://{s3_config['bucket_name']}/{s3_key}")
+            self.logger.info(f"✅ Backup uploaded to S3: s3://{s3_config['bucket_name']}/{self._s3_key(backup_name)}")
             return True
             
         except ClientError as e:
@@ -305,6 +541,113 @@ class DatabaseBackup:
             self.logger.error(f"S3 upload error: {str(e)}")
             return False
     
+    def stream_backup(self, backup_type: str = 'manual') -> Dict[str, Any]:
+        """
+        Stream pg_dump through a multithreaded compressor straight to S3
+        
+        The dump never touches local disk when S3 is enabled: pg_dump stdout is
+        piped into zstd/pigz and the compressed stream is uploaded as a
+        multipart object while pg_dump is still running. With S3 disabled the
+        compressed stream is written to the local backup directory instead.
+        """
+        s3_config = self.config['s3_settings']
+        chunk_size = self.config['backup_settings'].get('stream_chunk_size_kb', 1024) * 1024
+        result = {
+            'success': False,
+            'backup_file': None,
+            'location': None,
+            'compressor': None,
+            'compressed_bytes': 0,
+            'sha256': None,
+            'error_message': ''
+        }
+        
+        compressor_name, compressor_cmd, extension = self.select_compressor()
+        backup_filename = self.generate_backup_filename(backup_type, mode='streaming', compression_ext=extension)
+        result['backup_file'] = backup_filename
+        result['compressor'] = compressor_name
+        
+        if s3_config['enabled']:
+            s3_key = self._s3_key(backup_filename)
+            sink = S3MultipartUpload(
+                self._get_s3_client(),
+                s3_config['bucket_name'],
+                s3_key,
+                chunk_size=s3_config.get('multipart_chunk_size_mb', 64) * 1024 * 1024,
+                max_concurrency=s3_config.get('max_concurrency', 4),
+                extra_args=self._s3_extra_args()
+            )
+            result['location'] = f"s3://{s3_config['bucket_name']}/{s3_key}"
+        else:
+            local_path = os.path.join(self.create_backup_directory(), backup_filename)
+            sink = open(local_path, 'wb')
+            result['location'] = local_path
+        
+        # Compression happens in the pipeline, so pg_dump itself writes uncompressed
+        dump_cmd = self._build_pg_dump_command(backup_format='custom', compression_level=0)
+        self.logger.info(f"Starting streaming backup to {result['location']} ({compressor_name})")
+        
+        processes = []
+        checksum = hashlib.sha256()
+        try:
+            with tempfile.TemporaryFile() as dump_stderr, tempfile.TemporaryFile() as compressor_stderr, sink:
+                dump_process = subprocess.Popen(
+                    dump_cmd, stdout=subprocess.PIPE, stderr=dump_stderr, env=self._pg_env()
+                )
+                processes.append(dump_process)
+                
+                if compressor_cmd:
+                    compressor_process = subprocess.Popen(
+                        compressor_cmd, stdin=dump_process.stdout, stdout=subprocess.PIPE, stderr=compressor_stderr
+                    )
+                    processes.append(compressor_process)
+                    # Only the compressor reads pg_dump output now
+                    dump_process.stdout.close()
+                    stream, compress = compressor_process.stdout, None
+                else:
+                    stream = dump_process.stdout
+                    compress = zlib.compressobj(self.config['backup_settings']['compression_level'], zlib.DEFLATED, 31)
+                
+                for data in iter(lambda: stream.read(chunk_size), b''):
+                    if compress:
+                        data = compress.compress(data)
+                    if data:
+                        checksum.update(data)
+                        sink.write(data)
+                        result['compressed_bytes'] += len(data)
+                if compress:
+                    data = compress.flush()
+                    checksum.update(data)
+                    sink.write(data)
+                    result['compressed_bytes'] += len(data)
+                stream.close()
+                
+                # A failed pg_dump must abort the upload, not complete a truncated object
+                for process, stderr in zip(processes, (dump_stderr, compressor_stderr)):
+                    if process.wait() != 0:
+                        stderr.seek(0)
+                        raise RuntimeError(
+                            f"{process.args[0]} exited with code {process.returncode}: "
+                            f"{stderr.read().decode(errors='replace')[-2000:]}"
+                        )
+            
+            result['sha256'] = checksum.hexdigest()
+            result['success'] = True
+            size_mb = result['compressed_bytes'] / (1024 * 1024)
+            self.logger.info(f"✅ Streaming backup completed: {result['location']} ({size_mb:.2f} MB)")
+            
+        except Exception as e:
+            for process in processes:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+            if not s3_config['enabled'] and os.path.exists(result['location']):
+                os.remove(result['location'])
+            result['error_message'] = str(e)
+            self.logger.error(f"Streaming backup failed: {str(e)}")
+        
+        return result
+    
     def cleanup_old_backups(self) -> Dict[str, int]:
         """Remove old backup files based on retention policy"""
         try:
@@ -318,10 +661,10 @@ class DatabaseBackup:
             # Get all backup files with their timestamps
             backup_files = []
             for file in os.listdir(backup_dir):
-                if any(file.endswith(ext) for ext in ['.sql', '.dump', '.tar', '.gz']):
+                if any(file.endswith(ext) for ext in BACKUP_EXTENSIONS):
                     file_path = os.path.join(backup_dir, file)
                     file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    file_size = os.path.getsize(file_path)
+                    file_size = self._path_size(file_path)
                     
                     backup_files.append({
                         'path': file_path,
@@ -351,7 +694,10 @@ class DatabaseBackup:
                 
                 if should_delete:
                     try:
-                        os.remove(backup_file['path'])
+                        if os.path.isdir(backup_file['path']):
+                            shutil.rmtree(backup_file['path'])
+                        else:
+                            os.remove(backup_file['path'])
                         deleted_files += 1
                         freed_space += backup_file['size']
                         self.logger.info(f"Deleted old backup: {os.path.basename(backup_file['path'])} ({reason})")
@@ -440,9 +786,10 @@ AI Content Factory Backup System
         except Exception as e:
             self.logger.error(f"Failed to send notification: {str(e)}")
     
-    def create_backup(self, backup_type: str = 'manual') -> Dict[str, Any]:
+    def create_backup(self, backup_type: str = 'manual', mode: Optional[str] = None) -> Dict[str, Any]:
         """Create a complete backup with all steps"""
         start_time = datetime.now()
+        mode = mode or self.config['backup_settings'].get('backup_mode', 'file')
         backup_result = {
             'success': False,
             'backup_file': None,
@@ -454,22 +801,47 @@ AI Content Factory Backup System
         }
         
         try:
-            self.logger.info(f"🚀 Starting {backup_type} database backup...")
+            self.logger.info(f"🚀 Starting {backup_type} database backup ({mode} mode)...")
+            
+            # Streaming mode: dump, compression and upload run as one pipeline
+            if mode == 'streaming':
+                stream_result = self.stream_backup(backup_type)
+                if not stream_result['success']:
+                    backup_result['error_message'] = stream_result['error_message']
+                    return backup_result
+                
+                duration = (datetime.now() - start_time).total_seconds()
+                backup_result.update({
+                    'success': True,
+                    'backup_file': stream_result['backup_file'],
+                    'location': stream_result['location'],
+                    'sha256': stream_result['sha256'],
+                    'file_size_mb': round(stream_result['compressed_bytes'] / (1024 * 1024), 2),
+                    'duration_seconds': round(duration, 1),
+                    's3_uploaded': self.config['s3_settings']['enabled'],
+                    'cleanup_results': self.cleanup_old_backups()
+                })
+                self.logger.info(f"✅ Backup completed successfully in {duration:.1f} seconds")
+                return backup_result
             
             # Create backup directory
             backup_dir = self.create_backup_directory()
             
             # Generate backup filename
-            backup_filename = self.generate_backup_filename(backup_type)
+            backup_filename = self.generate_backup_filename(backup_type, mode=mode)
             backup_file = os.path.join(backup_dir, backup_filename)
             
             # Create database dump
-            if not self.create_pg_dump(backup_file):
+            if mode == 'directory':
+                dumped = self.create_directory_dump(backup_file)
+            else:
+                dumped = self.create_pg_dump(backup_file)
+            if not dumped:
                 backup_result['error_message'] = "Database dump creation failed"
                 return backup_result
             
             # Compress backup if needed
-            if self.config['backup_settings']['backup_format'] == 'plain':
+            if mode == 'file' and self.config['backup_settings']['backup_format'] == 'plain':
                 backup_file = self.compress_backup(backup_file)
             
             # Verify backup
@@ -478,7 +850,7 @@ AI Content Factory Backup System
                 return backup_result
             
             # Get file size
-            file_size_mb = os.path.getsize(backup_file) / (1024 * 1024)
+            file_size_mb = self._path_size(backup_file) / (1024 * 1024)
             
             # Upload to S3
             s3_uploaded = self.upload_to_s3(backup_file)
@@ -511,73 +883,247 @@ AI Content Factory Backup System
             
         return backup_result
     
-    def restore_backup(self, backup_file: str, target_db: str = None) -> bool:
-        """Restore database from backup file"""
+    @staticmethod
+    def _decompress_command(backup_file: str, from_stdin: bool = False) -> List[str]:
+        """Command that writes the decompressed backup (or its stdin) to stdout"""
+        if backup_file.endswith('.zst'):
+            cmd = ['zstd', '-d', '-q', '-c']
+        elif shutil.which('pigz'):
+            cmd = ['pigz', '-d', '-c']
+        else:
+            cmd = ['gzip', '-d', '-c']
+        return cmd if from_stdin else cmd + [backup_file]
+    
+    def download_from_s3(self, s3_uri: str, dest_dir: str) -> Optional[str]:
+        """Download a backup object (or every object of a directory dump) from S3"""
+        try:
+            s3_client = self._get_s3_client()
+            bucket, _, key = s3_uri[len('s3://'):].partition('/')
+            key = key.rstrip('/')
+            local_path = os.path.join(dest_dir, os.path.basename(key))
+            
+            # Directory dumps are stored as one object per file under the dump name
+            paginator = s3_client.get_paginator('list_objects_v2')
+            objects = [
+                item['Key']
+                for page in paginator.paginate(Bucket=bucket, Prefix=key + '/')
+                for item in page.get('Contents', [])
+            ]
+            
+            self.logger.info(f"Downloading backup from {s3_uri}")
+            if not objects:
+                s3_client.download_file(bucket, key, local_path)
+                return local_path
+            
+            os.makedirs(local_path, exist_ok=True)
+            max_concurrency = self.config['s3_settings'].get('max_concurrency', 4)
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                futures = [
+                    executor.submit(
+                        s3_client.download_file, bucket, object_key,
+                        os.path.join(local_path, os.path.basename(object_key))
+                    )
+                    for object_key in objects
+                ]
+                for future in as_completed(futures):
+                    future.result()
+            return local_path
+            
+        except Exception as e:
+            self.logger.error(f"S3 download failed: {str(e)}")
+            return None
+    
+    def _restore_commands(self, target_db: Optional[str] = None) -> Tuple[List[str], List[str], Dict[str, str]]:
+        """pg_restore and psql commands (without input) for the target database"""
+        db_config = self.config['database'].copy()
+        if target_db:
+            db_config['database'] = target_db
+        
+        # Set environment variables
+        env = os.environ.copy()
+        env['PGPASSWORD'] = db_config['password']
+        
+        connection = [
+            f"--host={db_config['host']}",
+            f"--port={db_config['port']}",
+            f"--username={db_config['user']}",
+            f"--dbname={db_config['database']}",
+            '--no-password'
+        ]
+        pg_restore_cmd = ['pg_restore'] + connection + ['--verbose', '--clean', '--no-acl', '--no-owner']
+        psql_cmd = ['psql'] + connection
+        return pg_restore_cmd, psql_cmd, env
+    
+    def _is_s3_directory_dump(self, s3_client, bucket: str, key: str) -> bool:
+        """Directory dumps are stored as one object per file under the dump name"""
+        response = s3_client.list_objects_v2(Bucket=bucket, Prefix=key.rstrip('/') + '/', MaxKeys=1)
+        return response.get('KeyCount', 0) > 0
+    
+    def stream_restore_from_s3(self, s3_uri: str, target_db: str = None) -> bool:
+        """
+        Restore a single-object backup by streaming it from S3
+        
+        The object body is piped through the decompressor into pg_restore (or
+        psql for plain dumps) while it downloads, so nothing is written to local
+        disk. Directory dumps and parallel restores go through restore_backup.
+        """
+        pg_restore_cmd, psql_cmd, env = self._restore_commands(target_db)
+        chunk_size = self.config['backup_settings'].get('stream_chunk_size_kb', 1024) * 1024
+        bucket, _, key = s3_uri[len('s3://'):].partition('/')
+        name = os.path.basename(key)
+        compressed = name.endswith('.gz') or name.endswith('.zst')
+        
+        if '.sql' in name:
+            restore_cmd = psql_cmd
+        else:
+            restore_cmd = pg_restore_cmd + ['--format=tar' if '.tar' in name else '--format=custom']
+        
+        processes = []
+        try:
+            body = self._get_s3_client().get_object(Bucket=bucket, Key=key)['Body']
+            self.logger.info(f"Streaming restore from {s3_uri}")
+            
+            with tempfile.TemporaryFile() as restore_output, tempfile.TemporaryFile() as decompress_stderr:
+                restore_process = subprocess.Popen(
+                    restore_cmd, stdin=subprocess.PIPE, stdout=restore_output, stderr=subprocess.STDOUT, env=env
+                )
+                processes.append((restore_process, restore_output))
+                
+                if compressed:
+                    decompress_process = subprocess.Popen(
+                        self._decompress_command(name, from_stdin=True),
+                        stdin=subprocess.PIPE, stdout=restore_process.stdin, stderr=decompress_stderr
+                    )
+                    processes.insert(0, (decompress_process, decompress_stderr))
+                    # Only the decompressor writes to the restore process now
+                    restore_process.stdin.close()
+                    sink = decompress_process.stdin
+                else:
+                    sink = restore_process.stdin
+                
+                try:
+                    for data in body.iter_chunks(chunk_size):
+                        sink.write(data)
+                except BrokenPipeError:
+                    # The restore side exited early; its exit code carries the error
+                    pass
+                finally:
+                    try:
+                        sink.close()
+                    except BrokenPipeError:
+                        pass
+                
+                for process, output in processes:
+                    if process.wait() != 0:
+                        output.seek(0)
+                        self.logger.error(
+                            f"❌ Database restore failed: {process.args[0]} exited with code "
+                            f"{process.returncode}: {output.read().decode(errors='replace')[-2000:]}"
+                        )
+                        return False
+            
+            self.logger.info("✅ Database restore completed successfully")
+            return True
+            
+        except Exception as e:
+            for process, _ in processes:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+            self.logger.error(f"Database restore failed: {str(e)}")
+            return False
+    
+    def restore_backup(self, backup_file: str, target_db: str = None, jobs: Optional[int] = None) -> bool:
+        """
+        Restore database from backup file, directory dump or s3:// URI
+        
+        Restores stream by default: s3:// objects are piped straight into the
+        restore and compressed archives are decompressed on the fly. jobs > 1
+        (or restore_jobs in the config) opts in to pg_restore --jobs, which
+        needs a local, seekable copy of the archive.
+        """
+        jobs = jobs or self.config['backup_settings'].get('restore_jobs', 1)
+        temp_dir = None
         try:
             self.logger.info(f"🔄 Starting database restore from {backup_file}")
             
+            if backup_file.startswith('s3://'):
+                bucket, _, key = backup_file[len('s3://'):].partition('/')
+                if jobs <= 1 and not self._is_s3_directory_dump(self._get_s3_client(), bucket, key):
+                    return self.stream_restore_from_s3(backup_file, target_db)
+                
+                temp_dir = tempfile.mkdtemp(prefix='restore_', dir=self.create_backup_directory())
+                backup_file = self.download_from_s3(backup_file, temp_dir)
+                if not backup_file:
+                    return False
+            
             if not os.path.exists(backup_file):
                 self.logger.error(f"Backup file not found: {backup_file}")
                 return False
             
-            db_config = self.config['database'].copy()
-            if target_db:
-                db_config['database'] = target_db
-            
-            # Build pg_restore command
-            cmd = [
-                'pg_restore',
-                f"--host={db_config['host']}",
-                f"--port={db_config['port']}",
-                f"--username={db_config['user']}",
-                f"--dbname={db_config['database']}",
-                '--no-password',
-                '--verbose',
-                '--clean',
-                '--no-acl',
-                '--no-owner'
-            ]
+            cmd, psql_cmd, env = self._restore_commands(target_db)
+            compressed = backup_file.endswith('.gz') or backup_file.endswith('.zst')
+            
+            if os.path.isdir(backup_file):
+                # Directory dumps can restore tables in parallel
+                self.logger.info(f"Restoring directory dump with {jobs} jobs")
+                if jobs > 1:
+                    cmd.append(f'--jobs={jobs}')
+                result = subprocess.run(
+                    cmd + ['--format=directory', backup_file],
+                    env=env, capture_output=True, text=True
+                )
             
-            # Handle compressed files
-            if backup_file.endswith('.gz'):
-                # For compressed files, use zcat to decompress
-                zcat_process = subprocess.Popen(['zcat', backup_file], stdout=subprocess.PIPE)
+            elif compressed and '.sql' in os.path.basename(backup_file):
+                # Compressed plain dumps are streamed into psql
+                decompress_process = subprocess.Popen(self._decompress_command(backup_file), stdout=subprocess.PIPE)
+                result = subprocess.run(
+                    psql_cmd,
+                    stdin=decompress_process.stdout,
+                    env=env,
+                    capture_output=True,
+                    text=True
+                )
+                decompress_process.stdout.close()
+                decompress_process.wait()
+            
+            elif compressed and jobs > 1:
+                # pg_restore --jobs needs a seekable archive, so decompress to a temp file first
+                temp_dir = temp_dir or tempfile.mkdtemp(prefix='restore_', dir=self.create_backup_directory())
+                archive = os.path.join(temp_dir, os.path.splitext(os.path.basename(backup_file))[0])
+                with open(archive, 'wb') as archive_file:
+                    subprocess.run(self._decompress_command(backup_file), stdout=archive_file, check=True)
                 
-                # Set environment variables
-                env = os.environ.copy()
-                env['PGPASSWORD'] = db_config['password']
+                self.logger.info(f"Restoring archive with {jobs} jobs")
+                result = subprocess.run(
+                    cmd + ['--format=custom', f'--jobs={jobs}', archive],
+                    env=env, capture_output=True, text=True
+                )
+            
+            elif compressed:
+                # For compressed files, stream the decompressed archive into pg_restore
+                decompress_process = subprocess.Popen(self._decompress_command(backup_file), stdout=subprocess.PIPE)
                 
-                # Run pg_restore with zcat output as input
+                # Run pg_restore with decompressed output as input
                 result = subprocess.run(
                     cmd + ['--format=custom'],
-                    stdin=zcat_process.stdout,
+                    stdin=decompress_process.stdout,
                     env=env,
                     capture_output=True,
                     text=True
                 )
-                zcat_process.stdout.close()
-                zcat_process.wait()
+                decompress_process.stdout.close()
+                decompress_process.wait()
                 
+            elif backup_file.endswith('.sql'):
+                # For SQL files, use psql instead
+                result = subprocess.run(psql_cmd + ['--file', backup_file], env=env, capture_output=True, text=True)
+            
             else:
+                # Tar archives cannot be restored in parallel
+                if not backup_file.endswith('.tar') and jobs > 1:
+                    cmd.append(f'--jobs={jobs}')
                 cmd.append(backup_file)
-                
-                # Set environment variables
-                env = os.environ.copy()
-                env['PGPASSWORD'] = db_config['password']
-                
-                # Determine format based on file extension
-                if backup_file.endswith('.sql'):
-                    # For SQL files, use psql instead
-                    cmd = [
-                        'psql',
-                        f"--host={db_config['host']}",
-                        f"--port={db_config['port']}",
-                        f"--username={db_config['user']}",
-                        f"--dbname={db_config['database']}",
-                        '--no-password',
-                        '--file', backup_file
-                    ]
-                
                 result = subprocess.run(cmd, env=env, capture_output=True, text=True)
             
             if result.returncode == 0:
@@ -590,6 +1136,10 @@ AI Content Factory Backup System
         except Exception as e:
             self.logger.error(f"Database restore failed: {str(e)}")
             return False
+        
+        finally:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
     
     def list_backups(self) -> List[Dict[str, Any]]:
         """List available backup files"""
@@ -601,14 +1151,14 @@ AI Content Factory Backup System
             
             backups = []
             for file in os.listdir(backup_dir):
-                if any(file.endswith(ext) for ext in ['.sql', '.dump', '.tar', '.gz']):
+                if any(file.endswith(ext) for ext in BACKUP_EXTENSIONS):
                     file_path = os.path.join(backup_dir, file)
                     file_stat = os.stat(file_path)
                     
                     backups.append({
                         'filename': file,
                         'path': file_path,
-                        'size_mb': round(file_stat.st_size / (1024 * 1024), 2),
+                        'size_mb': round(self._path_size(file_path) / (1024 * 1024), 2),
                         'created': datetime.fromtimestamp(file_stat.st_mtime),
                         'age_days': (datetime.now() - datetime.fromtimestamp(file_stat.st_mtime)).days
                     })
@@ -673,8 +1223,13 @@ def main():
     parser.add_argument('--type', '-t', default='manual',
                        choices=['manual', 'daily', 'weekly', 'monthly'],
                        help='Backup type (default: manual)')
-    parser.add_argument('--file', '-f', help='Backup file path (for restore)')
+    parser.add_argument('--file', '-f', help='Backup file path, directory dump or s3:// URI (for restore)')
     parser.add_argument('--target-db', help='Target database name (for restore)')
+    parser.add_argument('--mode', '-m', choices=['file', 'streaming', 'directory'],
+                       help='Backup mode (default: backup_mode from config)')
+    parser.add_argument('--jobs', '-j', type=int,
+                       help='Parallel pg_dump/pg_restore jobs (default: parallel_jobs from config for backups, '
+                            'restore_jobs for restores)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose logging')
     
@@ -686,10 +1241,12 @@ def main():
     
     # Initialize backup system
     backup_system = DatabaseBackup(args.config)
+    if args.jobs:
+        backup_system.config['backup_settings']['parallel_jobs'] = args.jobs
     
     try:
         if args.action == 'backup':
-            result = backup_system.create_backup(args.type)
+            result = backup_system.create_backup(args.type, args.mode)
             if result['success']:
                 logger.info("Backup completed successfully! 🎉")
                 print(f"Backup file: {result['backup_file']}")
@@ -704,7 +1261,7 @@ def main():
                 logger.error("Backup file is required for restore")
                 sys.exit(1)
             
-            success = backup_system.restore_backup(args.file, args.target_db)
+            success = backup_system.restore_backup(args.file, args.target_db, args.jobs)
             if success:
                 logger.info("Restore completed successfully! 🎉")
                 sys.exit(0)
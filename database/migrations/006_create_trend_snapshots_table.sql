@@ -0,0 +1,66 @@
+-- Migration 006: Create trend_snapshots and trend_topic_state tables
+-- Compact score time series per topic plus momentum state updated at ingest,
+-- so growth / "rising now" queries are index lookups instead of GROUP BY over trends
+
+CREATE TABLE trend_snapshots (
+    fingerprint CHAR(40) NOT NULL,
+    captured_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    score REAL NOT NULL,
+
+    PRIMARY KEY (fingerprint, captured_at)
+);
+
+-- Append-only and time ordered: BRIN keeps the retention scan cheap
+CREATE INDEX idx_trend_snapshots_captured_at ON trend_snapshots USING brin(captured_at);
+
+CREATE TABLE trend_topic_state (
+    fingerprint CHAR(40) PRIMARY KEY,
+    topic VARCHAR(500) NOT NULL,
+    source VARCHAR(50) NOT NULL,
+    category VARCHAR(100) DEFAULT 'other',
+    region VARCHAR(50) DEFAULT 'global',
+
+    first_seen TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_seen TIMESTAMP WITH TIME ZONE NOT NULL,
+    observations INTEGER NOT NULL DEFAULT 1,
+
+    first_score REAL NOT NULL,
+    last_score REAL NOT NULL,
+    peak_score REAL NOT NULL,
+
+    -- EWMA of score change (points per hour) and of velocity change (points per hour^2)
+    velocity REAL NOT NULL DEFAULT 0.0,
+    acceleration REAL NOT NULL DEFAULT 0.0,
+
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_trend_topic_state_rising ON trend_topic_state(last_seen DESC, velocity DESC);
+CREATE INDEX idx_trend_topic_state_velocity ON trend_topic_state(velocity DESC) WHERE observations > 1;
+CREATE INDEX idx_trend_topic_state_category_velocity ON trend_topic_state(category, velocity DESC);
+CREATE INDEX idx_trend_topic_state_topic ON trend_topic_state(lower(topic));
+
+COMMENT ON TABLE trend_snapshots IS 'Score of each topic at each collection (fingerprint = sha1 of source + normalised topic)';
+COMMENT ON TABLE trend_topic_state IS 'Latest per-topic momentum (EWMA velocity/acceleration) maintained at ingest';
+COMMENT ON COLUMN trend_topic_state.velocity IS 'EWMA of popularity score change in points per hour';
+COMMENT ON COLUMN trend_topic_state.acceleration IS 'EWMA of velocity change in points per hour squared';
+
+-- Data retention for snapshots (topic state is kept while the topic is seen)
+CREATE OR REPLACE FUNCTION cleanup_old_trend_snapshots(retention_days INTEGER DEFAULT 30)
+RETURNS INTEGER AS $$
+DECLARE
+    deleted_count INTEGER;
+BEGIN
+    DELETE FROM trend_snapshots
+    WHERE captured_at < CURRENT_TIMESTAMP - (retention_days || ' days')::INTERVAL;
+
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+
+    DELETE FROM trend_topic_state
+    WHERE last_seen < CURRENT_TIMESTAMP - (retention_days || ' days')::INTERVAL;
+
+    RETURN deleted_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION cleanup_old_trend_snapshots IS 'Function to remove old trend snapshots and stale topic state';
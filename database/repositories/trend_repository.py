@@ -5,7 +5,7 @@ Provides database operations for trend data with advanced querying capabilities
 
 import logging
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
 
 import psycopg2
@@ -18,6 +18,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from trend_monitor.models.trend_data import TrendData, TrendSource, TrendCategory
+from trend_monitor.models.trend_momentum import TopicMomentum, topic_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,8 @@ class TrendRepository:
             conn = self._get_connection()
             cursor = conn.cursor()
             
+            self._record_snapshots_safely(cursor, [trend])
+            
             insert_sql = """
                 INSERT INTO trends (
                     id, source, topic, keywords, popularity_score, growth_rate,
@@ -101,6 +104,8 @@ class TrendRepository:
             conn = self._get_connection()
             cursor = conn.cursor()
             
+            self._record_snapshots_safely(cursor, trends)
+            
             insert_sql = """
                 INSERT INTO trends (
                     id, source, topic, keywords, popularity_score, growth_rate,
@@ -147,6 +152,93 @@ class TrendRepository:
                 conn.close()
             return 0
     
+    def _record_snapshots_safely(self, cursor, trends: List[TrendData]) -> Dict[str, TopicMomentum]:
+        """Record snapshots inside a savepoint so a failure never blocks saving the trends"""
+        cursor.execute("SAVEPOINT trend_snapshots")
+        try:
+            states = self._record_snapshots(cursor, trends)
+            cursor.execute("RELEASE SAVEPOINT trend_snapshots")
+            return states
+        except Exception as e:
+            logger.warning(f"Could not record trend snapshots: {e}")
+            cursor.execute("ROLLBACK TO SAVEPOINT trend_snapshots")
+            return {}
+    
+    def _record_snapshots(self, cursor, trends: List[TrendData]) -> Dict[str, TopicMomentum]:
+        """Append score snapshots and fold them into per-topic momentum state
+        
+        Runs in the caller's transaction. Each trend's raw_data gets a 'momentum'
+        entry so downstream scoring sees real velocity instead of the collectors'
+        heuristic growth estimate.
+        """
+        if not trends:
+            return {}
+        
+        observations = []
+        for trend in trends:
+            at = trend.collected_at or datetime.utcnow()
+            if at.tzinfo is None:
+                at = at.replace(tzinfo=timezone.utc)
+            observations.append((topic_fingerprint(trend.topic, trend.source.value), at, trend))
+        
+        fingerprints = list({fp for fp, _, _ in observations})
+        cursor.execute("""
+            SELECT fingerprint, topic, source, category, region, first_seen, last_seen,
+                   first_score, last_score, peak_score, observations, velocity, acceleration
+            FROM trend_topic_state
+            WHERE fingerprint = ANY(%s)
+            FOR UPDATE
+        """, (fingerprints,))
+        
+        states: Dict[str, TopicMomentum] = {}
+        for row in cursor.fetchall():
+            states[row[0]] = TopicMomentum(*row)
+        
+        snapshots: Dict[tuple, float] = {}
+        for fp, at, trend in sorted(observations, key=lambda o: o[1]):
+            score = trend.popularity_score
+            state = states.get(fp)
+            if state is None:
+                states[fp] = state = TopicMomentum.start(
+                    fp, trend.topic, trend.source.value, trend.category.value,
+                    trend.region or 'global', score, at
+                )
+            elif at >= state.last_seen:
+                state.update(score, at)
+            snapshots[(fp, at)] = max(score, snapshots.get((fp, at), 0.0))
+            
+            if trend.raw_data is None:
+                trend.raw_data = {}
+            trend.raw_data['momentum'] = state.to_signal()
+        
+        psycopg2.extras.execute_values(cursor, """
+            INSERT INTO trend_snapshots (fingerprint, captured_at, score) VALUES %s
+            ON CONFLICT (fingerprint, captured_at) DO NOTHING
+        """, [(fp, at, score) for (fp, at), score in snapshots.items()])
+        
+        psycopg2.extras.execute_values(cursor, """
+            INSERT INTO trend_topic_state (
+                fingerprint, topic, source, category, region, first_seen, last_seen,
+                first_score, last_score, peak_score, observations, velocity, acceleration
+            ) VALUES %s
+            ON CONFLICT (fingerprint) DO UPDATE SET
+                category = EXCLUDED.category,
+                region = EXCLUDED.region,
+                last_seen = EXCLUDED.last_seen,
+                last_score = EXCLUDED.last_score,
+                peak_score = EXCLUDED.peak_score,
+                observations = EXCLUDED.observations,
+                velocity = EXCLUDED.velocity,
+                acceleration = EXCLUDED.acceleration,
+                updated_at = CURRENT_TIMESTAMP
+        """, [
+            (s.fingerprint, s.topic, s.source, s.category, s.region, s.first_seen, s.last_seen,
+             s.first_score, s.last_score, s.peak_score, s.observations, s.velocity, s.acceleration)
+            for s in states.values()
+        ])
+        
+        return states
+    
     def get_trends(self,
                    source: Optional[str] = None,
                    category: Optional[str] = None,
@@ -458,6 +550,7 @@ class TrendRepository:
             # Use the database cleanup function
             cursor.execute("SELECT cleanup_old_trends(%s)", (retention_days,))
             deleted_count = cursor.fetchone()[0]
+            cursor.execute("SELECT cleanup_old_trend_snapshots(%s)", (retention_days,))
             
             if self._owned_connection:
                 conn.commit()
@@ -514,7 +607,7 @@ class TrendRepository:
     
     def get_trend_growth_analysis(self, 
                                  hours_back: int = 24) -> List[Dict[str, Any]]:
-        """Analyze trend growth patterns"""
+        """Analyze trend growth patterns (reads ingest-time momentum state)"""
         try:
             conn = self._get_connection()
             cursor = conn.cursor(cursor_factory=RealDictCursor)
@@ -524,18 +617,19 @@ class TrendRepository:
                     topic,
                     source,
                     category,
-                    MIN(collected_at) as first_seen,
-                    MAX(collected_at) as last_seen,
-                    COUNT(*) as mention_count,
-                    MIN(popularity_score) as initial_score,
-                    MAX(popularity_score) as peak_score,
-                    MAX(popularity_score) - MIN(popularity_score) as score_growth,
-                    AVG(growth_rate) FILTER (WHERE growth_rate IS NOT NULL) as avg_growth_rate
-                FROM trends
-                WHERE collected_at >= CURRENT_TIMESTAMP - (%s || ' hours')::INTERVAL
-                GROUP BY topic, source, category
-                HAVING COUNT(*) > 1
-                ORDER BY score_growth DESC, peak_score DESC
+                    first_seen,
+                    last_seen,
+                    observations as mention_count,
+                    first_score as initial_score,
+                    peak_score,
+                    last_score - first_score as score_growth,
+                    velocity,
+                    acceleration,
+                    velocity as avg_growth_rate
+                FROM trend_topic_state
+                WHERE observations > 1
+                  AND last_seen >= CURRENT_TIMESTAMP - (%s || ' hours')::INTERVAL
+                ORDER BY velocity DESC, peak_score DESC
                 LIMIT 50
             """, (hours_back,))
             
@@ -550,4 +644,108 @@ class TrendRepository:
             logger.error(f"Error getting trend growth analysis: {e}")
             if self._owned_connection and conn:
                 conn.close()
-            return []
\ No newline at end of file
+            return []
+    
+    def get_rising_trends(self,
+                          within_hours: int = 6,
+                          min_velocity: float = 0.5,
+                          category: Optional[str] = None,
+                          limit: int = 20) -> List[Dict[str, Any]]:
+        """Topics seen recently whose score is climbing now (velocity and acceleration)"""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            
+            params: List[Any] = [within_hours, min_velocity]
+            category_clause = ""
+            if category:
+                category_clause = "AND category = %s"
+                params.append(category)
+            params.append(limit)
+            
+            cursor.execute(f"""
+                SELECT fingerprint, topic, source, category, region, last_seen,
+                       last_score, peak_score, observations, velocity, acceleration
+                FROM trend_topic_state
+                WHERE last_seen >= CURRENT_TIMESTAMP - (%s || ' hours')::INTERVAL
+                  AND velocity >= %s
+                  AND observations > 1
+                  {category_clause}
+                ORDER BY velocity DESC
+                LIMIT %s
+            """, params)
+            
+            rows = cursor.fetchall()
+            
+            if self._owned_connection:
+                conn.close()
+            
+            return [dict(row) for row in rows]
+            
+        except Exception as e:
+            logger.error(f"Error getting rising trends: {e}")
+            if self._owned_connection and conn:
+                conn.close()
+            return []
+    
+    def get_topic_momentum(self, topic: str, source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Momentum signal for a topic (strongest source if none given)"""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            
+            if source:
+                cursor.execute("""
+                    SELECT * FROM trend_topic_state WHERE fingerprint = %s
+                """, (topic_fingerprint(topic, source),))
+            else:
+                sources = [s.value for s in TrendSource]
+                cursor.execute("""
+                    SELECT * FROM trend_topic_state
+                    WHERE fingerprint = ANY(%s)
+                    ORDER BY velocity DESC
+                    LIMIT 1
+                """, ([topic_fingerprint(topic, s) for s in sources],))
+            
+            row = cursor.fetchone()
+            
+            if self._owned_connection:
+                conn.close()
+            
+            return dict(row) if row else None
+            
+        except Exception as e:
+            logger.error(f"Error getting topic momentum: {e}")
+            if self._owned_connection and conn:
+                conn.close()
+            return None
+    
+    def get_topic_history(self, topic: str, source: str,
+                          since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Score time series of one topic from trend_snapshots"""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            
+            if since is None:
+                since = datetime.utcnow() - timedelta(hours=48)
+            
+            cursor.execute("""
+                SELECT captured_at, score
+                FROM trend_snapshots
+                WHERE fingerprint = %s AND captured_at >= %s
+                ORDER BY captured_at
+            """, (topic_fingerprint(topic, source), since))
+            
+            rows = cursor.fetchall()
+            
+            if self._owned_connection:
+                conn.close()
+            
+            return [dict(row) for row in rows]
+            
+        except Exception as e:
+            logger.error(f"Error getting topic history: {e}")
+            if self._owned_connection and conn:
+                conn.close()
+            return []
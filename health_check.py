@@ -19,13 +19,16 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import json
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from shared.utils.logger import setup_logger
 from shared.utils.error_handler import ErrorHandler
+from shared.utils.health_engine import (
+    HealthEngine, HealthEngineConfig, ProbeResult, http_probe, run_command, run_sync,
+    STATUS_WARNING
+)
 
 class HealthStatus(Enum):
     """Health status enumeration"""
@@ -59,6 +62,14 @@ class SystemHealthChecker:
         self.config = config or self._load_default_config()
         self.results = {}
         
+        engine_config = self.config.get('engine', {})
+        self.engine = HealthEngine(HealthEngineConfig(
+            max_concurrency=engine_config.get('max_concurrency', 200),
+            default_ttl=engine_config.get('cache_ttl', 15),
+            blocking_workers=engine_config.get('blocking_workers', 8)
+        ), name="system_health")
+        self._register_checks()
+        
         self.logger.info("System Health Checker initialized")
     
     def _load_default_config(self) -> Dict[str, Any]:
@@ -119,9 +130,65 @@ class SystemHealthChecker:
             'thresholds': {
                 'response_time_warning': 1000,  # ms
                 'response_time_critical': 5000  # ms
+            },
+            'engine': {
+                'max_concurrency': 200,
+                'cache_ttl': 15,  # seconds a result is served without re-probing
+                'blocking_workers': 8
             }
         }
     
+    def _register_checks(self):
+        """Register every configured check with the shared health engine"""
+        engine = self.engine
+        
+        if 'database' in self.config:
+            # connect timeout plus the stats queries
+            engine.register('database', engine.blocking_probe(self._as_probe_result, self.check_database_health),
+                            timeout=self.config['database'].get('timeout', 5) * 2)
+        if 'redis' in self.config:
+            engine.register('redis', engine.blocking_probe(self._as_probe_result, self.check_redis_health),
+                            timeout=self.config['redis'].get('timeout', 3) * 2)
+        if 'system' in self.config:
+            engine.register('system_resources',
+                            engine.blocking_probe(self._as_probe_result, self.check_system_resources),
+                            timeout=10)
+        engine.register('docker_containers', self._docker_probe, timeout=15)
+        
+        for service_name, service_config in self._http_checks().items():
+            engine.register(
+                service_name,
+                http_probe(service_config['url'], headers=service_config.get('headers'),
+                           server_error_status=STATUS_WARNING),
+                timeout=service_config.get('timeout', 10)
+            )
+    
+    def _http_checks(self) -> Dict[str, Dict[str, Any]]:
+        """Internal services plus the external APIs that have a key configured"""
+        checks = dict(self.config.get('services', {}))
+        for api_name, api_config in self.config.get('external_apis', {}).items():
+            authorization = api_config.get('headers', {}).get('Authorization', '')
+            if authorization.replace('Bearer', '').strip():
+                checks[f"external_{api_name}"] = api_config
+        return checks
+    
+    @staticmethod
+    def _as_probe_result(check: Any) -> ProbeResult:
+        """Run a blocking check method and convert its result for the engine"""
+        result = check()
+        return ProbeResult(status=result.status.value, message=result.message, details=result.details)
+    
+    @staticmethod
+    def _from_probe_result(result: ProbeResult) -> HealthCheckResult:
+        return HealthCheckResult(
+            service_name=result.name,
+            status=HealthStatus(result.status),
+            response_time_ms=result.response_time_ms,
+            message=result.message,
+            details=result.details,
+            timestamp=datetime.fromtimestamp(result.checked_at)
+        )
+    
     def check_database_health(self) -> HealthCheckResult:
         """Check PostgreSQL database health"""
         start_time = time.time()
@@ -390,48 +457,15 @@ class SystemHealthChecker:
             if result.returncode != 0:
                 raise Exception(f"Docker command failed: {result.stderr}")
             
-            containers = []
-            if result.stdout.strip():
-                for line in result.stdout.strip().split('\n'):
-                    try:
-                        container = json.loads(line)
-                        containers.append({
-                            'name': container.get('Names', ''),
-                            'image': container.get('Image', ''),
-                            'status': container.get('Status', ''),
-                            'ports': container.get('Ports', '')
-                        })
-                    except json.JSONDecodeError:
-                        pass
-            
+            status, message, details = self._summarize_containers(result.stdout)
             response_time = (time.time() - start_time) * 1000
             
-            # Check for specific containers
-            expected_containers = ['postgres', 'redis', 'n8n']
-            running_containers = [c['name'] for c in containers]
-            
-            missing_containers = []
-            for expected in expected_containers:
-                if not any(expected in name for name in running_containers):
-                    missing_containers.append(expected)
-            
-            status = HealthStatus.HEALTHY
-            message = f"Found {len(containers)} running containers"
-            
-            if missing_containers:
-                status = HealthStatus.WARNING
-                message = f"Missing expected containers: {', '.join(missing_containers)}"
-            
             return HealthCheckResult(
                 service_name="docker_containers",
                 status=status,
                 response_time_ms=response_time,
                 message=message,
-                details={
-                    'container_count': len(containers),
-                    'containers': containers,
-                    'missing_containers': missing_containers
-                }
+                details=details
             )
             
         except subprocess.TimeoutExpired:
@@ -462,15 +496,94 @@ class SystemHealthChecker:
                 details={'error': str(e)}
             )
     
-    def run_all_checks(self, parallel: bool = True) -> Dict[str, HealthCheckResult]:
+    @staticmethod
+    def _summarize_containers(output: str) -> Tuple[HealthStatus, str, Dict[str, Any]]:
+        """Parse `docker ps --format json` output and look for the expected containers"""
+        containers = []
+        if output.strip():
+            for line in output.strip().split('\n'):
+                try:
+                    container = json.loads(line)
+                    containers.append({
+                        'name': container.get('Names', ''),
+                        'image': container.get('Image', ''),
+                        'status': container.get('Status', ''),
+                        'ports': container.get('Ports', '')
+                    })
+                except json.JSONDecodeError:
+                    pass
+        
+        # Check for specific containers
+        expected_containers = ['postgres', 'redis', 'n8n']
+        running_containers = [c['name'] for c in containers]
+        
+        missing_containers = []
+        for expected in expected_containers:
+            if not any(expected in name for name in running_containers):
+                missing_containers.append(expected)
+        
+        status = HealthStatus.HEALTHY
+        message = f"Found {len(containers)} running containers"
+        
+        if missing_containers:
+            status = HealthStatus.WARNING
+            message = f"Missing expected containers: {', '.join(missing_containers)}"
+        
+        return status, message, {
+            'container_count': len(containers),
+            'containers': containers,
+            'missing_containers': missing_containers
+        }
+    
+    async def _docker_probe(self) -> ProbeResult:
+        """Docker check as an async subprocess, so it never holds a probe thread"""
+        try:
+            returncode, stdout, stderr = await run_command(['docker', 'ps', '--format', 'json'], timeout=10)
+        except asyncio.TimeoutError:
+            return ProbeResult(status=HealthStatus.WARNING.value, message="Docker command timeout",
+                               details={'error': 'Command timeout'})
+        except FileNotFoundError:
+            return ProbeResult(status=HealthStatus.WARNING.value, message="Docker not available",
+                               details={'error': 'Docker command not found'})
+        
+        if returncode != 0:
+            return ProbeResult(status=HealthStatus.CRITICAL.value,
+                               message=f"Docker check failed: Docker command failed: {stderr}",
+                               details={'error': stderr})
+        
+        status, message, details = self._summarize_containers(stdout)
+        return ProbeResult(status=status.value, message=message, details=details)
+    
+    def run_all_checks(self, parallel: bool = True, use_cache: bool = True) -> Dict[str, HealthCheckResult]:
         """Run all health checks"""
         self.logger.info("Starting comprehensive health check...")
         
         if parallel:
-            return self._run_checks_parallel()
+            return run_sync(self.run_all_checks_async(use_cache=use_cache))
         else:
             return self._run_checks_sequential()
     
+    async def run_all_checks_async(self, use_cache: bool = True) -> Dict[str, HealthCheckResult]:
+        """
+        Run every check concurrently on the health engine
+        
+        Results younger than the cache TTL are reused, so callers polling
+        this (e.g. a /health endpoint) do not re-probe the dependencies.
+        """
+        probe_results = await self.engine.run_all(force=not use_cache)
+        results = {name: self._from_probe_result(result) for name, result in probe_results.items()}
+        self.results = results
+        return results
+    
+    def get_cached_results(self) -> Dict[str, HealthCheckResult]:
+        """Last known result of every check, without probing"""
+        results = {}
+        for name in self.engine.names:
+            cached = self.engine.get_cached(name)
+            if cached is not None:
+                results[name] = self._from_probe_result(cached)
+        return results
+    
     def _run_checks_sequential(self) -> Dict[str, HealthCheckResult]:
         """Run health checks sequentially"""
         results = {}
@@ -487,60 +600,10 @@ class SystemHealthChecker:
         # Docker containers check
         results['docker_containers'] = self.check_docker_containers()
         
-        # Service checks
-        for service_name, service_config in self.config['services'].items():
+        # Service and external API checks
+        for service_name, service_config in self._http_checks().items():
             results[service_name] = self.check_service_health(service_name, service_config)
         
-        # External API checks
-        for api_name, api_config in self.config['external_apis'].items():
-            if api_config.get('headers', {}).get('Authorization', '').endswith(''):
-                # Skip if no API key configured
-                continue
-            results[f"external_{api_name}"] = self.check_service_health(f"external_{api_name}", api_config)
-        
-        self.results = results
-        return results
-    
-    def _run_checks_parallel(self) -> Dict[str, HealthCheckResult]:
-        """Run health checks in parallel"""
-        results = {}
-        
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = {}
-            
-            # Submit all checks
-            futures['database'] = executor.submit(self.check_database_health)
-            futures['redis'] = executor.submit(self.check_redis_health)
-            futures['system_resources'] = executor.submit(self.check_system_resources)
-            futures['docker_containers'] = executor.submit(self.check_docker_containers)
-            
-            # Service checks
-            for service_name, service_config in self.config['services'].items():
-                futures[service_name] = executor.submit(
-                    self.check_service_health, service_name, service_config
-                )
-            
-            # External API checks
-            for api_name, api_config in self.config['external_apis'].items():
-                if api_config.get('headers', {}).get('Authorization', '').endswith(''):
-                    continue
-                futures[f"external_{api_name}"] = executor.submit(
-                    self.check_service_health, f"external_{api_name}", api_config
-                )
-            
-            # Collect results
-            for future_name, future in futures.items():
-                try:
-                    results[future_name] = future.result(timeout=30)
-                except Exception as e:
-                    results[future_name] = HealthCheckResult(
-                        service_name=future_name,
-                        status=HealthStatus.UNKNOWN,
-                        response_time_ms=0,
-                        message=f"Health check failed: {str(e)}",
-                        details={'error': str(e)}
-                    )
-        
         self.results = results
         return results
     
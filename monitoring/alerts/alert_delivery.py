@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+"""
+Alert Delivery Queue for AI Content Factory
+ใช้สำหรับส่งการแจ้งเตือนผ่าน webhooks แบบเข้าคิว รวมกลุ่มเป็น digest พร้อม rate limit, retry และเก็บคิวข้ามการรีสตาร์ท
+
+One delivery queue per webhook, all running on a dedicated event loop thread:
+- Alerts with the same key are coalesced; a key that was just delivered
+  waits out its cooldown and then goes out once with its repeat count
+- Critical alerts flush after a short window, warnings and info wait longer
+  so bursts become one digest message instead of hundreds of requests
+- Per-webhook token bucket, Retry-After handling for 429s, retries with
+  exponential backoff on the shared pooled HTTP sessions
+- Undelivered alerts are written to a JSON state file and restored on start
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import asyncio
+import logging
+import threading
+import weakref
+import concurrent.futures
+from dataclasses import dataclass, field, asdict
+from typing import Any, Awaitable, Dict, List, Optional
+
+import aiohttp
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+try:
+    from ...shared.utils.http_sessions import close_loop_sessions, get_http_session
+except ImportError:
+    from shared.utils.http_sessions import close_loop_sessions, get_http_session
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_PRIORITY = {'critical': 0, 'warning': 1, 'info': 2}
+
+SEVERITY_COLORS = {'critical': "#ff0000", 'warning': "#ff9500", 'info': "#36a64f"}
+SEVERITY_EMOJI = {'critical': ":rotating_light:", 'warning': ":warning:", 'info': ":information_source:"}
+
+# Most groups one digest can carry for each webhook type
+DIGEST_LIMITS = {'discord': 10}
+
+
+@dataclass
+class DeliveryConfig:
+    """Delivery settings shared by all webhooks of one service"""
+    coalesce_windows: Dict[str, float] = field(default_factory=lambda: {
+        'critical': 2.0,
+        'warning': 30.0,
+        'info': 60.0
+    })
+    cooldown_seconds: float = 600.0
+    max_digest_items: int = 20
+    rate_limit_per_minute: float = 10.0
+    rate_limit_burst: int = 5
+    max_backoff_seconds: float = 300.0
+    max_item_age_seconds: float = 86400.0
+    state_path: Optional[str] = None
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'DeliveryConfig':
+        """Build from an `alert_settings`-style dict (unknown keys are ignored)"""
+        config = cls()
+        if 'cooldown_minutes' in settings:
+            config.cooldown_seconds = settings['cooldown_minutes'] * 60
+        if 'max_requests_per_window' in settings:
+            window_minutes = settings.get('rate_limit_window_minutes', 1) or 1
+            config.rate_limit_per_minute = settings['max_requests_per_window'] / window_minutes
+            config.rate_limit_burst = max(1, min(settings['max_requests_per_window'], config.rate_limit_burst))
+        if 'coalesce_window_seconds' in settings:
+            config.coalesce_windows.update(settings['coalesce_window_seconds'])
+        for name in ('max_digest_items', 'rate_limit_burst', 'max_backoff_seconds',
+                     'max_item_age_seconds', 'state_path'):
+            if name in settings:
+                setattr(config, name, settings[name])
+        return config
+
+
+@dataclass
+class WebhookEndpoint:
+    """Where and how one webhook is delivered"""
+    name: str
+    url: str
+    type: str = "generic"  # "slack", "discord", "teams", "generic"
+    headers: Dict[str, str] = field(default_factory=dict)
+    timeout: float = 30
+    retry_count: int = 3
+    retry_delay: float = 5
+
+
+@dataclass
+class PendingAlert:
+    """One coalescing group waiting for delivery"""
+    key: str
+    severity: str
+    title: str
+    message: str
+    first_seen: float
+    last_seen: float
+    service: Optional[str] = None
+    payload: Optional[Dict[str, Any]] = None  # single-alert payload in the webhook's own format
+    count: int = 1
+    samples: List[str] = field(default_factory=list)
+
+    def merge(self, other: 'PendingAlert'):
+        self.count += other.count
+        self.first_seen = min(self.first_seen, other.first_seen)
+        if other.last_seen >= self.last_seen:
+            self.last_seen = other.last_seen
+            self.message = other.message
+            self.payload = other.payload
+        if SEVERITY_PRIORITY.get(other.severity, 2) < SEVERITY_PRIORITY.get(self.severity, 2):
+            self.severity = other.severity
+        for sample in other.samples:
+            if sample in self.samples:
+                self.samples.remove(sample)
+            self.samples.append(sample)
+        del self.samples[:-5]
+
+
+def render_digest(webhook_type: str, items: List[PendingAlert]) -> Dict[str, Any]:
+    """One message summarising several alert groups, in the webhook's format"""
+    total = sum(item.count for item in items)
+    header = f"{total} alerts in {len(items)} groups from AI Content Factory"
+
+    def title(item: PendingAlert) -> str:
+        prefix = f"{item.count}× " if item.count > 1 else ""
+        service = f" ({item.service})" if item.service else ""
+        return f"{prefix}{item.title}{service}"
+
+    def text(item: PendingAlert) -> str:
+        return "\n".join(item.samples[-3:]) or item.message
+
+    if webhook_type == "slack":
+        return {
+            "text": header,
+            "attachments": [{
+                "color": SEVERITY_COLORS.get(item.severity, "#808080"),
+                "title": f"{SEVERITY_EMOJI.get(item.severity, '')} {title(item)}",
+                "text": text(item),
+                "footer": "AI Content Factory Monitoring",
+                "ts": int(item.last_seen)
+            } for item in items]
+        }
+
+    if webhook_type == "discord":
+        return {
+            "content": header,
+            "embeds": [{
+                "title": title(item)[:256],
+                "description": text(item)[:4096],
+                "color": int(SEVERITY_COLORS.get(item.severity, "#808080")[1:], 16),
+                "footer": {"text": "AI Content Factory Monitoring"}
+            } for item in items]
+        }
+
+    if webhook_type == "teams":
+        worst = min(items, key=lambda item: SEVERITY_PRIORITY.get(item.severity, 2)).severity
+        return {
+            "@type": "MessageCard",
+            "@context": "http://schema.org/extensions",
+            "themeColor": {'critical': "attention", 'warning': "warning"}.get(worst, "good"),
+            "summary": header,
+            "sections": [{
+                "activityTitle": title(item),
+                "text": text(item),
+                "facts": [{"name": "Severity", "value": item.severity.upper()}]
+            } for item in items]
+        }
+
+    return {
+        "type": "digest",
+        "count": total,
+        "alerts": [{
+            "key": item.key,
+            "severity": item.severity,
+            "title": item.title,
+            "message": item.message,
+            "service": item.service,
+            "count": item.count,
+            "first_seen": item.first_seen,
+            "last_seen": item.last_seen,
+            "payload": item.payload
+        } for item in items]
+    }
+
+
+class WebhookQueue:
+    """Pending alerts and the delivery worker of one webhook (lives on the delivery loop)"""
+
+    def __init__(self, endpoint: WebhookEndpoint, config: DeliveryConfig, on_change):
+        self.endpoint = endpoint
+        self.config = config
+        self.on_change = on_change
+
+        self.pending: Dict[str, PendingAlert] = {}
+        self.inflight: List[PendingAlert] = []
+        self.last_sent: Dict[str, float] = {}
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.force_flush = False
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+        self.tokens = float(config.rate_limit_burst)
+        self.tokens_updated = time.monotonic()
+        self.stats = {
+            'alerts': 0,
+            'coalesced': 0,
+            'messages': 0,
+            'digests': 0,
+            'alerts_delivered': 0,
+            'retries': 0,
+            'rate_limited': 0,
+            'failures': 0,
+            'rejected': 0,
+            'dropped': 0
+        }
+
+    # Queue state
+    def add(self, item: PendingAlert, count_alert: bool = True):
+        existing = self.pending.get(item.key)
+        if existing is not None:
+            existing.merge(item)
+            if count_alert:
+                self.stats['coalesced'] += 1
+        else:
+            self.pending[item.key] = item
+        if count_alert:
+            self.stats['alerts'] += 1
+        self.wakeup.set()
+        self.on_change()
+
+    def _due_at(self, item: PendingAlert) -> float:
+        window = self.config.coalesce_windows.get(item.severity, self.config.coalesce_windows.get('info', 60.0))
+        cooldown_until = self.last_sent.get(item.key, float('-inf')) + self.config.cooldown_seconds
+        return max(item.first_seen + window, cooldown_until)
+
+    def _seconds_until_due(self, now: float) -> Optional[float]:
+        if not self.pending:
+            return None
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        if self.force_flush:
+            return 0.0
+        return max(0.0, min(self._due_at(item) for item in self.pending.values()) - now)
+
+    def _take_batch(self, now: float) -> List[PendingAlert]:
+        """Every pending group out of cooldown, most severe first, up to the digest limit"""
+        ready = [
+            item for item in self.pending.values()
+            if self.force_flush or self.last_sent.get(item.key, float('-inf')) + self.config.cooldown_seconds <= now
+        ]
+        ready.sort(key=lambda item: (SEVERITY_PRIORITY.get(item.severity, 2), item.first_seen))
+        limit = min(self.config.max_digest_items, DIGEST_LIMITS.get(self.endpoint.type, self.config.max_digest_items))
+        batch = ready[:limit]
+        for item in batch:
+            del self.pending[item.key]
+        return batch
+
+    def _requeue(self, batch: List[PendingAlert]):
+        cutoff = time.time() - self.config.max_item_age_seconds
+        for item in batch:
+            if item.last_seen < cutoff:
+                self.stats['dropped'] += item.count
+                continue
+            self.add(item, count_alert=False)
+
+    # Rate limiting
+    async def _acquire_token(self):
+        rate = self.config.rate_limit_per_minute / 60.0
+        while True:
+            now = time.monotonic()
+            self.tokens = min(float(self.config.rate_limit_burst), self.tokens + (now - self.tokens_updated) * rate)
+            self.tokens_updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            self.stats['rate_limited'] += 1
+            await asyncio.sleep((1 - self.tokens) / rate)
+
+    # Worker
+    async def run(self):
+        while True:
+            now = time.time()
+            wait = self._seconds_until_due(now)
+            if wait is None or wait > 0:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Alerts keep coalescing while we wait for the rate limiter
+            await self._acquire_token()
+            batch = self._take_batch(time.time())
+            if not batch:
+                continue
+
+            self.inflight = batch
+            try:
+                await self._deliver(batch)
+            except asyncio.CancelledError:
+                # Shutting down mid-send: keep the batch so it is persisted
+                self._requeue(batch)
+                raise
+            finally:
+                self.inflight = []
+                self.on_change()
+
+    async def _deliver(self, batch: List[PendingAlert]):
+        endpoint = self.endpoint
+        single = len(batch) == 1 and batch[0].count == 1 and batch[0].payload is not None
+        payload = batch[0].payload if single else render_digest(endpoint.type, batch)
+        headers = {"Content-Type": "application/json", **endpoint.headers}
+
+        for attempt in range(max(1, endpoint.retry_count)):
+            try:
+                session = get_http_session(endpoint.url)
+                async with session.post(endpoint.url, json=payload, headers=headers,
+                                        timeout=aiohttp.ClientTimeout(total=endpoint.timeout)) as response:
+                    status = response.status
+                    retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Webhook {endpoint.name} delivery error: {e}")
+                status, retry_after = None, None
+
+            if status is not None and status < 400:
+                self._delivered(batch, single)
+                return
+
+            if status == 429:
+                # Respect the webhook's own limit and try again later with whatever has queued up
+                self.stats['rate_limited'] += 1
+                delay = float(retry_after) if retry_after else endpoint.retry_delay
+                self.blocked_until = time.time() + delay
+                self._requeue(batch)
+                return
+
+            if status is not None and status < 500:
+                self.stats['rejected'] += sum(item.count for item in batch)
+                logger.error(f"Webhook {endpoint.name} rejected alerts with status {status}")
+                return
+
+            if attempt < endpoint.retry_count - 1:
+                self.stats['retries'] += 1
+                await asyncio.sleep(endpoint.retry_delay * (2 ** attempt))
+
+        # Still failing: keep the alerts and back off before the next attempt
+        self.failures += 1
+        self.stats['failures'] += 1
+        backoff = min(endpoint.retry_delay * (2 ** self.failures), self.config.max_backoff_seconds)
+        self.blocked_until = time.time() + backoff
+        logger.error(f"Webhook {endpoint.name} unavailable, retrying {len(batch)} alert groups in {backoff:.0f}s")
+        self._requeue(batch)
+
+    def _delivered(self, batch: List[PendingAlert], single: bool):
+        now = time.time()
+        self.failures = 0
+        self.stats['messages'] += 1
+        if not single:
+            self.stats['digests'] += 1
+        for item in batch:
+            self.last_sent[item.key] = now
+            self.stats['alerts_delivered'] += item.count
+        # Forget cooldowns that have long expired
+        if len(self.last_sent) > 10000:
+            cutoff = now - self.config.cooldown_seconds
+            self.last_sent = {key: ts for key, ts in self.last_sent.items() if ts >= cutoff}
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [asdict(item) for item in self.inflight + list(self.pending.values())]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'type': self.endpoint.type,
+            'queued_groups': len(self.pending) + len(self.inflight),
+            'queued_alerts': sum(item.count for item in list(self.pending.values()) + self.inflight),
+            'blocked_seconds': round(max(0.0, self.blocked_until - time.time()), 1)
+        }
+
+
+class AlertDeliveryService:
+    """
+    Delivery queues for a set of webhooks
+
+    enqueue() and submit() are thread-safe; the queues run on a background
+    event loop thread that is started on first use.
+    """
+
+    def __init__(self, config: Optional[DeliveryConfig] = None, name: str = "alerts"):
+        self.config = config or DeliveryConfig()
+        self.name = name
+
+        self._queues: Dict[str, WebhookQueue] = {}
+        self._endpoints: Dict[str, WebhookEndpoint] = {}
+        self._restored: Dict[str, List[Dict[str, Any]]] = self._load_state()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._persist_handle: Optional[asyncio.TimerHandle] = None
+        _register_service(self)
+
+    # Loop management
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+                self._thread = threading.Thread(target=self._run_loop, args=(ready,),
+                                                name=f"{self.name}-delivery", daemon=True)
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    def _run_loop(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(close_loop_sessions())
+            loop.close()
+
+    def _call(self, func, *args):
+        self._ensure_loop().call_soon_threadsafe(func, *args)
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """Run a coroutine on the delivery loop (from any thread)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    # Webhooks
+    def register(self, endpoint: WebhookEndpoint):
+        """Add or replace a webhook; alerts restored from the state file are queued again"""
+        self._endpoints[endpoint.name] = endpoint
+        self._call(self._start_queue, endpoint)
+
+    def unregister(self, name: str):
+        self._endpoints.pop(name, None)
+        self._call(self._stop_queue, name)
+
+    def _start_queue(self, endpoint: WebhookEndpoint):
+        queue = self._queues.get(endpoint.name)
+        if queue is not None:
+            queue.endpoint = endpoint
+            return
+        queue = WebhookQueue(endpoint, self.config, self._schedule_persist)
+        for data in self._restored.pop(endpoint.name, []):
+            queue.add(PendingAlert(**data), count_alert=False)
+        queue.task = self._loop.create_task(queue.run())
+        self._queues[endpoint.name] = queue
+
+    def _stop_queue(self, name: str):
+        queue = self._queues.pop(name, None)
+        if queue is not None and queue.task is not None:
+            queue.task.cancel()
+        self._schedule_persist()
+
+    def enqueue(self, webhook_name: str, key: str, severity: str = "info", title: str = "",
+                message: str = "", payload: Optional[Dict[str, Any]] = None,
+                service: Optional[str] = None) -> bool:
+        """Queue an alert for one webhook; False if the webhook is not registered"""
+        if webhook_name not in self._endpoints:
+            return False
+        now = time.time()
+        item = PendingAlert(
+            key=key,
+            severity=severity if severity in SEVERITY_PRIORITY else 'info',
+            title=title,
+            message=message,
+            first_seen=now,
+            last_seen=now,
+            service=service,
+            payload=payload,
+            samples=[message] if message else []
+        )
+        self._call(self._add, webhook_name, item)
+        return True
+
+    def _add(self, webhook_name: str, item: PendingAlert):
+        queue = self._queues.get(webhook_name)
+        if queue is not None:
+            queue.add(item)
+
+    # Flushing and shutdown
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Deliver everything queued now, ignoring coalescing windows; True if all went out"""
+        if self._loop is None:
+            return True
+        try:
+            return self.submit(self.flush_async(timeout)).result(timeout + 1)
+        except concurrent.futures.TimeoutError:
+            return False
+
+    async def flush_async(self, timeout: float = 10.0) -> bool:
+        if asyncio.get_running_loop() is not self._loop:
+            return await asyncio.wrap_future(self.submit(self.flush_async(timeout)))
+
+        deadline = time.monotonic() + timeout
+        for queue in self._queues.values():
+            queue.force_flush = True
+            queue.wakeup.set()
+        try:
+            while time.monotonic() < deadline:
+                if not any(queue.pending or queue.inflight for queue in self._queues.values()):
+                    return True
+                await asyncio.sleep(0.01)
+            return False
+        finally:
+            for queue in self._queues.values():
+                queue.force_flush = False
+
+    def stop(self, flush: bool = True, timeout: float = 5.0):
+        """Optionally flush, persist what is left and stop the delivery loop"""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+        if flush:
+            self.flush(timeout)
+
+        async def shutdown():
+            for queue in self._queues.values():
+                if queue.task is not None:
+                    queue.task.cancel()
+            self._persist()
+
+        try:
+            self.submit(shutdown()).result(timeout)
+        except Exception as e:
+            logger.error(f"Alert delivery shutdown failed: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._lock:
+            self._loop = None
+            self._thread = None
+            self._queues = {}
+            self._restored = self._load_state()
+
+    # Persistence
+    def _schedule_persist(self):
+        if self.config.state_path and self._persist_handle is None:
+            self._persist_handle = self._loop.call_later(1.0, self._persist)
+
+    def _persist(self):
+        self._persist_handle = None
+        path = self.config.state_path
+        if not path:
+            return
+        state = {name: queue.snapshot() for name, queue in self._queues.items()}
+        state.update({name: items for name, items in self._restored.items() if name not in state})
+        state = {name: items for name, items in state.items() if items}
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Could not persist alert queue to {path}: {e}")
+
+    def _load_state(self) -> Dict[str, List[Dict[str, Any]]]:
+        path = self.config.state_path
+        if not path or not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read alert queue state {path}: {e}")
+            return {}
+        restored = sum(len(items) for items in state.values())
+        if restored:
+            logger.info(f"Restored {restored} undelivered alert groups from {path}")
+        return state
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'running': self._loop is not None,
+            'webhooks': {name: queue.get_stats() for name, queue in list(self._queues.items())}
+        }
+
+    def reset_rate_limits(self):
+        """Refill every token bucket and lift Retry-After/backoff blocks"""
+        def reset():
+            for queue in self._queues.values():
+                queue.tokens = float(self.config.rate_limit_burst)
+                queue.blocked_until = 0.0
+                queue.wakeup.set()
+        if self._loop is not None:
+            self._call(reset)
+
+    def clear_cooldowns(self):
+        def clear():
+            for queue in self._queues.values():
+                queue.last_sent.clear()
+                queue.wakeup.set()
+        if self._loop is not None:
+            self._call(clear)
+
+
+# Persist queued alerts when the process exits
+_services: "weakref.WeakSet[AlertDeliveryService]" = weakref.WeakSet()
+
+
+def _register_service(service: AlertDeliveryService):
+    _services.add(service)
+
+
+def shutdown_delivery(timeout: float = 2.0):
+    for service in list(_services):
+        service.stop(flush=False, timeout=timeout)
+
+
+atexit.register(shutdown_delivery)
@@ -23,6 +23,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 from shared.utils.logger import setup_logger
 from shared.utils.error_handler import ErrorHandler
+from shared.utils.http_sessions import get_http_session
+from monitoring.alerts.alert_delivery import AlertDeliveryService, DeliveryConfig, WebhookEndpoint
 
 class AlertSeverity(Enum):
     """Alert severity levels"""
@@ -78,16 +80,18 @@ class WebhookAlertManager:
         self.error_handler = ErrorHandler()
         self.config = config or self._load_default_config()
         
+        # Per-webhook delivery queues: coalescing, cooldowns, rate limits and retries
+        self.delivery = AlertDeliveryService(
+            DeliveryConfig.from_settings(self.config.get('alert_settings', {})),
+            name="webhook_alerts"
+        )
+        
         # Initialize webhooks
         self.webhooks: List[WebhookConfig] = []
         self._load_webhooks()
         
         # Alert management
         self.alert_history = []
-        self.cooldown_cache = defaultdict(dict)  # Track cooldowns per webhook/alert type
-        
-        # Rate limiting
-        self.rate_limits = defaultdict(list)  # Track request timestamps per webhook
         
         self.logger.info("Webhook Alert Manager initialized")
     
@@ -116,7 +120,10 @@ class WebhookAlertManager:
                 'cooldown_minutes': 10,
                 'max_alerts_per_hour': 100,
                 'rate_limit_window_minutes': 1,
-                'max_requests_per_window': 10
+                'max_requests_per_window': 10,
+                'coalesce_window_seconds': {'critical': 2, 'warning': 30, 'info': 60},
+                'max_digest_items': 20,
+                'state_path': os.getenv('ALERT_QUEUE_STATE', 'logs/webhook_alert_queue.json')
             },
             'formatting': {
                 'include_timestamp': True,
@@ -140,57 +147,33 @@ class WebhookAlertManager:
                     retry_delay=webhook_config.get('retry_delay', 5)
                 )
                 self.webhooks.append(webhook)
+                self._register_delivery(webhook)
                 self.logger.info(f"Loaded webhook: {webhook.name} ({webhook.type.value})")
     
+    def _register_delivery(self, webhook: WebhookConfig):
+        """Give a webhook its delivery queue"""
+        self.delivery.register(WebhookEndpoint(
+            name=webhook.name,
+            url=webhook.url,
+            type=webhook.type.value,
+            headers=webhook.headers,
+            timeout=webhook.timeout,
+            retry_count=webhook.retry_count,
+            retry_delay=webhook.retry_delay
+        ))
+    
     def add_webhook(self, webhook: WebhookConfig):
         """Add a new webhook configuration"""
         self.webhooks.append(webhook)
+        self._register_delivery(webhook)
         self.logger.info(f"Added webhook: {webhook.name}")
     
     def remove_webhook(self, webhook_name: str):
         """Remove a webhook by name"""
         self.webhooks = [w for w in self.webhooks if w.name != webhook_name]
+        self.delivery.unregister(webhook_name)
         self.logger.info(f"Removed webhook: {webhook_name}")
     
-    def _check_cooldown(self, webhook_name: str, alert_key: str) -> bool:
-        """Check if alert is in cooldown period"""
-        cooldown_minutes = self.config['alert_settings']['cooldown_minutes']
-        
-        if webhook_name in self.cooldown_cache and alert_key in self.cooldown_cache[webhook_name]:
-            last_sent = self.cooldown_cache[webhook_name][alert_key]
-            cooldown_until = last_sent + timedelta(minutes=cooldown_minutes)
-            
-            if datetime.now() < cooldown_until:
-                return True
-        
-        return False
-    
-    def _update_cooldown(self, webhook_name: str, alert_key: str):
-        """Update cooldown timestamp for alert"""
-        self.cooldown_cache[webhook_name][alert_key] = datetime.now()
-    
-    def _check_rate_limit(self, webhook_name: str) -> bool:
-        """Check if webhook is rate limited"""
-        settings = self.config['alert_settings']
-        window_minutes = settings['rate_limit_window_minutes']
-        max_requests = settings['max_requests_per_window']
-        
-        now = datetime.now()
-        cutoff_time = now - timedelta(minutes=window_minutes)
-        
-        # Clean old timestamps
-        self.rate_limits[webhook_name] = [
-            ts for ts in self.rate_limits[webhook_name] if ts > cutoff_time
-        ]
-        
-        # Check if we're over the limit
-        if len(self.rate_limits[webhook_name]) >= max_requests:
-            return True
-        
-        # Add current timestamp
-        self.rate_limits[webhook_name].append(now)
-        return False
-    
     def _generate_alert_key(self, alert: AlertData) -> str:
         """Generate unique key for alert deduplication"""
         key_data = f"{alert.service}:{alert.title}:{alert.severity.value}"
@@ -372,7 +355,7 @@ class WebhookAlertManager:
             return self._format_generic_payload(alert)
     
     async def _send_webhook(self, webhook: WebhookConfig, payload: Dict[str, Any]) -> bool:
-        """Send webhook with retry logic"""
+        """Send webhook immediately with retry logic (bypasses the delivery queue)"""
         headers = {
             "Content-Type": "application/json",
             **webhook.headers
@@ -380,20 +363,20 @@ class WebhookAlertManager:
         
         for attempt in range(webhook.retry_count):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        webhook.url,
-                        json=payload,
-                        headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=webhook.timeout)
-                    ) as response:
-                        if response.status < 400:
-                            self.logger.debug(f"Webhook sent successfully: {webhook.name}")
-                            return True
-                        else:
-                            self.logger.warning(f"Webhook failed: {webhook.name}, status: {response.status}")
-                            if attempt < webhook.retry_count - 1:
-                                await asyncio.sleep(webhook.retry_delay)
+                session = get_http_session(webhook.url)
+                async with session.post(
+                    webhook.url,
+                    json=payload,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=webhook.timeout)
+                ) as response:
+                    if response.status < 400:
+                        self.logger.debug(f"Webhook sent successfully: {webhook.name}")
+                        return True
+                    else:
+                        self.logger.warning(f"Webhook failed: {webhook.name}, status: {response.status}")
+                        if attempt < webhook.retry_count - 1:
+                            await asyncio.sleep(webhook.retry_delay)
                             
             except asyncio.TimeoutError:
                 self.logger.error(f"Webhook timeout: {webhook.name}")
@@ -412,7 +395,13 @@ class WebhookAlertManager:
                         severity: str = "info",
                         service: str = None,
                         data: Dict[str, Any] = None) -> Dict[str, bool]:
-        """Send alert to all configured webhooks"""
+        """
+        Queue alert for all configured webhooks
+        
+        Returns whether each webhook accepted the alert. Delivery happens in
+        the background: repeats of the same alert are coalesced and sent as a
+        digest once the cooldown expires; use flush() to wait for delivery.
+        """
         alert = AlertData(
             title=title,
             message=message,
@@ -435,34 +424,33 @@ class WebhookAlertManager:
             if not webhook.enabled:
                 continue
             
-            # Check cooldown
-            if self._check_cooldown(webhook.name, alert_key):
-                self.logger.debug(f"Alert in cooldown for webhook: {webhook.name}")
-                results[webhook.name] = False
-                continue
-            
-            # Check rate limit
-            if self._check_rate_limit(webhook.name):
-                self.logger.warning(f"Rate limit exceeded for webhook: {webhook.name}")
-                results[webhook.name] = False
-                continue
-            
-            # Format and send
+            # Format and queue
             try:
                 payload = self._format_payload(webhook, alert)
-                success = await self._send_webhook(webhook, payload)
-                results[webhook.name] = success
-                
-                if success:
-                    self._update_cooldown(webhook.name, alert_key)
-                
+                results[webhook.name] = self.delivery.enqueue(
+                    webhook.name,
+                    key=alert_key,
+                    severity=alert.severity.value,
+                    title=alert.title,
+                    message=alert.message,
+                    payload=payload,
+                    service=alert.service
+                )
             except Exception as e:
-                self.logger.error(f"Failed to send alert via {webhook.name}: {str(e)}")
+                self.logger.error(f"Failed to queue alert for {webhook.name}: {str(e)}")
                 results[webhook.name] = False
         
-        self.logger.info(f"Alert sent: {title} (severity: {severity}) - Results: {results}")
+        self.logger.info(f"Alert queued: {title} (severity: {severity}) - Results: {results}")
         return results
     
+    async def flush(self, timeout: float = 10.0) -> bool:
+        """Deliver all queued alerts now; True if every webhook accepted them"""
+        return await self.delivery.flush_async(timeout)
+    
+    def close(self, timeout: float = 5.0):
+        """Flush, persist undelivered alerts and stop the delivery thread"""
+        self.delivery.stop(flush=True, timeout=timeout)
+    
     async def send_test_alert(self, webhook_name: str = None) -> Dict[str, bool]:
         """Send test alert to verify webhook configuration"""
         test_alert = AlertData(
@@ -521,23 +509,25 @@ class WebhookAlertManager:
             "service_breakdown_24h": dict(service_counts),
             "configured_webhooks": len(self.webhooks),
             "enabled_webhooks": len([w for w in self.webhooks if w.enabled]),
-            "last_alert": self.alert_history[-1].timestamp.isoformat() if self.alert_history else None
+            "last_alert": self.alert_history[-1].timestamp.isoformat() if self.alert_history else None,
+            "delivery": self.delivery.get_stats()
         }
     
     def get_webhook_status(self) -> List[Dict[str, Any]]:
         """Get status of all configured webhooks"""
         status_list = []
+        queues = self.delivery.get_stats()['webhooks']
         
         for webhook in self.webhooks:
-            # Check recent rate limit status
-            recent_requests = len(self.rate_limits.get(webhook.name, []))
+            queue = queues.get(webhook.name, {})
             
             status_list.append({
                 "name": webhook.name,
                 "type": webhook.type.value,
                 "enabled": webhook.enabled,
-                "recent_requests": recent_requests,
-                "rate_limited": self._check_rate_limit(webhook.name),
+                "recent_requests": queue.get('messages', 0),
+                "queued_alerts": queue.get('queued_alerts', 0),
+                "rate_limited": queue.get('blocked_seconds', 0) > 0,
                 "url_configured": bool(webhook.url),
                 "timeout": webhook.timeout,
                 "retry_count": webhook.retry_count
@@ -547,12 +537,12 @@ class WebhookAlertManager:
     
     def clear_cooldowns(self):
         """Clear all cooldown timers"""
-        self.cooldown_cache.clear()
+        self.delivery.clear_cooldowns()
         self.logger.info("All cooldowns cleared")
     
     def clear_rate_limits(self):
         """Clear all rate limit counters"""
-        self.rate_limits.clear()
+        self.delivery.reset_rate_limits()
         self.logger.info("All rate limits cleared")
 
 # Utility functions for easy alert sending
@@ -560,17 +550,23 @@ class WebhookAlertManager:
 async def send_critical_alert(title: str, message: str, service: str = None, data: Dict[str, Any] = None):
     """Send critical alert - convenience function"""
     manager = WebhookAlertManager()
-    return await manager.send_alert(title, message, "critical", service, data)
+    results = await manager.send_alert(title, message, "critical", service, data)
+    await asyncio.to_thread(manager.close)
+    return results
 
 async def send_warning_alert(title: str, message: str, service: str = None, data: Dict[str, Any] = None):
     """Send warning alert - convenience function"""
     manager = WebhookAlertManager()
-    return await manager.send_alert(title, message, "warning", service, data)
+    results = await manager.send_alert(title, message, "warning", service, data)
+    await asyncio.to_thread(manager.close)
+    return results
 
 async def send_info_alert(title: str, message: str, service: str = None, data: Dict[str, Any] = None):
     """Send info alert - convenience function"""
     manager = WebhookAlertManager()
-    return await manager.send_alert(title, message, "info", service, data)
+    results = await manager.send_alert(title, message, "info", service, data)
+    await asyncio.to_thread(manager.close)
+    return results
 
 # Example usage and CLI
 async def main():
@@ -614,7 +610,8 @@ async def main():
             severity=args.severity,
             service=args.service
         )
-        print(f"Send results: {json.dumps(results, indent=2)}")
+        delivered = await alert_manager.flush()
+        print(f"Send results: {json.dumps(results, indent=2)} (delivered: {delivered})")
     
     elif args.action == 'status':
         status = alert_manager.get_webhook_status()
@@ -66,6 +66,11 @@ alert_config = {
 }
 alert_manager = AlertManager(alert_config)
 
+# Feed collected metrics to the alert rules as they arrive
+metrics_collector.metrics_buffer.subscribe(
+    lambda metric: alert_manager.add_metric_value(metric.name, metric.value, metric.timestamp)
+)
+
 # Start monitoring services
 metrics_collector.start_collection()
 alert_manager.start_monitoring()
@@ -80,8 +85,16 @@ async def get_metrics():
     """Get comprehensive metrics"""
     try:
         time_range = request.args.get('time_range', 'today')
-        metrics = await performance_dashboard.get_metrics(time_range)
-        return jsonify(metrics)
+        snapshot = await performance_dashboard.get_metrics_snapshot(time_range)
+        
+        # Polling clients that already hold this snapshot get 304 Not Modified
+        if snapshot.matches(request.if_none_match):
+            response = app.response_class(status=304)
+        else:
+            response = app.response_class(snapshot.body, mimetype='application/json')
+        response.set_etag(snapshot.etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         logger.error(f"Error getting metrics: {e}")
         return jsonify({'error': str(e)}), 500
@@ -269,6 +282,8 @@ def health_check():
                 'alert_manager': alert_manager.is_running,
                 'performance_dashboard': True
             },
+            # last probe results from the collector; never re-probes per request
+            'dependencies': metrics_collector.get_service_health_snapshot(),
             'version': '1.0.0'
         }
         return jsonify(health_info)
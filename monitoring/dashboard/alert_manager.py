@@ -1,6 +1,8 @@
 import asyncio
 import json
+import os
 import smtplib
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass, asdict
@@ -12,6 +14,19 @@ from collections import defaultdict
 import threading
 import time
 
+try:
+    from .rule_engine import RuleEngine, RuleSpec, DEFAULT_WINDOW_SECONDS
+except ImportError:
+    from rule_engine import RuleEngine, RuleSpec, DEFAULT_WINDOW_SECONDS
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+try:
+    from ..alerts.alert_delivery import AlertDeliveryService, DeliveryConfig, WebhookEndpoint
+except ImportError:
+    from monitoring.alerts.alert_delivery import AlertDeliveryService, DeliveryConfig, WebhookEndpoint
+
 logger = logging.getLogger(__name__)
 
 class AlertSeverity(Enum):
@@ -34,6 +49,8 @@ class AlertRule:
     duration: int = 60  # seconds - how long condition must persist
     description: str = ""
     enabled: bool = True
+    aggregation: str = "last"  # "last", "avg", "min", "max", "sum", "count", "rate"
+    window: int = 0  # seconds aggregated over; 0 uses the duration
 
 @dataclass
 class Alert:
@@ -70,7 +87,7 @@ class AlertManager:
         self.notification_channels = {}
         
         # Alert state tracking
-        self.metric_states = defaultdict(list)  # Track metric values over time
+        self.rule_engine = RuleEngine()  # Indexed rules and per-metric rolling windows
         self.rule_timers = {}  # Track how long conditions have been true
         
         # Threading
@@ -78,6 +95,15 @@ class AlertManager:
         self.evaluation_thread = None
         self.evaluation_interval = config.get('evaluation_interval', 30)  # seconds
         
+        # Notifications run on the delivery thread; Slack/webhook channels are queued and coalesced
+        self.delivery = AlertDeliveryService(
+            DeliveryConfig.from_settings({
+                'state_path': 'logs/dashboard_alert_queue.json',
+                **config.get('delivery', {})
+            }),
+            name="dashboard_alerts"
+        )
+        
         # Load default rules and channels
         self._load_default_rules()
         self._load_notification_channels()
@@ -162,7 +188,17 @@ class AlertManager:
         ]
         
         for rule in default_rules:
-            self.alert_rules[rule.name] = rule
+            self._register_rule(rule)
+
+    def _register_rule(self, rule: AlertRule):
+        """Store a rule and compile its metric pattern into the rule engine"""
+        self.alert_rules[rule.name] = rule
+        self.rule_engine.add_rule(RuleSpec(
+            name=rule.name,
+            pattern=rule.metric_name,
+            aggregation=rule.aggregation,
+            window=rule.window or rule.duration or DEFAULT_WINDOW_SECONDS
+        ))
 
     def _load_notification_channels(self):
         """Load notification channels from config"""
@@ -183,6 +219,7 @@ class AlertManager:
                 type="slack", 
                 config=channels_config['slack']
             )
+            self._register_channel(self.notification_channels['slack'])
         
         # Webhook channel
         if 'webhook' in channels_config:
@@ -191,6 +228,24 @@ class AlertManager:
                 type="webhook",
                 config=channels_config['webhook']
             )
+            self._register_channel(self.notification_channels['webhook'])
+
+    def _register_channel(self, channel: NotificationChannel):
+        """Give Slack and webhook channels a delivery queue"""
+        if channel.type == "slack" and channel.config.get('webhook_url'):
+            self.delivery.register(WebhookEndpoint(
+                name=channel.name,
+                url=channel.config['webhook_url'],
+                type="slack"
+            ))
+        elif channel.type == "webhook" and channel.config.get('url'):
+            self.delivery.register(WebhookEndpoint(
+                name=channel.name,
+                url=channel.config['url'],
+                type="generic",
+                headers=channel.config.get('headers', {}),
+                timeout=channel.config.get('timeout', 10)
+            ))
 
     def start_monitoring(self):
         """Start alert monitoring"""
@@ -205,6 +260,7 @@ class AlertManager:
         self.is_running = False
         if self.evaluation_thread:
             self.evaluation_thread.join(timeout=5)
+        self.delivery.stop(flush=True)
         logger.info("Alert monitoring stopped")
 
     def _evaluation_loop(self):
@@ -222,81 +278,26 @@ class AlertManager:
         if timestamp is None:
             timestamp = datetime.now()
         
-        # Store metric value with timestamp
-        self.metric_states[metric_name].append((timestamp, value))
-        
-        # Keep only recent values (last 1 hour)
-        cutoff_time = timestamp - timedelta(hours=1)
-        self.metric_states[metric_name] = [
-            (ts, val) for ts, val in self.metric_states[metric_name] 
-            if ts >= cutoff_time
-        ]
+        # Appends to the metric's rolling windows and marks its rules for evaluation
+        self.rule_engine.add_point(metric_name, float(value), timestamp.timestamp())
 
     def _evaluate_all_rules(self):
-        """Evaluate all alert rules"""
+        """Evaluate the rules whose metrics changed or whose duration timers came due"""
         current_time = datetime.now()
         
-        for rule_name, rule in self.alert_rules.items():
-            if not rule.enabled:
+        for rule_name, metric_name, value in self.rule_engine.evaluate(current_time.timestamp()):
+            rule = self.alert_rules.get(rule_name)
+            if rule is None or not rule.enabled:
                 continue
                 
             try:
-                self._evaluate_rule(rule, current_time)
+                self._evaluate_rule_for_metric(rule, metric_name, value, current_time)
             except Exception as e:
                 logger.error(f"Error evaluating rule {rule_name}: {e}")
 
-    def _evaluate_rule(self, rule: AlertRule, current_time: datetime):
-        """Evaluate a single alert rule"""
-        # Handle wildcard metric names
-        if '*' in rule.metric_name:
-            metric_names = self._find_matching_metrics(rule.metric_name)
-        else:
-            metric_names = [rule.metric_name]
-        
-        for metric_name in metric_names:
-            self._evaluate_rule_for_metric(rule, metric_name, current_time)
-
-    def _find_matching_metrics(self, pattern: str) -> List[str]:
-        """Find metric names matching a pattern"""
-        matching = []
-        pattern_parts = pattern.split('*')
-        
-        for metric_name in self.metric_states.keys():
-            matches = True
-            pos = 0
-            
-            for i, part in enumerate(pattern_parts):
-                if i == 0:  # First part must match from beginning
-                    if not metric_name.startswith(part):
-                        matches = False
-                        break
-                    pos = len(part)
-                elif i == len(pattern_parts) - 1:  # Last part must match to end
-                    if not metric_name[pos:].endswith(part):
-                        matches = False
-                        break
-                else:  # Middle parts must exist somewhere
-                    next_pos = metric_name.find(part, pos)
-                    if next_pos == -1:
-                        matches = False
-                        break
-                    pos = next_pos + len(part)
-            
-            if matches:
-                matching.append(metric_name)
-        
-        return matching
-
-    def _evaluate_rule_for_metric(self, rule: AlertRule, metric_name: str, current_time: datetime):
-        """Evaluate rule for a specific metric"""
-        metric_values = self.metric_states.get(metric_name, [])
-        
-        if not metric_values:
-            return
-        
-        # Get latest value
-        latest_timestamp, latest_value = metric_values[-1]
-        
+    def _evaluate_rule_for_metric(self, rule: AlertRule, metric_name: str, latest_value: float,
+                                  current_time: datetime):
+        """Evaluate rule for a specific metric given its aggregated value"""
         # Check if condition is met
         condition_met = self._check_condition(rule, latest_value)
         
@@ -306,6 +307,10 @@ class AlertManager:
             # Start or update timer
             if rule_key not in self.rule_timers:
                 self.rule_timers[rule_key] = current_time
+                if rule.duration > 0:
+                    # Come back when the duration has passed, even without new points
+                    self.rule_engine.schedule(rule.name, metric_name,
+                                              current_time.timestamp() + rule.duration)
             
             # Check if condition has persisted long enough
             time_since_start = (current_time - self.rule_timers[rule_key]).total_seconds()
@@ -368,7 +373,7 @@ class AlertManager:
         self.alert_history.append(alert)
         
         # Send notifications
-        asyncio.create_task(self._send_alert_notifications(alert))
+        self.delivery.submit(self._send_alert_notifications(alert))
         
         logger.info(f"Alert triggered: {alert_id} - {alert.message}")
 
@@ -383,7 +388,7 @@ class AlertManager:
             del self.active_alerts[alert_id]
             
             # Send resolution notification
-            asyncio.create_task(self._send_resolution_notification(alert))
+            self.delivery.submit(self._send_resolution_notification(alert))
             
             logger.info(f"Alert resolved: {alert_id}")
 
@@ -491,22 +496,14 @@ class AlertManager:
         
         # Send email
         try:
-            with smtplib.SMTP(config.get('smtp_server', 'localhost'), config.get('smtp_port', 587)) as server:
-                if config.get('use_tls', True):
-                    server.starttls()
-                if config.get('username') and config.get('password'):
-                    server.login(config['username'], config['password'])
-                server.send_message(msg)
-                
+            await asyncio.get_running_loop().run_in_executor(None, self._send_email, config, msg)
             logger.info(f"Email notification sent for alert {alert.id}")
             
         except Exception as e:
             logger.error(f"Failed to send email notification: {e}")
 
     async def _send_slack_notification(self, channel: NotificationChannel, alert: Alert):
-        """Send Slack notification"""
-        import aiohttp
-        
+        """Queue Slack notification; alerts of one rule are coalesced into a digest"""
         config = channel.config
         webhook_url = config.get('webhook_url')
         
@@ -556,22 +553,21 @@ class AlertManager:
             ]
         }
         
-        # Send to Slack
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(webhook_url, json=slack_message) as response:
-                    if response.status == 200:
-                        logger.info(f"Slack notification sent for alert {alert.id}")
-                    else:
-                        logger.error(f"Failed to send Slack notification: {response.status}")
-                        
-        except Exception as e:
-            logger.error(f"Error sending Slack notification: {e}")
+        # Queue for Slack
+        if self.delivery.enqueue(
+            channel.name,
+            key=f"{alert.rule_name}:{alert.metric_name}:{alert.severity.value}",
+            severity=alert.severity.value,
+            title=alert.rule_name,
+            message=alert.message,
+            payload=slack_message
+        ):
+            logger.info(f"Slack notification queued for alert {alert.id}")
+        else:
+            logger.error(f"Slack channel {channel.name} has no delivery queue")
 
     async def _send_webhook_notification(self, channel: NotificationChannel, alert: Alert):
-        """Send webhook notification"""
-        import aiohttp
-        
+        """Queue webhook notification; alerts queued together go out in one digest request"""
         config = channel.config
         webhook_url = config.get('url')
         
@@ -594,25 +590,18 @@ class AlertManager:
             "metadata": alert.metadata
         }
         
-        # Send webhook
-        try:
-            headers = config.get('headers', {})
-            timeout = config.get('timeout', 10)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    webhook_url, 
-                    json=payload, 
-                    headers=headers, 
-                    timeout=timeout
-                ) as response:
-                    if response.status < 400:
-                        logger.info(f"Webhook notification sent for alert {alert.id}")
-                    else:
-                        logger.error(f"Webhook notification failed: {response.status}")
-                        
-        except Exception as e:
-            logger.error(f"Error sending webhook notification: {e}")
+        # Queue webhook
+        if self.delivery.enqueue(
+            channel.name,
+            key=alert.id,
+            severity=alert.severity.value,
+            title=alert.rule_name,
+            message=alert.message,
+            payload=payload
+        ):
+            logger.info(f"Webhook notification queued for alert {alert.id}")
+        else:
+            logger.error(f"Webhook channel {channel.name} has no delivery queue")
 
     async def _send_resolution_notification_to_channel(self, channel: NotificationChannel, alert: Alert):
         """Send resolution notification to specific channel"""
@@ -652,20 +641,22 @@ class AlertManager:
         msg.attach(MIMEText(body, 'plain'))
         
         try:
-            with smtplib.SMTP(config.get('smtp_server', 'localhost'), config.get('smtp_port', 587)) as server:
-                if config.get('use_tls', True):
-                    server.starttls()
-                if config.get('username') and config.get('password'):
-                    server.login(config['username'], config['password'])
-                server.send_message(msg)
-                
+            await asyncio.get_running_loop().run_in_executor(None, self._send_email, config, msg)
         except Exception as e:
             logger.error(f"Failed to send email resolution: {e}")
 
+    def _send_email(self, config: Dict[str, Any], msg: MIMEMultipart):
+        """Blocking SMTP send; runs in an executor so the delivery loop keeps serving webhooks"""
+        with smtplib.SMTP(config.get('smtp_server', 'localhost'), config.get('smtp_port', 587),
+                          timeout=config.get('timeout', 30)) as server:
+            if config.get('use_tls', True):
+                server.starttls()
+            if config.get('username') and config.get('password'):
+                server.login(config['username'], config['password'])
+            server.send_message(msg)
+
     async def _send_slack_resolution(self, channel: NotificationChannel, alert: Alert):
-        """Send Slack resolution notification"""
-        import aiohttp
-        
+        """Queue Slack resolution notification"""
         config = channel.config
         webhook_url = config.get('webhook_url')
         
@@ -698,19 +689,18 @@ class AlertManager:
             ]
         }
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(webhook_url, json=slack_message) as response:
-                    if response.status == 200:
-                        logger.info(f"Slack resolution sent for alert {alert.id}")
-                        
-        except Exception as e:
-            logger.error(f"Error sending Slack resolution: {e}")
+        if self.delivery.enqueue(
+            channel.name,
+            key=f"resolved:{alert.rule_name}:{alert.metric_name}",
+            severity=AlertSeverity.INFO.value,
+            title=f"Resolved: {alert.rule_name}",
+            message=f"✅ {alert.message}",
+            payload=slack_message
+        ):
+            logger.info(f"Slack resolution queued for alert {alert.id}")
 
     async def _send_webhook_resolution(self, channel: NotificationChannel, alert: Alert):
-        """Send webhook resolution notification"""
-        import aiohttp
-        
+        """Queue webhook resolution notification"""
         config = channel.config
         webhook_url = config.get('url')
         
@@ -729,14 +719,15 @@ class AlertManager:
             "duration_seconds": (alert.resolved_at - alert.first_triggered).total_seconds()
         }
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(webhook_url, json=payload) as response:
-                    if response.status < 400:
-                        logger.info(f"Webhook resolution sent for alert {alert.id}")
-                        
-        except Exception as e:
-            logger.error(f"Error sending webhook resolution: {e}")
+        if self.delivery.enqueue(
+            channel.name,
+            key=f"resolved:{alert.id}",
+            severity=AlertSeverity.INFO.value,
+            title=f"Resolved: {alert.rule_name}",
+            message=alert.message,
+            payload=payload
+        ):
+            logger.info(f"Webhook resolution queued for alert {alert.id}")
 
     # Management methods
     def acknowledge_alert(self, alert_id: str, acknowledged_by: str = "system") -> bool:
@@ -758,7 +749,7 @@ class AlertManager:
             logger.warning(f"Alert rule {rule.name} already exists")
             return False
         
-        self.alert_rules[rule.name] = rule
+        self._register_rule(rule)
         logger.info(f"Alert rule added: {rule.name}")
         return True
 
@@ -766,6 +757,7 @@ class AlertManager:
         """Remove an alert rule"""
         if rule_name in self.alert_rules:
             del self.alert_rules[rule_name]
+            self.rule_engine.remove_rule(rule_name)
             
             # Remove any active alerts for this rule
             alerts_to_remove = [
@@ -784,7 +776,10 @@ class AlertManager:
     def update_alert_rule(self, rule_name: str, updated_rule: AlertRule) -> bool:
         """Update an existing alert rule"""
         if rule_name in self.alert_rules:
-            self.alert_rules[rule_name] = updated_rule
+            if updated_rule.name != rule_name:
+                del self.alert_rules[rule_name]
+                self.rule_engine.remove_rule(rule_name)
+            self._register_rule(updated_rule)
             logger.info(f"Alert rule updated: {rule_name}")
             return True
         
@@ -853,7 +848,9 @@ class AlertManager:
             "severity_breakdown": dict(severity_counts),
             "top_rules": dict(sorted(rule_counts.items(), key=lambda x: x[1], reverse=True)[:5]),
             "average_resolution_time_seconds": avg_resolution_time,
-            "resolution_rate": len(resolved_alerts) / len(recent_alerts) * 100 if recent_alerts else 0
+            "resolution_rate": len(resolved_alerts) / len(recent_alerts) * 100 if recent_alerts else 0,
+            "rule_engine": self.rule_engine.get_stats(),
+            "delivery": self.delivery.get_stats()
         }
 
     def export_config(self) -> Dict[str, Any]:
@@ -874,13 +871,16 @@ class AlertManager:
         if "alert_rules" in config_data:
             for name, rule_data in config_data["alert_rules"].items():
                 rule = AlertRule(**rule_data)
-                self.alert_rules[name] = rule
+                if isinstance(rule.severity, str):
+                    rule.severity = AlertSeverity(rule.severity)
+                self._register_rule(rule)
         
         # Import notification channels
         if "notification_channels" in config_data:
             for name, channel_data in config_data["notification_channels"].items():
                 channel = NotificationChannel(**channel_data)
                 self.notification_channels[name] = channel
+                self._register_channel(channel)
         
         logger.info("Configuration imported successfully")
 
@@ -1,15 +1,24 @@
 import asyncio
 import json
+import os
+import sys
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
 from collections import defaultdict, deque
 import threading
 import psutil
-import requests
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shared.utils.health_engine import (
+    HealthEngine, HealthEngineConfig, http_probe, run_and_close_sessions,
+    STATUS_HEALTHY, STATUS_WARNING
+)
 
 logger = logging.getLogger(__name__)
 
@@ -43,10 +52,20 @@ class MetricsBuffer:
         self.max_size = max_size
         self.metrics = deque(maxlen=max_size)
         self.lock = threading.Lock()
+        self.subscribers: List[Callable[[SystemMetric], None]] = []
+    
+    def subscribe(self, callback: Callable[[SystemMetric], None]):
+        """Call `callback` with every metric added from now on"""
+        self.subscribers.append(callback)
     
     def add_metric(self, metric: SystemMetric):
         with self.lock:
             self.metrics.append(metric)
+        for callback in self.subscribers:
+            try:
+                callback(metric)
+            except Exception as e:
+                logger.error(f"Metric subscriber failed for {metric.name}: {e}")
     
     def get_metrics(self, since: Optional[datetime] = None) -> List[SystemMetric]:
         with self.lock:
@@ -64,6 +83,13 @@ class MetricsBuffer:
 class MetricsCollector:
     """Comprehensive system metrics collector"""
     
+    # Endpoints probed in addition to /health
+    TEST_ENDPOINTS = {
+        'content_engine': ['/generate', '/analyze'],
+        'platform_manager': ['/upload', '/platforms'],
+        'trend_monitor': ['/trends', '/collect']
+    }
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.metrics_buffer = MetricsBuffer(max_size=config.get('buffer_size', 10000))
@@ -83,6 +109,14 @@ class MetricsCollector:
         self.error_counts = defaultdict(int)
         self.response_times = defaultdict(list)
         
+        # Service probes share one engine; /health readers use its cached results
+        self.health_engine = HealthEngine(HealthEngineConfig(
+            max_concurrency=config.get('health_check_concurrency', 200),
+            default_ttl=config.get('health_cache_ttl', 15)
+        ), name="metrics_collector")
+        for service_name, base_url in self.service_endpoints.items():
+            self._register_health_checks(service_name, base_url)
+        
         logger.info("MetricsCollector initialized")
 
     def start_collection(self):
@@ -102,31 +136,42 @@ class MetricsCollector:
 
     def _collection_loop(self):
         """Main collection loop running in background thread"""
+        # One event loop for the whole run instead of asyncio.run per cycle,
+        # so HTTP sessions and their connections survive between cycles
+        asyncio.run(run_and_close_sessions(self._async_collection_loop()))
+    
+    async def _async_collection_loop(self):
         while self.is_running:
             try:
                 # Collect system metrics
-                asyncio.run(self._collect_system_metrics())
+                await self._collect_system_metrics()
                 
                 # Collect service health
-                asyncio.run(self._collect_service_health())
+                await self._collect_service_health()
                 
                 # Collect application metrics
                 self._collect_application_metrics()
                 
                 # Sleep until next collection
-                time.sleep(self.collection_interval)
+                await self._sleep(self.collection_interval)
                 
             except Exception as e:
                 logger.error(f"Error in metrics collection loop: {e}")
-                time.sleep(10)  # Wait before retrying
+                await self._sleep(10)  # Wait before retrying
+    
+    async def _sleep(self, seconds: float):
+        """Sleep in short steps so stop_collection() is noticed quickly"""
+        deadline = time.monotonic() + seconds
+        while self.is_running and time.monotonic() < deadline:
+            await asyncio.sleep(min(1.0, deadline - time.monotonic()))
 
     async def _collect_system_metrics(self):
         """Collect system-level metrics"""
         try:
             timestamp = datetime.now()
             
-            # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU metrics (sampled off the loop so service probes are not held up)
+            cpu_percent = await asyncio.to_thread(psutil.cpu_percent, 1)
             self.metrics_buffer.add_metric(SystemMetric(
                 name="system.cpu.usage",
                 value=cpu_percent,
@@ -195,9 +240,16 @@ class MetricsCollector:
         """Collect health status of all services"""
         timestamp = datetime.now()
         
-        for service_name, base_url in self.service_endpoints.items():
+        services = list(self.service_endpoints.items())
+        statuses = await asyncio.gather(
+            *(self._check_service_health(service_name, base_url) for service_name, base_url in services),
+            return_exceptions=True
+        )
+        
+        for (service_name, base_url), health_status in zip(services, statuses):
             try:
-                health_status = await self._check_service_health(service_name, base_url)
+                if isinstance(health_status, Exception):
+                    raise health_status
                 
                 # Store service health metrics
                 self.metrics_buffer.add_metric(SystemMetric(
@@ -238,61 +290,60 @@ class MetricsCollector:
                     metadata={"error": str(e)}
                 ))
 
+    def _register_health_checks(self, service_name: str, base_url: str):
+        """Register the /health probe and endpoint probes of one service"""
+        self.health_engine.register(service_name, http_probe(f"{base_url}/health"), timeout=5)
+        for endpoint in self.TEST_ENDPOINTS.get(service_name, []):
+            self.health_engine.register(f"{service_name}{endpoint}", http_probe(f"{base_url}{endpoint}"), timeout=3)
+    
     async def _check_service_health(self, service_name: str, base_url: str) -> ServiceHealth:
         """Check health of a specific service"""
-        start_time = time.time()
+        if service_name not in self.health_engine:
+            self._register_health_checks(service_name, base_url)
         
-        try:
-            # Check main health endpoint
-            health_url = f"{base_url}/health"
-            response = requests.get(health_url, timeout=5)
-            response_time = (time.time() - start_time) * 1000  # ms
-            
-            if response.status_code == 200:
-                status = "healthy"
-            elif response.status_code < 500:
-                status = "degraded"
-            else:
-                status = "down"
-            
-            # Check specific endpoints
-            endpoints = {}
-            test_endpoints = {
-                'content_engine': ['/generate', '/analyze'],
-                'platform_manager': ['/upload', '/platforms'],
-                'trend_monitor': ['/trends', '/collect']
-            }
-            
-            if service_name in test_endpoints:
-                for endpoint in test_endpoints[service_name]:
-                    try:
-                        test_response = requests.get(f"{base_url}{endpoint}", timeout=3)
-                        endpoints[endpoint] = test_response.status_code < 500
-                    except:
-                        endpoints[endpoint] = False
-            
-            # Calculate error rate (simplified)
-            total_requests = self.request_counts[service_name]
-            total_errors = self.error_counts[service_name]
-            error_rate = (total_errors / total_requests * 100) if total_requests > 0 else 0
-            
-            return ServiceHealth(
-                service_name=service_name,
-                status=status,
-                response_time=response_time,
-                error_rate=error_rate,
-                last_check=datetime.now(),
-                endpoints=endpoints
-            )
-            
-        except requests.exceptions.RequestException as e:
+        # Main health endpoint and specific endpoints are probed concurrently
+        endpoint_names = [f"{service_name}{endpoint}" for endpoint in self.TEST_ENDPOINTS.get(service_name, [])]
+        results = await self.health_engine.run_all([service_name] + endpoint_names)
+        health = results[service_name]
+        
+        if 'status_code' not in health.details:
             return ServiceHealth(
                 service_name=service_name,
                 status="down",
                 response_time=None,
                 error_rate=100.0,
-                last_check=datetime.now()
+                last_check=datetime.fromtimestamp(health.checked_at)
             )
+        
+        if health.status == STATUS_HEALTHY:
+            status = "healthy"
+        elif health.status == STATUS_WARNING:
+            status = "degraded"
+        else:
+            status = "down"
+        
+        endpoints = {
+            name[len(service_name):]: result.details.get('status_code', 500) < 500
+            for name, result in results.items() if name != service_name
+        }
+        
+        # Calculate error rate (simplified)
+        total_requests = self.request_counts[service_name]
+        total_errors = self.error_counts[service_name]
+        error_rate = (total_errors / total_requests * 100) if total_requests > 0 else 0
+        
+        return ServiceHealth(
+            service_name=service_name,
+            status=status,
+            response_time=health.response_time_ms,
+            error_rate=error_rate,
+            last_check=datetime.fromtimestamp(health.checked_at),
+            endpoints=endpoints
+        )
+    
+    def get_service_health_snapshot(self) -> Dict[str, Any]:
+        """Last probe results for every service endpoint, without probing"""
+        return self.health_engine.snapshot()
 
     def _collect_application_metrics(self):
         """Collect application-specific metrics"""
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import json
 import logging
@@ -14,6 +14,12 @@ from database.repositories.trend_repository import TrendRepository
 from database.repositories.opportunity_repository import OpportunityRepository
 from database.repositories.content_repository import ContentRepository
 from database.repositories.performance_repository import PerformanceRepository
+try:
+    from ...shared.utils.health_engine import run_sync
+    from ...shared.utils.snapshot_cache import Snapshot, SnapshotCache
+except ImportError:
+    from shared.utils.health_engine import run_sync
+    from shared.utils.snapshot_cache import Snapshot, SnapshotCache
 
 logger = logging.getLogger(__name__)
 
@@ -65,83 +71,166 @@ class FinancialMetrics:
     roi: float
     cost_breakdown: Dict[str, float]
 
+@dataclass
+class RangeData:
+    """Rows for one time range, loaded once and shared by every tile"""
+    start_time: datetime
+    end_time: datetime
+    trends: List[Any] = field(default_factory=list)
+    opportunities_count: int = 0
+    content_items: List[Any] = field(default_factory=list)
+    uploads: List[Any] = field(default_factory=list)
+
+# Revenue per view by platform (simplified estimate)
+REVENUE_PER_VIEW = {
+    'youtube': 0.001,  # $1 per 1000 views
+    'tiktok': 0.0005  # Lower rate for TikTok
+}
+
 class PerformanceDashboard:
-    def __init__(self, db_config: Dict[str, Any]):
+    TIME_RANGES = ("today", "week", "month", "day")
+
+    def __init__(self, db_config: Dict[str, Any], snapshot_ttl: float = 30.0):
         self.trend_repo = TrendRepository(db_config)
         self.opportunity_repo = OpportunityRepository(db_config)
         self.content_repo = ContentRepository(db_config)
         self.performance_repo = PerformanceRepository(db_config)
         
+        # One materialised snapshot per time range, refreshed in the background
+        self.snapshots = SnapshotCache(
+            lambda time_range: run_sync(self._collect_metrics(time_range)),
+            ttl=snapshot_ttl,
+            max_stale=snapshot_ttl * 10,
+            volatile_keys=("timestamp",),
+            name="performance_dashboard"
+        )
+        
     async def get_metrics(self, time_range: str = "today") -> Dict[str, Any]:
         """Get comprehensive metrics for dashboard"""
         try:
-            logger.info(f"Collecting metrics for time range: {time_range}")
-            
-            # Calculate time boundaries
-            now = datetime.now()
-            if time_range == "today":
-                start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-                end_time = now
-            elif time_range == "week":
-                start_time = now - timedelta(days=7)
-                end_time = now
-            elif time_range == "month":
-                start_time = now - timedelta(days=30)
-                end_time = now
-            else:
-                start_time = now - timedelta(days=1)
-                end_time = now
-            
-            # Collect all metrics in parallel
-            tasks = [
-                self._get_today_summary(),
-                self._get_trend_metrics(start_time, end_time),
-                self._get_content_metrics(start_time, end_time),
-                self._get_platform_metrics(start_time, end_time),
-                self._get_financial_metrics(start_time, end_time),
-                self._get_system_health(),
-                self._get_alerts()
-            ]
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            return {
-                "timestamp": now.isoformat(),
-                "time_range": time_range,
-                "summary": results[0] if not isinstance(results[0], Exception) else {},
-                "trends": results[1] if not isinstance(results[1], Exception) else {},
-                "content": results[2] if not isinstance(results[2], Exception) else {},
-                "platforms": results[3] if not isinstance(results[3], Exception) else {},
-                "financial": results[4] if not isinstance(results[4], Exception) else {},
-                "system_health": results[5] if not isinstance(results[5], Exception) else {},
-                "alerts": results[6] if not isinstance(results[6], Exception) else []
-            }
-            
+            snapshot = await self.get_metrics_snapshot(time_range)
+            return snapshot.data
         except Exception as e:
             logger.error(f"Error collecting metrics: {e}")
             return self._get_error_response(str(e))
 
-    async def _get_today_summary(self) -> Dict[str, DashboardMetric]:
-        """Get today's key metrics summary"""
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        yesterday_start = today_start - timedelta(days=1)
-        yesterday_end = today_start
+    async def get_metrics_snapshot(self, time_range: str = "today") -> Snapshot:
+        """Cached metrics with their serialised body and ETag"""
+        if time_range not in self.TIME_RANGES:
+            time_range = "day"
+        return await self.snapshots.aget(time_range)
+
+    async def _collect_metrics(self, time_range: str) -> Dict[str, Any]:
+        """Load each time range once and compute every tile from the shared rows"""
+        logger.info(f"Collecting metrics for time range: {time_range}")
+        
+        # Calculate time boundaries
+        now = datetime.now()
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        if time_range == "today":
+            start_time = today_start
+        elif time_range == "week":
+            start_time = now - timedelta(days=7)
+        elif time_range == "month":
+            start_time = now - timedelta(days=30)
+        else:
+            start_time = now - timedelta(days=1)
+        end_time = now
         
-        # Today's metrics
-        trends_today = await self.trend_repo.count_by_date_range(today_start, datetime.now())
-        opportunities_today = await self.opportunity_repo.count_by_date_range(today_start, datetime.now())
-        content_today = await self.content_repo.count_by_date_range(today_start, datetime.now())
-        uploads_today = await self.performance_repo.count_uploads_by_date_range(today_start, datetime.now())
+        # Load the period, today and yesterday's counts in parallel
+        yesterday_start = today_start - timedelta(days=1)
+        loads = [
+            self._load_range(start_time, end_time),
+            self._load_counts(yesterday_start, today_start)
+        ]
+        if time_range != "today":
+            loads.append(self._load_range(today_start, now))
+        load_month = (end_time - start_time).days == 1  # If today, calculate month
+        if load_month:
+            loads.append(self.content_repo.get_by_date_range(start_time.replace(day=1), end_time))
+        results = await asyncio.gather(*loads, return_exceptions=True)
+        
+        period, yesterday = results[0], results[1]
+        today = results[2] if time_range != "today" else period
+        monthly_items = None
+        if load_month:
+            monthly_items = self._results_or_defaults(results[-1:], (None,))[0]
+        
+        def tile(compute, *args, default=None):
+            try:
+                return compute(*args)
+            except Exception as e:
+                logger.error(f"Error computing dashboard tile {compute.__name__}: {e}")
+                return default if default is not None else {}
         
-        # Yesterday's metrics for comparison
-        trends_yesterday = await self.trend_repo.count_by_date_range(yesterday_start, yesterday_end)
-        opportunities_yesterday = await self.opportunity_repo.count_by_date_range(yesterday_start, yesterday_end)
-        content_yesterday = await self.content_repo.count_by_date_range(yesterday_start, yesterday_end)
-        uploads_yesterday = await self.performance_repo.count_uploads_by_date_range(yesterday_start, yesterday_end)
+        return {
+            "timestamp": now.isoformat(),
+            "time_range": time_range,
+            "summary": tile(self._get_today_summary, today, yesterday),
+            "trends": tile(self._get_trend_metrics, period),
+            "content": tile(self._get_content_metrics, period),
+            "platforms": tile(self._get_platform_metrics, period),
+            "financial": tile(self._get_financial_metrics, period, monthly_items),
+            "system_health": tile(self._get_system_health),
+            "alerts": tile(self._get_alerts, today, default=[])
+        }
+
+    async def _load_range(self, start_time: datetime, end_time: datetime) -> RangeData:
+        """Everything the tiles need for one range: four repository calls"""
+        trends, opportunities_count, content_items, uploads = self._results_or_defaults(
+            await asyncio.gather(
+                self.trend_repo.get_by_date_range(start_time, end_time),
+                self.opportunity_repo.count_by_date_range(start_time, end_time),
+                self.content_repo.get_by_date_range(start_time, end_time),
+                self.performance_repo.get_uploads_by_date_range(start_time, end_time),
+                return_exceptions=True
+            ),
+            ([], 0, [], [])
+        )
+        return RangeData(
+            start_time=start_time,
+            end_time=end_time,
+            trends=trends,
+            opportunities_count=opportunities_count,
+            content_items=content_items,
+            uploads=uploads
+        )
+
+    async def _load_counts(self, start_time: datetime, end_time: datetime) -> Dict[str, int]:
+        """Counts only, for the day-over-day comparison"""
+        trends, opportunities, content, uploads = self._results_or_defaults(
+            await asyncio.gather(
+                self.trend_repo.count_by_date_range(start_time, end_time),
+                self.opportunity_repo.count_by_date_range(start_time, end_time),
+                self.content_repo.count_by_date_range(start_time, end_time),
+                self.performance_repo.count_uploads_by_date_range(start_time, end_time),
+                return_exceptions=True
+            ),
+            (0, 0, 0, 0)
+        )
+        return {"trends": trends, "opportunities": opportunities, "content": content, "uploads": uploads}
+
+    @staticmethod
+    def _results_or_defaults(results: List[Any], defaults: tuple) -> List[Any]:
+        """A failed repository call only empties the tiles that use it"""
+        values = []
+        for result, default in zip(results, defaults):
+            if isinstance(result, Exception):
+                logger.error(f"Error loading dashboard data: {result}")
+                result = default
+            values.append(result)
+        return values
+
+    def _get_today_summary(self, today: RangeData, yesterday: Dict[str, int]) -> Dict[str, DashboardMetric]:
+        """Get today's key metrics summary"""
+        trends_today = len(today.trends)
+        opportunities_today = today.opportunities_count
+        content_today = len(today.content_items)
+        uploads_today = len(today.uploads)
         
         # Calculate costs and revenue
-        total_cost = await self._calculate_cost_today()
-        estimated_revenue = await self._estimate_revenue_today()
+        total_cost = self._total_cost(today.content_items)
+        estimated_revenue = self._estimate_revenue(today.uploads)
         
         def calculate_change(today_val: int, yesterday_val: int) -> Optional[float]:
             if yesterday_val == 0:
@@ -153,25 +242,25 @@ class PerformanceDashboard:
                 name="Trends Collected",
                 value=trends_today,
                 unit="count",
-                change_percent=calculate_change(trends_today, trends_yesterday)
+                change_percent=calculate_change(trends_today, yesterday["trends"])
             ),
             "opportunities_generated": DashboardMetric(
                 name="Opportunities Generated", 
                 value=opportunities_today,
                 unit="count",
-                change_percent=calculate_change(opportunities_today, opportunities_yesterday)
+                change_percent=calculate_change(opportunities_today, yesterday["opportunities"])
             ),
             "content_created": DashboardMetric(
                 name="Content Created",
                 value=content_today,
                 unit="count", 
-                change_percent=calculate_change(content_today, content_yesterday)
+                change_percent=calculate_change(content_today, yesterday["content"])
             ),
             "uploads_completed": DashboardMetric(
                 name="Uploads Completed",
                 value=uploads_today,
                 unit="count",
-                change_percent=calculate_change(uploads_today, uploads_yesterday)
+                change_percent=calculate_change(uploads_today, yesterday["uploads"])
             ),
             "total_cost": DashboardMetric(
                 name="Total Cost",
@@ -190,12 +279,9 @@ class PerformanceDashboard:
             )
         }
 
-    async def _get_trend_metrics(self, start_time: datetime, end_time: datetime) -> TrendMetrics:
+    def _get_trend_metrics(self, data: RangeData) -> TrendMetrics:
         """Get detailed trend analytics"""
-        
-        # Get trend counts and statistics
-        trend_count = await self.trend_repo.count_by_date_range(start_time, end_time)
-        trends = await self.trend_repo.get_by_date_range(start_time, end_time)
+        trends = data.trends
         
         # Calculate unique topics
         unique_topics = len(set(trend.topic for trend in trends))
@@ -214,35 +300,25 @@ class PerformanceDashboard:
             for cat, count in sorted(category_counts.items(), key=lambda x: x[1], reverse=True)[:5]
         ]
         
-        # Get growth trends (simplified)
-        growth_trends = await self._calculate_growth_trends(trends)
-        
         return TrendMetrics(
-            total_collected=trend_count,
+            total_collected=len(trends),
             unique_topics=unique_topics,
             avg_popularity_score=round(avg_popularity, 2),
             top_categories=top_categories,
-            growth_trends=growth_trends
+            growth_trends=self._calculate_growth_trends(trends)
         )
 
-    async def _get_content_metrics(self, start_time: datetime, end_time: datetime) -> ContentMetrics:
+    def _get_content_metrics(self, data: RangeData) -> ContentMetrics:
         """Get content generation and performance metrics"""
-        
-        opportunities_count = await self.opportunity_repo.count_by_date_range(start_time, end_time)
-        content_count = await self.content_repo.count_by_date_range(start_time, end_time)
+        opportunities_count = data.opportunities_count
+        content_items = data.content_items
+        content_count = len(content_items)
         
         # Calculate success rate (opportunities -> content)
         success_rate = (content_count / opportunities_count * 100) if opportunities_count > 0 else 0
         
-        # Get content items for cost calculation
-        content_items = await self.content_repo.get_by_date_range(start_time, end_time)
-        
         # Calculate average cost
-        total_cost = sum(
-            item.cost_breakdown.get('total_cost', 0) if item.cost_breakdown else 0 
-            for item in content_items
-        )
-        avg_cost = (total_cost / len(content_items)) if content_items else 0
+        avg_cost = (self._total_cost(content_items) / len(content_items)) if content_items else 0
         
         # Get popular content types
         content_types = {}
@@ -264,11 +340,10 @@ class PerformanceDashboard:
             popular_content_types=popular_types
         )
 
-    async def _get_platform_metrics(self, start_time: datetime, end_time: datetime) -> PlatformMetrics:
+    def _get_platform_metrics(self, data: RangeData) -> PlatformMetrics:
         """Get platform upload and performance metrics"""
-        
-        total_uploads = await self.performance_repo.count_uploads_by_date_range(start_time, end_time)
-        uploads = await self.performance_repo.get_uploads_by_date_range(start_time, end_time)
+        uploads = data.uploads
+        total_uploads = len(uploads)
         
         # Calculate success rate
         successful_uploads = len([u for u in uploads if u.url is not None])
@@ -332,12 +407,8 @@ class PerformanceDashboard:
             platform_performance=platform_performance
         )
 
-    async def _get_financial_metrics(self, start_time: datetime, end_time: datetime) -> FinancialMetrics:
+    def _get_financial_metrics(self, data: RangeData, monthly_items: Optional[List[Any]] = None) -> FinancialMetrics:
         """Get financial performance metrics"""
-        
-        # Calculate costs
-        content_items = await self.content_repo.get_by_date_range(start_time, end_time)
-        
         total_cost = 0
         cost_breakdown = {
             "ai_text": 0,
@@ -347,38 +418,19 @@ class PerformanceDashboard:
             "infrastructure": 0
         }
         
-        for item in content_items:
+        for item in data.content_items:
             if item.cost_breakdown:
-                item_cost = item.cost_breakdown.get('total_cost', 0)
-                total_cost += item_cost
+                total_cost += item.cost_breakdown.get('total_cost', 0)
                 
                 # Breakdown costs
                 for category in cost_breakdown.keys():
                     cost_breakdown[category] += item.cost_breakdown.get(category, 0)
         
-        # Calculate monthly cost
-        if (end_time - start_time).days == 1:  # If today, calculate month
-            monthly_start = start_time.replace(day=1)
-            monthly_items = await self.content_repo.get_by_date_range(monthly_start, end_time)
-            total_cost_month = sum(
-                item.cost_breakdown.get('total_cost', 0) if item.cost_breakdown else 0
-                for item in monthly_items
-            )
-        else:
-            total_cost_month = total_cost
+        # Monthly cost is only loaded for the one-day range
+        total_cost_month = self._total_cost(monthly_items) if monthly_items is not None else total_cost
         
         # Estimate revenue (simplified calculation)
-        uploads = await self.performance_repo.get_uploads_by_date_range(start_time, end_time)
-        estimated_revenue = 0
-        
-        for upload in uploads:
-            if upload.performance_data:
-                views = upload.performance_data.get('views', 0)
-                # Estimate revenue based on platform and views
-                if upload.platform == 'youtube':
-                    estimated_revenue += views * 0.001  # $1 per 1000 views
-                elif upload.platform == 'tiktok':
-                    estimated_revenue += views * 0.0005  # Lower rate for TikTok
+        estimated_revenue = self._estimate_revenue(data.uploads)
         
         # Calculate ROI
         roi = ((estimated_revenue - total_cost) / total_cost * 100) if total_cost > 0 else 0
@@ -391,7 +443,7 @@ class PerformanceDashboard:
             cost_breakdown={k: round(v, 2) for k, v in cost_breakdown.items()}
         )
 
-    async def _get_system_health(self) -> Dict[str, Any]:
+    def _get_system_health(self) -> Dict[str, Any]:
         """Get system health metrics"""
         return {
             "status": "healthy",
@@ -409,14 +461,13 @@ class PerformanceDashboard:
             }
         }
 
-    async def _get_alerts(self) -> List[Dict[str, Any]]:
+    def _get_alerts(self, today: RangeData) -> List[Dict[str, Any]]:
         """Get current system alerts"""
         alerts = []
         
         # Check for low success rates
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        opportunities_today = await self.opportunity_repo.count_by_date_range(today_start, datetime.now())
-        content_today = await self.content_repo.count_by_date_range(today_start, datetime.now())
+        opportunities_today = today.opportunities_count
+        content_today = len(today.content_items)
         
         success_rate = (content_today / opportunities_today * 100) if opportunities_today > 0 else 0
         
@@ -429,7 +480,7 @@ class PerformanceDashboard:
             })
         
         # Check for high costs
-        total_cost = await self._calculate_cost_today()
+        total_cost = self._total_cost(today.content_items)
         if total_cost > 100:  # More than 100 baht per day
             alerts.append({
                 "level": "warning", 
@@ -440,33 +491,25 @@ class PerformanceDashboard:
         
         return alerts
 
-    async def _calculate_cost_today(self) -> float:
-        """Calculate today's total cost"""
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        content_items = await self.content_repo.get_by_date_range(today_start, datetime.now())
-        
+    @staticmethod
+    def _total_cost(content_items: List[Any]) -> float:
+        """Sum of total_cost over content items"""
         return sum(
             item.cost_breakdown.get('total_cost', 0) if item.cost_breakdown else 0
             for item in content_items
         )
 
-    async def _estimate_revenue_today(self) -> float:
-        """Estimate today's revenue"""
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        uploads = await self.performance_repo.get_uploads_by_date_range(today_start, datetime.now())
-        
+    @staticmethod
+    def _estimate_revenue(uploads: List[Any]) -> float:
+        """Estimated revenue from upload views"""
         estimated_revenue = 0
         for upload in uploads:
             if upload.performance_data:
                 views = upload.performance_data.get('views', 0)
-                if upload.platform == 'youtube':
-                    estimated_revenue += views * 0.001
-                elif upload.platform == 'tiktok':
-                    estimated_revenue += views * 0.0005
-        
+                estimated_revenue += views * REVENUE_PER_VIEW.get(upload.platform, 0)
         return estimated_revenue
 
-    async def _calculate_growth_trends(self, trends: List) -> List[Dict[str, Any]]:
+    def _calculate_growth_trends(self, trends: List) -> List[Dict[str, Any]]:
         """Calculate growth trends for visualization"""
         # Group trends by date
         daily_counts = {}
@@ -599,10 +642,7 @@ class PerformanceDashboard:
                 # Calculate revenue
                 if upload.performance_data:
                     views = upload.performance_data.get('views', 0)
-                    if platform == 'youtube':
-                        total_revenue += views * 0.001
-                    elif platform == 'tiktok':
-                        total_revenue += views * 0.0005
+                    total_revenue += views * REVENUE_PER_VIEW.get(platform, 0)
             
             roi = ((total_revenue - total_cost) / total_cost * 100) if total_cost > 0 else 0
             roi_by_platform[platform] = round(roi, 2)
@@ -0,0 +1,350 @@
+import heapq
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Aggregations a rule can apply to its metric window
+AGGREGATIONS = ("last", "avg", "min", "max", "sum", "count", "rate")
+
+DEFAULT_WINDOW_SECONDS = 3600
+DEFAULT_WINDOW_CAPACITY = 4096
+
+
+class RollingWindow:
+    """
+    Ring buffer of (timestamp, value) points with O(1) rolling aggregates
+
+    Sum and count are updated on append/evict, min and max come from
+    monotonic deques (amortised O(1)), and rate is the slope between the
+    oldest and newest point. Points older than window_seconds, or beyond
+    capacity, are evicted from the head.
+    """
+
+    def __init__(self, window_seconds: float, capacity: int = DEFAULT_WINDOW_CAPACITY):
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+        self._timestamps = [0.0] * capacity
+        self._values = [0.0] * capacity
+        self._head = 0  # index of the oldest point
+        self._size = 0
+        self._seq = 0  # sequence number of the next point
+        self._sum = 0.0
+        self._max: deque = deque()  # (seq, value), values decreasing
+        self._min: deque = deque()  # (seq, value), values increasing
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, value: float):
+        if self._size == self.capacity:
+            self._evict_oldest()
+
+        index = (self._head + self._size) % self.capacity
+        self._timestamps[index] = timestamp
+        self._values[index] = value
+        self._size += 1
+        self._sum += value
+
+        seq = self._seq
+        self._seq += 1
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+
+        self.evict(timestamp)
+
+    def evict(self, now: float):
+        """Drop points that fell out of the window ending at `now`"""
+        cutoff = now - self.window_seconds
+        while self._size and self._timestamps[self._head] < cutoff:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        oldest_seq = self._seq - self._size
+        self._sum -= self._values[self._head]
+        self._head = (self._head + 1) % self.capacity
+        self._size -= 1
+        if self._max and self._max[0][0] == oldest_seq:
+            self._max.popleft()
+        if self._min and self._min[0][0] == oldest_seq:
+            self._min.popleft()
+        if not self._size:
+            self._sum = 0.0  # drop accumulated float error
+
+    def _newest_index(self) -> int:
+        return (self._head + self._size - 1) % self.capacity
+
+    def aggregate(self, aggregation: str) -> Optional[float]:
+        """Aggregate over the points in the window (None when empty)"""
+        if not self._size:
+            return None
+        if aggregation == "last":
+            return self._values[self._newest_index()]
+        if aggregation == "avg":
+            return self._sum / self._size
+        if aggregation == "max":
+            return self._max[0][1]
+        if aggregation == "min":
+            return self._min[0][1]
+        if aggregation == "sum":
+            return self._sum
+        if aggregation == "count":
+            return float(self._size)
+        if aggregation == "rate":
+            newest = self._newest_index()
+            elapsed = self._timestamps[newest] - self._timestamps[self._head]
+            if elapsed <= 0:
+                return 0.0
+            return (self._values[newest] - self._values[self._head]) / elapsed
+        raise ValueError(f"Unknown aggregation: {aggregation}")
+
+    def points(self) -> List[Tuple[float, float]]:
+        return [
+            (self._timestamps[(self._head + i) % self.capacity], self._values[(self._head + i) % self.capacity])
+            for i in range(self._size)
+        ]
+
+
+class MetricSeries:
+    """Latest point of one metric plus one rolling window per window size its rules use"""
+
+    def __init__(self, name: str, capacity: int = DEFAULT_WINDOW_CAPACITY):
+        self.name = name
+        self.capacity = capacity
+        self.last_timestamp: Optional[float] = None
+        self.last_value: Optional[float] = None
+        self.windows: Dict[float, RollingWindow] = {}
+
+    def window(self, window_seconds: float) -> RollingWindow:
+        window = self.windows.get(window_seconds)
+        if window is None:
+            window = self.windows[window_seconds] = RollingWindow(window_seconds, self.capacity)
+        return window
+
+    def add(self, timestamp: float, value: float):
+        self.last_timestamp = timestamp
+        self.last_value = value
+        for window in self.windows.values():
+            window.append(timestamp, value)
+
+    def aggregate(self, aggregation: str, window_seconds: float, now: Optional[float] = None) -> Optional[float]:
+        if aggregation == "last":
+            return self.last_value
+        window = self.window(window_seconds)
+        if now is not None:
+            window.evict(now)
+        return window.aggregate(aggregation)
+
+
+def compile_pattern(pattern: str) -> Tuple[str, Optional[re.Pattern]]:
+    """(literal prefix, regex) for a metric pattern; '*' matches any run of characters"""
+    if '*' not in pattern:
+        return pattern, None
+    prefix = pattern.split('*', 1)[0]
+    regex = re.compile('.*'.join(re.escape(part) for part in pattern.split('*')), re.DOTALL)
+    return prefix, regex
+
+
+class PatternIndex:
+    """
+    Index of metric patterns to rule names
+
+    Exact names are a dict lookup. Wildcard patterns hang off a character
+    trie keyed by their literal prefix, so resolving a new metric name only
+    tests the patterns whose prefix it starts with. Resolutions are cached
+    per metric name until the set of patterns changes.
+    """
+
+    def __init__(self):
+        self._exact: Dict[str, Set[str]] = {}
+        self._trie: Dict[str, Any] = {}
+        self._patterns: Dict[str, Tuple[str, Optional[re.Pattern]]] = {}
+        self._resolved: Dict[str, Tuple[str, ...]] = {}
+
+    def add(self, rule_name: str, pattern: str):
+        self.remove(rule_name)
+        prefix, regex = compile_pattern(pattern)
+        self._patterns[rule_name] = (pattern, regex)
+        if regex is None:
+            self._exact.setdefault(pattern, set()).add(rule_name)
+        else:
+            node = self._trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node.setdefault(None, set()).add(rule_name)
+        self._resolved.clear()
+
+    def remove(self, rule_name: str):
+        entry = self._patterns.pop(rule_name, None)
+        if entry is None:
+            return
+        pattern, regex = entry
+        if regex is None:
+            rules = self._exact.get(pattern, set())
+            rules.discard(rule_name)
+            if not rules:
+                self._exact.pop(pattern, None)
+        else:
+            node = self._trie
+            for char in compile_pattern(pattern)[0]:
+                node = node[char]
+            node[None].discard(rule_name)
+        self._resolved.clear()
+
+    def match(self, metric_name: str) -> Tuple[str, ...]:
+        """Names of the rules whose pattern matches metric_name"""
+        resolved = self._resolved.get(metric_name)
+        if resolved is not None:
+            return resolved
+
+        matches = set(self._exact.get(metric_name, ()))
+        node = self._trie
+        candidates = list(node.get(None, ()))
+        for char in metric_name:
+            node = node.get(char)
+            if node is None:
+                break
+            candidates.extend(node.get(None, ()))
+        for rule_name in candidates:
+            if self._patterns[rule_name][1].fullmatch(metric_name):
+                matches.add(rule_name)
+
+        resolved = self._resolved[metric_name] = tuple(sorted(matches))
+        return resolved
+
+
+@dataclass
+class RuleSpec:
+    """What the engine needs to know about a rule"""
+    name: str
+    pattern: str
+    aggregation: str = "last"
+    window: float = DEFAULT_WINDOW_SECONDS
+
+
+@dataclass(order=True)
+class _DueCheck:
+    due: float
+    rule_name: str = field(compare=False)
+    metric_name: str = field(compare=False)
+
+
+class RuleEngine:
+    """
+    Incremental rule evaluation
+
+    Points are appended to per-metric series and mark the metric dirty.
+    evaluate() only visits rules matched by dirty metrics, plus rule/metric
+    pairs whose pending duration timer has come due, so its cost follows
+    the number of updates instead of rules x metrics.
+    """
+
+    def __init__(self, window_capacity: int = DEFAULT_WINDOW_CAPACITY):
+        self.window_capacity = window_capacity
+        self.index = PatternIndex()
+        self.rules: Dict[str, RuleSpec] = {}
+        self.series: Dict[str, MetricSeries] = {}
+        self._dirty: Set[str] = set()
+        self._due: List[_DueCheck] = []
+        self._lock = threading.Lock()
+        self.stats = {
+            'points': 0,
+            'evaluations': 0,
+            'rule_checks': 0,
+            'timer_checks': 0
+        }
+
+    # Rules
+    def add_rule(self, spec: RuleSpec):
+        if spec.aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {spec.aggregation}")
+        with self._lock:
+            self.rules[spec.name] = spec
+            self.index.add(spec.name, spec.pattern)
+            # Existing metrics get the new rule's window and are evaluated once
+            for metric_name, series in self.series.items():
+                if spec.name in self.index.match(metric_name):
+                    self._prepare_window(series, spec)
+                    self._dirty.add(metric_name)
+
+    def remove_rule(self, rule_name: str):
+        with self._lock:
+            self.rules.pop(rule_name, None)
+            self.index.remove(rule_name)
+
+    def _prepare_window(self, series: MetricSeries, spec: RuleSpec):
+        if spec.aggregation == "last" or spec.window in series.windows:
+            return
+        # A new window starts from the points the series already holds
+        window = series.window(spec.window)
+        source = max(series.windows.values(), key=lambda w: w.window_seconds, default=None)
+        if source is not None and source is not window:
+            for timestamp, value in source.points():
+                window.append(timestamp, value)
+
+    # Points
+    def add_point(self, metric_name: str, value: float, timestamp: float):
+        with self._lock:
+            series = self.series.get(metric_name)
+            if series is None:
+                series = self.series[metric_name] = MetricSeries(metric_name, self.window_capacity)
+                for rule_name in self.index.match(metric_name):
+                    self._prepare_window(series, self.rules[rule_name])
+            series.add(timestamp, value)
+            self._dirty.add(metric_name)
+            self.stats['points'] += 1
+
+    def schedule(self, rule_name: str, metric_name: str, due: float):
+        """Re-evaluate a rule/metric pair at `due` even if no new points arrive"""
+        with self._lock:
+            heapq.heappush(self._due, _DueCheck(due, rule_name, metric_name))
+
+    # Evaluation
+    def evaluate(self, now: float) -> List[Tuple[str, str, float]]:
+        """(rule name, metric name, aggregated value) for every pair that needs a decision"""
+        with self._lock:
+            self.stats['evaluations'] += 1
+            pairs: Dict[Tuple[str, str], None] = {}
+            for metric_name in self._dirty:
+                for rule_name in self.index.match(metric_name):
+                    pairs[(rule_name, metric_name)] = None
+            self._dirty.clear()
+
+            while self._due and self._due[0].due <= now:
+                check = heapq.heappop(self._due)
+                if (check.rule_name, check.metric_name) not in pairs:
+                    self.stats['timer_checks'] += 1
+                    pairs[(check.rule_name, check.metric_name)] = None
+
+            results = []
+            for rule_name, metric_name in pairs:
+                spec = self.rules.get(rule_name)
+                series = self.series.get(metric_name)
+                if spec is None or series is None:
+                    continue
+                value = series.aggregate(spec.aggregation, spec.window, now)
+                if value is not None:
+                    results.append((rule_name, metric_name, value))
+            self.stats['rule_checks'] += len(results)
+            return results
+
+    def get_window(self, metric_name: str, window_seconds: float = DEFAULT_WINDOW_SECONDS) -> List[Tuple[float, float]]:
+        with self._lock:
+            series = self.series.get(metric_name)
+            if series is None or window_seconds not in series.windows:
+                return []
+            return series.windows[window_seconds].points()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                'rules': len(self.rules),
+                'metrics': len(self.series),
+                'pending_timers': len(self._due)
+            }
@@ -14,17 +14,18 @@ from typing import Dict, List, Any, Optional, Callable
 from dataclasses import dataclass, asdict
 from collections import deque
 import json
-import requests
 import psycopg2
 import redis
-from concurrent.futures import ThreadPoolExecutor
-import schedule
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from shared.utils.logger import setup_logger
 from shared.utils.error_handler import ErrorHandler
+from shared.utils.health_engine import (
+    HealthEngine, HealthEngineConfig, ProbeResult, http_probe, run_and_close_sessions, run_sync,
+    STATUS_CRITICAL, STATUS_UNKNOWN
+)
 from monitoring.alerts.webhook_alerts import WebhookAlertManager
 
 @dataclass
@@ -75,12 +76,20 @@ class ServiceHealthMonitor:
         # Monitoring control
         self.monitoring_active = False
         self.monitoring_thread = None
+        self._alert_tasks = set()
         
         # Initialize metrics history for each service
         for service_name in self.config['services'].keys():
             self.metrics_history[service_name] = deque(maxlen=1000)  # Keep last 1000 metrics
             self.service_status[service_name] = 'unknown'
         
+        monitoring_config = self.config.get('monitoring', {})
+        self.engine = HealthEngine(HealthEngineConfig(
+            max_concurrency=monitoring_config.get('max_concurrent_checks', 200),
+            blocking_workers=monitoring_config.get('blocking_workers', 8)
+        ), name="service_health")
+        self._register_checks()
+        
         self.logger.info("Service Health Monitor initialized")
     
     def _load_default_config(self) -> Dict[str, Any]:
@@ -130,6 +139,8 @@ class ServiceHealthMonitor:
             },
             'monitoring': {
                 'global_check_interval': 30,
+                'max_concurrent_checks': 200,
+                'blocking_workers': 8,
                 'max_retries': 3,
                 'retry_delay': 5,
                 'health_history_days': 7
@@ -151,67 +162,73 @@ class ServiceHealthMonitor:
             }
         }
     
-    def check_http_service(self, service_name: str, service_config: Dict[str, Any]) -> ServiceMetrics:
-        """Check HTTP-based service health"""
-        start_time = time.time()
+    def _register_checks(self):
+        """Register each enabled service with the health engine"""
+        default_interval = self.config.get('monitoring', {}).get('global_check_interval', 30)
         
-        try:
-            response = requests.get(
-                service_config['url'],
-                timeout=service_config.get('timeout', 10),
-                headers=service_config.get('headers', {})
-            )
-            
-            response_time = (time.time() - start_time) * 1000
-            
-            # Parse response for additional metrics
-            metrics_data = {}
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    metrics_data = data.get('metrics', {})
-                except:
-                    pass
+        for service_name, service_config in self.config['services'].items():
+            if not service_config.get('enabled', True):
+                continue
             
-            status = 'healthy' if response.status_code == 200 else 'warning'
-            if response.status_code >= 500:
-                status = 'critical'
-            
-            return ServiceMetrics(
-                service_name=service_name,
-                status=status,
-                response_time_ms=response_time,
-                cpu_usage=metrics_data.get('cpu_usage', 0.0),
-                memory_usage=metrics_data.get('memory_usage', 0.0),
-                error_rate=metrics_data.get('error_rate', 0.0),
-                request_count=metrics_data.get('request_count', 0)
-            )
+            if service_name == 'database':
+                probe = self.engine.blocking_probe(self._as_probe_result, self.check_database_service, service_config)
+            elif service_name == 'redis':
+                probe = self.engine.blocking_probe(self._as_probe_result, self.check_redis_service, service_config)
+            else:
+                probe = http_probe(service_config['url'], headers=service_config.get('headers'))
             
-        except requests.exceptions.Timeout:
-            response_time = (time.time() - start_time) * 1000
-            return ServiceMetrics(
-                service_name=service_name,
-                status='critical',
-                response_time_ms=response_time,
-                error_rate=100.0
-            )
-        except requests.exceptions.ConnectionError:
-            response_time = (time.time() - start_time) * 1000
-            return ServiceMetrics(
-                service_name=service_name,
-                status='critical',
-                response_time_ms=response_time,
-                error_rate=100.0
-            )
-        except Exception as e:
-            response_time = (time.time() - start_time) * 1000
-            self.logger.error(f"HTTP service check failed for {service_name}: {str(e)}")
-            return ServiceMetrics(
-                service_name=service_name,
-                status='unknown',
-                response_time_ms=response_time,
-                error_rate=100.0
-            )
+            # A cached result is reused until the service's own check interval
+            # (minus some slack) has passed, so a 30s cycle re-probes a 60s
+            # service every other cycle
+            interval = service_config.get('check_interval', default_interval)
+            self.engine.register(service_name, probe,
+                                 timeout=service_config.get('timeout', 10),
+                                 ttl=interval * 0.9)
+    
+    @staticmethod
+    def _as_probe_result(check: Callable[..., ServiceMetrics], *args) -> ProbeResult:
+        """Run a blocking check and carry its metrics through the engine"""
+        metrics = check(*args)
+        return ProbeResult(status=metrics.status, details={'metrics': {
+            'cpu_usage': metrics.cpu_usage,
+            'memory_usage': metrics.memory_usage,
+            'error_rate': metrics.error_rate,
+            'request_count': metrics.request_count
+        }})
+    
+    @staticmethod
+    def _to_metrics(result: ProbeResult) -> ServiceMetrics:
+        """ServiceMetrics from an engine result (HTTP bodies may report their own metrics)"""
+        details = result.details or {}
+        metrics_data = details.get('metrics')
+        if metrics_data is None:
+            response = details.get('response')
+            metrics_data = response.get('metrics', {}) if isinstance(response, dict) else {}
+        
+        # No response at all (timeout, unreachable) counts as a full error rate
+        no_response = result.status in (STATUS_CRITICAL, STATUS_UNKNOWN) and 'status_code' not in details
+        
+        return ServiceMetrics(
+            service_name=result.name,
+            status=result.status,
+            response_time_ms=result.response_time_ms,
+            cpu_usage=metrics_data.get('cpu_usage', 0.0),
+            memory_usage=metrics_data.get('memory_usage', 0.0),
+            error_rate=metrics_data.get('error_rate', 100.0 if no_response else 0.0),
+            request_count=metrics_data.get('request_count', 0),
+            timestamp=datetime.fromtimestamp(result.checked_at)
+        )
+    
+    async def check_http_service_async(self, service_name: str, service_config: Dict[str, Any]) -> ServiceMetrics:
+        """Check HTTP-based service health on the shared pooled session"""
+        if service_name not in self.engine:
+            self.engine.register(service_name, http_probe(service_config['url'], headers=service_config.get('headers')),
+                                 timeout=service_config.get('timeout', 10))
+        return self._to_metrics(await self.engine.check(service_name, force=True))
+    
+    def check_http_service(self, service_name: str, service_config: Dict[str, Any]) -> ServiceMetrics:
+        """Check HTTP-based service health"""
+        return run_sync(self.check_http_service_async(service_name, service_config))
     
     def check_database_service(self, service_config: Dict[str, Any]) -> ServiceMetrics:
         """Check database service health"""
@@ -312,12 +329,7 @@ class ServiceHealthMonitor:
             )
         
         try:
-            if service_name == 'database':
-                return self.check_database_service(service_config)
-            elif service_name == 'redis':
-                return self.check_redis_service(service_config)
-            else:
-                return self.check_http_service(service_name, service_config)
+            return self._to_metrics(run_sync(self.engine.check(service_name, force=True)))
                 
         except Exception as e:
             self.logger.error(f"Service health check failed for {service_name}: {str(e)}")
@@ -480,41 +492,66 @@ class ServiceHealthMonitor:
         
         return trend
     
-    def run_health_check_cycle(self):
+    def run_health_check_cycle(self, force: bool = True):
         """Run one complete health check cycle for all services"""
+        run_sync(self._run_cycle_and_flush_alerts(force))
+    
+    async def _run_cycle_and_flush_alerts(self, force: bool):
+        await self.run_health_check_cycle_async(force=force)
+        if self._alert_tasks:
+            await asyncio.gather(*list(self._alert_tasks), return_exceptions=True)
+    
+    async def run_health_check_cycle_async(self, force: bool = False):
+        """
+        Check all services concurrently on the health engine
+        
+        Without force, services probed within their check interval keep
+        their cached result and are not recorded again.
+        """
         self.logger.debug("Running health check cycle...")
         
-        with ThreadPoolExecutor(max_workers=len(self.config['services'])) as executor:
-            futures = {
-                executor.submit(self.check_service_health, service_name): service_name
-                for service_name in self.config['services'].keys()
-            }
+        results = await self.engine.run_all(force=force)
+        
+        for service_name, result in results.items():
+            previous = self.current_metrics.get(service_name)
+            if previous is not None and previous.timestamp == datetime.fromtimestamp(result.checked_at):
+                continue  # cached result, already recorded
             
-            for future in futures:
-                service_name = futures[future]
-                try:
-                    metrics = future.result(timeout=30)
-                    
-                    # Store metrics
-                    self.current_metrics[service_name] = metrics
-                    self.metrics_history[service_name].append(metrics)
-                    
-                    # Update service status
-                    old_status = self.service_status.get(service_name, 'unknown')
-                    new_status = metrics.status
-                    self.service_status[service_name] = new_status
-                    
-                    # Check for status changes and alert if necessary
-                    if old_status != new_status:
-                        self._handle_status_change(service_name, old_status, new_status, metrics)
-                    
-                    # Analyze metrics and send alerts if needed
-                    analysis = self.analyze_service_health(metrics)
-                    if analysis['alerts']:
-                        self._handle_alerts(service_name, analysis)
-                    
-                except Exception as e:
-                    self.logger.error(f"Health check failed for {service_name}: {str(e)}")
+            try:
+                metrics = self._to_metrics(result)
+                
+                # Store metrics
+                self.current_metrics[service_name] = metrics
+                self.metrics_history[service_name].append(metrics)
+                
+                # Update service status
+                old_status = self.service_status.get(service_name, 'unknown')
+                new_status = metrics.status
+                self.service_status[service_name] = new_status
+                
+                # Check for status changes and alert if necessary
+                if old_status != new_status:
+                    self._handle_status_change(service_name, old_status, new_status, metrics)
+                
+                # Analyze metrics and send alerts if needed
+                analysis = self.analyze_service_health(metrics)
+                if analysis['alerts']:
+                    self._handle_alerts(service_name, analysis)
+                
+            except Exception as e:
+                self.logger.error(f"Health check failed for {service_name}: {str(e)}")
+    
+    def _dispatch_alert(self, alert):
+        """Send an alert from the monitor's loop without waiting on the webhooks"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            run_sync(alert)
+            return
+        
+        task = loop.create_task(alert)
+        self._alert_tasks.add(task)
+        task.add_done_callback(self._alert_tasks.discard)
     
     def _handle_status_change(self, service_name: str, old_status: str, new_status: str, metrics: ServiceMetrics):
         """Handle service status change"""
@@ -533,7 +570,7 @@ class ServiceHealthMonitor:
             
             severity = 'critical' if new_status == 'critical' else 'warning' if new_status == 'warning' else 'info'
             
-            asyncio.create_task(self.alert_manager.send_alert(
+            self._dispatch_alert(self.alert_manager.send_alert(
                 title=f"Service Status Change: {service_name}",
                 message=f"Service {service_name} status changed from {old_status} to {new_status}",
                 severity=severity,
@@ -554,7 +591,7 @@ class ServiceHealthMonitor:
                     'timestamp': datetime.now().isoformat()
                 }
                 
-                asyncio.create_task(self.alert_manager.send_alert(
+                self._dispatch_alert(self.alert_manager.send_alert(
                     title=f"Service Alert: {service_name}",
                     message=alert['message'],
                     severity=alert['type'],
@@ -570,11 +607,9 @@ class ServiceHealthMonitor:
         self.monitoring_active = True
         self.logger.info("Starting service health monitoring...")
         
-        # Schedule health checks
         interval = self.config['monitoring']['global_check_interval']
-        schedule.every(interval).seconds.do(self.run_health_check_cycle)
         
-        # Start monitoring thread
+        # Start monitoring thread (runs the monitor's event loop)
         self.monitoring_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
         self.monitoring_thread.start()
         
@@ -587,24 +622,38 @@ class ServiceHealthMonitor:
         if self.monitoring_thread:
             self.monitoring_thread.join(timeout=5)
         
-        schedule.clear()
+        self.engine.close()
         self.logger.info("Service health monitoring stopped")
     
     def _monitoring_loop(self):
         """Main monitoring loop"""
+        asyncio.run(run_and_close_sessions(self._monitoring_loop_async()))
+    
+    async def _monitoring_loop_async(self):
+        """One event loop for the monitor's lifetime; HTTP sessions stay warm between cycles"""
+        interval = self.config['monitoring']['global_check_interval']
+        loop = asyncio.get_running_loop()
+        
         while self.monitoring_active:
+            next_run = loop.time() + interval
             try:
-                schedule.run_pending()
-                time.sleep(1)
+                await self.run_health_check_cycle_async()
             except Exception as e:
                 self.logger.error(f"Monitoring loop error: {str(e)}")
-                time.sleep(5)
+                next_run = loop.time() + 5
+            
+            while self.monitoring_active and loop.time() < next_run:
+                await asyncio.sleep(min(1.0, next_run - loop.time()))
+        
+        if self._alert_tasks:
+            await asyncio.gather(*list(self._alert_tasks), return_exceptions=True)
     
     def get_current_status(self) -> Dict[str, Any]:
         """Get current status of all services"""
         return {
             'timestamp': datetime.now().isoformat(),
             'monitoring_active': self.monitoring_active,
+            'engine': self.engine.get_stats(),
             'services': {
                 name: {
                     'status': status,
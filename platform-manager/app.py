@@ -20,6 +20,7 @@ from models.platform_type import PlatformType
 from models.upload_metadata import UploadMetadata, UploadResult
 from utils.config_manager import ConfigManager
 from utils.content_optimizer import ContentOptimizer
+from shared.utils.http_sessions import get_http_session_stats, shutdown_http_sessions
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -81,7 +82,8 @@ def health_check():
         "status": "healthy",
         "service": "platform-manager",
         "timestamp": datetime.now().isoformat(),
-        "platforms_available": platform_manager.get_available_platforms() if platform_manager else []
+        "platforms_available": platform_manager.get_available_platforms() if platform_manager else [],
+        "http_sessions": get_http_session_stats()
     })
 
 @app.route('/platforms', methods=['GET'])
@@ -442,6 +444,7 @@ def internal_error(error):
 
 if __name__ == '__main__':
     import asyncio
+    import atexit
     
     async def startup():
         """Initialize all services"""
@@ -455,6 +458,9 @@ if __name__ == '__main__':
     asyncio.set_event_loop(loop)
     loop.run_until_complete(startup())
     
+    # ปิด HTTP sessions ที่แชร์กันทั้ง process (ทุก event loop ไม่ใช่แค่ loop ของ startup) เมื่อ service หยุด
+    atexit.register(shutdown_http_sessions)
+    
     # Start Flask app
     app.run(
         host='0.0.0.0',
@@ -16,6 +16,11 @@ import hashlib
 import time
 from urllib.parse import urlencode
 
+try:
+    from ....shared.utils.http_sessions import http_session
+except ImportError:
+    from shared.utils.http_sessions import http_session
+
 logger = logging.getLogger(__name__)
 
 class FacebookUploader:
@@ -148,7 +153,7 @@ class FacebookUploader:
             if content_data.get('targeting'):
                 post_data['targeting'] = json.dumps(content_data['targeting'])
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.base_url) as session:
                 async with session.post(endpoint, data=post_data) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -207,7 +212,7 @@ class FacebookUploader:
                 data.add_field('scheduled_publish_time', str(content_data['scheduled_publish_time']))
                 data.add_field('published', 'false')
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.base_url) as session:
                 async with session.post(photo_endpoint, data=data, timeout=300) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -288,7 +293,7 @@ class FacebookUploader:
             if content_data.get('privacy'):
                 data.add_field('privacy', json.dumps(content_data['privacy']))
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.base_url) as session:
                 async with session.post(video_endpoint, data=data, timeout=1800) as response:  # 30 min timeout
                     if response.status == 200:
                         result = await response.json()
@@ -330,7 +335,7 @@ class FacebookUploader:
                 'file_size': file_size
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.base_url) as session:
                 async with session.post(init_endpoint, data=init_data) as response:
                     if response.status != 200:
                         error_text = await response.text()
@@ -451,7 +456,7 @@ class FacebookUploader:
                 post_data['scheduled_publish_time'] = content_data['scheduled_publish_time']
                 post_data['published'] = False
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.base_url) as session:
                 async with session.post(endpoint, data=post_data) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -510,7 +515,7 @@ class FacebookUploader:
                 if content_data.get(field):
                     event_data[field] = content_data[field]
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.base_url) as session:
                 async with session.post(event_endpoint, data=event_data) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -559,7 +564,7 @@ class FacebookUploader:
             if content_data.get('privacy'):
                 live_data['privacy'] = json.dumps(content_data['privacy'])
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.base_url) as session:
                 async with session.post(live_endpoint, data=live_data) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -705,7 +710,7 @@ class FacebookUploader:
                 'metric': 'post_impressions,post_engaged_users,post_reactions_like_total,post_clicks'
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.base_url) as session:
                 async with session.get(insights_endpoint, params=params) as response:
                     if response.status == 200:
                         return await response.json()
@@ -726,7 +731,7 @@ class FacebookUploader:
             
             params = {'access_token': access_token}
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(self.base_url) as session:
                 async with session.delete(delete_endpoint, params=params) as response:
                     return response.status == 200
                     
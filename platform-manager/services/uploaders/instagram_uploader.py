@@ -15,6 +15,19 @@ from pathlib import Path
 import hashlib
 import time
 
+try:
+    from ....shared.utils.http_sessions import http_session
+except ImportError:
+    from shared.utils.http_sessions import http_session
+try:
+    from ....shared.utils.job_poller import (
+        JobPoller, JobState, JobUpdate, JobFailedError, JobTimeoutError, PollSchedule, get_job_poller
+    )
+except ImportError:
+    from shared.utils.job_poller import (
+        JobPoller, JobState, JobUpdate, JobFailedError, JobTimeoutError, PollSchedule, get_job_poller
+    )
+
 logger = logging.getLogger(__name__)
 
 class InstagramUploader:
@@ -365,7 +378,7 @@ class InstagramUploader:
             data.add_field('media_type', media_type)
             data.add_field('access_token', self.access_token)
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(url) as session:
                 async with session.post(url, data=data, timeout=300) as response:  # 5 min timeout for large files
                     if response.status == 200:
                         result = await response.json()
@@ -405,7 +418,7 @@ class InstagramUploader:
             if metadata.get('user_tags'):
                 params['user_tags'] = json.dumps(metadata['user_tags'])
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(url) as session:
                 async with session.post(url, params=params) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -446,7 +459,7 @@ class InstagramUploader:
             if metadata.get('location_id'):
                 params['location_id'] = metadata['location_id']
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(url) as session:
                 async with session.post(url, params=params) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -466,51 +479,69 @@ class InstagramUploader:
             logger.error(f"Error creating carousel container: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _get_job_poller(self) -> JobPoller:
+        """Shared poller for all uploaders using the same access token"""
+        token_hash = hashlib.sha1((self.access_token or '').encode()).hexdigest()[:12]
+        return get_job_poller(
+            f"instagram:{token_hash}",
+            lambda: JobPoller(
+                name='instagram',
+                check_batch=self._check_containers_status,
+                schedule=PollSchedule(initial_interval=3.0, max_interval=30.0),
+                # Graph API multi-id lookups accept up to 50 ids
+                batch_size=50,
+                default_timeout=300,
+                base_url=self.base_url
+            )
+        )
+    
+    async def _check_containers_status(self, session: aiohttp.ClientSession,
+                                       container_ids: List[str]) -> Dict[str, JobUpdate]:
+        """Check processing status of several containers in one Graph API request"""
+        params = {
+            'ids': ','.join(container_ids),
+            'access_token': self.access_token,
+            'fields': 'status_code,status'
+        }
+        
+        async with session.get(f"{self.base_url}/", params=params) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"Status check failed: {response.status} - {error_text}")
+                return {}
+            result = await response.json()
+        
+        updates = {}
+        for container_id, container in result.items():
+            status_code = container.get('status_code')
+            
+            if status_code in ('FINISHED', 'PUBLISHED'):
+                updates[container_id] = JobUpdate(JobState.COMPLETED)
+            elif status_code in ('ERROR', 'EXPIRED'):
+                updates[container_id] = JobUpdate(
+                    JobState.FAILED,
+                    error=f"Video processing failed: {container.get('status') or status_code}"
+                )
+            else:
+                if status_code != 'IN_PROGRESS':
+                    logger.warning(f"Unknown status code: {status_code}")
+                updates[container_id] = JobUpdate(JobState.PENDING)
+        
+        return updates
+    
     async def _wait_for_video_processing(self, container_id: str, max_wait_time: int = 300) -> Dict[str, Any]:
         """Wait for video processing to complete"""
         try:
-            start_time = time.time()
-            
-            while time.time() - start_time < max_wait_time:
-                # Check container status
-                url = f"{self.base_url}/{container_id}"
-                params = {
-                    'access_token': self.access_token,
-                    'fields': 'status_code,status'
-                }
-                
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, params=params) as response:
-                        if response.status == 200:
-                            result = await response.json()
-                            status_code = result.get('status_code')
-                            
-                            if status_code == 'FINISHED':
-                                return {'success': True}
-                            elif status_code == 'ERROR':
-                                return {
-                                    'success': False,
-                                    'error': 'Video processing failed'
-                                }
-                            elif status_code == 'IN_PROGRESS':
-                                # Continue waiting
-                                await asyncio.sleep(5)
-                                continue
-                            else:
-                                logger.warning(f"Unknown status code: {status_code}")
-                                await asyncio.sleep(5)
-                                continue
-                        else:
-                            error_text = await response.text()
-                            logger.error(f"Status check failed: {response.status} - {error_text}")
-                            await asyncio.sleep(5)
-                            continue
+            await self._get_job_poller().wait(container_id, timeout=max_wait_time)
+            return {'success': True}
             
+        except JobFailedError as e:
+            return {'success': False, 'error': str(e)}
+        except JobTimeoutError:
             return {
                 'success': False,
                 'error': 'Video processing timeout'
             }
-            
         except Exception as e:
             logger.error(f"Error waiting for video processing: {e}")
             return {'success': False, 'error': str(e)}
@@ -525,7 +556,7 @@ class InstagramUploader:
                 'creation_id': container_id
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(url) as session:
                 async with session.post(url, params=params) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -654,7 +685,7 @@ class InstagramUploader:
                 'fields': 'id,media_type,media_url,permalink,timestamp,caption'
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(url) as session:
                 async with session.get(url, params=params) as response:
                     if response.status == 200:
                         return await response.json()
@@ -672,7 +703,7 @@ class InstagramUploader:
             url = f"{self.base_url}/{media_id}"
             params = {'access_token': self.access_token}
             
-            async with aiohttp.ClientSession() as session:
+            async with http_session(url) as session:
                 async with session.delete(url, params=params) as response:
                     return response.status == 200
                     
@@ -18,6 +18,10 @@ import time
 
 from ...models.upload_metadata import UploadMetadata, UploadResult
 from ...models.platform_type import PlatformRegistry, PlatformType
+try:
+    from ....shared.utils.http_sessions import get_http_session, http_session
+except ImportError:
+    from shared.utils.http_sessions import get_http_session, http_session
 
 logger = logging.getLogger(__name__)
 
@@ -184,18 +188,10 @@ class TikTokUploader:
                 error=str(e)
             )
     
-    async def _get_http_session(self) -> aiohttp.ClientSession:
-        """ได้รับ HTTP session สำหรับ API calls"""
-        
-        if not self.session or self.session.closed:
-            connector = aiohttp.TCPConnector(limit=10)
-            timeout = aiohttp.ClientTimeout(total=300)  # 5 minutes timeout
-            
-            self.session = aiohttp.ClientSession(
-                connector=connector,
-                timeout=timeout
-            )
+    async def _get_http_session(self, url: Optional[str] = None) -> aiohttp.ClientSession:
+        """ได้รับ HTTP session ที่แชร์ต่อ host สำหรับ API calls (ค่าเริ่มต้นคือ BASE_URL)"""
         
+        self.session = get_http_session(url or self.BASE_URL)
         return self.session
     
     async def _get_auth_headers(self) -> Dict[str, str]:
@@ -361,7 +357,7 @@ class TikTokUploader:
         """อัปโหลดไฟล์วิดีโอจริง"""
         
         try:
-            session = await self._get_http_session()
+            session = await self._get_http_session(upload_url)
             
             # Upload file using multipart form data
             with open(video_path, 'rb') as video_file:
@@ -619,10 +615,9 @@ class TikTokUploader:
             return None
     
     async def close(self) -> None:
-        """ปิด HTTP session"""
+        """ปล่อย HTTP session (session แชร์ทั้ง process ปิดตอน shutdown ด้วย close_http_sessions)"""
         
-        if self.session and not self.session.closed:
-            await self.session.close()
+        self.session = None
 
 # Utility functions for OAuth setup
 def get_oauth_url(client_key: str, redirect_uri: str, state: str = None) -> str:
@@ -655,7 +650,7 @@ async def exchange_code_for_token(
             "redirect_uri": redirect_uri
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with http_session(TikTokUploader.TOKEN_URL) as session:
             async with session.post(
                 TikTokUploader.TOKEN_URL,
                 json=payload
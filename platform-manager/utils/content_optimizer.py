@@ -34,6 +34,10 @@ from ...shared.constants.platform_constants import (
     get_optimal_resolution, calculate_aspect_ratio
 )
 from ...shared.utils.error_handler import handle_async_errors, ContentOptimizationError
+from ...shared.utils.video_transcoder import (
+    MultiPlatformTranscoder, RenditionTarget, TranscodeError, PLATFORM_VIDEO_BITRATES
+)
+from .image_pipeline import ImageVariantPipeline, RenditionSpec
 
 class ContentOptimizer:
     """
@@ -53,6 +57,19 @@ class ContentOptimizer:
         # Cache for optimized content
         self._optimization_cache = {}
         
+        # Decode-once image pipeline (renditions cached by source hash)
+        self.image_pipeline = ImageVariantPipeline(
+            self.temp_dir,
+            quality=self.image_quality,
+            max_workers=self.config.get('image_workers')
+        ) if Image else None
+        
+        # Single-pass multi-platform video transcode
+        self.transcoder = MultiPlatformTranscoder()
+        self.video_bitrates = {**PLATFORM_VIDEO_BITRATES, **self.config.get('video_bitrates', {})}
+        # (path, mtime, size, platform) -> output path; ไฟล์ที่ถูกแก้ไขจะได้ key ใหม่
+        self._video_renditions: Dict[Tuple[str, float, int, str], str] = {}
+        
         # Statistics
         self.stats = {
             'optimizations_performed': 0,
@@ -132,8 +149,54 @@ class ContentOptimizer:
             self.logger.error(f"Content optimization failed: {str(e)}")
             raise ContentOptimizationError(f"Optimization failed: {str(e)}")
     
+    def _video_target(self, platform: PlatformType) -> RenditionTarget:
+        platform_spec = get_platform_spec(platform)
+        return RenditionTarget(
+            platform=platform.value,
+            resolution=tuple(get_optimal_resolution(platform)),
+            bitrate=self.video_bitrates.get(platform.value, self.video_bitrates.get('youtube')),
+            max_duration=platform_spec.max_video_duration if platform_spec else None
+        )
+    
+    async def prepare_video_renditions(self, content: Dict[str, Any], platforms: List[PlatformType]) -> Dict[str, str]:
+        """
+        Transcode วิดีโอสำหรับทุก platform ใน ffmpeg pass เดียว
+        
+        ผลลัพธ์ถูกเก็บไว้ให้ _optimize_video ใช้แทนการ decode/encode ซ้ำต่อ platform
+        """
+        video_path = content.get('video_path')
+        if not video_path or not os.path.exists(video_path) or not self.transcoder.is_available():
+            return {}
+        
+        source_key = self._video_source_key(video_path)
+        pending = [p for p in platforms if (*source_key, p.value) not in self._video_renditions]
+        if pending:
+            outputs = await self.transcoder.transcode(
+                video_path, [self._video_target(p) for p in pending], self.temp_dir
+            )
+            for platform_value, output_path in outputs.items():
+                self._video_renditions[(*source_key, platform_value)] = output_path
+        
+        return {p.value: self._video_renditions[(*source_key, p.value)] for p in platforms
+                if (*source_key, p.value) in self._video_renditions}
+    
+    @staticmethod
+    def _video_source_key(video_path: str) -> Tuple[str, float, int]:
+        stat = os.stat(video_path)
+        return video_path, stat.st_mtime, stat.st_size
+    
     async def _optimize_video(self, content: Dict[str, Any], platform: PlatformType) -> Dict[str, Any]:
         """Optimize video content for platform"""
+        video_path = content.get('video_path')
+        rendition = None
+        if video_path and os.path.exists(video_path):
+            rendition = self._video_renditions.get((*self._video_source_key(video_path), platform.value))
+        if rendition and os.path.exists(rendition):
+            content['video_path'] = rendition
+            content['optimized_resolution'] = tuple(get_optimal_resolution(platform))
+            content['video_optimized'] = True
+            return content
+        
         if not VideoFileClip:
             self.logger.warning("Video optimization skipped - MoviePy not available")
             return content
@@ -208,9 +271,6 @@ class ContentOptimizer:
             self.logger.warning("Image optimization skipped - Pillow not available")
             return content
         
-        platform_spec = get_platform_spec(platform)
-        optimizations = PLATFORM_OPTIMIZATIONS.get(platform, {})
-        
         # Optimize main image
         if 'image_path' in content:
             content['image_path'] = await self._optimize_single_image(
@@ -221,16 +281,64 @@ class ContentOptimizer:
         
         # Optimize thumbnail
         if 'thumbnail_path' in content:
-            thumbnail_size = optimizations.get('thumbnail_size', (1280, 720))
             content['thumbnail_path'] = await self._optimize_single_image(
                 content['thumbnail_path'],
                 platform,
                 'thumbnail',
-                target_size=thumbnail_size
+                target_size=self._thumbnail_size(platform)
             )
         
         return content
     
+    def _thumbnail_size(self, platform: PlatformType) -> Tuple[int, int]:
+        return PLATFORM_OPTIMIZATIONS.get(platform, {}).get('thumbnail_size', (1280, 720))
+    
+    def _image_rendition_specs(self, content: Dict[str, Any], platforms: List[PlatformType]) -> Dict[str, List[RenditionSpec]]:
+        """รวบรวม rendition ทั้งหมดของทุก platform แยกตามไฟล์ต้นฉบับ"""
+        jobs: Dict[str, List[RenditionSpec]] = {}
+        for platform in platforms:
+            if content.get('image_path'):
+                jobs.setdefault(content['image_path'], []).append(
+                    RenditionSpec(platform.value, 'main_image', tuple(get_optimal_resolution(platform)))
+                )
+            if content.get('thumbnail_path'):
+                jobs.setdefault(content['thumbnail_path'], []).append(
+                    RenditionSpec(platform.value, 'thumbnail', tuple(self._thumbnail_size(platform)))
+                )
+        return jobs
+    
+    async def prepare_image_renditions(self, content: Dict[str, Any], platforms: List[PlatformType]) -> Dict[str, Dict]:
+        """
+        สร้าง rendition ของทุก platform ล่วงหน้าในครั้งเดียว
+        
+        ภาพต้นฉบับแต่ละไฟล์ถูก decode ครั้งเดียว และ rendition ถูกสร้างพร้อมกันใน
+        thread pool; _optimize_single_image จะได้ผลจาก cache ในภายหลัง
+        """
+        if not self.image_pipeline:
+            return {}
+        
+        jobs = [
+            (path, specs) for path, specs in self._image_rendition_specs(content, platforms).items()
+            if os.path.exists(path)
+        ]
+        if not jobs:
+            return {}
+        
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, self.image_pipeline.render_many, jobs, self._postprocess_image
+        )
+    
+    def _postprocess_image(self, img: "Image.Image", platform_value: str) -> "Image.Image":
+        """Apply platform-specific enhancements"""
+        if platform_value == PlatformType.INSTAGRAM.value:
+            # Instagram likes vibrant colors
+            return self._enhance_colors(img)
+        if platform_value == PlatformType.LINKEDIN.value:
+            # LinkedIn prefers professional look
+            return self._apply_professional_filter(img)
+        return img
+    
     async def _optimize_single_image(self, 
                                    image_path: str, 
                                    platform: PlatformType,
@@ -241,34 +349,16 @@ class ContentOptimizer:
             return image_path
         
         try:
-            with Image.open(image_path) as img:
-                # Convert to RGB if needed
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Get target size
-                if not target_size:
-                    target_size = get_optimal_resolution(platform)
-                
-                # Resize maintaining aspect ratio
-                img = fit(img, target_size, method=Image.Resampling.LANCZOS)
-                
-                # Apply platform-specific enhancements
-                if platform == PlatformType.INSTAGRAM:
-                    # Instagram likes vibrant colors
-                    img = self._enhance_colors(img)
-                elif platform == PlatformType.LINKEDIN:
-                    # LinkedIn prefers professional look
-                    img = self._apply_professional_filter(img)
-                
-                # Generate output path
-                output_filename = f"optimized_{platform.value}_{image_type}_{os.path.basename(image_path)}"
-                output_path = os.path.join(self.temp_dir, output_filename)
-                
-                # Save optimized image
-                img.save(output_path, 'JPEG', quality=self.image_quality, optimize=True)
-                
-                return output_path
+            # Get target size
+            if not target_size:
+                target_size = get_optimal_resolution(platform)
+            
+            spec = RenditionSpec(platform.value, image_type, tuple(target_size))
+            loop = asyncio.get_event_loop()
+            renditions = await loop.run_in_executor(
+                None, self.image_pipeline.render, image_path, [spec], self._postprocess_image
+            )
+            return renditions.get(spec, image_path)
                 
         except Exception as e:
             self.logger.error(f"Image optimization failed: {str(e)}")
@@ -564,6 +654,17 @@ class ContentOptimizer:
         """Optimize multiple content items for multiple platforms"""
         results = {}
         
+        # Decode each source once and render every platform's variants up front
+        for content in content_list:
+            try:
+                await self.prepare_image_renditions(content, platforms)
+            except Exception as e:
+                self.logger.warning(f"Image rendition prefetch failed: {str(e)}")
+            try:
+                await self.prepare_video_renditions(content, platforms)
+            except TranscodeError as e:
+                self.logger.warning(f"Single-pass video transcode failed, falling back per platform: {str(e)}")
+        
         for platform in platforms:
             results[platform.value] = []
             
@@ -588,12 +689,16 @@ class ContentOptimizer:
             'cache_hit_rate': self.stats['cache_hits'] / max(1, self.stats['optimizations_performed']),
             'total_processing_time': self.stats['total_processing_time'],
             'avg_processing_time': self.stats['total_processing_time'] / max(1, self.stats['optimizations_performed']),
-            'cache_size': len(self._optimization_cache)
+            'cache_size': len(self._optimization_cache),
+            'image_pipeline': dict(self.image_pipeline.stats) if self.image_pipeline else {}
         }
     
     def clear_cache(self):
         """Clear optimization cache"""
         self._optimization_cache.clear()
+        self._video_renditions.clear()
+        if self.image_pipeline:
+            self.image_pipeline.clear()
         self.logger.info("Optimization cache cleared")
     
     async def cleanup_temp_files(self):
@@ -0,0 +1,205 @@
+"""
+Image Variant Pipeline
+Decode ภาพต้นฉบับครั้งเดียว แล้วสร้างทุก rendition ของทุก platform จาก downscale pyramid
+"""
+
+import os
+import io
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image
+    from PIL.ImageOps import fit
+except ImportError:
+    Image = None
+    logging.warning("Pillow not available. Image variant pipeline disabled.")
+
+@dataclass(frozen=True)
+class RenditionSpec:
+    """หนึ่ง rendition ที่ต้องการ เช่น ('youtube', 'thumbnail', (1280, 720))"""
+    platform: str
+    image_type: str
+    size: Tuple[int, int]
+
+class ImagePyramid:
+    """ภาพที่ decode แล้วพร้อม level ที่ย่อทีละครึ่ง (สร้างเมื่อจำเป็น)"""
+
+    def __init__(self, image: "Image.Image"):
+        self.levels: List["Image.Image"] = [image]
+        self._lock = threading.Lock()
+
+    def level_for(self, size: Tuple[int, int]) -> "Image.Image":
+        """เลือก level ที่เล็กที่สุดที่ยังครอบคลุม crop ของ size เป้าหมาย
+
+        ImageOps.fit crop ตามสัดส่วนแล้ว resize ดังนั้น level ต้องมีขนาด
+        อย่างน้อย 2 เท่าของเป้าหมายในแกนที่ถูกย่อเพื่อคงคุณภาพ LANCZOS
+        """
+        target_w, target_h = size
+        with self._lock:
+            level = self.levels[0]
+            index = 0
+            while True:
+                src_w, src_h = level.size
+                # สเกลที่ fit ต้องใช้ (ด้านที่บีบน้อยสุดตามสัดส่วน crop)
+                scale = max(target_w / src_w, target_h / src_h)
+                if scale > 0.25 or src_w < 4 or src_h < 4:
+                    return level
+                index += 1
+                if index >= len(self.levels):
+                    self.levels.append(level.reduce(2))
+                level = self.levels[index]
+
+class ImageVariantPipeline:
+    """
+    สร้าง rendition หลายขนาดจากภาพเดียวโดย decode เพียงครั้งเดียว
+
+    - ภาพต้นฉบับถูก hash (sha256) จาก bytes ที่อ่านมาเพื่อ decode อยู่แล้ว
+    - pyramid ที่ decode แล้วเก็บใน LRU เล็กๆ ต่อ source hash
+    - rendition set ที่เขียนแล้วถูก cache ต่อ (source hash, spec)
+    - การ resize/encode รันใน thread pool (Pillow ปล่อย GIL ระหว่างทำงาน)
+    """
+
+    def __init__(self,
+                 output_dir: str,
+                 quality: int = 85,
+                 max_workers: Optional[int] = None,
+                 max_cached_sources: int = 8):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self.quality = quality
+        self.max_cached_sources = max_cached_sources
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or min(8, (os.cpu_count() or 1) + 2))
+        self._pyramids: "OrderedDict[str, ImagePyramid]" = OrderedDict()
+        self._renditions: Dict[Tuple[str, RenditionSpec], str] = {}
+        self._path_hashes: Dict[Tuple[str, float, int], str] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'sources_decoded': 0,
+            'renditions_written': 0,
+            'rendition_cache_hits': 0
+        }
+
+    def render(self,
+               image_path: str,
+               specs: List[RenditionSpec],
+               postprocess: Optional[Callable[["Image.Image", str], "Image.Image"]] = None
+               ) -> Dict[RenditionSpec, str]:
+        """สร้างทุก rendition ของภาพเดียว คืน dict spec -> output path"""
+        source_hash = self._source_hash(image_path)
+
+        results: Dict[RenditionSpec, str] = {}
+        pending: List[RenditionSpec] = []
+        with self._lock:
+            for spec in specs:
+                cached = self._renditions.get((source_hash, spec))
+                if cached and os.path.exists(cached):
+                    results[spec] = cached
+                    self.stats['rendition_cache_hits'] += 1
+                else:
+                    pending.append(spec)
+
+        if not pending:
+            return results
+
+        pyramid = self._get_pyramid(image_path, source_hash)
+        futures = {
+            spec: self._executor.submit(self._write_rendition, pyramid, image_path, source_hash, spec, postprocess)
+            for spec in pending
+        }
+        for spec, future in futures.items():
+            try:
+                results[spec] = future.result()
+            except Exception as e:
+                self.logger.error(f"Rendition {spec} failed: {str(e)}")
+                results[spec] = image_path
+
+        return results
+
+    def render_many(self,
+                    jobs: List[Tuple[str, List[RenditionSpec]]],
+                    postprocess: Optional[Callable[["Image.Image", str], "Image.Image"]] = None
+                    ) -> Dict[str, Dict[RenditionSpec, str]]:
+        """สร้าง rendition ของหลายภาพพร้อมกัน (แต่ละภาพ decode ครั้งเดียว)"""
+        with ThreadPoolExecutor(max_workers=max(1, min(len(jobs), 4))) as outer:
+            futures = {path: outer.submit(self.render, path, specs, postprocess) for path, specs in jobs}
+            return {path: future.result() for path, future in futures.items()}
+
+    def _source_hash(self, image_path: str) -> str:
+        stat = os.stat(image_path)
+        key = (image_path, stat.st_mtime, stat.st_size)
+        with self._lock:
+            cached = self._path_hashes.get(key)
+        if cached:
+            return cached
+
+        digest = hashlib.sha256()
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        source_hash = digest.hexdigest()
+
+        with self._lock:
+            self._path_hashes[key] = source_hash
+        return source_hash
+
+    def _get_pyramid(self, image_path: str, source_hash: str) -> ImagePyramid:
+        with self._lock:
+            pyramid = self._pyramids.get(source_hash)
+            if pyramid is not None:
+                self._pyramids.move_to_end(source_hash)
+                return pyramid
+
+        with open(image_path, 'rb') as f:
+            data = f.read()
+        img = Image.open(io.BytesIO(data))
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        else:
+            img.load()
+        pyramid = ImagePyramid(img)
+
+        with self._lock:
+            self.stats['sources_decoded'] += 1
+            self._pyramids[source_hash] = pyramid
+            while len(self._pyramids) > self.max_cached_sources:
+                self._pyramids.popitem(last=False)
+        return pyramid
+
+    def _write_rendition(self,
+                         pyramid: ImagePyramid,
+                         image_path: str,
+                         source_hash: str,
+                         spec: RenditionSpec,
+                         postprocess: Optional[Callable]) -> str:
+        level = pyramid.level_for(spec.size)
+        img = fit(level, spec.size, method=Image.Resampling.LANCZOS)
+        if postprocess:
+            img = postprocess(img, spec.platform)
+
+        # hash + ขนาดอยู่ในชื่อไฟล์ เพื่อให้ภาพต่างต้นฉบับที่ชื่อซ้ำกันไม่เขียนทับกัน
+        stem = os.path.splitext(os.path.basename(image_path))[0]
+        width, height = spec.size
+        output_filename = (f"optimized_{spec.platform}_{spec.image_type}_{width}x{height}_"
+                           f"{source_hash[:16]}_{stem}.jpg")
+        output_path = os.path.join(self.output_dir, output_filename)
+        img.save(output_path, 'JPEG', quality=self.quality, optimize=True)
+
+        with self._lock:
+            self._renditions[(source_hash, spec)] = output_path
+            self.stats['renditions_written'] += 1
+        return output_path
+
+    def clear(self):
+        """ล้าง cache ทั้งหมด"""
+        with self._lock:
+            self._pyramids.clear()
+            self._renditions.clear()
+            self._path_hashes.clear()
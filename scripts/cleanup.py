@@ -59,6 +59,7 @@ class SystemCleaner:
                 'temp_files_retention_hours': 24,
                 'log_files_retention_days': 14,
                 'backup_files_retention_days': 30,
+                'backup_assets_before_cleanup': True,
                 'cache_clear_patterns': ['trend_*', 'content_*', 'upload_*']
             },
             'directories': {
@@ -224,6 +225,100 @@ class SystemCleaner:
                         except Exception:
                             pass  # Directory might not be empty or accessible
             
+            freed_space_mb = freed_space / (1024 * 1024)
+            self.logger.info(f"Cleaned up {cleaned_files} temporary files, freed {freed_space_mb:.2f} MB")
+            
+            return {
+                'temp_files_deleted': cleaned_files,
+                'space_freed_mb': round(freed_space_mb, 2)
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Temporary files cleanup failed: {str(e)}")
+            return {'temp_files_deleted': 0, 'space_freed_mb': 0}
+    
+    def cleanup_log_files(self) -> Dict[str, int]:
+        """Clean up old log files"""
+        try:
+            self.logger.info("Starting log files cleanup...")
+            
+            retention_days = self.config['cleanup_settings']['log_files_retention_days']
+            cutoff_date = datetime.now() - timedelta(days=retention_days)
+            
+            log_dir = self.config['directories']['log_dir']
+            
+            if not os.path.exists(log_dir):
+                self.logger.info("Log directory does not exist")
+                return {'log_files_deleted': 0}
+            
+            cleaned_files = 0
+            freed_space = 0
+            
+            for file in os.listdir(log_dir):
+                if not file.endswith('.log'):
+                    continue
+                    
+                file_path = os.path.join(log_dir, file)
+                
+                try:
+                    file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
+                    
+                    if file_mtime < cutoff_date:
+                        file_size = os.path.getsize(file_path)
+                        os.remove(file_path)
+                        cleaned_files += 1
+                        freed_space += file_size
+                        
+                except Exception as e:
+                    self.logger.warning(f"Could not delete log file {file_path}: {str(e)}")
+            
+            freed_space_mb = freed_space / (1024 * 1024)
+            self.logger.info(f"Cleaned up {cleaned_files} log files, freed {freed_space_mb:.2f} MB")
+            
+            return {
+                'log_files_deleted': cleaned_files,
+                'log_space_freed_mb': round(freed_space_mb, 2)
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Log files cleanup failed: {str(e)}")
+            return {'log_files_deleted': 0, 'log_space_freed_mb': 0}
+    
+    def cleanup_backup_files(self) -> Dict[str, int]:
+        """Clean up old backup files"""
+        try:
+            self.logger.info("Starting backup files cleanup...")
+            
+            retention_days = self.config['cleanup_settings']['backup_files_retention_days']
+            cutoff_date = datetime.now() - timedelta(days=retention_days)
+            
+            backup_dir = self.config['directories']['backup_dir']
+            
+            if not os.path.exists(backup_dir):
+                self.logger.info("Backup directory does not exist")
+                return {'backup_files_deleted': 0}
+            
+            cleaned_files = 0
+            freed_space = 0
+            
+            for file in os.listdir(backup_dir):
+                if not (file.endswith('.sql') or file.endswith('.dump')):
+                    continue
+                    
+                file_path = os.path.join(backup_dir, file)
+                
+                try:
+                    file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
+                    
+                    if file_mtime < cutoff_date:
+                        file_size = os.path.getsize(file_path)
+                        os.remove(file_path)
+                        cleaned_files += 1
+                        freed_space += file_size
+                        
+                except Exception as e:
+                    self.logger.warning(f"Could not delete backup file {file_path}: {str(e)}")
+            
             freed_space_mb = freed_space / (1024 * 1024)
             self.logger.info(f"Cleaned up {cleaned_files} backup files, freed {freed_space_mb:.2f} MB")
             
@@ -269,6 +364,21 @@ class SystemCleaner:
             self.logger.error(f"Redis cache cleanup failed: {str(e)}")
             return {'cache_keys_deleted': 0}
     
+    def backup_generated_content(self, content_dir: str) -> bool:
+        """Run an incremental asset backup of generated content"""
+        try:
+            sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database', 'backup'))
+            from asset_backup import AssetBackup
+            
+            result = AssetBackup(self.config.get('asset_backup_config')).create_backup(content_dir)
+            if result['success']:
+                self.logger.info(f"Generated content backed up: {result['backup_id']} ({result['chunks_new']} new chunks)")
+            return result['success']
+            
+        except Exception as e:
+            self.logger.error(f"Asset backup failed: {str(e)}")
+            return False
+    
     def cleanup_generated_content(self) -> Dict[str, int]:
         """Clean up old generated content files"""
         try:
@@ -280,6 +390,12 @@ class SystemCleaner:
                 self.logger.info("Generated content directory does not exist")
                 return {'content_files_deleted': 0}
             
+            # Deleted assets must be recoverable from an asset backup
+            if self.config['cleanup_settings'].get('backup_assets_before_cleanup', True):
+                if not self.backup_generated_content(content_dir):
+                    self.logger.warning("Asset backup failed - skipping generated content cleanup")
+                    return {'content_files_deleted': 0, 'content_space_freed_mb': 0}
+            
             # Get content items that are published and older than 7 days
             cutoff_date = datetime.now() - timedelta(days=7)
             
@@ -559,98 +675,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()024)
-            self.logger.info(f"Cleaned up {cleaned_files} temporary files, freed {freed_space_mb:.2f} MB")
-            
-            return {
-                'temp_files_deleted': cleaned_files,
-                'space_freed_mb': round(freed_space_mb, 2)
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Temporary files cleanup failed: {str(e)}")
-            return {'temp_files_deleted': 0, 'space_freed_mb': 0}
-    
-    def cleanup_log_files(self) -> Dict[str, int]:
-        """Clean up old log files"""
-        try:
-            self.logger.info("Starting log files cleanup...")
-            
-            retention_days = self.config['cleanup_settings']['log_files_retention_days']
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
-            
-            log_dir = self.config['directories']['log_dir']
-            
-            if not os.path.exists(log_dir):
-                self.logger.info("Log directory does not exist")
-                return {'log_files_deleted': 0}
-            
-            cleaned_files = 0
-            freed_space = 0
-            
-            for file in os.listdir(log_dir):
-                if not file.endswith('.log'):
-                    continue
-                    
-                file_path = os.path.join(log_dir, file)
-                
-                try:
-                    file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    
-                    if file_mtime < cutoff_date:
-                        file_size = os.path.getsize(file_path)
-                        os.remove(file_path)
-                        cleaned_files += 1
-                        freed_space += file_size
-                        
-                except Exception as e:
-                    self.logger.warning(f"Could not delete log file {file_path}: {str(e)}")
-            
-            freed_space_mb = freed_space / (1024 * 1024)
-            self.logger.info(f"Cleaned up {cleaned_files} log files, freed {freed_space_mb:.2f} MB")
-            
-            return {
-                'log_files_deleted': cleaned_files,
-                'log_space_freed_mb': round(freed_space_mb, 2)
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Log files cleanup failed: {str(e)}")
-            return {'log_files_deleted': 0, 'log_space_freed_mb': 0}
-    
-    def cleanup_backup_files(self) -> Dict[str, int]:
-        """Clean up old backup files"""
-        try:
-            self.logger.info("Starting backup files cleanup...")
-            
-            retention_days = self.config['cleanup_settings']['backup_files_retention_days']
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
-            
-            backup_dir = self.config['directories']['backup_dir']
-            
-            if not os.path.exists(backup_dir):
-                self.logger.info("Backup directory does not exist")
-                return {'backup_files_deleted': 0}
-            
-            cleaned_files = 0
-            freed_space = 0
-            
-            for file in os.listdir(backup_dir):
-                if not (file.endswith('.sql') or file.endswith('.dump')):
-                    continue
-                    
-                file_path = os.path.join(backup_dir, file)
-                
-                try:
-                    file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-                    
-                    if file_mtime < cutoff_date:
-                        file_size = os.path.getsize(file_path)
-                        os.remove(file_path)
-                        cleaned_files += 1
-                        freed_space += file_size
-                        
-                except Exception as e:
-                    self.logger.warning(f"Could not delete backup file {file_path}: {str(e)}")
-            
-            freed_space_mb = freed_space / (1024 * 1
\ No newline at end of file
+    main()
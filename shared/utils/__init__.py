@@ -7,39 +7,32 @@ all services in the AI Content Factory system.
 
 Utilities included:
 - Logger: Centralized logging with structured output
-- Cache: Redis-based caching with TTL support  
+- Cache: In-memory and Redis caching with TTL support
 - RateLimiter: API rate limiting and throttling
 - ErrorHandler: Exception handling and error reporting
-- ConfigManager: Configuration management
-- FileManager: File operations and management
-- DateUtils: Date/time utilities
-- StringUtils: String processing utilities
-- ValidationUtils: Data validation utilities
-- CryptoUtils: Encryption and security utilities
+
+Submodules such as http_sessions, job_poller or snapshot_cache are imported
+directly (`from shared.utils.http_sessions import get_http_session`); this
+package only re-exports the core utilities above.
 
 Usage:
-    from shared.utils import logger, cache, rate_limiter
-    
+    from shared.utils import get_logger, get_rate_limiter
+
+    logger = get_logger("trend_monitor")
     logger.info("Starting process")
-    cache.set("key", "value", ttl=3600)
-    rate_limiter.check_limit("api_call", max_calls=100)
+    get_rate_limiter().is_allowed("openai")
 """
 
 import os
 import sys
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 # Import all utility modules
-from .logger import get_logger, setup_logging, LogConfig
-from .cache import CacheManager, RedisCache, MemoryCache
-from .rate_limiter import RateLimiter, TokenBucket, SlidingWindow
-from .error_handler import ErrorHandler, ErrorReporter, handle_errors
-from .config_manager import ConfigManager, load_config, get_config
-from .file_manager import FileManager, S3Manager, LocalFileManager
-from .date_utils import DateUtils, format_datetime, parse_datetime
-from .string_utils import StringUtils, sanitize_string, generate_slug
-from .validation_utils import ValidationUtils, validate_email, validate_phone
-from .crypto_utils import CryptoUtils, hash_password, encrypt_data
+from .logger import ContentFactoryLogger, LogContext, setup_logger, shutdown_logging
+from .cache import SmartCache, RedisCache, MemoryCache
+from .rate_limiter import RateLimiter, RateLimitConfig, TokenBucket, SlidingWindowLimiter
+from .error_handler import ErrorHandler, handle_errors
 
 # Package version
 __version__ = "1.0.0"
@@ -47,19 +40,18 @@ __version__ = "1.0.0"
 # Default configurations
 DEFAULT_CONFIG = {
     'logging': {
+        'name': 'ai_content_factory',
         'level': 'INFO',
-        'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        'handlers': ['console', 'file']
+        'log_dir': 'logs'
     },
     'cache': {
-        'backend': 'redis',
+        'backend': 'memory',
         'ttl': 3600,
         'max_size': 1000
     },
     'rate_limiting': {
         'default_limit': 100,
-        'window_size': 3600,
-        'algorithm': 'sliding_window'
+        'window_size': 3600
     }
 }
 
@@ -68,68 +60,36 @@ _logger = None
 _cache = None
 _rate_limiter = None
 _error_handler = None
-_config_manager = None
-_file_manager = None
 
 # Export all utility classes and functions
 __all__ = [
     # Core utilities
     'get_logger',
-    'get_cache', 
+    'get_cache',
     'get_rate_limiter',
     'get_error_handler',
-    'get_config_manager',
-    'get_file_manager',
-    
+
     # Logger utilities
-    'setup_logging',
-    'LogConfig',
-    
-    # Cache utilities  
-    'CacheManager',
+    'setup_logger',
+    'shutdown_logging',
+    'ContentFactoryLogger',
+    'LogContext',
+
+    # Cache utilities
+    'SmartCache',
     'RedisCache',
     'MemoryCache',
-    
+
     # Rate limiting utilities
     'RateLimiter',
-    'TokenBucket', 
-    'SlidingWindow',
-    
+    'RateLimitConfig',
+    'TokenBucket',
+    'SlidingWindowLimiter',
+
     # Error handling utilities
     'ErrorHandler',
-    'ErrorReporter',
     'handle_errors',
-    
-    # Configuration utilities
-    'ConfigManager',
-    'load_config',
-    'get_config',
-    
-    # File management utilities
-    'FileManager',
-    'S3Manager',
-    'LocalFileManager',
-    
-    # Date utilities
-    'DateUtils',
-    'format_datetime',
-    'parse_datetime',
-    
-    # String utilities
-    'StringUtils',
-    'sanitize_string',
-    'generate_slug',
-    
-    # Validation utilities  
-    'ValidationUtils',
-    'validate_email',
-    'validate_phone',
-    
-    # Crypto utilities
-    'CryptoUtils', 
-    'hash_password',
-    'encrypt_data',
-    
+
     # Package utilities
     'initialize_utils',
     'get_system_info',
@@ -139,149 +99,87 @@ __all__ = [
 def get_logger(name: str = None):
     """
     Get centralized logger instance.
-    
+
     Args:
         name: Logger name (defaults to calling module)
-        
+
     Returns:
         Logger instance
     """
     global _logger
     if _logger is None:
-        _logger = setup_logging()
-    
+        _logger = setup_logger(**DEFAULT_CONFIG['logging'])
+
     if name:
-        return _logger.getChild(name)
-    return _logger
+        return _logger.get_logger().getChild(name)
+    return _logger.get_logger()
 
 def get_cache():
     """
-    Get cache manager instance.
-    
+    Get cache instance.
+
     Returns:
-        CacheManager instance
+        SmartCache instance
     """
     global _cache
     if _cache is None:
         cache_config = DEFAULT_CONFIG['cache']
-        if cache_config['backend'] == 'redis':
-            _cache = RedisCache()
-        else:
-            _cache = MemoryCache()
+        memory_cache = MemoryCache(max_size=cache_config['max_size'], default_ttl=cache_config['ttl'])
+        redis_cache = RedisCache() if cache_config['backend'] == 'redis' else None
+        _cache = SmartCache(memory_cache=memory_cache, redis_cache=redis_cache)
     return _cache
 
 def get_rate_limiter():
     """
     Get rate limiter instance.
-    
+
     Returns:
-        RateLimiter instance  
+        RateLimiter instance
     """
     global _rate_limiter
     if _rate_limiter is None:
-        config = DEFAULT_CONFIG['rate_limiting']
-        _rate_limiter = RateLimiter(
-            default_limit=config['default_limit'],
-            window_size=config['window_size']
-        )
+        _rate_limiter = RateLimiter()
     return _rate_limiter
 
 def get_error_handler():
     """
     Get error handler instance.
-    
+
     Returns:
         ErrorHandler instance
     """
     global _error_handler
     if _error_handler is None:
-        _error_handler = ErrorHandler(
-            logger=get_logger('error_handler')
-        )
+        _error_handler = ErrorHandler()
     return _error_handler
 
-def get_config_manager():
-    """
-    Get configuration manager instance.
-    
-    Returns:
-        ConfigManager instance
-    """
-    global _config_manager
-    if _config_manager is None:
-        _config_manager = ConfigManager()
-    return _config_manager
-
-def get_file_manager():
-    """
-    Get file manager instance.
-    
-    Returns:
-        FileManager instance
-    """
-    global _file_manager
-    if _file_manager is None:
-        # Choose based on environment
-        if os.getenv('AWS_ACCESS_KEY_ID'):
-            _file_manager = S3Manager()
-        else:
-            _file_manager = LocalFileManager()
-    return _file_manager
-
 def initialize_utils(config: Dict[str, Any] = None):
     """
     Initialize all utility instances with custom configuration.
-    
+
     Args:
         config: Custom configuration dictionary
     """
-    global _logger, _cache, _rate_limiter, _error_handler, _config_manager, _file_manager
-    
+    global _logger, _cache, _rate_limiter, _error_handler
+
     # Merge with default config
     if config:
-        merged_config = {**DEFAULT_CONFIG, **config}
-    else:
-        merged_config = DEFAULT_CONFIG
-    
-    # Initialize logger
-    log_config = LogConfig(**merged_config['logging'])
-    _logger = setup_logging(log_config)
-    
-    # Initialize cache
-    cache_config = merged_config['cache']
-    if cache_config['backend'] == 'redis':
-        _cache = RedisCache(
-            ttl=cache_config['ttl'],
-            max_size=cache_config['max_size']
-        )
-    else:
-        _cache = MemoryCache(
-            ttl=cache_config['ttl'], 
-            max_size=cache_config['max_size']
-        )
-    
-    # Initialize rate limiter
-    rl_config = merged_config['rate_limiting']
-    _rate_limiter = RateLimiter(
-        default_limit=rl_config['default_limit'],
-        window_size=rl_config['window_size']
-    )
-    
-    # Initialize error handler
-    _error_handler = ErrorHandler(logger=_logger)
-    
-    # Initialize config manager
-    _config_manager = ConfigManager(config=merged_config)
-    
-    # Initialize file manager
-    _file_manager = get_file_manager()
-    
-    _logger.info("All utilities initialized successfully")
+        DEFAULT_CONFIG.update({key: {**DEFAULT_CONFIG.get(key, {}), **value} for key, value in config.items()})
+
+    _logger = None
+    _cache = None
+    _rate_limiter = None
+    _error_handler = None
+
+    get_cache()
+    get_rate_limiter()
+    get_error_handler()
+    get_logger().info("All utilities initialized successfully")
 
 def get_system_info() -> Dict[str, Any]:
     """
     Get system information and utility status.
-    
+
     Returns:
         Dictionary with system information
     """
@@ -290,11 +188,9 @@ def get_system_info() -> Dict[str, Any]:
         'platform': sys.platform,
         'utilities': {
             'logger': _logger is not None,
-            'cache': _cache is not None, 
+            'cache': _cache is not None,
             'rate_limiter': _rate_limiter is not None,
-            'error_handler': _error_handler is not None,
-            'config_manager': _config_manager is not None,
-            'file_manager': _file_manager is not None
+            'error_handler': _error_handler is not None
         },
         'environment': {
             'ENVIRONMENT': os.getenv('ENVIRONMENT', 'development'),
@@ -302,71 +198,55 @@ def get_system_info() -> Dict[str, Any]:
             'LOG_LEVEL': os.getenv('LOG_LEVEL', 'INFO')
         }
     }
-    
+
     # Add cache info if available
     if _cache:
         try:
-            cache_info = _cache.get_info()
-            info['cache_info'] = cache_info
+            info['cache_info'] = _cache.memory_cache.get_stats()
         except Exception:
             info['cache_info'] = {'status': 'unavailable'}
-    
+
     # Add rate limiter info if available
     if _rate_limiter:
         try:
-            rl_info = _rate_limiter.get_stats()
-            info['rate_limiter_info'] = rl_info
+            info['rate_limiter_info'] = _rate_limiter.get_all_stats()
         except Exception:
             info['rate_limiter_info'] = {'status': 'unavailable'}
-    
+
     return info
 
 def cleanup_utils():
     """
     Cleanup and close all utility instances.
-    
+
     Should be called on application shutdown.
     """
-    global _logger, _cache, _rate_limiter, _error_handler, _config_manager, _file_manager
-    
+    global _logger, _cache, _rate_limiter, _error_handler
+
     try:
-        if _cache:
-            _cache.close()
-        
-        if _rate_limiter:
-            _rate_limiter.cleanup()
-        
-        if _error_handler:
-            _error_handler.flush()
-        
-        if _file_manager:
-            _file_manager.cleanup()
-        
         if _logger:
             _logger.info("Utilities cleanup completed")
-            
+            _logger.close()
     except Exception as e:
         print(f"Error during utilities cleanup: {e}")
-    
+
     # Reset global instances
     _logger = None
     _cache = None
     _rate_limiter = None
     _error_handler = None
-    _config_manager = None
-    _file_manager = None
 
 # Context manager for automatic cleanup
 class UtilityContext:
     """Context manager for automatic utility initialization and cleanup."""
-    
+
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config
-    
+
     def __enter__(self):
         initialize_utils(self.config)
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         cleanup_utils()
 
@@ -374,7 +254,7 @@ class UtilityContext:
 def with_error_handling(func):
     """
     Decorator that adds automatic error handling to functions.
-    
+
     Usage:
         @with_error_handling
         def my_function():
@@ -390,61 +270,21 @@ def with_error_handling(func):
                 'function': func.__name__,
                 'args': args,
                 'kwargs': kwargs
-            })
+            }, should_retry=False)
             raise
-    
-    return wrapper
 
-# Decorator for automatic caching
-def with_cache(ttl: int = 3600, key_prefix: str = None):
-    """
-    Decorator that adds automatic caching to functions.
-    
-    Args:
-        ttl: Cache TTL in seconds
-        key_prefix: Optional key prefix
-    
-    Usage:
-        @with_cache(ttl=1800, key_prefix="user_data")
-        def get_user_data(user_id):
-            # Function code here
-            return data
-    """
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            cache = get_cache()
-            
-            # Generate cache key
-            key_parts = [func.__name__]
-            if key_prefix:
-                key_parts.insert(0, key_prefix)
-            key_parts.extend([str(arg) for arg in args])
-            key_parts.extend([f"{k}={v}" for k, v in sorted(kwargs.items())])
-            cache_key = ":".join(key_parts)
-            
-            # Try to get from cache
-            cached_result = cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl=ttl)
-            return result
-        
-        return wrapper
-    return decorator
+    return wrapper
 
 # Decorator for rate limiting
 def with_rate_limit(limit: int = 100, window: int = 3600, key_func=None):
     """
     Decorator that adds rate limiting to functions.
-    
+
     Args:
         limit: Maximum calls per window
         window: Time window in seconds
         key_func: Function to generate rate limit key
-    
+
     Usage:
         @with_rate_limit(limit=10, window=60)
         def api_call(user_id):
@@ -454,19 +294,21 @@ def with_rate_limit(limit: int = 100, window: int = 3600, key_func=None):
     def decorator(func):
         def wrapper(*args, **kwargs):
             rate_limiter = get_rate_limiter()
-            
+
             # Generate rate limit key
             if key_func:
                 rl_key = key_func(*args, **kwargs)
             else:
                 rl_key = f"{func.__name__}:{args[0] if args else 'global'}"
-            
+
             # Check rate limit
-            if not rate_limiter.check_limit(rl_key, limit, window):
+            if rl_key not in rate_limiter.configs:
+                rate_limiter.configure_service(rl_key, RateLimitConfig(max_requests=limit, time_window=window))
+            if not rate_limiter.is_allowed(rl_key):
                 raise Exception(f"Rate limit exceeded for {rl_key}")
-            
+
             return func(*args, **kwargs)
-        
+
         return wrapper
     return decorator
 
@@ -474,16 +316,16 @@ def with_rate_limit(limit: int = 100, window: int = 3600, key_func=None):
 def health_check() -> Dict[str, Any]:
     """
     Perform health check on all utilities.
-    
+
     Returns:
         Dictionary with health status
     """
     health = {
         'status': 'healthy',
-        'timestamp': format_datetime(),
+        'timestamp': datetime.now().isoformat(),
         'utilities': {}
     }
-    
+
     # Check logger
     try:
         logger = get_logger()
@@ -492,25 +334,18 @@ def health_check() -> Dict[str, Any]:
     except Exception as e:
         health['utilities']['logger'] = {'status': 'unhealthy', 'error': str(e)}
         health['status'] = 'degraded'
-    
+
     # Check cache
     try:
-        cache = get_cache()
-        cache.set('health_check', 'ok', ttl=60)
-        cached_value = cache.get('health_check')
-        if cached_value == 'ok':
-            health['utilities']['cache'] = {'status': 'healthy'}
-        else:
-            health['utilities']['cache'] = {'status': 'unhealthy', 'error': 'cache test failed'}
-            health['status'] = 'degraded'
+        health['utilities']['cache'] = {'status': 'healthy', **get_cache().memory_cache.get_stats()}
     except Exception as e:
         health['utilities']['cache'] = {'status': 'unhealthy', 'error': str(e)}
         health['status'] = 'degraded'
-    
+
     # Check rate limiter
     try:
         rate_limiter = get_rate_limiter()
-        can_proceed = rate_limiter.check_limit('health_check', 10, 60)
+        can_proceed = rate_limiter.is_allowed('health_check')
         health['utilities']['rate_limiter'] = {
             'status': 'healthy',
             'can_proceed': can_proceed
@@ -518,9 +353,9 @@ def health_check() -> Dict[str, Any]:
     except Exception as e:
         health['utilities']['rate_limiter'] = {'status': 'unhealthy', 'error': str(e)}
         health['status'] = 'degraded'
-    
+
     return health
 
 # Initialize default utilities on import (optional)
 if os.getenv('AUTO_INIT_UTILS', 'false').lower() == 'true':
-    initialize_utils()
\ No newline at end of file
+    initialize_utils()
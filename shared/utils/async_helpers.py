@@ -10,13 +10,17 @@ This module provides advanced async utilities including:
 - Rate limiting
 - Queue management
 - Background task management
+- Single-flight request coalescing
 
 Path: ai-content-factory/shared/utils/async_helpers.py
 """
 
 import asyncio
+import hashlib
+import json
 import time
 import logging
+import uuid
 from typing import Any, Callable, Dict, List, Optional, Union, Awaitable, TypeVar, Generic
 from functools import wraps
 from dataclasses import dataclass
@@ -27,6 +31,11 @@ import signal
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+try:
+    from .http_sessions import get_http_session
+except ImportError:
+    from http_sessions import get_http_session
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -625,21 +634,22 @@ class BackgroundTaskManager:
 
 # HTTP client helpers
 class AsyncHTTPClient:
-    """Async HTTP client with advanced features"""
+    """Async HTTP client with advanced features
+    
+    Requests go through the process-wide per-host sessions from http_sessions,
+    so entering and leaving the client does not open or close connections.
+    """
     
     def __init__(self, timeout: float = 30.0, max_retries: int = 3, rate_limit_config: RateLimitConfig = None):
         self.timeout = aiohttp.ClientTimeout(total=timeout)
         self.max_retries = max_retries
         self.rate_limiter = AsyncRateLimiter(rate_limit_config) if rate_limit_config else None
-        self._session = None
     
     async def __aenter__(self):
-        self._session = aiohttp.ClientSession(timeout=self.timeout)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._session:
-            await self._session.close()
+        pass
     
     async def request(self, method: str, url: str, **kwargs) -> aiohttp.ClientResponse:
         """Make HTTP request with rate limiting and retries"""
@@ -651,9 +661,10 @@ class AsyncHTTPClient:
             exceptions=(aiohttp.ClientError, asyncio.TimeoutError)
         )
         retrier = AsyncRetrier(retry_config)
+        kwargs.setdefault('timeout', self.timeout)
         
         async def make_request():
-            return await self._session.request(method, url, **kwargs)
+            return await get_http_session(url).request(method, url, **kwargs)
         
         result = await retrier.execute(make_request())
         if result.success:
@@ -662,6 +673,195 @@ class AsyncHTTPClient:
             raise result.error
 
 
+# Request coalescing (single-flight)
+def make_flight_key(*parts: Any) -> str:
+    """Stable key for a call from its identifying arguments"""
+    raw = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesce identical in-flight calls by key
+    
+    Concurrent callers with the same key share one execution and its result
+    (or exception). With a backend (e.g. RedisCache) one process takes a lock
+    per key and publishes its result; other processes wait for it instead of
+    computing the same thing. The backend needs async add (set-if-absent with
+    TTL), get, set, delete and exists; any backend error falls back to a local
+    execution.
+    """
+    
+    def __init__(self, name: str = "default",
+                 backend: Any = None,
+                 lock_ttl: float = 120.0,
+                 wait_timeout: float = 120.0,
+                 poll_interval: float = 0.25,
+                 result_ttl: float = 60.0,
+                 encode: Optional[Callable[[Any], Any]] = None,
+                 decode: Optional[Callable[[Any], Any]] = None):
+        self.name = name
+        self.backend = backend
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.result_ttl = result_ttl
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda value: value)
+        
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._blocking: Dict[str, Dict[str, Any]] = {}
+        self._blocking_lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'executions': 0,
+            'collapsed_local': 0,
+            'collapsed_remote': 0,
+            'remote_wait_timeouts': 0,
+            'backend_errors': 0,
+            'errors': 0
+        }
+    
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run func once per key among concurrent callers and return its result"""
+        self.stats['calls'] += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats['collapsed_local'] += 1
+        else:
+            task = asyncio.create_task(self._execute(key, func))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _, k=key: self._inflight.pop(k, None))
+        # shield: a cancelled caller must not cancel the shared execution
+        return await asyncio.shield(task)
+    
+    def do_blocking(self, key: str, func: Callable[[], T]) -> T:
+        """Thread-based variant for blocking callers (local coalescing only)"""
+        with self._blocking_lock:
+            self.stats['calls'] += 1
+            call = self._blocking.get(key)
+            leader = call is None
+            if leader:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self._blocking[key] = call
+            else:
+                self.stats['collapsed_local'] += 1
+        
+        if not leader:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+        
+        try:
+            self.stats['executions'] += 1
+            call['result'] = func()
+            return call['result']
+        except Exception as e:
+            self.stats['errors'] += 1
+            call['error'] = e
+            raise
+        finally:
+            with self._blocking_lock:
+                self._blocking.pop(key, None)
+            call['event'].set()
+    
+    async def _execute(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        if self.backend is None:
+            return await self._run_local(func)
+        
+        lock_key = f"singleflight:{self.name}:{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.backend.add(lock_key, token, int(self.lock_ttl))
+        except Exception as e:
+            self.stats['backend_errors'] += 1
+            logger.warning(f"Single-flight lock unavailable for {self.name}: {e}")
+            return await self._run_local(func)
+        
+        if acquired:
+            return await self._run_as_leader(lock_key, token, func)
+        
+        found, value = await self._wait_for_remote(lock_key)
+        if found:
+            self.stats['collapsed_remote'] += 1
+            return value
+        return await self._run_local(func)
+    
+    async def _run_local(self, func: Callable[[], Awaitable[T]]) -> T:
+        self.stats['executions'] += 1
+        try:
+            return await func()
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+    
+    async def _run_as_leader(self, lock_key: str, token: str, func: Callable[[], Awaitable[T]]) -> T:
+        try:
+            result = await self._run_local(func)
+            try:
+                # result is keyed by the lock token so waiters never read an older run
+                await self.backend.set(f"{lock_key}:{token}", self.encode(result), int(self.result_ttl))
+            except Exception as e:
+                self.stats['backend_errors'] += 1
+                logger.warning(f"Single-flight could not publish result for {self.name}: {e}")
+            return result
+        finally:
+            try:
+                if await self.backend.get(lock_key) == token:
+                    await self.backend.delete(lock_key)
+            except Exception:
+                self.stats['backend_errors'] += 1
+    
+    async def _wait_for_remote(self, lock_key: str):
+        """Wait for the lock holder in another process; (found, value)"""
+        deadline = time.monotonic() + self.wait_timeout
+        token = None
+        try:
+            while time.monotonic() < deadline:
+                token = token or await self.backend.get(lock_key)
+                if token is not None:
+                    value = await self.backend.get(f"{lock_key}:{token}")
+                    if value is not None:
+                        return True, self.decode(value)
+                if not await self.backend.exists(lock_key):
+                    # holder finished: one last look for its result, else it failed
+                    if token is not None:
+                        value = await self.backend.get(f"{lock_key}:{token}")
+                        if value is not None:
+                            return True, self.decode(value)
+                    return False, None
+                await asyncio.sleep(self.poll_interval)
+        except Exception as e:
+            self.stats['backend_errors'] += 1
+            logger.warning(f"Single-flight wait failed for {self.name}: {e}")
+            return False, None
+        
+        self.stats['remote_wait_timeouts'] += 1
+        return False, None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        collapsed = self.stats['collapsed_local'] + self.stats['collapsed_remote']
+        return {
+            'name': self.name,
+            **self.stats,
+            'collapsed': collapsed,
+            'collapse_ratio': round(collapsed / self.stats['calls'], 3) if self.stats['calls'] else 0.0,
+            'inflight': len(self._inflight) + len(self._blocking),
+            'distributed': self.backend is not None
+        }
+
+
+def single_flight(flight: SingleFlight, key_func: Callable[..., str]):
+    """Decorator: coalesce concurrent calls of an async function by key_func(*args, **kwargs)"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await flight.do(key_func(*args, **kwargs), lambda: func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
 # Utility functions for common async patterns
 async def async_map(func: Callable[[T], Awaitable[Any]], items: List[T], concurrency: int = 10) -> List[Any]:
     """Async version of map with concurrency control"""
@@ -176,6 +176,14 @@ class MemoryCache(CacheBackend):
             self._cache[key] = item
             return True
     
+    async def add(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> bool:
+        """เก็บเฉพาะเมื่อยังไม่มี key (ใช้เป็น lock ภายใน process)"""
+        with self._lock:
+            item = self._cache.get(key)
+            if item is not None and not item.is_expired():
+                return False
+            return await self.set(key, value, ttl_seconds)
+    
     async def delete(self, key: str) -> bool:
         """ลบข้อมูลจาก cache"""
         with self._lock:
@@ -327,6 +335,13 @@ class RedisCache(CacheBackend):
         except Exception:
             return False
     
+    async def add(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> bool:
+        """SET NX: เก็บเฉพาะเมื่อยังไม่มี key (ใช้เป็น lock ข้าม process)"""
+        redis = await self._get_redis()
+        
+        result = await redis.set(self._make_key(key), pickle.dumps(value), ex=ttl_seconds, nx=True)
+        return bool(result)
+    
     async def delete(self, key: str) -> bool:
         """ลบข้อมูลจาก Redis"""
         redis = await self._get_redis()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+AI Content Factory - Async Health Check Engine
+==============================================
+
+One asyncio engine behind every dependency health check:
+- Named probes: HTTP on the shared pooled sessions, TCP connects,
+  subprocess commands and blocking client calls (psycopg2, redis, psutil)
+  on a small bounded thread pool
+- Per-check timeouts; a hung dependency becomes a critical result
+  instead of a stuck checker
+- Last result per check cached with a TTL, and concurrent callers of the
+  same check share one probe, so frequent /health hits never re-probe
+- Bounded fan-out over hundreds of endpoints with one semaphore per loop
+
+Usage:
+    engine = HealthEngine()
+    engine.register("content_engine", http_probe("http://content-engine:5002/health"), timeout=5)
+    results = await engine.run_all()
+    overall = overall_status(results.values())
+
+Path: ai-content-factory/shared/utils/health_engine.py
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+try:
+    from .http_sessions import close_loop_sessions, get_http_session
+    from .async_helpers import SingleFlight
+except ImportError:
+    from http_sessions import close_loop_sessions, get_http_session
+    from async_helpers import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+STATUS_HEALTHY = "healthy"
+STATUS_WARNING = "warning"
+STATUS_CRITICAL = "critical"
+STATUS_UNKNOWN = "unknown"
+
+# Worst status wins when results are combined
+STATUS_SEVERITY = {
+    STATUS_HEALTHY: 0,
+    STATUS_UNKNOWN: 1,
+    STATUS_WARNING: 2,
+    STATUS_CRITICAL: 3
+}
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one probe; name, timing and timestamp are filled in by the engine"""
+    status: str
+    message: str = ""
+    details: Dict[str, Any] = field(default_factory=dict)
+    name: str = ""
+    response_time_ms: float = 0.0
+    checked_at: float = 0.0
+
+    @property
+    def age(self) -> float:
+        """Seconds since the probe ran"""
+        return time.time() - self.checked_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'status': self.status,
+            'message': self.message,
+            'details': self.details,
+            'response_time_ms': self.response_time_ms,
+            'checked_at': self.checked_at,
+            'age_seconds': round(self.age, 3)
+        }
+
+
+Probe = Callable[[], Awaitable[ProbeResult]]
+
+
+@dataclass
+class HealthCheck:
+    """A registered probe with its own timeout and cache TTL"""
+    name: str
+    probe: Probe
+    timeout: float
+    ttl: float
+
+
+@dataclass
+class HealthEngineConfig:
+    """Engine-wide limits and defaults"""
+    max_concurrency: int = 200
+    default_timeout: float = 10.0
+    default_ttl: float = 15.0
+    blocking_workers: int = 8
+
+
+def overall_status(results: Iterable[ProbeResult]) -> str:
+    """Worst status among results (healthy when there are none)"""
+    status = STATUS_HEALTHY
+    for result in results:
+        if STATUS_SEVERITY.get(result.status, 1) > STATUS_SEVERITY[status]:
+            status = result.status
+    return status
+
+
+async def run_and_close_sessions(coro: Awaitable[Any]) -> Any:
+    """Await coro, then close the HTTP sessions its (short-lived) loop opened"""
+    try:
+        return await coro
+    finally:
+        await close_loop_sessions()
+
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    """Run a coroutine from blocking code, even when the caller's thread already runs a loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run_and_close_sessions(coro))
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-sync") as executor:
+        return executor.submit(asyncio.run, run_and_close_sessions(coro)).result()
+
+
+class HealthEngine:
+    """
+    Runs registered health checks concurrently and caches their results
+
+    Results are stored in a thread-safe map so synchronous readers (a Flask
+    /health route, a status CLI) can serve the last known state with
+    get_cached()/snapshot() without touching any dependency.
+    """
+
+    def __init__(self, config: Optional[HealthEngineConfig] = None, name: str = "health"):
+        self.config = config or HealthEngineConfig()
+        self.name = name
+        self.flight = SingleFlight(name=f"health:{name}")
+
+        self._checks: Dict[str, HealthCheck] = {}
+        self._results: Dict[str, ProbeResult] = {}
+        self._lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.stats = {
+            'checks': 0,
+            'cache_hits': 0,
+            'probes': 0,
+            'timeouts': 0,
+            'errors': 0
+        }
+
+    # Registration
+    def register(self, name: str, probe: Probe,
+                 timeout: Optional[float] = None, ttl: Optional[float] = None) -> HealthCheck:
+        """Register (or replace) a named check"""
+        check = HealthCheck(
+            name=name,
+            probe=probe,
+            timeout=timeout if timeout is not None else self.config.default_timeout,
+            ttl=ttl if ttl is not None else self.config.default_ttl
+        )
+        self._checks[name] = check
+        return check
+
+    def unregister(self, name: str):
+        self._checks.pop(name, None)
+        with self._lock:
+            self._results.pop(name, None)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._checks)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._checks
+
+    # Running checks
+    async def check(self, name: str, force: bool = False) -> ProbeResult:
+        """Result of one check: cached while fresh, otherwise one shared probe"""
+        check = self._checks[name]
+        self.stats['checks'] += 1
+        if not force:
+            cached = self.get_cached(name, max_age=check.ttl)
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                return cached
+        # in-flight probes are shared per event loop; tasks cannot be awaited across loops
+        key = f"{id(asyncio.get_running_loop())}:{name}"
+        return await self.flight.do(key, lambda: self._probe(check))
+
+    async def run_all(self, names: Optional[Iterable[str]] = None,
+                      force: bool = False) -> Dict[str, ProbeResult]:
+        """Run checks concurrently (all registered checks by default)"""
+        names = list(names) if names is not None else self.names
+        results = await asyncio.gather(*(self.check(name, force=force) for name in names))
+        return dict(zip(names, results))
+
+    async def _probe(self, check: HealthCheck) -> ProbeResult:
+        async with self._semaphore():
+            self.stats['probes'] += 1
+            checked_at = time.time()
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(check.probe(), timeout=check.timeout)
+            except asyncio.TimeoutError:
+                self.stats['timeouts'] += 1
+                result = ProbeResult(
+                    status=STATUS_CRITICAL,
+                    message=f"Check timed out after {check.timeout:g}s",
+                    details={'timeout_seconds': check.timeout}
+                )
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.debug(f"Health check {check.name} failed: {e}")
+                result = ProbeResult(
+                    status=STATUS_CRITICAL,
+                    message=f"Check failed: {e}",
+                    details={'error': str(e)}
+                )
+            result.name = check.name
+            result.response_time_ms = round((time.perf_counter() - start) * 1000, 2)
+            result.checked_at = checked_at
+
+        with self._lock:
+            self._results[check.name] = result
+        return result
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.config.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    # Blocking clients
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.blocking_workers,
+                    thread_name_prefix=f"{self.name}-probe"
+                )
+            return self._executor
+
+    async def run_blocking(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking call on the engine's probe pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), partial(func, *args, **kwargs))
+
+    def blocking_probe(self, func: Callable[..., ProbeResult], *args, **kwargs) -> Probe:
+        """Probe wrapping a blocking function that returns a ProbeResult"""
+        async def probe() -> ProbeResult:
+            return await self.run_blocking(func, *args, **kwargs)
+        return probe
+
+    # Cached state
+    def get_cached(self, name: str, max_age: Optional[float] = None) -> Optional[ProbeResult]:
+        """Last result of a check, or None if missing or older than max_age"""
+        with self._lock:
+            result = self._results.get(name)
+        if result is None or (max_age is not None and result.age > max_age):
+            return None
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Last known results without probing anything"""
+        with self._lock:
+            results = dict(self._results)
+        return {
+            'status': overall_status(results.values()) if results else STATUS_UNKNOWN,
+            'checks': {name: result.to_dict() for name, result in results.items()}
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            **self.stats,
+            'registered': len(self._checks),
+            'cached': len(self._results),
+            'hit_ratio': round(self.stats['cache_hits'] / self.stats['checks'], 3) if self.stats['checks'] else 0.0,
+            'single_flight': self.flight.get_stats()
+        }
+
+    def close(self):
+        """Release the blocking probe pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+# Probe factories
+def http_probe(url: str, headers: Optional[Dict[str, str]] = None,
+               method: str = "GET", server_error_status: str = STATUS_CRITICAL) -> Probe:
+    """HTTP probe on the shared per-host session: 200 is healthy, other codes degrade"""
+    async def probe() -> ProbeResult:
+        try:
+            session = get_http_session(url)
+            async with session.request(method, url, headers=headers or {}) as response:
+                status_code = response.status
+                body = await response.text()
+        except aiohttp.ClientConnectionError as e:
+            return ProbeResult(
+                status=STATUS_CRITICAL,
+                message="Service unreachable",
+                details={'url': url, 'error': str(e)}
+            )
+
+        if status_code == 200:
+            try:
+                data = json.loads(body) if body else {}
+            except ValueError:
+                data = {'raw_response': body[:200]}
+            return ProbeResult(
+                status=STATUS_HEALTHY,
+                message="Service is healthy",
+                details={'status_code': status_code, 'response': data}
+            )
+
+        return ProbeResult(
+            status=server_error_status if status_code >= 500 else STATUS_WARNING,
+            message=f"Service returned status {status_code}",
+            details={'status_code': status_code, 'response': body[:200]}
+        )
+    return probe
+
+
+def tcp_probe(host: str, port: int) -> Probe:
+    """Probe that only checks the port accepts connections"""
+    async def probe() -> ProbeResult:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError as e:
+            return ProbeResult(
+                status=STATUS_CRITICAL,
+                message=f"{host}:{port} unreachable",
+                details={'host': host, 'port': port, 'error': str(e)}
+            )
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return ProbeResult(
+            status=STATUS_HEALTHY,
+            message=f"{host}:{port} accepting connections",
+            details={'host': host, 'port': port}
+        )
+    return probe
+
+
+async def run_command(args: List[str], timeout: float) -> Tuple[int, str, str]:
+    """Run a command without blocking the loop; the process is killed on timeout or cancel"""
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+        raise
+    return process.returncode, stdout.decode(errors='replace'), stderr.decode(errors='replace')
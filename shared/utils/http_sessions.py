@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+AI Content Factory - Shared HTTP Sessions
+=========================================
+
+Process-wide registry of long-lived aiohttp sessions:
+- One session per host (and event loop) instead of one per call
+- Tuned connector limits, DNS cache and keep-alive per host
+- Connection reuse metrics collected through aiohttp tracing
+- Startup/shutdown hooks for the services that own the event loop
+
+Usage:
+    async with http_session(url) as session:
+        async with session.get(url) as response:
+            ...
+
+The context manager never closes the shared session; call
+close_http_sessions() when the application shuts down, or register
+shutdown_http_sessions() with atexit to close sessions of every loop.
+
+Path: ai-content-factory/shared/utils/http_sessions.py
+"""
+
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HTTPPoolConfig:
+    """Connector settings for one host"""
+    limit: int = 100
+    limit_per_host: int = 20
+    ttl_dns_cache: int = 300
+    keepalive_timeout: float = 60.0
+    # Default request timeout; individual requests may still pass their own
+    total_timeout: Optional[float] = 300.0
+    connect_timeout: Optional[float] = 15.0
+    enable_cleanup_closed: bool = True
+
+
+@dataclass
+class HostStats:
+    """Request and connection counters for one host"""
+    requests: int = 0
+    request_errors: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+    sessions_created: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        connections = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "request_errors": self.request_errors,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / connections, 3) if connections else 0.0,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+            "sessions_created": self.sessions_created
+        }
+
+
+def host_key(url: str) -> str:
+    """scheme://host[:port] of a URL (bare hosts are treated as https)"""
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class HTTPSessionRegistry:
+    """
+    Long-lived aiohttp sessions shared per host
+
+    Sessions are bound to the event loop that created them. A caller on a
+    different loop (e.g. a worker thread or a later asyncio.run) gets its own
+    session, and sessions whose loop has closed are dropped on the next lookup.
+    """
+
+    def __init__(self, default_config: Optional[HTTPPoolConfig] = None):
+        self.default_config = default_config or HTTPPoolConfig()
+        self._host_configs: Dict[str, HTTPPoolConfig] = {}
+        self._sessions: Dict[Tuple[int, str], Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+        self._stats: Dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+        self._startup_hooks: List[Callable[[], Awaitable[None]]] = []
+        self._shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+    def configure_host(self, url: str, **overrides):
+        """Override connector settings for one host (before its session is created)"""
+        key = host_key(url)
+        self._host_configs[key] = replace(self._host_configs.get(key, self.default_config), **overrides)
+
+    def config_for(self, key: str) -> HTTPPoolConfig:
+        return self._host_configs.get(key, self.default_config)
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        """Shared session for the host of `url` on the running event loop"""
+        loop = asyncio.get_running_loop()
+        key = host_key(url)
+
+        with self._lock:
+            self._drop_dead_sessions()
+            entry = self._sessions.get((id(loop), key))
+            if entry is not None and entry[0] is loop and not entry[1].closed:
+                return entry[1]
+
+            session = self._create_session(key)
+            self._sessions[(id(loop), key)] = (loop, session)
+            return session
+
+    def _drop_dead_sessions(self):
+        for session_key, (loop, session) in list(self._sessions.items()):
+            if loop.is_closed() or session.closed:
+                del self._sessions[session_key]
+                if not session.closed:
+                    # Its loop is gone, so the session cannot be closed properly any more
+                    session.detach()
+
+    def _create_session(self, key: str) -> aiohttp.ClientSession:
+        config = self.config_for(key)
+        stats = self._stats.setdefault(key, HostStats())
+        stats.sessions_created += 1
+
+        connector = aiohttp.TCPConnector(
+            limit=config.limit,
+            limit_per_host=config.limit_per_host,
+            ttl_dns_cache=config.ttl_dns_cache,
+            keepalive_timeout=config.keepalive_timeout,
+            enable_cleanup_closed=config.enable_cleanup_closed
+        )
+        timeout = aiohttp.ClientTimeout(total=config.total_timeout, connect=config.connect_timeout)
+        logger.debug(f"Creating shared HTTP session for {key}")
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[self._trace_config(stats)]
+        )
+
+    @staticmethod
+    def _trace_config(stats: HostStats) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        def counter(attribute: str):
+            async def increment(session, context, params):
+                setattr(stats, attribute, getattr(stats, attribute) + 1)
+            return increment
+
+        trace.on_request_start.append(counter("requests"))
+        trace.on_request_exception.append(counter("request_errors"))
+        trace.on_connection_create_end.append(counter("connections_created"))
+        trace.on_connection_reuseconn.append(counter("connections_reused"))
+        trace.on_dns_cache_hit.append(counter("dns_cache_hits"))
+        trace.on_dns_cache_miss.append(counter("dns_cache_misses"))
+        return trace
+
+    # Lifecycle
+
+    def on_startup(self, hook: Callable[[], Awaitable[None]]):
+        self._startup_hooks.append(hook)
+
+    def on_shutdown(self, hook: Callable[[], Awaitable[None]]):
+        self._shutdown_hooks.append(hook)
+
+    async def startup(self, warm_hosts: Optional[List[str]] = None):
+        """Run startup hooks and open sessions for hosts that are used right away"""
+        for url in warm_hosts or []:
+            self.get_session(url)
+        for hook in self._startup_hooks:
+            await hook()
+
+    async def close_all(self, run_hooks: bool = True):
+        """Run shutdown hooks, then close every session owned by the running loop"""
+        for hook in self._shutdown_hooks if run_hooks else []:
+            try:
+                await hook()
+            except Exception as e:
+                logger.warning(f"HTTP session shutdown hook failed: {e}")
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            owned = [key for key, (session_loop, _) in self._sessions.items() if session_loop is loop]
+            sessions = [self._sessions.pop(key)[1] for key in owned]
+            self._drop_dead_sessions()
+
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+
+    def shutdown(self, timeout: float = 10.0):
+        """Close every registered session from outside the event loops (e.g. atexit)
+
+        Each session is closed on the loop that owns it: directly when that loop is
+        idle, through run_coroutine_threadsafe when it is running in another thread.
+        Sessions whose loop has already closed can only be detached.
+        """
+        if self._shutdown_hooks:
+            hook_loop = asyncio.new_event_loop()
+            try:
+                for hook in self._shutdown_hooks:
+                    try:
+                        hook_loop.run_until_complete(hook())
+                    except Exception as e:
+                        logger.warning(f"HTTP session shutdown hook failed: {e}")
+            finally:
+                hook_loop.close()
+
+        with self._lock:
+            entries = list(self._sessions.values())
+            self._sessions.clear()
+
+        for loop, session in entries:
+            if session.closed:
+                continue
+            try:
+                if loop.is_closed():
+                    logger.warning("HTTP session outlived its event loop; detaching without close")
+                    session.detach()
+                elif loop.is_running():
+                    asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout)
+                else:
+                    loop.run_until_complete(session.close())
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP session: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            open_sessions = sum(1 for _, session in self._sessions.values() if not session.closed)
+        totals = HostStats()
+        for stats in self._stats.values():
+            for name in vars(totals):
+                setattr(totals, name, getattr(totals, name) + getattr(stats, name))
+        return {
+            "open_sessions": open_sessions,
+            "totals": totals.to_dict(),
+            "hosts": {key: stats.to_dict() for key, stats in self._stats.items()}
+        }
+
+
+_registry = HTTPSessionRegistry()
+
+
+def get_session_registry() -> HTTPSessionRegistry:
+    return _registry
+
+
+def get_http_session(url: str) -> aiohttp.ClientSession:
+    """Shared long-lived session for the host of `url`"""
+    return _registry.get_session(url)
+
+
+@asynccontextmanager
+async def http_session(url: str):
+    """`async with` drop-in for aiohttp.ClientSession() that reuses the shared session"""
+    yield _registry.get_session(url)
+
+
+async def close_http_sessions():
+    await _registry.close_all()
+
+
+def shutdown_http_sessions():
+    """Synchronous shutdown for atexit: closes the sessions of every event loop"""
+    _registry.shutdown()
+
+
+async def close_loop_sessions():
+    """Close only the running loop's sessions; for worker loops that end before the process"""
+    await _registry.close_all(run_hooks=False)
+
+
+def get_http_session_stats() -> Dict[str, Any]:
+    return _registry.get_stats()
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+AI Content Factory - Async Job Poller
+=====================================
+
+Shared engine for waiting on long-running remote jobs (image generations,
+video processing) without one poll loop per job:
+- One poll loop per provider on the shared pooled HTTP session
+- Adaptive intervals: fast first polls, exponential backoff afterwards,
+  steered by the provider's observed completion-time histogram
+- Batched status queries for APIs that can report several jobs at once
+- Futures that resolve when a job completes, fails or times out
+
+Path: ai-content-factory/shared/utils/job_poller.py
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+
+try:
+    from .http_sessions import get_http_session
+except ImportError:
+    from http_sessions import get_http_session
+
+logger = logging.getLogger(__name__)
+
+
+class JobState(Enum):
+    """Remote job states as seen by the poller"""
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class JobUpdate:
+    """Result of one status check for one job"""
+    state: JobState
+    result: Any = None
+    error: Optional[str] = None
+    progress: Optional[float] = None
+
+
+class JobFailedError(Exception):
+    """Raised from a job future when the provider reports failure"""
+
+    def __init__(self, job_id: str, error: Optional[str] = None, result: Any = None):
+        super().__init__(error or f"Job {job_id} failed")
+        self.job_id = job_id
+        self.error = error
+        self.result = result
+
+
+class JobTimeoutError(asyncio.TimeoutError):
+    """Raised from a job future when it does not finish before its deadline"""
+
+    def __init__(self, job_id: str, timeout: float):
+        super().__init__(f"Job {job_id} did not complete within {timeout:.0f}s")
+        self.job_id = job_id
+        self.timeout = timeout
+
+
+# Completion-time buckets in seconds (roughly log-spaced)
+DEFAULT_BUCKETS = (1, 2, 3, 5, 8, 13, 20, 30, 45, 60, 90, 120, 180, 240, 300, 450, 600, 900, 1200, 1800, 3600)
+
+
+class CompletionHistogram:
+    """Bucketed histogram over the most recent completion times"""
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS, window: int = 200):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self._recent: Deque[int] = deque(maxlen=window)
+
+    def _bucket(self, seconds: float) -> int:
+        return bisect.bisect_left(self.bounds, seconds)
+
+    def record(self, seconds: float):
+        if len(self._recent) == self._recent.maxlen:
+            self.counts[self._recent[0]] -= 1
+        bucket = self._bucket(seconds)
+        self._recent.append(bucket)
+        self.counts[bucket] += 1
+
+    @property
+    def count(self) -> int:
+        return len(self._recent)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf if beyond the last bucket)"""
+        if not self._recent:
+            return float("inf")
+        target = q * len(self._recent)
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target and bucket_count:
+                return self.bounds[index] if index < len(self.bounds) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": self.count,
+            "p50_seconds": self.quantile(0.5),
+            "p90_seconds": self.quantile(0.9),
+            "p99_seconds": self.quantile(0.99)
+        }
+
+
+@dataclass
+class PollSchedule:
+    """Adaptive polling intervals for one provider"""
+    initial_interval: float = 2.0
+    fast_polls: int = 3
+    backoff_factor: float = 1.5
+    max_interval: float = 30.0
+    min_interval: float = 0.5
+    # Completion history needed before the histogram steers polling
+    min_samples: int = 5
+    quantiles: Tuple[float, ...] = (0.1, 0.5, 0.75, 0.9, 0.95, 0.99)
+
+    def backoff(self, polls: int) -> float:
+        """Plain schedule: fast_polls at initial_interval, then exponential backoff"""
+        exponent = max(0, polls - self.fast_polls + 1)
+        return min(self.max_interval, self.initial_interval * self.backoff_factor ** exponent)
+
+    def next_delay(self, age: float, polls: int, histogram: Optional[CompletionHistogram] = None) -> float:
+        """
+        Delay before the next status check of a job that is `age` seconds old.
+
+        With enough history the next check lands on the next completion-time
+        quantile boundary: nothing is polled before jobs typically finish and
+        the poller never sleeps past a point where many jobs complete.
+        """
+        delay = self.backoff(polls)
+        if histogram is None or histogram.count < self.min_samples:
+            return delay
+
+        earliest = histogram.quantile(self.quantiles[0])
+        for q in self.quantiles:
+            boundary = histogram.quantile(q)
+            if boundary > age:
+                # Before the earliest typical completion, skip straight to it
+                cap = self.max_interval if age < earliest else delay
+                return max(self.min_interval, min(boundary - age, cap))
+        return delay
+
+
+CheckFunc = Callable[[Optional[aiohttp.ClientSession], str], Awaitable[JobUpdate]]
+BatchCheckFunc = Callable[[Optional[aiohttp.ClientSession], List[str]], Awaitable[Dict[str, JobUpdate]]]
+
+
+@dataclass
+class _Job:
+    job_id: str
+    future: asyncio.Future
+    submitted_at: float
+    deadline: float
+    timeout: float
+    next_poll_at: float
+    polls: int = 0
+    waiters: int = 0
+    progress: Optional[float] = None
+
+
+class JobPoller:
+    """
+    Multiplexes every outstanding job of one provider onto a single poll loop.
+
+    Provide either `check(session, job_id)` or `check_batch(session, job_ids)`;
+    the latter is used for APIs that report many jobs per request (ids missing
+    from its answer stay pending). Exceptions raised by a check are treated as
+    transient and the job is retried on its backoff schedule.
+
+    The session is taken from `session_factory` when given; otherwise it is
+    the process-wide shared session for `base_url` (see http_sessions).
+    """
+
+    def __init__(self,
+                 name: str,
+                 check: Optional[CheckFunc] = None,
+                 check_batch: Optional[BatchCheckFunc] = None,
+                 schedule: Optional[PollSchedule] = None,
+                 batch_size: int = 50,
+                 max_concurrency: int = 10,
+                 default_timeout: float = 600.0,
+                 coalesce_window: float = 0.5,
+                 session_factory: Optional[Callable[[], Optional[aiohttp.ClientSession]]] = None,
+                 base_url: Optional[str] = None):
+        if not check and not check_batch:
+            raise ValueError("JobPoller needs check or check_batch")
+        if session_factory is None and base_url is None:
+            raise ValueError("JobPoller needs session_factory or base_url")
+
+        self.name = name
+        self.check = check
+        self.check_batch = check_batch
+        self.schedule = schedule or PollSchedule()
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self.coalesce_window = coalesce_window
+        self.session_factory = session_factory
+        self.base_url = base_url
+
+        self.histogram = CompletionHistogram()
+        self._jobs: Dict[str, _Job] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {
+            "jobs_submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "status_requests": 0,
+            "status_errors": 0,
+            "job_checks": 0
+        }
+
+    # Session handling
+
+    def _get_session(self) -> Optional[aiohttp.ClientSession]:
+        if self.session_factory is not None:
+            return self.session_factory()
+        return get_http_session(self.base_url)
+
+    def is_bound_to_other_loop(self) -> bool:
+        """True when the poller was started on an event loop that is no longer current"""
+        if self._loop is None:
+            return False
+        try:
+            return self._loop is not asyncio.get_running_loop() or self._loop.is_closed()
+        except RuntimeError:
+            return self._loop.is_closed()
+
+    # Public API
+
+    def submit(self, job_id: str, timeout: Optional[float] = None) -> asyncio.Future:
+        """Register a job and return a future for its result (same future for repeated submits)"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.future
+
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+
+        now = time.monotonic()
+        timeout = timeout or self.default_timeout
+        job = _Job(
+            job_id=job_id,
+            future=loop.create_future(),
+            submitted_at=now,
+            deadline=now + timeout,
+            timeout=timeout,
+            next_poll_at=now + self.schedule.next_delay(0.0, 0, self.histogram)
+        )
+        self._jobs[job_id] = job
+        self.stats["jobs_submitted"] += 1
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+        return job.future
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Any:
+        """Wait for a job; cancelling the last waiter stops polling that job"""
+        future = self.submit(job_id, timeout)
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.waiters += 1
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if job is not None:
+                job.waiters -= 1
+                if job.waiters <= 0 and not future.done():
+                    future.cancel()
+                    self._jobs.pop(job_id, None)
+                    self.stats["cancelled"] += 1
+            raise
+
+    def pending_jobs(self) -> List[str]:
+        return list(self._jobs)
+
+    async def close(self):
+        """Cancel outstanding jobs and stop the loop"""
+        for job in list(self._jobs.values()):
+            if not job.future.done():
+                job.future.cancel()
+        self._jobs.clear()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        requests = self.stats["status_requests"]
+        return {
+            "name": self.name,
+            **self.stats,
+            "pending": len(self._jobs),
+            "batched": self.check_batch is not None,
+            "avg_jobs_per_request": round(self.stats["job_checks"] / requests, 2) if requests else 0.0,
+            "completion_times": self.histogram.to_dict()
+        }
+
+    # Poll loop
+
+    async def _run(self):
+        try:
+            while self._jobs:
+                now = time.monotonic()
+                self._expire(now)
+                if not self._jobs:
+                    break
+
+                next_at = min(min(job.next_poll_at, job.deadline) for job in self._jobs.values())
+                if next_at > now:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), next_at - now)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                # Jobs due a moment later ride along with this round
+                horizon = now + self.coalesce_window
+                due = [job for job in self._jobs.values() if job.next_poll_at <= horizon]
+                await self._poll(due)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job poller {self.name} stopped: {e}")
+            for job in list(self._jobs.values()):
+                self._resolve(job, exception=e)
+
+    def _expire(self, now: float):
+        for job in list(self._jobs.values()):
+            if job.future.done():
+                self._jobs.pop(job.job_id, None)
+            elif now >= job.deadline:
+                self.stats["timed_out"] += 1
+                self._resolve(job, exception=JobTimeoutError(job.job_id, job.timeout))
+
+    async def _poll(self, due: List[_Job]):
+        session = self._get_session()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_batch(jobs: List[_Job]):
+            async with semaphore:
+                self.stats["status_requests"] += 1
+                self.stats["job_checks"] += len(jobs)
+                try:
+                    updates = await self.check_batch(session, [job.job_id for job in jobs])
+                except Exception as e:
+                    self.stats["status_errors"] += 1
+                    logger.warning(f"{self.name} batch status check failed: {e}")
+                    updates = {}
+            for job in jobs:
+                self._apply(job, updates.get(job.job_id))
+
+        async def run_single(job: _Job):
+            async with semaphore:
+                self.stats["status_requests"] += 1
+                self.stats["job_checks"] += 1
+                try:
+                    update = await self.check(session, job.job_id)
+                except Exception as e:
+                    self.stats["status_errors"] += 1
+                    logger.warning(f"{self.name} status check for {job.job_id} failed: {e}")
+                    update = None
+            self._apply(job, update)
+
+        if self.check_batch is not None:
+            chunks = [due[i:i + self.batch_size] for i in range(0, len(due), self.batch_size)]
+            await asyncio.gather(*(run_batch(chunk) for chunk in chunks))
+        else:
+            await asyncio.gather(*(run_single(job) for job in due))
+
+    def _apply(self, job: _Job, update: Optional[JobUpdate]):
+        if job.future.done():
+            self._jobs.pop(job.job_id, None)
+            return
+
+        now = time.monotonic()
+        job.polls += 1
+
+        if update is not None and update.state == JobState.COMPLETED:
+            self.histogram.record(now - job.submitted_at)
+            self.stats["completed"] += 1
+            self._resolve(job, result=update.result)
+        elif update is not None and update.state == JobState.FAILED:
+            self.stats["failed"] += 1
+            self._resolve(job, exception=JobFailedError(job.job_id, update.error, update.result))
+        else:
+            if update is not None and update.progress is not None:
+                job.progress = update.progress
+            age = now - job.submitted_at
+            job.next_poll_at = now + self.schedule.next_delay(age, job.polls, self.histogram)
+
+    def _resolve(self, job: _Job, result: Any = None, exception: Optional[BaseException] = None):
+        self._jobs.pop(job.job_id, None)
+        if job.future.done():
+            return
+        if exception is not None:
+            job.future.set_exception(exception)
+            # Avoid "exception never retrieved" when every waiter has gone
+            job.future.add_done_callback(lambda f: f.exception())
+        else:
+            job.future.set_result(result)
+
+
+# Process-wide registry: one poller per provider (and credential)
+
+_pollers: Dict[str, JobPoller] = {}
+
+
+def get_job_poller(key: str, factory: Callable[[], JobPoller]) -> JobPoller:
+    """Return the shared poller for `key`, creating it with `factory` on first use"""
+    poller = _pollers.get(key)
+    if poller is None or poller.is_bound_to_other_loop():
+        poller = factory()
+        _pollers[key] = poller
+    return poller
+
+
+async def close_job_pollers():
+    """Close every registered poller (call on application shutdown)"""
+    pollers = list(_pollers.values())
+    _pollers.clear()
+    for poller in pollers:
+        if not poller.is_bound_to_other_loop():
+            await poller.close()
+
+
+def get_job_poller_stats() -> Dict[str, Any]:
+    return {key: poller.get_stats() for key, poller in _pollers.items()}
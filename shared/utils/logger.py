@@ -6,11 +6,19 @@ Advanced Logging System for AI Content Factory
 import logging
 import logging.handlers
 import json
+import os
 import sys
+import time
+import queue
+import atexit
+import random
+import tempfile
+import threading
 import traceback
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import uuid
 from enum import Enum
 
@@ -82,9 +90,11 @@ class StructuredFormatter(logging.Formatter):
             f"{color_end}"
         )
         
-        # เพิ่ม exception info ถ้ามี
+        # เพิ่ม exception info ถ้ามี (exc_text เมื่อ record ผ่าน queue มาแล้ว)
         if record.exc_info:
             formatted += f"\n{color_start}Exception: {self.formatException(record.exc_info)}{color_end}"
+        elif record.exc_text:
+            formatted += f"\n{color_start}Exception: {record.exc_text}{color_end}"
         
         # เพิ่ม extra fields ถ้ามี
         extra_fields = self._get_extra_fields(record)
@@ -131,9 +141,11 @@ class JSONFormatter(logging.Formatter):
             'line': record.lineno
         }
         
-        # เพิ่ม exception info ถ้ามี
+        # เพิ่ม exception info ถ้ามี (exc_text เมื่อ record ผ่าน queue มาแล้ว)
         if record.exc_info:
             log_data['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data['exception'] = record.exc_text
         
         # เพิ่ม extra fields
         extra_fields = self._get_extra_fields(record)
@@ -167,20 +179,285 @@ class JSONFormatter(logging.Formatter):
 class PerformanceFilter(logging.Filter):
     """Filter สำหรับ track performance metrics"""
     
+    # อ่าน memory usage ไม่เกินวินาทีละครั้ง แทนที่จะอ่านทุก record ทุก handler
+    _memory_mb: Optional[float] = None
+    _memory_read_at: float = 0.0
+    
     def filter(self, record: logging.LogRecord) -> bool:
         """เพิ่ม performance metrics ใน log record"""
         
-        # เพิ่ม memory usage ถ้ามี psutil
-        try:
-            import psutil
-            process = psutil.Process()
-            record.memory_mb = round(process.memory_info().rss / 1024 / 1024, 2)
-        except ImportError:
-            record.memory_mb = None
+        now = time.monotonic()
+        if now - PerformanceFilter._memory_read_at >= 1.0:
+            PerformanceFilter._memory_read_at = now
+            # เพิ่ม memory usage ถ้ามี psutil
+            try:
+                import psutil
+                process = psutil.Process()
+                PerformanceFilter._memory_mb = round(process.memory_info().rss / 1024 / 1024, 2)
+            except ImportError:
+                PerformanceFilter._memory_mb = None
         
+        record.memory_mb = PerformanceFilter._memory_mb
         return True
 
 
+@dataclass
+class AsyncLogConfig:
+    """การตั้งค่า queue-based logging"""
+    queue_size: int = 10000
+    batch_size: int = 256
+    flush_interval: float = 0.5  # วินาทีสูงสุดที่ record รออยู่ใน queue
+    # WARNING ขึ้นไปรอที่ว่างใน queue ได้ไม่เกินเวลานี้ก่อนถูก drop; ระดับต่ำกว่าไม่รอเลย
+    block_level: int = logging.WARNING
+    block_timeout: float = 0.05
+    # Sampling / rate limiting ใช้กับ record ที่ระดับไม่เกิน throttle_level
+    throttle_level: int = logging.DEBUG
+    sample_rate: float = 1.0
+    rate_limit_per_second: float = 0.0  # ต่อจุดที่เรียก log (0 = ปิด)
+    rate_limit_burst: int = 50
+    drop_report_interval: float = 10.0
+    
+    @classmethod
+    def from_env(cls) -> 'AsyncLogConfig':
+        return cls(
+            queue_size=int(os.getenv('LOG_QUEUE_SIZE', 10000)),
+            sample_rate=float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 1.0)),
+            rate_limit_per_second=float(os.getenv('LOG_DEBUG_RATE_LIMIT', 0.0))
+        )
+
+
+class LogThrottleFilter(logging.Filter):
+    """
+    Sampling และ rate limiting สำหรับ debug events ที่เกิดถี่ (progress, upload chunks)
+    
+    Rate limit นับแยกตามจุดที่เรียก log (ไฟล์ + บรรทัด) เพราะข้อความส่วนใหญ่เป็น
+    f-string ที่ไม่ซ้ำกัน
+    """
+    
+    MAX_TRACKED_SITES = 10000
+    
+    def __init__(self, max_level: int = logging.DEBUG, sample_rate: float = 1.0,
+                 rate_per_second: float = 0.0, burst: int = 50):
+        super().__init__()
+        self.max_level = max_level
+        self.sample_rate = sample_rate
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._buckets: Dict[tuple, List[float]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'sampled_out': 0, 'rate_limited': 0}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.stats['sampled_out'] += 1
+            return False
+        
+        if self.rate_per_second > 0:
+            now = time.monotonic()
+            site = (record.pathname, record.lineno)
+            with self._lock:
+                bucket = self._buckets.get(site)
+                if bucket is None:
+                    if len(self._buckets) >= self.MAX_TRACKED_SITES:
+                        self._buckets.clear()
+                    bucket = self._buckets[site] = [float(self.burst), now]
+                # Token bucket: [tokens, last refill]
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate_per_second)
+                bucket[1] = now
+                if bucket[0] < 1:
+                    self.stats['rate_limited'] += 1
+                    return False
+                bucket[0] -= 1
+        
+        return True
+
+
+class AsyncLogHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler ที่ไม่บล็อก event loop
+    
+    ฝั่งผู้เรียกทำแค่ snapshot record (render ข้อความ, เก็บ traceback เป็นข้อความ)
+    แล้วใส่ queue; การ format JSON และ file I/O ทำใน writer thread.
+    เมื่อ queue เต็ม record ระดับต่ำจะถูก drop ทันทีและนับไว้ใน stats.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, block_level: int = logging.WARNING, block_timeout: float = 0.05):
+        super().__init__(log_queue)
+        self.block_level = block_level
+        self.block_timeout = block_timeout
+        self.stats: Dict[str, Any] = {'enqueued': 0, 'dropped': 0, 'dropped_by_level': {}}
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Snapshot สิ่งที่อาจเปลี่ยนหลังจากนี้; ไม่ format ทั้ง record แบบ QueueHandler ปกติ
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Warning/error รอได้สั้นๆ ส่วน debug/info drop ทันที
+            try:
+                if record.levelno < self.block_level:
+                    raise
+                self.queue.put(record, timeout=self.block_timeout)
+            except queue.Full:
+                self.stats['dropped'] += 1
+                by_level = self.stats['dropped_by_level']
+                by_level[record.levelname] = by_level.get(record.levelname, 0) + 1
+                return
+        self.stats['enqueued'] += 1
+
+
+class BatchingLogListener:
+    """
+    Writer thread ที่เขียน log เป็น batch
+    
+    แต่ละ record ถูก serialise ครั้งเดียวต่อ formatter (handler ที่ใช้ formatter
+    ตัวเดียวกันจะใช้ JSON บรรทัดเดียวกัน) แล้วเขียนทั้ง batch ด้วย write ครั้งเดียวต่อ handler
+    """
+    
+    _SENTINEL = None
+    
+    def __init__(self, log_queue: queue.Queue, handlers: List[logging.Handler],
+                 batch_size: int = 256, flush_interval: float = 0.5,
+                 drop_source: Optional[AsyncLogHandler] = None, drop_report_interval: float = 10.0):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop_source = drop_source
+        self.drop_report_interval = drop_report_interval
+        self._thread: Optional[threading.Thread] = None
+        self._reported_drops = 0
+        self._last_drop_report = 0.0
+        self.stats = {'written': 0, 'batches': 0, 'max_batch': 0, 'max_queue_depth': 0, 'write_errors': 0}
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0):
+        """เขียน record ที่ค้างให้หมดแล้วหยุด thread"""
+        if self._thread is None:
+            return
+        self.queue.put(self._SENTINEL)
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """รอจน record ที่อยู่ใน queue ถูกเขียนหมด"""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+    
+    def _run(self):
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            
+            batch = []
+            stopping = record is self._SENTINEL
+            if not stopping:
+                batch.append(record)
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self.queue.qsize() + 1)
+            
+            while not stopping and len(batch) < self.batch_size:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is self._SENTINEL:
+                    stopping = True
+                else:
+                    batch.append(record)
+            
+            dequeued = len(batch) + (1 if stopping else 0)
+            try:
+                self._report_drops(batch)
+                if batch:
+                    self._write_batch(batch)
+            finally:
+                for _ in range(dequeued):
+                    self.queue.task_done()
+            
+            if stopping:
+                return
+    
+    def _report_drops(self, batch: List[logging.LogRecord]):
+        if not self.drop_source:
+            return
+        dropped = self.drop_source.stats['dropped']
+        now = time.monotonic()
+        if dropped > self._reported_drops and now - self._last_drop_report >= self.drop_report_interval:
+            name = batch[0].name if batch else 'logging'
+            batch.append(logging.makeLogRecord({
+                'name': name,
+                'levelno': logging.WARNING,
+                'levelname': 'WARNING',
+                'msg': f"Log queue full: dropped {dropped - self._reported_drops} records",
+                'dropped_total': dropped
+            }))
+            self._reported_drops = dropped
+            self._last_drop_report = now
+    
+    def _write_batch(self, batch: List[logging.LogRecord]):
+        formatted: Dict[tuple, str] = {}
+        for handler in self.handlers:
+            lines = []
+            for index, record in enumerate(batch):
+                if record.levelno < handler.level or not handler.filter(record):
+                    continue
+                key = (id(handler.formatter), index)
+                if key not in formatted:
+                    formatted[key] = handler.format(record)
+                lines.append(formatted[key])
+            if lines:
+                self._write_lines(handler, lines, batch)
+        
+        self.stats['written'] += len(batch)
+        self.stats['batches'] += 1
+        self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+    
+    def _write_lines(self, handler: logging.Handler, lines: List[str], batch: List[logging.LogRecord]):
+        if not isinstance(handler, logging.StreamHandler):
+            for record in batch:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            return
+        
+        text = handler.terminator.join(lines) + handler.terminator
+        handler.acquire()
+        try:
+            if isinstance(handler, logging.handlers.RotatingFileHandler):
+                if handler.stream is None:
+                    handler.stream = handler._open()
+                position = handler.stream.tell()
+                size = len(text.encode(handler.encoding or 'utf-8'))
+                if handler.maxBytes > 0 and position and position + size >= handler.maxBytes:
+                    handler.doRollover()
+            handler.stream.write(text)
+            handler.flush()
+        except Exception:
+            self.stats['write_errors'] += 1
+        finally:
+            handler.release()
+
+
 class ContentFactoryLogger:
     """Main logger class สำหรับ AI Content Factory"""
     
@@ -192,11 +469,19 @@ class ContentFactoryLogger:
                  backup_count: int = 5,
                  use_json: bool = False,
                  use_color: bool = True,
-                 use_emoji: bool = True):
+                 use_emoji: bool = True,
+                 async_mode: Optional[bool] = None,
+                 async_config: Optional[AsyncLogConfig] = None):
         
         self.name = name
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        if async_mode is None:
+            async_mode = os.getenv('LOG_ASYNC', 'false').lower() == 'true'
+        self.async_mode = async_mode
+        self.async_config = async_config or AsyncLogConfig.from_env()
+        self.queue_handler: Optional[AsyncLogHandler] = None
+        self.listener: Optional[BatchingLogListener] = None
         
         # สร้าง logger
         self.logger = logging.getLogger(name)
@@ -204,20 +489,31 @@ class ContentFactoryLogger:
         
         # เคลียร์ handlers เก่า
         self.logger.handlers.clear()
+        self.logger.filters.clear()
+        
+        # Sampling / rate limiting สำหรับ debug events ที่ถี่ (ใช้ได้ทั้งสองโหมด)
+        self.throttle = LogThrottleFilter(
+            max_level=self.async_config.throttle_level,
+            sample_rate=self.async_config.sample_rate,
+            rate_per_second=self.async_config.rate_limit_per_second,
+            burst=self.async_config.rate_limit_burst
+        )
+        self.logger.addFilter(self.throttle)
         
         # Console Handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.DEBUG)
         
+        # JSON formatter ตัวเดียวใช้ร่วมกัน เพื่อให้ writer thread serialise แต่ละ record ครั้งเดียว
+        json_formatter = JSONFormatter()
+        
         if use_json:
-            console_handler.setFormatter(JSONFormatter())
+            console_handler.setFormatter(json_formatter)
         else:
             console_handler.setFormatter(
                 StructuredFormatter(use_color=use_color, use_emoji=use_emoji)
             )
         
-        self.logger.addHandler(console_handler)
-        
         # File Handler (Always JSON for files)
         file_handler = logging.handlers.RotatingFileHandler(
             filename=self.log_dir / f"{name}.log",
@@ -226,7 +522,7 @@ class ContentFactoryLogger:
             encoding='utf-8'
         )
         file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(JSONFormatter())
+        file_handler.setFormatter(json_formatter)
         
         # Error File Handler
         error_handler = logging.handlers.RotatingFileHandler(
@@ -236,7 +532,7 @@ class ContentFactoryLogger:
             encoding='utf-8'
         )
         error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(JSONFormatter())
+        error_handler.setFormatter(json_formatter)
         
         # เพิ่ม Performance Filter
         perf_filter = PerformanceFilter()
@@ -244,13 +540,60 @@ class ContentFactoryLogger:
         file_handler.addFilter(perf_filter)
         error_handler.addFilter(perf_filter)
         
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(error_handler)
+        self.handlers = [console_handler, file_handler, error_handler]
+        
+        if not async_mode:
+            for handler in self.handlers:
+                self.logger.addHandler(handler)
+            return
+        
+        # Queue mode: logger มีแค่ queue handler, format และ I/O อยู่ใน writer thread
+        config = self.async_config
+        log_queue = queue.Queue(maxsize=config.queue_size)
+        self.queue_handler = AsyncLogHandler(log_queue, config.block_level, config.block_timeout)
+        self.listener = BatchingLogListener(
+            log_queue,
+            self.handlers,
+            batch_size=config.batch_size,
+            flush_interval=config.flush_interval,
+            drop_source=self.queue_handler,
+            drop_report_interval=config.drop_report_interval
+        )
+        self.logger.addHandler(self.queue_handler)
+        self.listener.start()
+        _register_async_logger(self)
     
     def get_logger(self) -> logging.Logger:
         """ดึง logger instance"""
         return self.logger
     
+    def flush(self, timeout: float = 5.0) -> bool:
+        """รอจน log ที่ค้างใน queue ถูกเขียนหมด (sync mode คืน True ทันที)"""
+        if self.listener:
+            return self.listener.flush(timeout)
+        return True
+    
+    def close(self):
+        """หยุด writer thread และปิดไฟล์ log"""
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
+        for handler in self.handlers:
+            self.logger.removeHandler(handler)
+            handler.close()
+        if self.queue_handler:
+            self.logger.removeHandler(self.queue_handler)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """สถิติของ logging pipeline: enqueued, dropped, sampled_out, batches ..."""
+        stats = {'async_mode': self.async_mode, **self.throttle.stats}
+        if self.queue_handler:
+            stats.update(self.queue_handler.stats)
+            stats['queue_depth'] = self.queue_handler.queue.qsize()
+        if self.listener:
+            stats.update(self.listener.stats)
+        return stats
+    
     def debug(self, message: str, **kwargs):
         """Log debug message with extra fields"""
         self._log_with_extra(logging.DEBUG, message, **kwargs)
@@ -294,11 +637,25 @@ class ContentFactoryLogger:
         # เพิ่ม kwargs อื่นๆ เข้า extra
         extra.update(kwargs)
         
-        self.logger.log(level, message, extra=extra, exc_info=exc_info)
+        # stacklevel ชี้ไปที่ผู้เรียก debug()/info() แทน logger.py (ใช้กับ rate limit ต่อจุดเรียก)
+        self.logger.log(level, message, extra=extra, exc_info=exc_info, stacklevel=3)
 
 
 # Global logger instances
 _loggers: Dict[str, ContentFactoryLogger] = {}
+_async_loggers: List[ContentFactoryLogger] = []
+
+
+def _register_async_logger(logger: ContentFactoryLogger):
+    if not _async_loggers:
+        atexit.register(shutdown_logging)
+    _async_loggers.append(logger)
+
+
+def shutdown_logging():
+    """Flush และหยุด writer thread ของทุก logger ที่ใช้ queue mode"""
+    while _async_loggers:
+        _async_loggers.pop().close()
 
 
 def setup_logger(name: str, 
@@ -306,7 +663,8 @@ def setup_logger(name: str,
                 log_dir: str = "logs",
                 use_json: bool = False,
                 use_color: bool = True,
-                use_emoji: bool = True) -> ContentFactoryLogger:
+                use_emoji: bool = True,
+                async_mode: Optional[bool] = None) -> ContentFactoryLogger:
     """Setup หรือดึง logger instance"""
     
     if name not in _loggers:
@@ -316,7 +674,8 @@ def setup_logger(name: str,
             log_dir=log_dir,
             use_json=use_json,
             use_color=use_color,
-            use_emoji=use_emoji
+            use_emoji=use_emoji,
+            async_mode=async_mode
         )
     
     return _loggers[name]
@@ -472,8 +831,57 @@ def log_function_call(logger: ContentFactoryLogger):
     return decorator
 
 
+def benchmark_log_latency(iterations: int = 5000, log_dir: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    วัด latency ที่แต่ละ log call เพิ่มให้ผู้เรียก (microseconds) ของ sync และ queue mode
+    
+    Console ถูกส่งไปที่ os.devnull เพื่อให้ยังมี write syscall จริงโดยไม่รก terminal
+    """
+    log_dir = log_dir or tempfile.mkdtemp(prefix="log_benchmark_")
+    results = {}
+    original_stdout = sys.stdout
+    
+    with open(os.devnull, 'w') as devnull:
+        for async_mode in (False, True):
+            mode = 'async' if async_mode else 'sync'
+            sys.stdout = devnull
+            try:
+                logger = ContentFactoryLogger(
+                    f"log_benchmark_{mode}", log_dir=log_dir, use_color=False,
+                    async_mode=async_mode, async_config=AsyncLogConfig(queue_size=iterations + 1)
+                )
+            finally:
+                sys.stdout = original_stdout
+            
+            samples = []
+            for i in range(iterations):
+                started = time.perf_counter_ns()
+                logger.info("Upload chunk sent", chunk=i, bytes=1048576, platform="youtube")
+                samples.append(time.perf_counter_ns() - started)
+            
+            drain_started = time.perf_counter()
+            logger.flush(timeout=60)
+            drain_seconds = time.perf_counter() - drain_started
+            logger.close()
+            
+            samples.sort()
+            results[mode] = {
+                'mean_us': round(sum(samples) / len(samples) / 1000, 2),
+                'p50_us': round(samples[len(samples) // 2] / 1000, 2),
+                'p99_us': round(samples[int(len(samples) * 0.99)] / 1000, 2),
+                'max_us': round(samples[-1] / 1000, 2),
+                'drain_seconds': round(drain_seconds, 3)
+            }
+    
+    return results
+
+
 # Example usage and testing
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        print(json.dumps(benchmark_log_latency(), indent=2))
+        sys.exit(0)
+    
     # ทดสอบ logging system
     logger = setup_logger("test", use_emoji=True, use_color=True)
     
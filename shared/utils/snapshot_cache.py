@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+AI Content Factory - Materialised Snapshot Cache
+================================================
+
+Caches the result of an expensive builder (a dashboard's tiles, a report)
+per key, for endpoints that many clients poll:
+- Served from memory while younger than `ttl`
+- Between `ttl` and `max_stale` the cached snapshot is served at once and
+  rebuilt on a background thread (stale-while-revalidate)
+- Concurrent misses for the same key share one build
+- Each snapshot carries its JSON body and an ETag, so polling clients can
+  get 304 Not Modified; volatile keys (e.g. "timestamp") are left out of
+  the ETag so an unchanged dashboard keeps its tag across rebuilds
+
+Usage:
+    snapshots = SnapshotCache(build_stats, ttl=5, volatile_keys=("timestamp",))
+    snapshot = snapshots.get("today")
+    if snapshot.etag in request.if_none_match: ...
+
+Path: ai-content-factory/shared/utils/snapshot_cache.py
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def json_default(value: Any) -> Any:
+    """JSON encoding for the types dashboards return"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+@dataclass
+class Snapshot:
+    """One materialised result with its serialised body and ETag"""
+    data: Any
+    body: bytes
+    etag: str
+    built_at: float
+    build_ms: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.built_at
+
+    def matches(self, etags: Iterable[str]) -> bool:
+        """True if a client's If-None-Match already holds this snapshot"""
+        return self.etag in etags or '*' in etags
+
+
+class SnapshotCache:
+    """
+    TTL cache of materialised snapshots with background refresh
+
+    The builder is called as builder(*key); get() blocks only when there is
+    no snapshot at all or the cached one is older than max_stale.
+    """
+
+    def __init__(self, builder: Callable[..., Any], ttl: float = 5.0, max_stale: float = 60.0,
+                 volatile_keys: Iterable[str] = (), max_entries: int = 32, name: str = "snapshot"):
+        self.builder = builder
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self.volatile_keys = frozenset(volatile_keys)
+        self.max_entries = max_entries
+        self.name = name
+
+        self._entries: Dict[Tuple[Hashable, ...], Snapshot] = {}
+        self._building: Dict[Tuple[Hashable, ...], threading.Event] = {}
+        self._generation = 0  # bumped by invalidate() so builds started before it are not stored
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'builds': 0,
+            'background_builds': 0,
+            'unchanged_builds': 0,
+            'errors': 0
+        }
+
+    def get(self, *key: Hashable) -> Snapshot:
+        """Snapshot for key: cached, stale while refreshing, or freshly built"""
+        with self._lock:
+            snapshot = self._entries.get(key)
+        if snapshot is not None:
+            age = snapshot.age
+            if age < self.ttl:
+                self.stats['hits'] += 1
+                return snapshot
+            if age < self.max_stale:
+                self.stats['stale_hits'] += 1
+                self._refresh_in_background(key)
+                return snapshot
+        self.stats['misses'] += 1
+        return self._build(key)
+
+    async def aget(self, *key: Hashable) -> Snapshot:
+        """get() for async callers; a blocking build runs off the event loop"""
+        with self._lock:
+            snapshot = self._entries.get(key)
+        if snapshot is not None and snapshot.age < self.ttl:
+            self.stats['hits'] += 1
+            return snapshot
+        return await asyncio.to_thread(self.get, *key)
+
+    def invalidate(self, *key: Hashable):
+        """Drop one key (or every key when called without arguments)"""
+        with self._lock:
+            self._generation += 1
+            if key:
+                self._entries.pop(key, None)
+            else:
+                self._entries.clear()
+
+    # Building
+    def _build(self, key: Tuple[Hashable, ...]) -> Snapshot:
+        with self._lock:
+            event = self._building.get(key)
+            owner = event is None
+            if owner:
+                event = self._building[key] = threading.Event()
+            generation = self._generation
+
+        if not owner:
+            # Someone else is building this key: share their result
+            event.wait()
+            with self._lock:
+                snapshot = self._entries.get(key)
+            if snapshot is not None and snapshot.age < self.max_stale:
+                return snapshot
+            return self._build(key)
+
+        try:
+            start = time.perf_counter()
+            try:
+                data = self.builder(*key)
+            except Exception:
+                self.stats['errors'] += 1
+                raise
+            snapshot = self._materialise(key, data, (time.perf_counter() - start) * 1000)
+            self.stats['builds'] += 1
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[key] = snapshot
+                while len(self._entries) > self.max_entries:
+                    oldest = min(self._entries, key=lambda k: self._entries[k].built_at)
+                    del self._entries[oldest]
+            return snapshot
+        finally:
+            with self._lock:
+                self._building.pop(key, None)
+            event.set()
+
+    def _refresh_in_background(self, key: Tuple[Hashable, ...]):
+        with self._lock:
+            if key in self._building:
+                return
+
+        def refresh():
+            try:
+                self._build(key)
+                self.stats['background_builds'] += 1
+            except Exception as e:
+                logger.error(f"Background refresh of {self.name} snapshot {key} failed: {e}")
+
+        threading.Thread(target=refresh, name=f"{self.name}-refresh", daemon=True).start()
+
+    def _materialise(self, key: Tuple[Hashable, ...], data: Any, build_ms: float) -> Snapshot:
+        body = json.dumps(data, default=json_default).encode('utf-8')
+        stable = data
+        if self.volatile_keys and isinstance(data, dict):
+            stable = {k: v for k, v in data.items() if k not in self.volatile_keys}
+        digest = hashlib.sha1(json.dumps(stable, sort_keys=True, default=json_default).encode('utf-8'))
+        etag = digest.hexdigest()[:20]
+
+        with self._lock:
+            previous = self._entries.get(key)
+        if previous is not None and previous.etag == etag:
+            self.stats['unchanged_builds'] += 1
+
+        return Snapshot(data=data, body=body, etag=etag, built_at=time.time(), build_ms=round(build_ms, 2))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = {
+                repr(key): {'age_seconds': round(snapshot.age, 3), 'build_ms': snapshot.build_ms, 'etag': snapshot.etag}
+                for key, snapshot in self._entries.items()
+            }
+        requests = self.stats['hits'] + self.stats['stale_hits'] + self.stats['misses']
+        return {
+            'name': self.name,
+            **self.stats,
+            'hit_ratio': round((self.stats['hits'] + self.stats['stale_hits']) / requests, 3) if requests else 0.0,
+            'entries': entries
+        }
@@ -0,0 +1,206 @@
+"""
+Multi-Platform Video Transcoder
+Decode วิดีโอต้นฉบับครั้งเดียว แล้ว encode ทุก platform rendition จาก ffmpeg filter graph เดียว
+"""
+
+import asyncio
+import hashlib
+import os
+import shutil
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# bitrate เป้าหมายต่อ platform (ใช้ร่วมกันโดย PlatformOptimizer.platform_specs และ ContentOptimizer)
+PLATFORM_VIDEO_BITRATES = {
+    "youtube": "8000k",
+    "tiktok": "6000k",
+    "instagram": "5000k",
+    "facebook": "4000k"
+}
+
+@dataclass
+class RenditionTarget:
+    """Output ของหนึ่ง platform"""
+    platform: str
+    resolution: Tuple[int, int]        # width, height
+    bitrate: Optional[str] = None      # เช่น "6000k" (None = ใช้ CRF)
+    max_duration: Optional[float] = None
+    fps: int = 30
+
+    @classmethod
+    def from_spec(cls, platform: str, spec: Dict[str, Any]) -> "RenditionTarget":
+        """สร้างจาก dict รูปแบบเดียวกับ PlatformOptimizer.platform_specs"""
+        return cls(
+            platform=platform,
+            resolution=tuple(spec["resolution"]),
+            bitrate=spec.get("bitrate"),
+            max_duration=spec.get("max_duration"),
+            fps=spec.get("fps", 30)
+        )
+
+class TranscodeError(Exception):
+    """ffmpeg transcode ล้มเหลว"""
+    pass
+
+class MultiPlatformTranscoder:
+    """
+    สร้างทุก platform rendition ใน ffmpeg process เดียว
+
+    Filter graph: [0:v]split=N -> แต่ละสาขา scale (cover) + crop ตามขนาด
+    เป้าหมาย แล้ว encode แยก output พร้อม bitrate / ความยาวของแต่ละ platform
+    """
+
+    def __init__(self,
+                 ffmpeg_binary: str = "ffmpeg",
+                 video_codec: str = "libx264",
+                 audio_codec: str = "aac",
+                 preset: str = "veryfast",
+                 crf: int = 23):
+        self.ffmpeg_binary = ffmpeg_binary
+        self.video_codec = video_codec
+        self.audio_codec = audio_codec
+        self.preset = preset
+        self.crf = crf
+
+    def is_available(self) -> bool:
+        return shutil.which(self.ffmpeg_binary) is not None
+
+    def _scale_crop_filter(self, target: RenditionTarget) -> str:
+        width, height = target.resolution
+        return (
+            f"scale={width}:{height}:force_original_aspect_ratio=increase,"
+            f"crop={width}:{height},setsar=1,fps={target.fps}"
+        )
+
+    def _output_args(self, target: RenditionTarget) -> List[str]:
+        args = ["-c:v", self.video_codec, "-preset", self.preset]
+        if target.bitrate:
+            args += ["-b:v", target.bitrate, "-maxrate", target.bitrate,
+                     "-bufsize", self._double_bitrate(target.bitrate)]
+        else:
+            args += ["-crf", str(self.crf)]
+        args += ["-c:a", self.audio_codec, "-b:a", "128k", "-movflags", "+faststart"]
+        if target.max_duration:
+            args += ["-t", str(target.max_duration)]
+        return args
+
+    @staticmethod
+    def _double_bitrate(bitrate: str) -> str:
+        digits = bitrate.rstrip("kKmM")
+        suffix = bitrate[len(digits):]
+        try:
+            return f"{int(float(digits) * 2)}{suffix}"
+        except ValueError:
+            return bitrate
+
+    def build_command(self, input_path: str, outputs: Dict[str, str],
+                      targets: Dict[str, RenditionTarget]) -> List[str]:
+        """สร้าง ffmpeg command แบบ single-pass สำหรับทุก output"""
+        platforms = list(outputs.keys())
+        count = len(platforms)
+
+        split_labels = "".join(f"[s{i}]" for i in range(count))
+        graph = [f"[0:v]split={count}{split_labels}"] if count > 1 else []
+        for i, platform in enumerate(platforms):
+            source = f"[s{i}]" if count > 1 else "[0:v]"
+            graph.append(f"{source}{self._scale_crop_filter(targets[platform])}[v{i}]")
+
+        command = [self.ffmpeg_binary, "-y", "-loglevel", "error", "-i", input_path,
+                   "-filter_complex", ";".join(graph)]
+        for i, platform in enumerate(platforms):
+            command += ["-map", f"[v{i}]", "-map", "0:a?"]
+            command += self._output_args(targets[platform])
+            command.append(outputs[platform])
+        return command
+
+    def _plan(self, input_path: str, targets: List[RenditionTarget],
+              output_dir: str) -> Tuple[Dict[str, str], Dict[str, RenditionTarget]]:
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.splitext(os.path.basename(input_path))[0]
+        # ต้นฉบับต่าง path/เวอร์ชันที่ชื่อไฟล์ซ้ำกันต้องไม่เขียนทับ output ของกันและกัน
+        stat = os.stat(input_path)
+        source_id = hashlib.sha1(
+            f"{os.path.abspath(input_path)}:{stat.st_mtime_ns}:{stat.st_size}".encode()
+        ).hexdigest()[:12]
+        outputs = {
+            target.platform: os.path.join(output_dir, f"optimized_{target.platform}_{source_id}_{base}.mp4")
+            for target in targets
+        }
+        return outputs, {target.platform: target for target in targets}
+
+    async def transcode(self, input_path: str, targets: List[RenditionTarget],
+                        output_dir: str) -> Dict[str, str]:
+        """Transcode ครั้งเดียวได้ทุก platform คืน dict platform -> output path"""
+        if not targets:
+            return {}
+        if not self.is_available():
+            raise TranscodeError("ffmpeg is not available")
+
+        outputs, by_platform = self._plan(input_path, targets, output_dir)
+        command = self.build_command(input_path, outputs, by_platform)
+
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise TranscodeError(stderr.decode(errors="replace").strip() or "ffmpeg failed")
+
+        logger.info(f"Transcoded {input_path} into {len(outputs)} renditions in one pass")
+        return outputs
+
+    def transcode_sync(self, input_path: str, targets: List[RenditionTarget],
+                       output_dir: str) -> Dict[str, str]:
+        """เวอร์ชัน synchronous (ใช้ใน thread / benchmark)"""
+        outputs, by_platform = self._plan(input_path, targets, output_dir)
+        command = self.build_command(input_path, outputs, by_platform)
+        result = subprocess.run(command, capture_output=True)
+        if result.returncode != 0:
+            raise TranscodeError(result.stderr.decode(errors="replace").strip() or "ffmpeg failed")
+        return outputs
+
+    def benchmark(self, input_path: str, targets: List[RenditionTarget],
+                  output_dir: str) -> Dict[str, float]:
+        """
+        เปรียบเทียบ single-pass กับแบบเดิม (decode + encode แยกทีละ platform)
+
+        แบบเดิมจำลองด้วย ffmpeg หนึ่ง process ต่อ platform ซึ่งเป็น lower bound
+        ของ path MoviePy (MoviePy decode ผ่าน ffmpeg pipe และช้ากว่านี้)
+        """
+        started = time.perf_counter()
+        for target in targets:
+            self.transcode_sync(input_path, [target], os.path.join(output_dir, "per_platform"))
+        per_platform = time.perf_counter() - started
+
+        started = time.perf_counter()
+        self.transcode_sync(input_path, targets, os.path.join(output_dir, "single_pass"))
+        single_pass = time.perf_counter() - started
+
+        return {
+            "renditions": len(targets),
+            "per_platform_seconds": round(per_platform, 3),
+            "single_pass_seconds": round(single_pass, 3),
+            "speedup": round(per_platform / single_pass, 2) if single_pass else 0.0
+        }
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    specs = {
+        "youtube": {"resolution": (1920, 1080), "bitrate": "8000k", "max_duration": 900},
+        "tiktok": {"resolution": (1080, 1920), "bitrate": "6000k", "max_duration": 180},
+        "instagram": {"resolution": (1080, 1080), "bitrate": "5000k", "max_duration": 90},
+        "facebook": {"resolution": (1280, 720), "bitrate": "4000k", "max_duration": 240}
+    }
+    transcoder = MultiPlatformTranscoder()
+    print(transcoder.benchmark(
+        sys.argv[1],
+        [RenditionTarget.from_spec(name, spec) for name, spec in specs.items()],
+        tempfile.mkdtemp(prefix="transcode_bench_")
+    ))
@@ -0,0 +1,115 @@
+"""
+Unit Tests for Adaptive Trend Polling
+=====================================
+
+Tests for TrendCollector.run_adaptive_polling including:
+- Every registered source x region polled once per due cycle
+- Batches handed to the sink and the loop stopping on stop_event
+- Units cut off by the per-source timeout recorded as timed out
+- The keyless YouTube fallback honouring the requested regions
+"""
+
+import pytest
+import asyncio
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../trend_monitor/services'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../trend_monitor'))
+
+from services.trend_collector import TrendCollector
+from youtube_trends import YouTubeTrendsCollector
+from models.trend_data import TrendData, TrendSource, TrendCategory
+
+
+class FakeRegionCollector:
+    """Collector returning one trend per requested region"""
+
+    def __init__(self, regions, slow=()):
+        self.regions = regions
+        self.slow = set(slow)
+        self.calls = []
+        self.closed = False
+
+    async def collect_trends(self, regions=None):
+        self.calls.append(list(regions or self.regions))
+        if self.slow.intersection(regions or ()):
+            await asyncio.sleep(10)
+        return [
+            TrendData(topic=f"Trend in {region}", source=TrendSource.YOUTUBE,
+                      keywords=[region.lower(), "trend"], popularity_score=50.0,
+                      category=TrendCategory.ENTERTAINMENT, region=region)
+            for region in (regions or self.regions)
+        ]
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def trend_collector(tmp_path):
+    collector = TrendCollector(config_path=str(tmp_path / "missing.yaml"))
+    collector.collectors = {'youtube': FakeRegionCollector(['US', 'TH'])}
+    collector.scheduler = collector._initialize_scheduler()
+    return collector
+
+
+class TestAdaptivePolling:
+    """Test cases for TrendCollector.run_adaptive_polling"""
+
+    @pytest.mark.asyncio
+    async def test_polls_each_region_and_stops(self, trend_collector):
+        """One cycle polls each due region separately, writes to the sink, then honours stop_event"""
+        stop_event = asyncio.Event()
+        saved = []
+
+        def on_trends(trends):
+            stop_event.set()
+
+        await asyncio.wait_for(
+            trend_collector.run_adaptive_polling(on_trends=on_trends, stop_event=stop_event,
+                                                 sink=lambda batch: saved.extend(batch) or len(batch)),
+            timeout=5
+        )
+
+        assert sorted(trend_collector.collectors['youtube'].calls) == [['TH'], ['US']]
+        assert sorted(t.region for t in saved) == ['TH', 'US']
+        states = trend_collector.scheduler.states
+        assert states[('youtube', 'US')].polls == 1 and states[('youtube', 'TH')].polls == 1
+        assert trend_collector.scheduler.due() == []
+
+    @pytest.mark.asyncio
+    async def test_timeout_records_unreached_units(self, trend_collector):
+        """Units the source timeout never reached get a timed-out result instead of staying due"""
+        trend_collector.collectors = {'youtube': FakeRegionCollector(['US', 'TH', 'GB'], slow={'TH'})}
+        trend_collector.scheduler = trend_collector._initialize_scheduler()
+        trend_collector.config['collection']['timeout_seconds'] = 0.2
+
+        trends = await trend_collector.collect_due_trends()
+
+        assert [t.region for t in trends] == ['US']
+        states = trend_collector.scheduler.states
+        assert states[('youtube', 'US')].timeouts == 0
+        assert states[('youtube', 'TH')].timeouts == 1
+        assert states[('youtube', 'GB')].timeouts == 1
+        assert trend_collector.scheduler.due() == []
+        metrics = trend_collector.get_scheduling_metrics()
+        assert metrics['schedules']['youtube:GB']['timeouts'] == 1
+
+
+class TestYouTubeFallback:
+    """Test cases for the keyless YouTube fallback"""
+
+    @pytest.mark.asyncio
+    async def test_fallback_uses_requested_regions(self, monkeypatch):
+        """Without an API key, trends are still attributed to the region that was polled"""
+        monkeypatch.delenv('YOUTUBE_API_KEY', raising=False)
+        collector = YouTubeTrendsCollector(config={'regions': ['US', 'GB']})
+        assert collector.api_key is None
+
+        trends = await collector.collect_trends(regions=['TH'])
+        assert trends and {t.region for t in trends} == {'TH'}
+
+        trends = await collector.collect_trends()
+        assert {t.region for t in trends} == {'US', 'GB'}
@@ -0,0 +1,145 @@
+"""
+Unit Tests for the Alert Delivery Queue
+=======================================
+
+Tests for batched webhook delivery including:
+- Bursts coalesced by key into digest messages
+- Retries on server errors and Retry-After on 429 responses
+- Undelivered alerts persisted and sent after a restart
+"""
+
+import pytest
+import asyncio
+import json
+from aiohttp import web
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../monitoring/alerts'))
+
+from alert_delivery import AlertDeliveryService, DeliveryConfig, WebhookEndpoint
+
+
+async def start_server(failures: dict = None):
+    received = []
+    failures = failures if failures is not None else {}
+
+    async def hook(request):
+        name = request.match_info['name']
+        pending = failures.get(name, [])
+        if pending:
+            status = pending.pop(0)
+            return web.Response(status=status, headers={'Retry-After': '0.2'} if status == 429 else {})
+        received.append((name, await request.json()))
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_post("/{name}", hook)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", received
+
+
+def fast_config(**overrides) -> DeliveryConfig:
+    config = DeliveryConfig(
+        coalesce_windows={'critical': 0.1, 'warning': 0.3, 'info': 0.3},
+        rate_limit_per_minute=600,
+        rate_limit_burst=5
+    )
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return config
+
+
+class TestAlertDelivery:
+    """Test cases for AlertDeliveryService"""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_coalesced_into_digests(self):
+        """Hundreds of alerts become a handful of digest messages with per-key counts"""
+        runner, base_url, received = await start_server()
+        service = AlertDeliveryService(fast_config(max_digest_items=20))
+        service.register(WebhookEndpoint(name="ops", url=f"{base_url}/ops"))
+        try:
+            service.enqueue("ops", key="db", severity="critical", title="DB down",
+                            message="first", payload={"single": True})
+            await asyncio.sleep(0.5)
+
+            for i in range(300):
+                service.enqueue("ops", key="db", severity="critical", title="DB down", message=f"retry {i % 3}")
+            for i in range(25):
+                service.enqueue("ops", key=f"gen-{i}", severity="warning", title=f"Generation {i} failed",
+                                message="timeout", payload={"id": i})
+            assert not service.enqueue("unknown", key="x")
+            assert await service.flush_async(timeout=5)
+            stats = service.get_stats()["webhooks"]["ops"]
+        finally:
+            service.stop(flush=False)
+            await runner.cleanup()
+
+        assert received[0] == ("ops", {"single": True})
+        digests = [payload for _, payload in received[1:]]
+        assert len(digests) == 2
+        assert all(digest["type"] == "digest" for digest in digests)
+        assert sum(digest["count"] for digest in digests) == 325
+        db = digests[0]["alerts"][0]
+        assert db["key"] == "db" and db["count"] == 300 and db["severity"] == "critical"
+        assert stats["alerts"] == 326 and stats["coalesced"] == 299
+        assert stats["messages"] == 3 and stats["digests"] == 2 and stats["queued_alerts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_retries_and_retry_after(self):
+        """Server errors are retried and a 429 pauses the webhook for Retry-After"""
+        runner, base_url, received = await start_server(failures={'flaky': [500, 502], 'limited': [429]})
+        service = AlertDeliveryService(fast_config())
+        service.register(WebhookEndpoint(name="flaky", url=f"{base_url}/flaky", retry_count=3, retry_delay=0.05))
+        service.register(WebhookEndpoint(name="limited", url=f"{base_url}/limited", type="slack"))
+        try:
+            service.enqueue("flaky", key="a", severity="critical", title="A", message="a", payload={"a": 1})
+            service.enqueue("limited", key="b", severity="critical", title="B", message="b", payload={"text": "b"})
+            service.enqueue("limited", key="c", severity="critical", title="C", message="c", payload={"text": "c"})
+            assert await service.flush_async(timeout=5)
+            stats = service.get_stats()["webhooks"]
+        finally:
+            service.stop(flush=False)
+            await runner.cleanup()
+
+        assert ("flaky", {"a": 1}) in received
+        assert stats["flaky"]["retries"] == 2 and stats["flaky"]["messages"] == 1
+        assert stats["limited"]["rate_limited"] >= 1
+        slack = [payload for name, payload in received if name == "limited"]
+        assert len(slack) == 1 and len(slack[0]["attachments"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_undelivered_alerts_survive_restart(self, tmp_path):
+        """Alerts queued while a webhook is down are restored from the state file"""
+        state_path = str(tmp_path / "queue.json")
+        service = AlertDeliveryService(fast_config(state_path=state_path))
+        service.register(WebhookEndpoint(name="ops", url="http://127.0.0.1:1/down", retry_count=1, retry_delay=0.05))
+        for i in range(3):
+            service.enqueue("ops", key=f"k{i}", severity="warning", title=f"T{i}", message="m", payload={"i": i})
+        service.enqueue("ops", key="k0", severity="warning", title="T0", message="m")
+        assert not await service.flush_async(timeout=0.5)
+        service.stop(flush=False)
+
+        with open(state_path) as f:
+            state = json.load(f)
+        assert sorted(item["key"] for item in state["ops"]) == ["k0", "k1", "k2"]
+
+        runner, base_url, received = await start_server()
+        restarted = AlertDeliveryService(fast_config(state_path=state_path))
+        restarted.register(WebhookEndpoint(name="ops", url=f"{base_url}/ops"))
+        try:
+            assert await restarted.flush_async(timeout=5)
+        finally:
+            restarted.stop(flush=False)
+            await runner.cleanup()
+
+        alerts = [alert for _, payload in received for alert in payload["alerts"]]
+        assert {alert["key"]: alert["count"] for alert in alerts} == {"k0": 2, "k1": 1, "k2": 1}
+        with open(state_path) as f:
+            assert json.load(f) == {}
@@ -0,0 +1,108 @@
+"""
+Unit Tests for the Analysis Result Cache
+========================================
+
+Tests for AnalysisResultCache including:
+- Fresh hits, and concurrent misses computed once
+- Stale entries served immediately while refreshing in the background
+- Results rejected by cacheable() never stored
+- Momentum signals kept apart in the cache key
+"""
+
+import pytest
+import asyncio
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../content-engine/services'))
+
+from analysis_cache import AnalysisResultCache, momentum_key, FRESH, STALE, MISS
+
+
+def make_cache(**kwargs):
+    return AnalysisResultCache(serialize=lambda value: value, deserialize=lambda data: data, **kwargs)
+
+
+class TestAnalysisResultCache:
+    """Test cases for AnalysisResultCache"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self):
+        """Callers racing on one key share a single compute; later calls are fresh hits"""
+        cache = make_cache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"score": 7}
+
+        results = await asyncio.gather(*(cache.get_or_compute("trend", compute) for _ in range(5)))
+        assert results == [{"score": 7}] * 5
+        assert len(calls) == 1
+
+        assert await cache.get_or_compute("trend", compute) == {"score": 7}
+        assert len(calls) == 1
+        assert cache.stats["fresh_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_refreshes_in_background(self):
+        """A stale entry is returned as-is and replaced by one background refresh"""
+        cache = make_cache(fresh_ttl=0, stale_ttl=60)
+        await cache.put("trend", {"score": 1})
+        assert (await cache.lookup("trend"))[1] == STALE
+
+        async def compute():
+            return {"score": 2}
+
+        assert await cache.get_or_compute("trend", compute) == {"score": 1}
+        await asyncio.gather(*cache._refreshing.values())
+        assert await cache.get("trend") == {"score": 2}
+        assert cache.stats["background_refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_results_are_not_stored(self):
+        """Fallback results are returned but leave the key missing"""
+        cache = make_cache()
+
+        async def compute():
+            return {"quality": "fallback"}
+
+        result = await cache.get_or_compute("trend", compute,
+                                            cacheable=lambda value: value["quality"] != "fallback")
+        assert result == {"quality": "fallback"}
+        assert (await cache.lookup("trend"))[1] == MISS
+
+
+class TestMomentumKey:
+    """Test cases for the momentum part of analysis cache keys"""
+
+    def test_momentum_changes_key(self):
+        """Analyses with different measured momentum never share an entry"""
+        rising = {"velocity": 2.5, "acceleration": 0.1, "observations": 6}
+        falling = {"velocity": -2.5, "acceleration": -0.1, "observations": 6}
+
+        assert momentum_key(None) == momentum_key({})
+        assert momentum_key(rising) != momentum_key(None)
+        assert momentum_key(rising) != momentum_key(falling)
+        assert momentum_key(rising) == momentum_key({**rising, "first_seen": "2026-01-01", "observations": 40})
+        assert momentum_key({**rising, "observations": 2}) != momentum_key(rising)
+
+    @pytest.mark.asyncio
+    async def test_keys_with_momentum_are_cached_separately(self):
+        """A result computed without momentum is not served when momentum is known"""
+        cache = make_cache()
+        signal = {"velocity": 3.0, "acceleration": 0.0, "observations": 5}
+
+        async def plain():
+            return {"momentum_score": 5.0}
+
+        async def measured():
+            return {"momentum_score": 6.5}
+
+        await cache.get_or_compute(f"trend_{momentum_key(None)}", plain)
+        result = await cache.get_or_compute(f"trend_{momentum_key(signal)}", measured)
+        assert result == {"momentum_score": 6.5}
+        assert (await cache.lookup(f"trend_{momentum_key(signal)}"))[1] == FRESH
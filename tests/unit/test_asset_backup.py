@@ -0,0 +1,104 @@
+"""
+Unit Tests for Incremental Asset Backups
+========================================
+
+Tests for the deduplicated asset backup tool including:
+- Content-defined chunk boundaries that survive insertions
+- Incremental backups that only upload new chunks
+- Parallel restore and pruning of unreferenced chunks
+"""
+
+import pytest
+import io
+import os
+import random
+
+# Import the modules to test
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../database/backup'))
+
+import asset_backup
+from asset_backup import AssetBackup, ContentDefinedChunker, LocalChunkStore
+
+SMALL_CHUNKS = dict(min_size=1024, avg_size=4096, max_size=16384, read_size=32768)
+
+
+def random_bytes(size: int, seed: int) -> bytes:
+    return random.Random(seed).randbytes(size)
+
+
+@pytest.fixture
+def backup(tmp_path):
+    tool = AssetBackup(store=LocalChunkStore(str(tmp_path / 'store')))
+    tool.chunker = ContentDefinedChunker(**SMALL_CHUNKS)
+    tool.config['asset_backup_settings']['workers'] = 4
+    return tool
+
+
+class TestAssetBackup:
+    """Test cases for AssetBackup"""
+
+    def test_chunk_boundaries_are_content_defined(self, monkeypatch):
+        """Chunks respect size limits, match the pure-Python path and realign after an insertion"""
+        chunker = ContentDefinedChunker(**SMALL_CHUNKS)
+        data = random_bytes(200_000, seed=1)
+
+        chunks = list(chunker.chunks(io.BytesIO(data)))
+        assert b''.join(chunks) == data
+        assert all(SMALL_CHUNKS['min_size'] <= len(chunk) <= SMALL_CHUNKS['max_size'] for chunk in chunks[:-1])
+
+        monkeypatch.setattr(asset_backup, 'np', None)
+        assert list(chunker.chunks(io.BytesIO(data))) == chunks
+        monkeypatch.undo()
+
+        edited = list(chunker.chunks(io.BytesIO(b'inserted bytes' + data)))
+        assert len(set(chunks) - set(edited)) <= 2
+
+    def test_second_backup_only_uploads_new_content(self, backup, tmp_path):
+        """Unchanged files are skipped and only chunks of new files are stored"""
+        source = tmp_path / 'content_output'
+        (source / 'videos').mkdir(parents=True)
+        (source / 'videos' / 'a.mp4').write_bytes(random_bytes(150_000, seed=2))
+        (source / 'images').mkdir()
+        (source / 'images' / 'b.png').write_bytes(random_bytes(40_000, seed=3))
+
+        first = backup.create_backup(str(source))
+        assert first['success'] and first['files_changed'] == 2
+        stored_chunks = len(backup.store.list_chunks())
+
+        # A new file that shares most of its content with an existing one
+        (source / 'videos' / 'a_edit.mp4').write_bytes(random_bytes(150_000, seed=2)[:100_000] + b'outro')
+        second = backup.create_backup(str(source))
+
+        assert second['success']
+        assert second['files_total'] == 3 and second['files_changed'] == 1
+        assert second['bytes_scanned'] == 100_005
+        assert 0 < second['chunks_new'] <= 2
+        assert len(backup.store.list_chunks()) == stored_chunks + second['chunks_new']
+
+    def test_parallel_restore_and_prune(self, backup, tmp_path):
+        """Restored files match the originals; pruning drops chunks of expired backups"""
+        source = tmp_path / 'content_output'
+        source.mkdir()
+        original = random_bytes(120_000, seed=4)
+        (source / 'voice.wav').write_bytes(original)
+        (source / 'script.txt').write_bytes(b'hello ' * 5000)
+        backup.create_backup(str(source))
+        original_mtime = os.stat(source / 'voice.wav').st_mtime_ns
+
+        (source / 'voice.wav').write_bytes(random_bytes(60_000, seed=5))
+        latest = backup.create_backup(str(source))
+
+        first_id = backup.store.list_manifests()[0]
+        restored = backup.restore_backup(str(tmp_path / 'restore'), backup_id=first_id)
+        assert restored['success'] and restored['files_restored'] == 2
+        assert (tmp_path / 'restore' / 'voice.wav').read_bytes() == original
+        assert (tmp_path / 'restore' / 'script.txt').read_bytes() == b'hello ' * 5000
+        assert os.stat(tmp_path / 'restore' / 'voice.wav').st_mtime_ns == original_mtime
+
+        result = backup.prune_backups(keep=1)
+        assert result['backups_deleted'] == 1 and result['chunks_deleted'] > 0
+        assert backup.store.list_manifests() == [latest['backup_id']]
+        assert backup.restore_backup(str(tmp_path / 'latest'))['success']
+        assert (tmp_path / 'latest' / 'voice.wav').read_bytes() == (source / 'voice.wav').read_bytes()
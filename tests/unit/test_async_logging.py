@@ -0,0 +1,134 @@
+"""
+Unit Tests for Queue-Based Logging
+==================================
+
+Tests for the non-blocking logging pipeline including:
+- Batched JSON writes from the writer thread
+- Drop counters when the queue is full
+- Sampling and per-call-site rate limiting of debug events
+"""
+
+import pytest
+import json
+import logging
+import logging.handlers
+import queue
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../shared/utils'))
+
+from logger import AsyncLogConfig, AsyncLogHandler, BatchingLogListener, ContentFactoryLogger
+
+
+class TestAsyncLogging:
+    """Test cases for queue-mode ContentFactoryLogger"""
+
+    def test_queue_mode_writes_batched_json(self, tmp_path):
+        """Records reach the JSON log files in batches, with exceptions and extras intact"""
+        factory_logger = ContentFactoryLogger("async_test", log_dir=str(tmp_path), level="DEBUG",
+                                              use_color=False, async_mode=True)
+        try:
+            for i in range(200):
+                factory_logger.info("Chunk uploaded", chunk=i)
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                factory_logger.exception("Upload failed", platform="tiktok")
+
+            assert factory_logger.flush(timeout=5)
+            stats = factory_logger.get_stats()
+        finally:
+            factory_logger.close()
+
+        lines = (tmp_path / "async_test.log").read_text(encoding="utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        assert len(records) == 201
+        assert records[0]["extra"]["chunk"] == 0 and records[0]["function"] == "test_queue_mode_writes_batched_json"
+        assert "ValueError: boom" in records[-1]["exception"]
+
+        errors = (tmp_path / "async_test.error.log").read_text(encoding="utf-8").splitlines()
+        assert len(errors) == 1 and json.loads(errors[0])["extra"]["platform"] == "tiktok"
+        assert stats["enqueued"] == 201 and stats["dropped"] == 0
+        assert stats["batches"] < 201
+
+    def test_full_queue_drops_and_reports(self):
+        """A full queue drops records without blocking and the writer reports the drops"""
+        log_queue = queue.Queue(maxsize=5)
+        handler = AsyncLogHandler(log_queue, block_timeout=0.01)
+        logger = logging.getLogger("async_backpressure_test")
+        logger.handlers.clear()
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(handler)
+
+        for i in range(20):
+            logger.debug(f"progress {i}")
+        logger.error("still failing")
+
+        assert handler.stats["enqueued"] == 5
+        assert handler.stats["dropped"] == 16
+        assert handler.stats["dropped_by_level"] == {"DEBUG": 15, "ERROR": 1}
+
+        written = []
+
+        class CollectingHandler(logging.Handler):
+            def emit(self, record):
+                written.append(record.getMessage())
+
+        listener = BatchingLogListener(log_queue, [CollectingHandler()], flush_interval=0.01,
+                                       drop_source=handler, drop_report_interval=0)
+        listener.start()
+        assert listener.flush(timeout=5)
+        listener.stop()
+
+        assert written[:5] == [f"progress {i}" for i in range(5)]
+        assert written[-1] == "Log queue full: dropped 16 records"
+
+    def test_debug_sampling_and_rate_limiting(self, tmp_path):
+        """Debug events are rate limited per call site; info and above pass untouched"""
+        config = AsyncLogConfig(rate_limit_per_second=0.001, rate_limit_burst=10)
+        factory_logger = ContentFactoryLogger("throttle_test", log_dir=str(tmp_path), level="DEBUG",
+                                              use_color=False, async_mode=True, async_config=config)
+        try:
+            for i in range(100):
+                factory_logger.debug(f"frame {i} rendered")
+            for i in range(3):
+                factory_logger.debug("other call site")
+            for i in range(30):
+                factory_logger.info(f"stage {i}")
+            factory_logger.flush(timeout=5)
+            stats = factory_logger.get_stats()
+        finally:
+            factory_logger.close()
+
+        assert stats["rate_limited"] == 90
+        assert stats["enqueued"] == 10 + 3 + 30
+
+        factory_logger = ContentFactoryLogger("sampling_test", log_dir=str(tmp_path), level="DEBUG",
+                                              async_mode=False, async_config=AsyncLogConfig(sample_rate=0.0))
+        factory_logger.debug("never kept")
+        factory_logger.info("always kept")
+        factory_logger.close()
+        assert factory_logger.get_stats()["sampled_out"] == 1
+        assert "always kept" in (tmp_path / "sampling_test.log").read_text(encoding="utf-8")
+
+    def test_batch_rotation_counts_bytes(self, tmp_path):
+        """Rotation is decided on the encoded size, so multi-byte text still rolls over at maxBytes"""
+        path = tmp_path / "thai.log"
+        handler = logging.handlers.RotatingFileHandler(str(path), maxBytes=300, backupCount=1, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log_queue = queue.Queue()
+        listener = BatchingLogListener(log_queue, [handler], flush_interval=0.01)
+        listener.start()
+        try:
+            for _ in range(2):
+                log_queue.put(logging.makeLogRecord({"msg": "ก" * 60, "levelno": logging.INFO, "levelname": "INFO"}))
+                assert listener.flush(timeout=5)
+        finally:
+            listener.stop()
+            handler.close()
+
+        assert (tmp_path / "thai.log.1").exists()
+        assert path.stat().st_size <= 300
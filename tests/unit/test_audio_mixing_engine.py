@@ -0,0 +1,77 @@
+"""
+Unit Tests for the Streaming Audio Mixer
+========================================
+
+Tests for StreamingAudioMixer including:
+- Final mix normalised to the headroom instead of hard-clipped
+- Ducking off by default and opt-in through MixSettings
+- Concurrent mixes on one mixer keeping separate ducking state
+"""
+
+import pytest
+import asyncio
+import io
+import wave
+
+import numpy as np
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../content-engine/services'))
+
+from audio_mixing_engine import MixSettings, StreamingAudioMixer, _synthetic_wav
+
+
+def read_wav(data: bytes) -> np.ndarray:
+    with wave.open(io.BytesIO(data), 'rb') as reader:
+        return np.frombuffer(reader.readframes(reader.getnframes()), dtype='<i2')
+
+
+def speech_like_wav(seconds: float, sample_rate: int = 44100) -> bytes:
+    """Tone bursts with pauses so ducking has something to react to"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t) * (np.floor(t * 2) % 2 == 0)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        writer.writeframes((tone * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+class TestStreamingAudioMixer:
+    """Test cases for StreamingAudioMixer"""
+
+    def test_mix_is_normalised_not_clipped(self):
+        """A click on top of full-scale speech is absorbed by normalising the whole mix"""
+        mixer = StreamingAudioMixer(MixSettings(output_format='wav', block_seconds=1.0))
+        data, duration = mixer.mix(_synthetic_wav(3, 220), _synthetic_wav(1, 440),
+                                   [{"type": "click", "position_ms": 1000}])
+        samples = read_wav(data)
+
+        assert duration == pytest.approx(3.0)
+        assert np.count_nonzero(np.abs(samples.astype(np.int32)) >= 32767) == 0
+        peak_db = 20 * np.log10(np.abs(samples).max() / 32768.0)
+        assert peak_db == pytest.approx(-0.1, abs=0.01)
+
+    def test_ducking_is_opt_in(self):
+        """Default settings leave the background level alone; ducking_db enables it"""
+        voice, music = speech_like_wav(3), _synthetic_wav(3, 440)
+        assert MixSettings().ducking_db == 0
+
+        plain = read_wav(StreamingAudioMixer(MixSettings(output_format='wav')).mix(voice, music)[0])
+        ducked = read_wav(StreamingAudioMixer(MixSettings(output_format='wav', ducking_db=-8.0)).mix(voice, music)[0])
+        assert not np.array_equal(plain, ducked)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_mixes_keep_their_own_ducking_state(self):
+        """Parallel mix_async calls on one mixer give the same output as running alone"""
+        mixer = StreamingAudioMixer(MixSettings(output_format='wav', ducking_db=-8.0, block_seconds=0.1))
+        jobs = [(speech_like_wav(2 + i * 0.5), _synthetic_wav(1, 330 + i * 50)) for i in range(4)]
+
+        expected = [mixer.mix(voice, music)[0] for voice, music in jobs]
+        results = await asyncio.gather(*(mixer.mix_async(voice, music) for voice, music in jobs))
+
+        assert [data for data, _ in results] == expected
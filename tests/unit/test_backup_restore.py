@@ -0,0 +1,112 @@
+"""
+Unit Tests for Database Restore
+===============================
+
+Tests for DatabaseBackup.restore_backup against an in-process S3 (moto) including:
+- Single-object backups streamed from S3 into psql / pg_restore by default
+- Parallel pg_restore only when jobs are requested, from a local copy
+"""
+
+import pytest
+import gzip
+import os
+import stat
+
+moto = pytest.importorskip('moto')
+boto3 = pytest.importorskip('boto3')
+
+# Import the modules to test
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../database/backup'))
+
+from backup_script import DatabaseBackup
+
+BUCKET = 'backups'
+
+# Records its arguments and everything read from stdin / the archive it was given
+FAKE_CLIENT = """#!/bin/sh
+name=$(basename "$0")
+echo "$@" > "$RESTORE_LOG/$name.args"
+last=""
+for arg in "$@"; do last="$arg"; done
+if [ -f "$last" ]; then cat "$last"; else cat; fi > "$RESTORE_LOG/$name.input"
+"""
+
+
+@pytest.fixture
+def restore_env(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'bin'
+    log_dir = tmp_path / 'log'
+    bin_dir.mkdir()
+    log_dir.mkdir()
+    for name in ('psql', 'pg_restore'):
+        client = bin_dir / name
+        client.write_text(FAKE_CLIENT)
+        client.chmod(client.stat().st_mode | stat.S_IEXEC)
+
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv('RESTORE_LOG', str(log_dir))
+    for variable in ('AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY'):
+        monkeypatch.setenv(variable, 'testing')
+
+    with moto.mock_aws():
+        boto3.client('s3', region_name='us-east-1').create_bucket(Bucket=BUCKET)
+        backup = DatabaseBackup(str(tmp_path / 'missing.yaml'))
+        backup.config['backup_settings']['local_backup_dir'] = str(tmp_path / 'local')
+        backup.config['s3_settings'].update(access_key='testing', secret_key='testing', endpoint_url='')
+        yield backup, log_dir
+
+
+def put_object(key: str, body: bytes):
+    boto3.client('s3', region_name='us-east-1').put_object(Bucket=BUCKET, Key=key, Body=body)
+
+
+class TestRestoreBackup:
+    """Test cases for DatabaseBackup.restore_backup"""
+
+    def test_s3_restore_streams_by_default(self, restore_env, monkeypatch):
+        """A compressed plain dump is piped from S3 through gzip into psql without a local download"""
+        backup, log_dir = restore_env
+        sql = b'CREATE TABLE trends (id serial);\n' * 1000
+        put_object('database-backups/backup.sql.gz', gzip.compress(sql))
+        monkeypatch.setattr(backup, 'download_from_s3', lambda *args: pytest.fail('restore downloaded the backup'))
+
+        assert backup.restore_backup(f's3://{BUCKET}/database-backups/backup.sql.gz')
+
+        assert (log_dir / 'psql.input').read_bytes() == sql
+        local_dir = backup.config['backup_settings']['local_backup_dir']
+        assert not any(files for _, _, files in os.walk(local_dir))
+
+    def test_s3_archive_streams_into_pg_restore(self, restore_env):
+        """Custom-format archives stream into pg_restore's stdin without --jobs"""
+        backup, log_dir = restore_env
+        put_object('database-backups/backup.dump', b'PGDMP archive')
+
+        assert backup.restore_backup(f's3://{BUCKET}/database-backups/backup.dump', target_db='restored')
+
+        args = (log_dir / 'pg_restore.args').read_text()
+        assert '--format=custom' in args and '--dbname=restored' in args
+        assert '--jobs' not in args
+        assert (log_dir / 'pg_restore.input').read_bytes() == b'PGDMP archive'
+
+    def test_parallel_restore_is_opt_in(self, restore_env):
+        """jobs > 1 downloads the archive and hands pg_restore a seekable file"""
+        backup, log_dir = restore_env
+        put_object('database-backups/backup.dump', b'PGDMP archive')
+
+        assert backup.restore_backup(f's3://{BUCKET}/database-backups/backup.dump', jobs=3)
+
+        args = (log_dir / 'pg_restore.args').read_text().split()
+        assert '--jobs=3' in args
+        assert args[-1].endswith('backup.dump')
+        assert (log_dir / 'pg_restore.input').read_bytes() == b'PGDMP archive'
+
+    def test_failed_restore_is_reported(self, restore_env):
+        """A restore client exiting non-zero fails the streaming restore"""
+        backup, log_dir = restore_env
+        put_object('database-backups/backup.dump', b'PGDMP archive')
+        failing = log_dir.parent / 'bin' / 'pg_restore'
+        failing.write_text('#!/bin/sh\ncat > /dev/null\nexit 1\n')
+
+        assert not backup.restore_backup(f's3://{BUCKET}/database-backups/backup.dump')
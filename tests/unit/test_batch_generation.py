@@ -0,0 +1,142 @@
+"""
+Unit Tests for Batch Generation
+===============================
+
+Tests for the batch generation helpers including:
+- Errors attributed to the request that caused them, even after unsupported types
+- Results returned as a list in request order
+- Combined metadata calls grouped per opportunity and charged once
+- Pending work cancelled when the consumer stops reading
+"""
+
+import pytest
+import asyncio
+from types import SimpleNamespace
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../content-engine/services'))
+
+from batch_generation import (BatchGenerationItem, collect_batch_results, plan_batch, split_call_cost,
+                              stream_batch)
+
+SUPPORTED = ("script", "title", "description", "hashtags", "thumbnail_concept")
+COMBINABLE = ("title", "description", "hashtags")
+
+
+def make_request(content_type, opportunity=None):
+    return SimpleNamespace(content_type=content_type, context={"opportunity": opportunity})
+
+
+def by_opportunity(request):
+    opportunity = request.context.get("opportunity")
+    return None if opportunity is None else id(opportunity)
+
+
+async def run_batch(plan, fail=()):
+    async def run_single(index, request):
+        await asyncio.sleep(0.01 * (5 - index % 5))
+        if request.content_type in fail:
+            return [BatchGenerationItem(index, request, error=f"{request.content_type} failed")]
+        return [BatchGenerationItem(index, request, result=f"{request.content_type}#{index}")]
+
+    async def run_group(group):
+        return [BatchGenerationItem(index, request, result=f"combined {request.content_type}#{index}")
+                for index, request in group]
+
+    return [item async for item in stream_batch(plan, run_single, run_group)]
+
+
+class TestBatchErrorAttribution:
+    """Test cases for request indexes in batch results"""
+
+    @pytest.mark.asyncio
+    async def test_errors_keep_original_request_index(self):
+        """An unsupported type earlier in the batch no longer shifts later errors onto other requests"""
+        requests = [make_request("script"), make_request("podcast"), make_request("title"),
+                    make_request("thumbnail_concept")]
+        plan = plan_batch(requests, SUPPORTED)
+
+        items = await run_batch(plan, fail=("thumbnail_concept",))
+        results, errors = collect_batch_results(items)
+
+        assert results == ["script#0", "title#2"]
+        assert errors == [
+            {"request_index": 1, "content_type": "podcast", "error": "Unsupported content type: podcast"},
+            {"request_index": 3, "content_type": "thumbnail_concept", "error": "thumbnail_concept failed"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_results_follow_request_order(self):
+        """Items stream in completion order but the collected list follows the requests"""
+        requests = [make_request(content_type) for content_type in SUPPORTED]
+        items = await run_batch(plan_batch(requests, SUPPORTED))
+
+        assert [item.index for item in items] != list(range(len(requests)))
+        results, errors = collect_batch_results(items)
+        assert results == [f"{content_type}#{i}" for i, content_type in enumerate(SUPPORTED)]
+        assert errors == []
+
+
+class TestCombinedMetadata:
+    """Test cases for combined title/description/hashtags calls"""
+
+    def test_groups_per_opportunity(self):
+        """Each opportunity gets one group with at most one request per type"""
+        first, second = object(), object()
+        requests = [make_request("title", first), make_request("hashtags", first), make_request("title", first),
+                    make_request("description", second), make_request("script", first),
+                    make_request("title", second)]
+
+        plan = plan_batch(requests, SUPPORTED, COMBINABLE, by_opportunity)
+
+        assert [[index for index, _ in group] for group in plan.groups] == [[0, 1], [3, 5]]
+        assert sorted(index for index, _ in plan.singles) == [2, 4]
+        assert plan.unsupported == []
+
+    def test_single_member_groups_run_alone(self):
+        """Without a second combinable request, or with combining off, requests run separately"""
+        opportunity = object()
+        requests = [make_request("title", opportunity), make_request("script", opportunity)]
+
+        assert plan_batch(requests, SUPPORTED, COMBINABLE, by_opportunity).groups == []
+        plan = plan_batch(requests + [make_request("hashtags", opportunity)], SUPPORTED, COMBINABLE)
+        assert plan.groups == [] and len(plan.singles) == 3
+
+    def test_call_cost_is_split_not_multiplied(self):
+        """One combined call is charged once; the parts' shares add up to that charge"""
+        shares = split_call_cost(10.0, 3)
+        assert shares == [3.33, 3.33, 3.34]
+        assert round(sum(shares), 2) == 10.0
+        assert split_call_cost(4.5, 1) == [4.5]
+        assert split_call_cost(4.5, 0) == []
+
+
+class TestStreamBatch:
+    """Test cases for stream_batch"""
+
+    @pytest.mark.asyncio
+    async def test_stopping_early_cancels_pending_work(self):
+        """Closing the stream after the first item cancels the requests still running"""
+        cancelled = []
+
+        async def run_single(index, request):
+            try:
+                await asyncio.sleep(0 if index == 0 else 5)
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+            return [BatchGenerationItem(index, request, result=index)]
+
+        async def run_group(group):
+            return []
+
+        plan = plan_batch([make_request("script") for _ in range(3)], SUPPORTED)
+        stream = stream_batch(plan, run_single, run_group)
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+        assert first.index == 0
+        assert sorted(cancelled) == [1, 2]
@@ -0,0 +1,135 @@
+"""
+Unit Tests for the Async Health Check Engine
+============================================
+
+Tests for the shared health-check engine including:
+- Cached results served within the TTL, one probe for concurrent callers
+- Per-check timeouts that do not hold up other checks
+- Bounded concurrent fan-out across many HTTP endpoints
+"""
+
+import pytest
+import asyncio
+import time
+from aiohttp import web
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../shared/utils'))
+
+from health_engine import (
+    HealthEngine, HealthEngineConfig, ProbeResult, http_probe, overall_status,
+    STATUS_HEALTHY, STATUS_CRITICAL, STATUS_WARNING
+)
+from http_sessions import close_http_sessions
+
+
+async def start_server(delay: float = 0.0):
+    hits = {'count': 0, 'active': 0, 'peak': 0}
+
+    async def health(request):
+        hits['count'] += 1
+        hits['active'] += 1
+        hits['peak'] = max(hits['peak'], hits['active'])
+        await asyncio.sleep(delay)
+        hits['active'] -= 1
+        if request.match_info['name'] == 'broken':
+            return web.Response(status=503, text="maintenance")
+        return web.json_response({"status": "ok", "metrics": {"error_rate": 1.5}})
+
+    app = web.Application()
+    app.router.add_get("/{name}/health", health)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", hits
+
+
+class TestHealthEngine:
+    """Test cases for HealthEngine"""
+
+    @pytest.mark.asyncio
+    async def test_cached_results_are_not_reprobed(self):
+        """Concurrent callers share one probe and later calls within the TTL hit the cache"""
+        calls = []
+
+        async def probe():
+            calls.append(time.time())
+            await asyncio.sleep(0.05)
+            return ProbeResult(status=STATUS_HEALTHY, message="ok")
+
+        engine = HealthEngine(HealthEngineConfig(default_ttl=60))
+        engine.register("database", probe)
+
+        results = await asyncio.gather(*(engine.check("database") for _ in range(50)))
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert results[0].name == "database" and results[0].response_time_ms >= 50
+
+        for _ in range(100):
+            await engine.check("database")
+        assert len(calls) == 1
+        assert engine.get_stats()["cache_hits"] == 100
+
+        await engine.check("database", force=True)
+        assert len(calls) == 2
+        assert engine.snapshot()["checks"]["database"]["status"] == STATUS_HEALTHY
+
+    @pytest.mark.asyncio
+    async def test_timeouts_are_per_check(self):
+        """A hung dependency times out on its own budget while the others complete"""
+        async def hung():
+            await asyncio.sleep(30)
+
+        async def fast():
+            return ProbeResult(status=STATUS_HEALTHY)
+
+        def blocking():
+            time.sleep(0.05)
+            return ProbeResult(status=STATUS_WARNING, message="slow replica")
+
+        engine = HealthEngine()
+        engine.register("redis", hung, timeout=0.2)
+        engine.register("api", fast, timeout=5)
+        engine.register("postgres", engine.blocking_probe(blocking), timeout=5)
+
+        start = time.perf_counter()
+        results = await engine.run_all()
+        elapsed = time.perf_counter() - start
+        engine.close()
+
+        assert elapsed < 1
+        assert results["redis"].status == STATUS_CRITICAL
+        assert results["redis"].details == {'timeout_seconds': 0.2}
+        assert results["api"].status == STATUS_HEALTHY
+        assert results["postgres"].message == "slow replica"
+        assert overall_status(results.values()) == STATUS_CRITICAL
+        assert engine.get_stats()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fan_out_to_many_endpoints(self):
+        """Hundreds of HTTP probes run concurrently up to the engine's limit"""
+        runner, base_url, hits = await start_server(delay=0.1)
+        engine = HealthEngine(HealthEngineConfig(max_concurrency=100))
+        for i in range(300):
+            engine.register(f"pod-{i}", http_probe(f"{base_url}/pod-{i}/health"), timeout=5)
+        engine.register("broken", http_probe(f"{base_url}/broken/health"), timeout=5)
+        engine.register("gone", http_probe("http://127.0.0.1:1/health"), timeout=5)
+        try:
+            start = time.perf_counter()
+            results = await engine.run_all()
+            elapsed = time.perf_counter() - start
+        finally:
+            await close_http_sessions()
+            await runner.cleanup()
+
+        assert elapsed < 2
+        assert hits["count"] == 301 and 1 < hits["peak"] <= 100
+        assert results["pod-7"].status == STATUS_HEALTHY
+        assert results["pod-7"].details["response"]["metrics"] == {"error_rate": 1.5}
+        assert results["broken"].status == STATUS_CRITICAL
+        assert results["broken"].details["status_code"] == 503
+        assert results["gone"].message == "Service unreachable"
@@ -0,0 +1,118 @@
+"""
+Unit Tests for Shared HTTP Sessions
+===================================
+
+Tests for the process-wide HTTP session registry including:
+- One long-lived session per host
+- Connection reuse metrics across requests
+- Per-event-loop sessions and shutdown
+- Process exit closing the sessions of every event loop
+"""
+
+import pytest
+import asyncio
+import threading
+from aiohttp import web
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../shared/utils'))
+
+from http_sessions import HTTPSessionRegistry, host_key
+
+
+async def start_server():
+    async def hello(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/hello", hello)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+class TestHTTPSessionRegistry:
+    """Test cases for HTTPSessionRegistry"""
+
+    def test_host_key_normalises_urls(self):
+        """Sessions are keyed by scheme and host, not path"""
+        assert host_key("https://graph.facebook.com/v18.0/me/videos") == "https://graph.facebook.com"
+        assert host_key("API.Groq.com") == "https://api.groq.com"
+        assert host_key("http://localhost:8080/x") != host_key("https://localhost:8080/x")
+
+    @pytest.mark.asyncio
+    async def test_requests_share_session_and_reuse_connections(self):
+        """Repeated calls to one host reuse one session and its keep-alive connections"""
+        runner, base_url = await start_server()
+        registry = HTTPSessionRegistry()
+        try:
+            for _ in range(5):
+                session = registry.get_session(f"{base_url}/hello")
+                async with session.get(f"{base_url}/hello") as response:
+                    assert (await response.json()) == {"ok": True}
+
+            assert registry.get_session(base_url) is session
+            stats = registry.get_stats()["hosts"][host_key(base_url)]
+            assert stats["requests"] == 5
+            assert stats["sessions_created"] == 1
+            assert stats["connections_created"] == 1
+            assert stats["connections_reused"] == 4
+        finally:
+            await registry.close_all()
+            await runner.cleanup()
+
+        assert session.closed
+        assert registry.get_stats()["open_sessions"] == 0
+
+    def test_sessions_are_per_event_loop(self):
+        """A new event loop gets a fresh session; sessions of closed loops are dropped"""
+        registry = HTTPSessionRegistry()
+
+        async def lookup():
+            return registry.get_session("https://api.example.com")
+
+        first = asyncio.run(lookup())
+        second = asyncio.run(lookup())
+
+        assert first is not second
+        assert first.closed
+        assert registry.get_stats()["hosts"]["https://api.example.com"]["sessions_created"] == 2
+
+    def test_shutdown_closes_sessions_of_every_loop(self):
+        """The atexit shutdown closes sessions on idle loops and on loops running in other threads"""
+        registry = HTTPSessionRegistry()
+        hooks = []
+
+        async def hook():
+            hooks.append("closed")
+
+        registry.on_shutdown(hook)
+
+        async def lookup():
+            return registry.get_session("https://api.example.com")
+
+        idle_loop = asyncio.new_event_loop()
+        idle_session = idle_loop.run_until_complete(lookup())
+
+        worker_loop = asyncio.new_event_loop()
+        worker = threading.Thread(target=worker_loop.run_forever, daemon=True)
+        worker.start()
+        worker_session = asyncio.run_coroutine_threadsafe(lookup(), worker_loop).result(5)
+
+        try:
+            assert registry.get_stats()["open_sessions"] == 2
+            registry.shutdown(timeout=5)
+
+            assert idle_session.closed and worker_session.closed
+            assert registry.get_stats()["open_sessions"] == 0
+            assert hooks == ["closed"]
+        finally:
+            worker_loop.call_soon_threadsafe(worker_loop.stop)
+            worker.join(5)
+            worker_loop.close()
+            idle_loop.close()
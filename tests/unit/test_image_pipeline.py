@@ -0,0 +1,66 @@
+"""
+Unit Tests for the Image Variant Pipeline
+=========================================
+
+Tests for ImageVariantPipeline including:
+- One decode per source for all of its renditions
+- Sources with the same basename kept in separate output files
+- Output names carrying the real encoded format
+"""
+
+import pytest
+import os
+
+from PIL import Image
+
+# Import the modules to test
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../platform-manager/utils'))
+
+from image_pipeline import ImageVariantPipeline, RenditionSpec
+
+THUMBNAIL = RenditionSpec('youtube', 'thumbnail', (320, 180))
+
+
+def write_image(path, color):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    Image.new('RGB', (1280, 720), color).save(path)
+    return str(path)
+
+
+class TestImageVariantPipeline:
+    """Test cases for ImageVariantPipeline"""
+
+    def test_decode_once_for_all_renditions(self, tmp_path):
+        """Every spec of one source comes from a single decode and is cached afterwards"""
+        source = write_image(tmp_path / "src" / "img.png", "green")
+        pipeline = ImageVariantPipeline(str(tmp_path / "out"))
+        specs = [THUMBNAIL, RenditionSpec('tiktok', 'main_image', (1080, 1920)),
+                 RenditionSpec('instagram', 'main_image', (1080, 1080))]
+
+        first = pipeline.render(source, specs)
+        second = pipeline.render(source, specs)
+
+        assert first == second
+        assert len(set(first.values())) == 3
+        assert pipeline.stats['sources_decoded'] == 1
+        assert pipeline.stats['renditions_written'] == 3
+        assert pipeline.stats['rendition_cache_hits'] == 3
+
+    def test_same_basename_sources_do_not_collide(self, tmp_path):
+        """Two different img.png files get their own renditions; re-rendering returns the right one"""
+        red = write_image(tmp_path / "a" / "img.png", "red")
+        blue = write_image(tmp_path / "b" / "img.png", "blue")
+        pipeline = ImageVariantPipeline(str(tmp_path / "out"))
+
+        red_path = pipeline.render(red, [THUMBNAIL])[THUMBNAIL]
+        blue_path = pipeline.render(blue, [THUMBNAIL])[THUMBNAIL]
+        again = pipeline.render(red, [THUMBNAIL])[THUMBNAIL]
+
+        assert red_path != blue_path
+        assert again == red_path
+        with Image.open(again) as img:
+            assert img.format == 'JPEG'
+            r, g, b = img.getpixel((160, 90))
+            assert r > 200 and b < 50
+        assert red_path.endswith('.jpg') and '320x180' in os.path.basename(red_path)
@@ -0,0 +1,109 @@
+"""
+Unit Tests for Instagram Uploader
+=================================
+
+Tests for InstagramUploader including:
+- Importing the uploader outside the platform-manager package
+- Container status polling through the shared job poller
+"""
+
+import pytest
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../platform-manager/services/uploaders'))
+
+from instagram_uploader import InstagramUploader
+from shared.utils.job_poller import JobPoller, PollSchedule
+
+FAST = PollSchedule(initial_interval=0.01, fast_polls=2, backoff_factor=2.0, max_interval=0.05, min_interval=0.005)
+
+
+class StubResponse:
+    """Graph API response returned by StubSession"""
+
+    def __init__(self, payload, status=200):
+        self.status = status
+        self.payload = payload
+
+    async def json(self):
+        return self.payload
+
+    async def text(self):
+        return str(self.payload)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class StubSession:
+    """Session answering multi-id status lookups from a list of scripted statuses"""
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.requests = []
+
+    def get(self, url, params=None):
+        self.requests.append((url, dict(params or {})))
+        ids = params['ids'].split(',')
+        status_code = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return StubResponse({container_id: {'status_code': status_code, 'status': status_code}
+                             for container_id in ids})
+
+
+@pytest.fixture
+def uploader():
+    return InstagramUploader(config={'access_token': 'token', 'business_account_id': '42'})
+
+
+def use_session(uploader, session):
+    """Route the uploader's polling through session with a fast schedule"""
+    poller = JobPoller('instagram', check_batch=uploader._check_containers_status, schedule=FAST,
+                       session_factory=lambda: session)
+    uploader._get_job_poller = lambda: poller
+    return poller
+
+
+class TestContainerPolling:
+    """Test cases for InstagramUploader container status polling"""
+
+    @pytest.mark.asyncio
+    async def test_wait_until_finished(self, uploader):
+        """Containers in progress are polled until the Graph API reports FINISHED"""
+        session = StubSession(['IN_PROGRESS', 'IN_PROGRESS', 'FINISHED'])
+        poller = use_session(uploader, session)
+
+        result = await uploader._wait_for_video_processing('c1', max_wait_time=5)
+
+        assert result == {'success': True}
+        assert len(session.requests) == 3
+        url, params = session.requests[0]
+        assert url == f"{uploader.base_url}/"
+        assert params['ids'] == 'c1' and params['access_token'] == 'token'
+        await poller.close()
+
+    @pytest.mark.asyncio
+    async def test_processing_error_is_reported(self, uploader):
+        """An ERROR status fails the wait with the Graph API status"""
+        poller = use_session(uploader, StubSession(['ERROR']))
+
+        result = await uploader._wait_for_video_processing('c1', max_wait_time=5)
+
+        assert result['success'] is False
+        assert 'Video processing failed' in result['error']
+        await poller.close()
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, uploader):
+        """A container that never finishes times out instead of polling forever"""
+        poller = use_session(uploader, StubSession(['IN_PROGRESS']))
+
+        result = await uploader._wait_for_video_processing('c1', max_wait_time=0.2)
+
+        assert result == {'success': False, 'error': 'Video processing timeout'}
+        await poller.close()
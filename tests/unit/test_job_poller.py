@@ -0,0 +1,100 @@
+"""
+Unit Tests for the Async Job Poller
+===================================
+
+Tests for the shared JobPoller including:
+- Multiplexing many jobs onto batched status requests
+- Failure and timeout propagation through job futures
+- Adaptive poll schedule driven by completion times
+"""
+
+import pytest
+import asyncio
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../shared/utils'))
+
+from job_poller import (
+    CompletionHistogram, JobFailedError, JobPoller, JobState, JobTimeoutError, JobUpdate, PollSchedule
+)
+
+FAST = PollSchedule(initial_interval=0.01, fast_polls=2, backoff_factor=2.0, max_interval=0.05, min_interval=0.005)
+
+
+class TestJobPoller:
+    """Test cases for JobPoller"""
+
+    @pytest.mark.asyncio
+    async def test_batch_checks_multiplex_outstanding_jobs(self):
+        """Concurrent waits share batched status requests and resolve individually"""
+        requests = []
+        polls_left = {f"job{i}": i % 3 for i in range(12)}
+
+        async def check_batch(session, job_ids):
+            requests.append(list(job_ids))
+            updates = {}
+            for job_id in job_ids:
+                if polls_left[job_id] == 0:
+                    updates[job_id] = JobUpdate(JobState.COMPLETED, result=f"done:{job_id}")
+                else:
+                    polls_left[job_id] -= 1
+                    updates[job_id] = JobUpdate(JobState.PENDING)
+            return updates
+
+        poller = JobPoller("test", check_batch=check_batch, schedule=FAST, batch_size=5,
+                           session_factory=lambda: None)
+        results = await asyncio.gather(*(poller.wait(job_id) for job_id in polls_left))
+
+        assert results == [f"done:{job_id}" for job_id in polls_left]
+        assert all(len(batch) <= 5 for batch in requests)
+        # 24 job checks in total, a handful of batched requests
+        assert sum(len(batch) for batch in requests) == 24
+        assert len(requests) <= 9
+        stats = poller.get_stats()
+        assert stats["completed"] == 12 and stats["pending"] == 0
+        await poller.close()
+
+    @pytest.mark.asyncio
+    async def test_failure_timeout_and_transient_errors(self):
+        """Failed jobs raise JobFailedError, stuck jobs time out, check errors are retried"""
+        attempts = {"flaky": 0}
+
+        async def check(session, job_id):
+            if job_id == "bad":
+                return JobUpdate(JobState.FAILED, error="render failed")
+            if job_id == "flaky":
+                attempts["flaky"] += 1
+                if attempts["flaky"] < 3:
+                    raise ConnectionError("reset")
+                return JobUpdate(JobState.COMPLETED, result="ok")
+            return JobUpdate(JobState.PENDING)
+
+        poller = JobPoller("test", check=check, schedule=FAST, session_factory=lambda: None)
+        bad, stuck, flaky = await asyncio.gather(
+            poller.wait("bad"), poller.wait("stuck", timeout=0.1), poller.wait("flaky"),
+            return_exceptions=True
+        )
+
+        assert isinstance(bad, JobFailedError) and bad.error == "render failed"
+        assert isinstance(stuck, JobTimeoutError)
+        assert flaky == "ok"
+        assert poller.get_stats()["status_errors"] == 2
+
+    def test_schedule_backs_off_and_follows_completion_histogram(self):
+        """Fast first polls, exponential backoff, then polls aimed at typical completion times"""
+        schedule = PollSchedule(initial_interval=2, fast_polls=3, backoff_factor=2, max_interval=30)
+
+        assert [schedule.next_delay(0, polls) for polls in range(6)] == [2, 2, 2, 4, 8, 16]
+        assert schedule.next_delay(0, 10) == 30
+
+        histogram = CompletionHistogram()
+        for seconds in [40, 42, 44, 50, 55, 58, 85]:
+            histogram.record(seconds)
+
+        # Nothing typically finishes before ~45s: first poll goes straight there (capped)
+        assert schedule.next_delay(0, 0, histogram) == 30
+        assert schedule.next_delay(20, 1, histogram) == 25
+        # Inside the completion window polls follow the next quantile boundary
+        assert schedule.next_delay(50, 4, histogram) == 8
@@ -0,0 +1,76 @@
+"""
+Unit Tests for Opportunity Scoring
+==================================
+
+Tests for the measured-momentum inputs to opportunity scoring including:
+- Reading the ingest-time momentum signal from stored trends
+- Mapping velocity/acceleration to momentum score and lifecycle
+- Rising trends outranking falling ones with otherwise equal AI scores
+"""
+
+import pytest
+from types import SimpleNamespace
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../content-engine/services'))
+
+from opportunity_scoring import (OpportunityScoringEngine, TrendColumns, momentum_lifecycle,
+                                 momentum_score, momentum_signal)
+
+WEIGHTS = {
+    "growth_momentum": 0.25,
+    "engagement_quality": 0.20,
+    "competition_gap": 0.20,
+    "viral_indicators": 0.15,
+    "monetization_signals": 0.10,
+    "timing_advantage": 0.10
+}
+
+
+def analysis_with(signal):
+    """Same AI-estimated analysis, with momentum/lifecycle replaced from the signal"""
+    return SimpleNamespace(
+        metrics=SimpleNamespace(momentum_score=momentum_score(signal),
+                                avg_engagement_rate=0.5, content_saturation=4.0),
+        lifecycle_stage=momentum_lifecycle(signal) or "stable",
+        competition_level="medium",
+        market_gaps=[],
+        recommended_content_angles=[{}, {}],
+        platform_priorities={"TikTok": 7.0},
+        opportunity_score=0.0
+    )
+
+
+class TestMomentumSignal:
+    """Test cases for measured momentum in opportunity scoring"""
+
+    def test_signal_read_from_raw_data(self):
+        """The repository stores the signal under raw_data['momentum']; a top-level key wins"""
+        signal = {"velocity": 2.0, "acceleration": 0.1, "observations": 5}
+
+        assert momentum_signal({"topic": "a", "raw_data": {"momentum": signal}}) == signal
+        assert momentum_signal({"topic": "a", "momentum": signal, "raw_data": {}}) == signal
+        assert momentum_signal({"topic": "a", "raw_data": None}) is None
+
+    def test_velocity_drives_score_and_lifecycle(self):
+        """Velocity maps onto 0-10 around 5; lifecycle needs at least two snapshots"""
+        assert momentum_score({"velocity": 0.0}) == 5.0
+        assert momentum_score({"velocity": 40.0}) == 10.0
+        assert momentum_score({"velocity": -40.0}) == 0.0
+
+        assert momentum_lifecycle({"velocity": 3.0, "observations": 1}) is None
+        assert momentum_lifecycle({"velocity": 3.0, "observations": 3}) == "emerging"
+        assert momentum_lifecycle({"velocity": 3.0, "acceleration": 0.2, "observations": 6}) == "growing"
+        assert momentum_lifecycle({"velocity": 3.0, "acceleration": -0.2, "observations": 6}) == "peak"
+        assert momentum_lifecycle({"velocity": -3.0, "observations": 6}) == "declining"
+
+    def test_rising_trend_outranks_falling_trend(self):
+        """Measured momentum changes the opportunity ranking of otherwise identical trends"""
+        rising = analysis_with({"velocity": 4.0, "acceleration": 0.5, "observations": 8})
+        falling = analysis_with({"velocity": -4.0, "acceleration": -0.5, "observations": 8})
+        engine = OpportunityScoringEngine(WEIGHTS)
+
+        scores = engine.score(TrendColumns.from_results([falling, rising]))["opportunity_score"]
+        assert scores[1] > scores[0]
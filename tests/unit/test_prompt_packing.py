@@ -0,0 +1,116 @@
+"""
+Unit Tests for Prompt Packing
+=============================
+
+Tests for packing several trends into one LLM request including:
+- Token-budget packing
+- Robust parsing of packed JSON responses
+- Individual retry of items missing from the packed response
+- Score validation of packed items (missing keys, non-numbers, out of range)
+"""
+
+import pytest
+import json
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../content-engine/services'))
+
+from prompt_packing import (PackingConfig, PackingStats, pack_items, parse_packed_response, run_packed,
+                            scores_in_range)
+
+
+class TestPromptPacking:
+    """Test cases for prompt packing"""
+
+    def test_pack_items_respects_item_and_output_budgets(self):
+        """Packs never exceed max items or the output token budget"""
+        config = PackingConfig(max_items_per_request=4, max_output_tokens=900, output_tokens_per_item=300)
+        items = [(f"t{i}", f"trend {i}") for i in range(10)]
+
+        packs = pack_items(items, overhead_tokens=100, config=config)
+
+        assert [len(pack) for pack in packs] == [3, 3, 3, 1]
+        assert [item for pack in packs for item in pack] == items
+
+    def test_parse_packed_response_variants(self):
+        """Code fences, wrappers, id-keyed dicts and truncated arrays are all parsed"""
+        ids = ["t0", "t1", "t2"]
+        items = [{"id": i, "score": n} for n, i in enumerate(ids)]
+
+        fenced = "Result:\n```json\n" + json.dumps(items) + "\n```"
+        assert set(parse_packed_response(fenced, ids)) == set(ids)
+
+        assert parse_packed_response({"items": items}, ids)["t1"] == {"score": 1}
+        assert parse_packed_response({"t2": {"score": 2}, "t9": {"score": 9}}, ids) == {"t2": {"score": 2}}
+
+        truncated = json.dumps(items)[:-15]
+        assert set(parse_packed_response(truncated, ids)) == {"t0", "t1"}
+
+    @pytest.mark.asyncio
+    async def test_run_packed_retries_only_failed_items(self):
+        """Items missing from a packed response fall back to the single-item path"""
+        prompts = []
+
+        async def call(prompt, max_tokens):
+            prompts.append(prompt)
+            ids = [line.split('"')[3] for line in prompt.splitlines() if line.startswith('{"id"')]
+            return json.dumps([{"id": i, "ok": True} for i in ids if i != "t3"])
+
+        async def single(item_id, payload):
+            return f"single:{payload}"
+
+        stats = PackingStats()
+        packed, individual = await run_packed(
+            {f"t{i}": f"trend {i}" for i in range(6)},
+            render_item=lambda item_id, trend: json.dumps({"id": item_id, "trend": trend}),
+            build_prompt=lambda pack: "\n".join(text for _, text in pack),
+            call=call,
+            single=single,
+            config=PackingConfig(max_items_per_request=3),
+            stats=stats
+        )
+
+        assert len(prompts) == 2
+        assert set(packed) == {"t0", "t1", "t2", "t4", "t5"}
+        assert individual == {"t3": "single:trend 3"}
+        assert stats.requests == 3
+        assert stats.individual_retries == 1
+
+    def test_scores_in_range(self):
+        """Scores must be a dict with the required keys and numeric values on the 0-10 scale"""
+        required = ("viral_potential", "audience_interest")
+
+        assert scores_in_range({"viral_potential": 8, "audience_interest": 6.5, "extra": 0}, required)
+        assert not scores_in_range(None, required)
+        assert not scores_in_range({"viral_potential": 8}, required)
+        assert not scores_in_range({"viral_potential": "8", "audience_interest": 6}, required)
+        assert not scores_in_range({"viral_potential": True, "audience_interest": 6}, required)
+        assert not scores_in_range({"viral_potential": 80, "audience_interest": 6}, required)
+        assert not scores_in_range({"viral_potential": 8, "audience_interest": -1}, required)
+
+    @pytest.mark.asyncio
+    async def test_invalid_scores_are_retried_individually(self):
+        """A packed item with malformed scores goes down the single-item path"""
+        async def call(prompt, max_tokens):
+            return json.dumps([
+                {"id": "t0", "scores": {"viral_potential": 7, "audience_interest": 5}},
+                {"id": "t1", "scores": {"viral_potential": 70, "audience_interest": 5}},
+                {"id": "t2", "scores": {"viral_potential": 6}}
+            ])
+
+        async def single(item_id, payload):
+            return f"single:{payload}"
+
+        packed, individual = await run_packed(
+            {f"t{i}": f"trend {i}" for i in range(3)},
+            render_item=lambda item_id, trend: json.dumps({"id": item_id, "trend": trend}),
+            build_prompt=lambda pack: "\n".join(text for _, text in pack),
+            call=call,
+            single=single,
+            validate=lambda item: scores_in_range(item.get("scores"), ("viral_potential", "audience_interest"))
+        )
+
+        assert set(packed) == {"t0"}
+        assert individual == {"t1": "single:trend 1", "t2": "single:trend 2"}
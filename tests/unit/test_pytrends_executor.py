@@ -0,0 +1,153 @@
+"""
+Unit Tests for Pytrends Executor
+================================
+
+Tests for the async pytrends execution engine including:
+- Cross-keyword batching into 5-keyword payloads
+- Per-keyword score normalisation
+- Shared backoff on HTTP 429
+"""
+
+import pytest
+import asyncio
+import threading
+import time
+
+import pandas as pd
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../trend_monitor/services'))
+
+from pytrends_executor import AsyncRateLimiter, PytrendsExecutor
+
+
+class FakeTrendReq:
+    """Minimal stand-in for pytrends.request.TrendReq."""
+
+    payloads = []
+
+    def build_payload(self, kw_list, **kwargs):
+        FakeTrendReq.payloads.append(list(kw_list))
+        self.kw_list = kw_list
+
+    def interest_over_time(self):
+        return pd.DataFrame({kw: [10 * (i + 1), 20 * (i + 1)] for i, kw in enumerate(self.kw_list)})
+
+    def related_queries(self):
+        return {kw: {'top': None, 'rising': None} for kw in self.kw_list}
+
+
+class TooManyRequestsError(Exception):
+    pass
+
+
+@pytest.fixture
+def fast_limiter():
+    return AsyncRateLimiter(min_interval=0.0, max_interval=0.0, base_backoff=0.01, max_backoff=0.02)
+
+
+@pytest.fixture(autouse=True)
+def reset_payloads():
+    FakeTrendReq.payloads = []
+
+
+class TestPytrendsExecutor:
+    """Test cases for PytrendsExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_keywords_are_batched(self, fast_limiter):
+        """Twelve concurrent lookups should need three payloads."""
+        executor = PytrendsExecutor(FakeTrendReq, fast_limiter)
+
+        results = await asyncio.gather(*(executor.interest(f"kw{i}") for i in range(12)))
+
+        assert len(FakeTrendReq.payloads) == 3
+        assert all(len(batch) <= 5 for batch in FakeTrendReq.payloads)
+        assert all(result['series'] is not None for result in results)
+
+    @pytest.mark.asyncio
+    async def test_scores_normalised_per_keyword(self, fast_limiter):
+        """Each keyword keeps a 0-100 scale even when batched."""
+        executor = PytrendsExecutor(FakeTrendReq, fast_limiter)
+
+        results = await asyncio.gather(executor.interest("a"), executor.interest("b"))
+
+        assert [int(result['series'].max()) for result in results] == [100, 100]
+
+    @pytest.mark.asyncio
+    async def test_retries_after_rate_limit(self, fast_limiter):
+        """A 429 triggers backoff and a retry instead of failing."""
+        executor = PytrendsExecutor(FakeTrendReq, fast_limiter)
+        attempts = []
+
+        def flaky(client):
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise TooManyRequestsError()
+            return "ok"
+
+        assert await executor.run(flaky) == "ok"
+        assert len(attempts) == 2
+        assert executor.stats['throttled'] == 1
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self):
+        """Waiting for the rate limiter must not block other coroutines."""
+        limiter = AsyncRateLimiter(min_interval=0.2, max_interval=0.2)
+        await limiter.acquire()
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        await asyncio.gather(limiter.acquire(), ticker())
+        assert ticks == 5
+
+    @pytest.mark.asyncio
+    async def test_related_queries_charge_one_token_per_request(self):
+        """A batch with related queries uses 1 + N tokens and spaces the next request accordingly."""
+        limiter = AsyncRateLimiter(max_requests_per_hour=100, min_interval=0.05, max_interval=0.05)
+        executor = PytrendsExecutor(FakeTrendReq, limiter)
+
+        await asyncio.gather(*(executor.interest(f"kw{i}", include_related=True) for i in range(5)))
+        assert limiter.status()["requests_last_hour"] == 6
+        assert executor.stats["google_requests"] == 6
+
+        started = time.monotonic()
+        await limiter.acquire()
+        assert time.monotonic() - started >= 0.2
+
+        limiter = AsyncRateLimiter(max_requests_per_hour=8, min_interval=0.0, max_interval=0.0)
+        await limiter.acquire(6)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.acquire(3), timeout=0.1)
+
+    @pytest.mark.asyncio
+    async def test_pending_batches_are_kept_and_cancelled_on_close(self, fast_limiter):
+        """Flushed batches stay referenced until done; close() cancels them instead of leaving waiters hanging"""
+        release = threading.Event()
+
+        class SlowTrendReq(FakeTrendReq):
+            def interest_over_time(self):
+                release.wait(5)
+                return super().interest_over_time()
+
+        executor = PytrendsExecutor(SlowTrendReq, fast_limiter)
+        try:
+            waiters = [asyncio.ensure_future(executor.interest(f"kw{i}")) for i in range(5)]
+            await asyncio.sleep(0.05)
+            assert len(executor._tasks) == 1
+
+            await executor.close()
+            results = await asyncio.gather(*waiters, return_exceptions=True)
+            assert all(isinstance(result, asyncio.CancelledError) for result in results)
+            assert not executor._tasks
+        finally:
+            release.set()
+            executor.shutdown()
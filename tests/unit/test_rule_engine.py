@@ -0,0 +1,187 @@
+"""
+Unit Tests for the Incremental Alert Rule Engine
+================================================
+
+Tests for indexed, sliding-window alert evaluation including:
+- Rolling aggregates that match a full recomputation
+- Glob/prefix pattern index for metric names
+- AlertManager evaluating only the rules touched by new points
+- Notifications coalesced per metric and email sent off the delivery loop
+"""
+
+import pytest
+import random
+import threading
+from datetime import datetime, timedelta
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../monitoring/dashboard'))
+
+from rule_engine import PatternIndex, RollingWindow
+import alert_manager
+from alert_manager import AlertManager, AlertRule, AlertSeverity
+
+
+class TestRuleEngine:
+    """Test cases for RollingWindow, PatternIndex and incremental evaluation"""
+
+    def test_rolling_aggregates_match_recomputation(self):
+        """O(1) aggregates agree with recomputing over the points still in the window"""
+        rng = random.Random(7)
+        window = RollingWindow(window_seconds=60, capacity=50)
+        points = []
+        now = 0.0
+
+        for _ in range(2000):
+            now += rng.uniform(0, 3)
+            value = rng.uniform(-100, 100)
+            window.append(now, value)
+            points.append((now, value))
+
+            expected = [(ts, val) for ts, val in points if ts >= now - 60][-50:]
+            values = [val for _, val in expected]
+            assert window.points() == expected
+            assert window.aggregate("avg") == pytest.approx(sum(values) / len(values))
+            assert window.aggregate("max") == max(values)
+            assert window.aggregate("min") == min(values)
+            assert window.aggregate("count") == len(values)
+            if len(expected) > 1 and expected[-1][0] > expected[0][0]:
+                slope = (expected[-1][1] - expected[0][1]) / (expected[-1][0] - expected[0][0])
+                assert window.aggregate("rate") == pytest.approx(slope)
+
+        window.evict(now + 61)
+        assert window.aggregate("avg") is None
+
+    def test_pattern_index_matches_globs(self):
+        """Exact names and '*' patterns resolve through the index; removals invalidate the cache"""
+        index = PatternIndex()
+        index.add("cpu", "system.cpu.usage")
+        index.add("service_down", "service.*.health")
+        index.add("any_error", "*error_rate")
+        index.add("app_errors", "app.*.error_rate")
+
+        assert index.match("system.cpu.usage") == ("cpu",)
+        assert index.match("service.content_engine.health") == ("service_down",)
+        assert index.match("service.content_engine.response_time") == ()
+        assert index.match("app.platform_manager.error_rate") == ("any_error", "app_errors")
+        assert index.match("system.cpu.usage.p99") == ()
+
+        index.remove("any_error")
+        assert index.match("app.platform_manager.error_rate") == ("app_errors",)
+
+    def test_only_touched_rules_are_evaluated(self):
+        """New points evaluate just their rules; a pending duration fires without new points"""
+        manager = AlertManager({'evaluation_interval': 1})
+        for i in range(500):
+            manager.add_alert_rule(AlertRule(
+                name=f"queue_{i}", metric_name=f"queue.worker_{i}.depth",
+                condition="greater_than", threshold=100, severity=AlertSeverity.WARNING, duration=0
+            ))
+        manager.add_alert_rule(AlertRule(
+            name="avg_latency", metric_name="service.*.latency", condition="greater_than",
+            threshold=500, severity=AlertSeverity.WARNING, duration=0, aggregation="avg", window=300
+        ))
+
+        now = datetime.now()
+        for value in (200, 900, 1000):
+            manager.add_metric_value("service.content_engine.latency", value, now)
+        manager.add_metric_value("queue.worker_3.depth", 150, now)
+        manager._evaluate_all_rules()
+
+        stats = manager.rule_engine.get_stats()
+        assert stats["rule_checks"] == 2
+        assert set(manager.active_alerts) == {"avg_latency:service.content_engine.latency", "queue_3:queue.worker_3.depth"}
+        assert manager.active_alerts["avg_latency:service.content_engine.latency"].current_value == pytest.approx(700)
+
+        manager._evaluate_all_rules()
+        assert manager.rule_engine.get_stats()["rule_checks"] == 2
+
+        # CPU rule needs 60s above threshold: it is re-checked when the timer is due
+        manager.add_metric_value("system.cpu.usage", 99.0, now)
+        manager._evaluate_all_rules()
+        assert "critical_cpu_usage:system.cpu.usage" not in manager.active_alerts
+        manager.rule_timers["critical_cpu_usage:system.cpu.usage"] -= timedelta(seconds=61)
+        manager.rule_engine._due[0].due -= 61
+        manager._evaluate_all_rules()
+        assert "critical_cpu_usage:system.cpu.usage" in manager.active_alerts
+        assert manager.rule_engine.get_stats()["timer_checks"] == 1
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = AlertManager({
+        'delivery': {'state_path': str(tmp_path / 'alert_queue.json')},
+        'notification_channels': {
+            'email': {'to_emails': ['ops@example.com'], 'use_tls': False},
+            'slack': {'webhook_url': 'http://127.0.0.1:9/hook'}
+        }
+    })
+    yield manager
+    manager.delivery.stop(flush=False)
+
+
+def make_alert(manager, rule_name, metric_name):
+    rule = manager.alert_rules[rule_name]
+    return alert_manager.Alert(
+        id=f"{rule_name}:{metric_name}", rule_name=rule_name, metric_name=metric_name,
+        severity=rule.severity, status=alert_manager.AlertStatus.ACTIVE, message=f"{metric_name} is high",
+        current_value=1.0, threshold=rule.threshold, first_triggered=datetime.now(),
+        last_triggered=datetime.now(), metadata={}
+    )
+
+
+class TestAlertNotifications:
+    """Test cases for AlertManager notification delivery"""
+
+    @pytest.mark.asyncio
+    async def test_slack_alerts_coalesce_per_metric(self, manager, monkeypatch):
+        """Alerts of one pattern rule on different metrics are queued under different keys"""
+        manager.add_alert_rule(AlertRule(
+            name="service_latency", metric_name="service.*.latency", condition="greater_than",
+            threshold=500, severity=AlertSeverity.WARNING, duration=0
+        ))
+        keys = []
+        monkeypatch.setattr(manager.delivery, 'enqueue', lambda name, key, **kwargs: keys.append(key) or True)
+        slack = manager.notification_channels['slack']
+
+        for metric_name in ("service.content_engine.latency", "service.platform_manager.latency",
+                            "service.content_engine.latency"):
+            await manager._send_slack_notification(slack, make_alert(manager, "service_latency", metric_name))
+
+        assert len(set(keys)) == 2
+        assert keys[0] == keys[2]
+
+    @pytest.mark.asyncio
+    async def test_email_is_sent_from_an_executor(self, manager, monkeypatch):
+        """The blocking SMTP client never runs on the delivery event loop thread"""
+        sent = []
+
+        class FakeSMTP:
+            def __init__(self, host, port, timeout=None):
+                self.host = host
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def send_message(self, msg):
+                sent.append((threading.get_ident(), msg['Subject']))
+
+        monkeypatch.setattr(alert_manager.smtplib, 'SMTP', FakeSMTP)
+        manager.add_alert_rule(AlertRule(
+            name="queue_depth", metric_name="queue.depth", condition="greater_than",
+            threshold=100, severity=AlertSeverity.CRITICAL, duration=0
+        ))
+        alert = make_alert(manager, "queue_depth", "queue.depth")
+        alert.resolved_at = datetime.now()
+        email = manager.notification_channels['email']
+
+        await manager._send_email_notification(email, alert)
+        await manager._send_email_resolution(email, alert)
+
+        assert [subject for _, subject in sent] == ["[CRITICAL] queue.depth is high", "[RESOLVED] queue.depth is high"]
+        assert all(thread_id != threading.get_ident() for thread_id, _ in sent)
@@ -0,0 +1,61 @@
+"""
+Unit Tests for the Scene Render Cache
+=====================================
+
+Tests for SceneRenderCache including:
+- Content-hash keys that change only with what affects the segment
+- Stored segments served from the cache directory
+- Uncached renders (fallback placeholders) kept out of the cache
+"""
+
+import pytest
+import os
+
+# Import the modules to test
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../content-engine/services'))
+
+from scene_render_cache import SceneRenderCache
+
+
+class RecordingClip:
+    """Minimal clip that writes its label where MoviePy would write the video"""
+
+    def __init__(self, label: str):
+        self.label = label
+
+    def write_videofile(self, path, **kwargs):
+        with open(path, "w") as f:
+            f.write(self.label)
+
+
+class TestSceneRenderCache:
+    """Test cases for SceneRenderCache"""
+
+    def test_store_and_get_by_content_key(self, tmp_path):
+        """Same scene spec maps to the same cached segment; a changed spec misses"""
+        cache = SceneRenderCache(cache_dir=str(tmp_path / "cache"))
+        key = cache.segment_key(kind="scene", index=0, scene={"text": "hello"})
+
+        assert cache.segment_key(kind="scene", index=0, scene={"text": "hello"}) == key
+        assert cache.segment_key(kind="scene", index=0, scene={"text": "bye"}) != key
+        assert cache.get(key) is None
+
+        path = cache.store(key, RecordingClip("scene-0"))
+        assert cache.get(key) == path
+        assert open(path).read() == "scene-0"
+        assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+    def test_uncached_render_does_not_populate_cache(self, tmp_path):
+        """A placeholder rendered after a failure is usable but never served for the real key"""
+        cache = SceneRenderCache(cache_dir=str(tmp_path / "cache"))
+        key = cache.segment_key(kind="scene", index=1, scene={"text": "broken asset"})
+
+        path = cache.render_uncached(RecordingClip("fallback"))
+        try:
+            assert open(path).read() == "fallback"
+            assert not path.startswith(cache.cache_dir)
+            assert os.listdir(cache.cache_dir) == []
+            assert cache.get(key) is None
+        finally:
+            os.unlink(path)
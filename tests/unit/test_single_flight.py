@@ -0,0 +1,96 @@
+"""
+Unit Tests for Single-Flight Request Coalescing
+===============================================
+
+Tests for the SingleFlight helper including:
+- Coalescing concurrent async calls in one process
+- Coalescing blocking calls across threads
+- Cross-process coordination through a cache backend lock
+"""
+
+import pytest
+import asyncio
+import threading
+import time
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../shared/utils'))
+
+from async_helpers import SingleFlight
+from cache import MemoryCache
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Identical in-flight calls run once and share result and errors"""
+        flight = SingleFlight("test")
+        executions = []
+
+        async def work():
+            executions.append(1)
+            await asyncio.sleep(0.05)
+            return {"plan": "ok"}
+
+        results = await asyncio.gather(*[flight.do("trend-a", work) for _ in range(5)])
+
+        assert len(executions) == 1
+        assert all(result == {"plan": "ok"} for result in results)
+        assert flight.get_stats()["collapsed"] == 4
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        outcomes = await asyncio.gather(*[flight.do("trend-b", failing) for _ in range(3)],
+                                        return_exceptions=True)
+        assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+
+        # Completed keys are not cached: a later call executes again
+        await flight.do("trend-a", work)
+        assert len(executions) == 2
+
+    def test_blocking_calls_coalesce_across_threads(self):
+        """do_blocking lets concurrent threads share one execution"""
+        flight = SingleFlight("test-blocking")
+        executions = []
+        results = []
+
+        def work():
+            executions.append(1)
+            time.sleep(0.1)
+            return "plan"
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do_blocking("k", work)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(executions) == 1
+        assert results == ["plan"] * 4
+
+    @pytest.mark.asyncio
+    async def test_backend_lock_coalesces_across_instances(self):
+        """Two flights sharing a backend (as two processes sharing Redis) execute once"""
+        backend = MemoryCache(max_size=100)
+        process_a = SingleFlight("shared", backend=backend, poll_interval=0.01)
+        process_b = SingleFlight("shared", backend=backend, poll_interval=0.01)
+        executions = []
+
+        async def work():
+            executions.append(1)
+            await asyncio.sleep(0.05)
+            return "analysis"
+
+        result_a, result_b = await asyncio.gather(process_a.do("trend", work), process_b.do("trend", work))
+
+        assert (result_a, result_b) == ("analysis", "analysis")
+        assert len(executions) == 1
+        assert process_a.stats["collapsed_remote"] + process_b.stats["collapsed_remote"] == 1
+        assert not await backend.exists("singleflight:shared:trend:lock")
@@ -0,0 +1,119 @@
+"""
+Unit Tests for the Materialised Snapshot Cache
+==============================================
+
+Tests for cached dashboard snapshots including:
+- One build shared by concurrent callers, hits within the TTL
+- Stale snapshots served while a background refresh runs, stable ETags
+- Async callers and refresh failures that keep the last good snapshot
+"""
+
+import pytest
+import asyncio
+import threading
+import time
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../shared/utils'))
+
+from snapshot_cache import SnapshotCache
+
+
+class TestSnapshotCache:
+    """Test cases for SnapshotCache"""
+
+    def test_concurrent_misses_share_one_build(self):
+        """Many pollers arriving together cause a single build; later calls are hits"""
+        calls = []
+
+        def build(time_range):
+            calls.append(time_range)
+            time.sleep(0.1)
+            return {"time_range": time_range, "trends_collected": 42}
+
+        cache = SnapshotCache(build, ttl=60)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get("today"))) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == ["today"]
+        assert all(snapshot is results[0] for snapshot in results)
+        assert results[0].body == b'{"time_range": "today", "trends_collected": 42}'
+
+        for _ in range(100):
+            assert cache.get("today") is results[0]
+        cache.get("week")
+        assert calls == ["today", "week"]
+        assert cache.get_stats()["hits"] == 100
+
+    def test_stale_snapshot_served_while_refreshing(self):
+        """Past the TTL the old snapshot is returned at once and rebuilt in the background"""
+        state = {"value": 1, "builds": 0}
+
+        def build():
+            state["builds"] += 1
+            if state["builds"] > 1:
+                time.sleep(0.2)
+            return {"timestamp": time.time(), "value": state["value"]}
+
+        cache = SnapshotCache(build, ttl=0.05, max_stale=30, volatile_keys=("timestamp",))
+        first = cache.get()
+        time.sleep(0.1)
+
+        start = time.perf_counter()
+        stale = cache.get()
+        assert time.perf_counter() - start < 0.05
+        assert stale is first
+
+        time.sleep(0.4)
+        refreshed = cache.get()
+        assert refreshed is not first
+        assert refreshed.data["timestamp"] > first.data["timestamp"]
+        assert refreshed.etag == first.etag  # only the volatile timestamp changed
+        assert refreshed.matches([first.etag]) and not refreshed.matches(["other"])
+        assert cache.get_stats()["unchanged_builds"] == 1
+
+        state["value"] = 2
+        cache.invalidate()
+        assert cache.get().etag != first.etag
+
+    @pytest.mark.asyncio
+    async def test_async_callers_and_failed_refresh(self):
+        """aget builds off the loop; a failing refresh keeps serving the last good snapshot"""
+        state = {"fail": False}
+
+        def build(time_range):
+            if state["fail"]:
+                raise RuntimeError("database unavailable")
+            time.sleep(0.05)
+            return {"time_range": time_range}
+
+        cache = SnapshotCache(build, ttl=0.05, max_stale=30)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        snapshots = await asyncio.gather(*(cache.aget("today") for _ in range(10)))
+        task.cancel()
+        assert ticks > 1  # the loop kept running during the build
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+
+        state["fail"] = True
+        await asyncio.sleep(0.1)
+        assert await cache.aget("today") is snapshots[0]
+        await asyncio.sleep(0.1)
+        assert await cache.aget("today") is snapshots[0]
+        assert cache.get_stats()["errors"] >= 1
+
+        with pytest.raises(RuntimeError):
+            await cache.aget("week")
@@ -0,0 +1,87 @@
+"""
+Unit Tests for Speculative Generation
+=====================================
+
+Tests for the speculative quality-control helpers including:
+- Speculation being opt-in per content type
+- Temperature passed only to text AI services that accept it
+- Racing candidates, cancelling the rest and charging every launched one
+"""
+
+import pytest
+import asyncio
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../content-engine/services'))
+
+from speculative_generation import accepts_keyword, candidate_count, race_candidates
+
+
+class TestSpeculativeSettings:
+    """Test cases for speculative generation settings"""
+
+    def test_speculation_is_opt_in(self):
+        """No setting, or enabled=False, means sequential generation"""
+        assert candidate_count({}, max_parallel=3) == 0
+        assert candidate_count({"enabled": False, "candidates": 3}, max_parallel=3) == 0
+        assert candidate_count({"enabled": True, "candidates": 3}, max_parallel=2) == 2
+        assert candidate_count({"enabled": True, "candidates": 3}, max_parallel=1) == 0
+
+    def test_accepts_keyword(self):
+        """Only services whose generate_content takes temperature get one"""
+        async def plain(prompt):
+            return prompt
+
+        async def tuned(prompt, temperature=0.7):
+            return prompt
+
+        async def flexible(prompt, **options):
+            return prompt
+
+        assert not accepts_keyword(plain, "temperature")
+        assert accepts_keyword(tuned, "temperature")
+        assert accepts_keyword(flexible, "temperature")
+        assert not accepts_keyword(None, "temperature")
+
+
+class TestRaceCandidates:
+    """Test cases for race_candidates"""
+
+    @pytest.mark.asyncio
+    async def test_first_passing_candidate_wins_and_rest_are_cancelled(self):
+        """A fast passing candidate cancels slower ones, which are still charged"""
+        cancelled = []
+
+        async def run_candidate(candidate, temperature):
+            try:
+                await asyncio.sleep(0.01 if candidate == 2 else 5)
+            except asyncio.CancelledError:
+                cancelled.append(candidate)
+                raise
+            return f"content@{temperature}", 8.0
+
+        outcome = await race_candidates(run_candidate, 3, [0.7, 0.9, 0.5], min_score=7.0,
+                                        cost_of=lambda seconds: 1.0)
+
+        assert outcome.winner == (8.0, "content@0.9", 2, 0.9)
+        assert sorted(cancelled) == [1, 3]
+        assert outcome.completed == 1 and outcome.cancelled == 2
+        assert outcome.total_cost == 3.0
+
+    @pytest.mark.asyncio
+    async def test_best_below_threshold_and_failures(self):
+        """Without a passing candidate the best completed one is chosen; errors are kept"""
+        async def run_candidate(candidate, temperature):
+            if candidate == 1:
+                raise RuntimeError("provider error")
+            return f"content {candidate}", float(candidate)
+
+        outcome = await race_candidates(run_candidate, 3, [None], min_score=9.0,
+                                        cost_of=lambda seconds: 0.5)
+
+        assert outcome.winner is None
+        assert outcome.chosen[2] == 3
+        assert [str(e) for e in outcome.errors] == ["provider error"]
+        assert outcome.total_cost == 1.5
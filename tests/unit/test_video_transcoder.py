@@ -0,0 +1,60 @@
+"""
+Unit Tests for the Multi-Platform Video Transcoder
+==================================================
+
+Tests for MultiPlatformTranscoder including:
+- One ffmpeg command with a per-platform bitrate for every rendition
+- Output names that differ for same-named or edited sources
+"""
+
+import pytest
+import os
+
+# Import the modules to test
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../shared/utils'))
+
+from video_transcoder import MultiPlatformTranscoder, RenditionTarget, PLATFORM_VIDEO_BITRATES
+
+
+def targets_for(platforms):
+    resolutions = {"youtube": (1920, 1080), "tiktok": (1080, 1920), "instagram": (1080, 1080)}
+    return [RenditionTarget.from_spec(platform, {"resolution": resolutions[platform],
+                                                 "bitrate": PLATFORM_VIDEO_BITRATES[platform]})
+            for platform in platforms]
+
+
+class TestMultiPlatformTranscoder:
+    """Test cases for MultiPlatformTranscoder"""
+
+    def test_single_command_carries_platform_bitrates(self, tmp_path):
+        """Every rendition is encoded from one split graph with its platform's bitrate"""
+        source = tmp_path / "clip.mp4"
+        source.write_bytes(b"video")
+        transcoder = MultiPlatformTranscoder()
+        outputs, by_platform = transcoder._plan(str(source), targets_for(["youtube", "tiktok", "instagram"]),
+                                                str(tmp_path / "out"))
+        command = transcoder.build_command(str(source), outputs, by_platform)
+
+        assert command.count("-i") == 1
+        assert "split=3" in command[command.index("-filter_complex") + 1]
+        bitrates = [command[i + 1] for i, arg in enumerate(command) if arg == "-b:v"]
+        assert bitrates == ["8000k", "6000k", "5000k"]
+        assert "-crf" not in command
+
+    def test_outputs_do_not_collide(self, tmp_path):
+        """Sources sharing a basename, or the same file after an edit, get distinct outputs"""
+        first = tmp_path / "a" / "clip.mp4"
+        second = tmp_path / "b" / "clip.mp4"
+        for path in (first, second):
+            path.parent.mkdir()
+            path.write_bytes(b"video")
+        transcoder = MultiPlatformTranscoder()
+        out_dir = str(tmp_path / "out")
+
+        plan_first = transcoder._plan(str(first), targets_for(["youtube"]), out_dir)[0]
+        plan_second = transcoder._plan(str(second), targets_for(["youtube"]), out_dir)[0]
+        assert plan_first["youtube"] != plan_second["youtube"]
+
+        first.write_bytes(b"edited video")
+        assert transcoder._plan(str(first), targets_for(["youtube"]), out_dir)[0]["youtube"] != plan_first["youtube"]
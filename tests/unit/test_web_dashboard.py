@@ -0,0 +1,63 @@
+"""
+Unit Tests for the Web Dashboard
+================================
+
+Smoke tests for the Flask web dashboard including:
+- Importing the app with its shared.utils snapshot cache
+- Dashboard stats served from the snapshot with ETag revalidation
+"""
+
+import pytest
+import importlib.util
+
+flask = pytest.importorskip('flask')
+pytest.importorskip('requests')
+
+# Import the modules to test
+import sys
+import os
+
+# Loaded under its own name: the repo root also has an app.py (used by conftest)
+APP_PATH = os.path.join(os.path.dirname(__file__), '../../web-dashboard/app.py')
+
+
+def load_dashboard():
+    if 'web_dashboard_app' not in sys.modules:
+        spec = importlib.util.spec_from_file_location('web_dashboard_app', APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['web_dashboard_app'] = module
+        spec.loader.exec_module(module)
+    return sys.modules['web_dashboard_app']
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # The dashboard keeps its SQLite database in the working directory
+    monkeypatch.chdir(tmp_path)
+    dashboard = load_dashboard()
+
+    dashboard.init_db()
+    dashboard.dashboard_snapshots.invalidate()
+    dashboard.app.config['TESTING'] = True
+    return dashboard.app.test_client()
+
+
+class TestWebDashboard:
+    """Test cases for the web dashboard app"""
+
+    def test_app_imports(self):
+        """The app module loads together with the shared snapshot cache"""
+        dashboard = load_dashboard()
+
+        assert isinstance(dashboard.app, flask.Flask)
+        assert dashboard.dashboard_snapshots is not None
+
+    def test_dashboard_stats_revalidate_with_etag(self, client):
+        """Stats come from the snapshot; a matching If-None-Match gets a 304"""
+        response = client.get('/api/dashboard-stats')
+        assert response.status_code == 200
+        assert 'recent_trends' in response.get_json()
+        etag = response.headers['ETag']
+
+        cached = client.get('/api/dashboard-stats', headers={'If-None-Match': etag})
+        assert cached.status_code == 304
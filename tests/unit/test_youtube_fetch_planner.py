@@ -0,0 +1,181 @@
+"""
+Unit Tests for YouTube Fetch Planner
+====================================
+
+Simulator tests against a local fake YouTube Data API covering:
+- Conditional requests with ETag / If-None-Match
+- Per-call quota accounting
+- Daily schedule under max_daily_quota
+"""
+
+import pytest
+import pytest_asyncio
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# Import the modules to test
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../trend_monitor/services'))
+
+from youtube_fetch_planner import YouTubeChartFetcher, YouTubeFetchPlanner
+
+
+class FakeYouTubeAPI:
+    """Serves mostPopular charts with ETags, like videos.list does."""
+
+    def __init__(self, unsupported=()):
+        self.versions = {}
+        self.unsupported = set(unsupported)
+        self.failing = set()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def videos(self, request):
+        key = (request.query['regionCode'], request.query.get('videoCategoryId'))
+        self.requests.append(key)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if key in self.unsupported:
+                return web.json_response({'error': {'code': 404}}, status=404)
+            if key in self.failing:
+                return web.json_response({'error': {'code': 500}}, status=500)
+
+            etag = f'"{key[0]}-{key[1]}-v{self.versions.get(key, 0)}"'
+            if request.headers.get('If-None-Match') == etag:
+                return web.Response(status=304, headers={'ETag': etag})
+
+            items = [{'id': f'{key[0]}{key[1]}{i}', 'snippet': {'title': f'video {i}'}} for i in range(5)]
+            return web.json_response({'etag': etag, 'items': items}, headers={'ETag': etag})
+        finally:
+            self.in_flight -= 1
+
+
+@pytest_asyncio.fixture
+async def fake_api():
+    api = FakeYouTubeAPI(unsupported={('TH', '29')})
+    app = web.Application()
+    app.router.add_get('/youtube/v3/videos', api.videos)
+    server = TestServer(app)
+    await server.start_server()
+    api.base_url = str(server.make_url('/youtube/v3'))
+    yield api
+    await server.close()
+
+
+class TestYouTubeFetchPlanner:
+    """Test cases for the fetch planner and chart fetcher."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_chart_returns_cached_items(self, fake_api):
+        """A second fetch of an unchanged chart is a 304 served from cache."""
+        async with YouTubeChartFetcher('key', base_url=fake_api.base_url) as fetcher:
+            first = await fetcher.fetch_chart('TH', '24')
+            second = await fetcher.fetch_chart('TH', '24')
+
+            fake_api.versions[('TH', '24')] = 1
+            third = await fetcher.fetch_chart('TH', '24')
+
+        assert first == second
+        assert len(third) == 5
+        assert fetcher.stats['not_modified'] == 1
+        assert fetcher.stats['bytes_saved'] > 0
+        assert fetcher.planner.quota_used == 3  # videos.list costs 1 unit
+
+    @pytest.mark.asyncio
+    async def test_region_category_fetches_run_concurrently(self, fake_api):
+        """All charts go out together on one session, bounded by max_concurrency."""
+        charts = [(region, category) for region in ('TH', 'US') for category in ('10', '20', '24', '29')]
+
+        async with YouTubeChartFetcher('key', base_url=fake_api.base_url, max_concurrency=4) as fetcher:
+            results = await fetcher.fetch_many(charts)
+
+        assert fake_api.max_in_flight == 4
+        assert results[('TH', '29')] == []
+        assert fetcher.planner.charts[('TH', '29')].unsupported
+        assert len(results) == len(charts)
+
+    @pytest.mark.asyncio
+    async def test_fetcher_serves_a_new_event_loop_per_call(self, fake_api):
+        """Callers that open a fresh loop per collection get their own session and concurrency limit."""
+        fetcher = YouTubeChartFetcher('key', base_url=fake_api.base_url, max_concurrency=1)
+        charts = [('TH', category) for category in ('10', '20', '24')]
+
+        async def collect():
+            results = await fetcher.fetch_many(charts)
+            await fetcher.close()
+            return results
+
+        first = await asyncio.to_thread(asyncio.run, collect())
+        second = await asyncio.to_thread(asyncio.run, collect())
+
+        assert len(first) == len(second) == 3
+        assert fake_api.max_in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_stops_at_quota_budget(self, fake_api):
+        """No request is sent once max_daily_quota is spent."""
+        planner = YouTubeFetchPlanner(max_daily_quota=3)
+        charts = [('US', str(category)) for category in range(10, 16)]
+
+        async with YouTubeChartFetcher('key', planner=planner, base_url=fake_api.base_url) as fetcher:
+            results = await fetcher.fetch_many(charts)
+
+        assert len(fake_api.requests) == 3
+        assert len(results) == 3
+        assert planner.remaining_quota() == 0
+
+    def test_daily_allocation_fits_budget(self):
+        """Every chart is covered once and volatile charts get the spare quota."""
+        planner = YouTubeFetchPlanner(max_daily_quota=200, min_interval_seconds=900)
+        planner.register(['TH', 'US'], ['10', '20', '24'])
+        planner.charts[('TH', '24')].change_rate = 1.0
+        planner.charts[('US', '10')].change_rate = 0.05
+
+        allocation = planner.daily_allocation()
+
+        assert sum(allocation.values()) <= 200
+        assert min(allocation.values()) >= 1
+        assert allocation[('TH', '24')] > allocation[('US', '10')]
+        assert max(allocation.values()) <= 96  # not more often than every 15 minutes
+
+    @pytest.mark.asyncio
+    async def test_collection_cycles_only_fetch_due_charts(self, fake_api):
+        """Repeated cycles reuse cached charts until the planner says they are due."""
+        planner = YouTubeFetchPlanner(max_daily_quota=100)
+        charts = [('TH', None), ('TH', '10'), ('US', None)]
+        planner.register(['TH', 'US'], [None, '10'])
+
+        async with YouTubeChartFetcher('key', planner=planner, base_url=fake_api.base_url) as fetcher:
+            first = await fetcher.fetch_planned(charts)
+            second = await fetcher.fetch_planned(charts)
+            assert len(fake_api.requests) == 3
+            assert second == first
+
+            planner.charts[('TH', '10')].next_due = 0
+            await fetcher.fetch_planned(charts)
+
+        assert fake_api.requests[3:] == [('TH', '10')]
+        assert planner.quota_used == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_backs_off(self, fake_api):
+        """A 5xx is recorded as a failure so the chart is not retried every cycle."""
+        planner = YouTubeFetchPlanner(max_daily_quota=100, min_interval_seconds=900)
+        planner.register(['TH'], ['24'])
+        fake_api.failing.add(('TH', '24'))
+
+        async with YouTubeChartFetcher('key', planner=planner, base_url=fake_api.base_url) as fetcher:
+            for _ in range(3):
+                assert await fetcher.fetch_planned([('TH', '24')]) == {}
+
+        state = planner.charts[('TH', '24')]
+        assert len(fake_api.requests) == 1
+        assert state.failures == 1
+        assert state.next_due > time.time() + 400
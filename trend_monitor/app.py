@@ -4,7 +4,9 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 import os
+import threading
 from services.trend_collector import TrendCollector
+from services.trend_stream import threaded_sink
 from models.trend_data import TrendData
 import sys
 sys.path.append('../database')
@@ -21,6 +23,62 @@ CORS(app)
 trend_collector = TrendCollector()
 trend_repo = TrendRepository()
 
+# Background adaptive polling (started/stopped via /trends/auto-collect)
+# The polling thread gets its own TrendCollector so /collect-trends never shares
+# fetcher sessions or pytrends batches with the polling loop
+auto_collection = {"thread": None, "loop": None, "stop_event": None, "collector": None}
+auto_collection_lock = threading.Lock()
+
+def _run_auto_collection(collector: TrendCollector, ready: threading.Event):
+    """Thread target: poll sources on their adaptive schedules until stopped"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    stop_event = asyncio.Event()
+    auto_collection.update(loop=loop, stop_event=stop_event)
+    ready.set()
+    
+    try:
+        loop.run_until_complete(collector.run_adaptive_polling(
+            stop_event=stop_event,
+            sink=threaded_sink(trend_repo.save_trends_batch)
+        ))
+    except Exception as e:
+        logger.error(f"Auto-collection stopped with error: {e}")
+    finally:
+        # ล้างสถานะก่อนปิด loop เพื่อให้ stop_auto_collection ไม่เห็น loop ที่ปิดแล้ว
+        with auto_collection_lock:
+            auto_collection.update(thread=None, loop=None, stop_event=None, collector=None)
+        loop.run_until_complete(collector.close())
+        loop.close()
+
+def start_auto_collection(interval_minutes: int) -> bool:
+    """Start the adaptive polling thread; False if it is already running"""
+    with auto_collection_lock:
+        if auto_collection["thread"] is not None:
+            return False
+        collector = TrendCollector()
+        # รอบคงที่เดิมใช้เป็น baseline ของ scheduling metrics
+        collector.scheduler.baseline_interval = interval_minutes * 60
+        ready = threading.Event()
+        thread = threading.Thread(target=_run_auto_collection, args=(collector, ready),
+                                  name="trend-auto-collection", daemon=True)
+        auto_collection.update(thread=thread, collector=collector)
+        thread.start()
+        ready.wait()
+        return True
+
+def stop_auto_collection(timeout: float = 30.0) -> bool:
+    """Signal the polling thread to stop and wait for it; False if it was not running"""
+    with auto_collection_lock:
+        thread = auto_collection["thread"]
+        if thread is None:
+            return False
+        loop, stop_event = auto_collection["loop"], auto_collection["stop_event"]
+        if loop is not None and stop_event is not None:
+            loop.call_soon_threadsafe(stop_event.set)
+    thread.join(timeout)
+    return True
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -42,16 +100,11 @@ def collect_trends():
         asyncio.set_event_loop(loop)
         
         try:
-            trends_data = loop.run_until_complete(trend_collector.collect_all_trends())
-            
-            # Save to database
-            saved_count = 0
-            for trend_data in trends_data:
-                try:
-                    trend_repo.save_trend(trend_data)
-                    saved_count += 1
-                except Exception as e:
-                    logger.error(f"Error saving trend {trend_data.topic}: {e}")
+            # Trends are saved in batches while collection is still running
+            trends_data = loop.run_until_complete(
+                trend_collector.collect_all_trends(sink=threaded_sink(trend_repo.save_trends_batch))
+            )
+            saved_count = trend_collector.last_pipeline_stats.get('stored', 0)
             
             logger.info(f"Collected and saved {saved_count} trends")
             
@@ -70,6 +123,8 @@ def collect_trends():
             })
             
         finally:
+            # collector sessions belong to this loop; close them before the loop goes away
+            loop.run_until_complete(trend_collector.close())
             loop.close()
             
     except Exception as e:
@@ -228,12 +283,14 @@ def toggle_auto_collection():
         interval_minutes = int(request.json.get('interval_minutes', 30))
         
         if action == 'start':
-            # This would integrate with a scheduler like Celery or APScheduler
-            # For now, we'll just return a success message
-            message = f"Auto-collection started with {interval_minutes} minute intervals"
+            # Sources are polled on adaptive per-region intervals; interval_minutes is the baseline
+            if start_auto_collection(interval_minutes):
+                message = f"Auto-collection started with {interval_minutes} minute baseline interval"
+            else:
+                message = "Auto-collection is already running"
             logger.info(message)
         elif action == 'stop':
-            message = "Auto-collection stopped"
+            message = "Auto-collection stopped" if stop_auto_collection() else "Auto-collection was not running"
             logger.info(message)
         else:
             return jsonify({
@@ -246,6 +303,7 @@ def toggle_auto_collection():
             "message": message,
             "action": action,
             "interval_minutes": interval_minutes if action == 'start' else None,
+            "scheduling": (auto_collection["collector"] or trend_collector).get_scheduling_metrics(),
             "timestamp": datetime.utcnow().isoformat()
         })
         
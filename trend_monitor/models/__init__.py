@@ -9,6 +9,11 @@ from .trend_data import (
     merge_similar_trends,
     merge_trend_group
 )
+from .trend_momentum import (
+    TopicMomentum,
+    normalize_topic,
+    topic_fingerprint
+)
 
 __all__ = [
     'TrendData',
@@ -16,5 +21,8 @@ __all__ = [
     'TrendSource',
     'TrendCategory',
     'merge_similar_trends',
-    'merge_trend_group'
+    'merge_trend_group',
+    'TopicMomentum',
+    'normalize_topic',
+    'topic_fingerprint'
 ]
\ No newline at end of file
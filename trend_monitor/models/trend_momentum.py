@@ -0,0 +1,89 @@
+import hashlib
+import math
+import re
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+# Time constant of the EWMA: older slopes lose weight as exp(-dt / tau)
+DEFAULT_TAU_HOURS = 6.0
+
+# Snapshots closer together than this are treated as one observation for the slope
+MIN_INTERVAL_HOURS = 1.0 / 60
+
+_WHITESPACE = re.compile(r'\s+')
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+def normalize_topic(topic: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    return _WHITESPACE.sub(' ', _PUNCTUATION.sub(' ', topic.lower())).strip()
+
+def topic_fingerprint(topic: str, source: str) -> str:
+    """Stable 40-char key of a topic within a source"""
+    return hashlib.sha1(f"{source}|{normalize_topic(topic)}".encode('utf-8')).hexdigest()
+
+@dataclass
+class TopicMomentum:
+    """Per-topic momentum state maintained at ingest"""
+    fingerprint: str
+    topic: str
+    source: str
+    category: str
+    region: str
+    first_seen: datetime
+    last_seen: datetime
+    first_score: float
+    last_score: float
+    peak_score: float
+    observations: int = 1
+    velocity: float = 0.0       # score points per hour (EWMA)
+    acceleration: float = 0.0   # score points per hour^2 (EWMA)
+
+    @classmethod
+    def start(cls, fingerprint: str, topic: str, source: str, category: str, region: str,
+              score: float, at: datetime) -> 'TopicMomentum':
+        return cls(fingerprint=fingerprint, topic=topic, source=source, category=category,
+                   region=region, first_seen=at, last_seen=at, first_score=score,
+                   last_score=score, peak_score=score)
+
+    def update(self, score: float, at: datetime, tau_hours: float = DEFAULT_TAU_HOURS) -> 'TopicMomentum':
+        """Fold a new observation into the EWMA velocity/acceleration"""
+        dt_hours = (at - self.last_seen).total_seconds() / 3600
+        if dt_hours < MIN_INTERVAL_HOURS:
+            # Same collection seen twice (e.g. several regions): keep the higher score only
+            self.last_score = max(self.last_score, score)
+            self.peak_score = max(self.peak_score, score)
+            return self
+
+        # alpha for irregular sampling: equivalent to a continuous-time EWMA with time constant tau
+        alpha = 1 - math.exp(-dt_hours / tau_hours)
+        instant_velocity = (score - self.last_score) / dt_hours
+
+        if self.observations == 1:
+            new_velocity = instant_velocity
+        else:
+            new_velocity = self.velocity + alpha * (instant_velocity - self.velocity)
+
+        if self.observations >= 2:
+            instant_acceleration = (new_velocity - self.velocity) / dt_hours
+            self.acceleration += alpha * (instant_acceleration - self.acceleration)
+
+        self.velocity = new_velocity
+        self.last_score = score
+        self.last_seen = at
+        self.peak_score = max(self.peak_score, score)
+        self.observations += 1
+        return self
+
+    def to_signal(self) -> Dict[str, Any]:
+        """Compact momentum signal for downstream scoring"""
+        return {
+            'velocity': round(self.velocity, 3),
+            'acceleration': round(self.acceleration, 3),
+            'observations': self.observations,
+            'first_seen': self.first_seen.isoformat(),
+            'peak_score': self.peak_score
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
@@ -29,11 +29,11 @@ class GoogleTrendsCollector:
         
         logger.info(f"Google Trends collector initialized for regions: {self.regions}")
     
-    async def collect_trends(self) -> List[TrendData]:
-        """Collect trending searches from Google Trends"""
+    async def collect_trends(self, regions: Optional[List[str]] = None) -> List[TrendData]:
+        """Collect trending searches from Google Trends (all configured regions unless given)"""
         all_trends = []
         
-        for region in self.regions:
+        for region in regions or self.regions:
             try:
                 logger.debug(f"Collecting Google Trends for region: {region}")
                 
@@ -0,0 +1,186 @@
+# ai-content-factory/trend-monitor/services/poll_scheduler.py
+
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PollKey = Tuple[str, Any]  # (source, region / location / subreddit)
+
+@dataclass
+class PollPolicy:
+    """ขอบเขตการ poll ของ source หนึ่ง (วินาที)"""
+    min_interval: float = 300.0
+    max_interval: float = 6 * 3600.0
+    initial_interval: float = 1800.0
+    target_change_rate: float = 0.3   # สัดส่วน trends ใหม่/เปลี่ยนต่อรอบที่ต้องการ
+    jitter: float = 0.1               # +-10% กันไม่ให้ทุก source ยิงพร้อมกัน
+    smoothing: float = 0.5            # EWMA ของ change rate
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], default: Optional["PollPolicy"] = None) -> "PollPolicy":
+        """สร้างจาก config (หน่วยนาที) เช่น {'min_interval_minutes': 5, ...}"""
+        base = default or cls()
+        return cls(
+            min_interval=config.get('min_interval_minutes', base.min_interval / 60) * 60,
+            max_interval=config.get('max_interval_minutes', base.max_interval / 60) * 60,
+            initial_interval=config.get('initial_interval_minutes', base.initial_interval / 60) * 60,
+            target_change_rate=config.get('target_change_rate', base.target_change_rate),
+            jitter=config.get('jitter', base.jitter),
+            smoothing=config.get('smoothing', base.smoothing)
+        )
+
+# ค่าเริ่มต้นตามความเร็วของแต่ละ source: Google daily เปลี่ยนช้า, Twitter/Reddit hot เปลี่ยนเร็ว
+DEFAULT_POLICIES = {
+    'google': PollPolicy(min_interval=1800, max_interval=12 * 3600, initial_interval=3600),
+    'youtube': PollPolicy(min_interval=900, max_interval=6 * 3600, initial_interval=3600),
+    'twitter': PollPolicy(min_interval=300, max_interval=2 * 3600, initial_interval=900),
+    'reddit': PollPolicy(min_interval=300, max_interval=2 * 3600, initial_interval=900),
+}
+
+@dataclass
+class PollState:
+    """สถานะการ poll ของ source x region หนึ่ง"""
+    policy: PollPolicy
+    interval: float
+    next_due: float = 0.0
+    change_rate: Optional[float] = None
+    last_poll: Optional[float] = None
+    fingerprints: Dict[str, int] = field(default_factory=dict)
+    polls: int = 0
+    empty_polls: int = 0
+    timeouts: int = 0
+    items_seen: int = 0
+    items_changed: int = 0
+    registered_at: float = field(default_factory=time.time)
+
+class AdaptivePollScheduler:
+    """
+    ตั้งรอบ poll แยกต่อ source x region ตามอัตราการเปลี่ยนที่สังเกตได้
+
+    หลังแต่ละรอบคำนวณสัดส่วน trends ที่ใหม่หรือเปลี่ยน (change rate) ถ้าสูงกว่า
+    target ให้ poll ถี่ขึ้น ถ้าต่ำกว่าให้ห่างขึ้น (ปรับได้ไม่เกิน 2 เท่าต่อรอบ)
+    แล้วบีบให้อยู่ใน [min_interval, max_interval] และใส่ jitter
+    """
+
+    def __init__(self, baseline_interval: float = 1800.0, clock=time.time):
+        # รอบคงที่เดิม (auto_collect_interval_minutes) ใช้เทียบว่าประหยัดการ poll ได้เท่าไร
+        self.baseline_interval = baseline_interval
+        self._clock = clock
+        self.states: Dict[PollKey, PollState] = {}
+
+    def register(self, source: str, regions: Iterable[Any], policy: Optional[PollPolicy] = None):
+        policy = policy or DEFAULT_POLICIES.get(source, PollPolicy())
+        now = self._clock()
+        for region in regions:
+            key = (source, region)
+            if key in self.states:
+                self.states[key].policy = policy
+                continue
+            self.states[key] = PollState(policy=policy, interval=policy.initial_interval,
+                                         next_due=now, registered_at=now)
+
+    def unregister(self, source: str):
+        for key in [k for k in self.states if k[0] == source]:
+            del self.states[key]
+
+    def due(self, now: Optional[float] = None) -> List[PollKey]:
+        now = self._clock() if now is None else now
+        return [key for key, state in self.states.items() if state.next_due <= now]
+
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        now = self._clock() if now is None else now
+        if not self.states:
+            return self.baseline_interval
+        return max(0.0, min(state.next_due for state in self.states.values()) - now)
+
+    @staticmethod
+    def _fingerprint(trend) -> Tuple[str, int]:
+        # topic เดิมแต่คะแนนขยับข้าม bucket 10 แต้มนับว่า "เปลี่ยน"
+        topic = trend.topic.strip().lower()
+        return topic, int(trend.popularity_score // 10)
+
+    def record_poll(self, key: PollKey, trends: List[Any], failed: bool = False) -> float:
+        """บันทึกผลการ poll และคืน interval ถัดไป (วินาที)"""
+        state = self.states[key]
+        policy = state.policy
+        now = self._clock()
+        state.polls += 1
+        state.last_poll = now
+
+        if failed:
+            # ไม่รู้ change rate จึงคง interval เดิม
+            state.next_due = now + self._jittered(state.interval, policy)
+            return state.interval
+
+        current = dict(self._fingerprint(trend) for trend in trends)
+        if not current:
+            state.empty_polls += 1
+            observed = 0.0
+        else:
+            changed = sum(1 for topic, bucket in current.items() if state.fingerprints.get(topic) != bucket)
+            observed = changed / len(current)
+            state.items_seen += len(current)
+            state.items_changed += changed
+
+        first_poll = not state.fingerprints and state.change_rate is None
+        state.fingerprints = current
+
+        if first_poll:
+            # รอบแรกทุก trend เป็น "ใหม่" ไม่ได้บอกอะไรเรื่องความเร็ว
+            state.change_rate = policy.target_change_rate
+        else:
+            state.change_rate = (1 - policy.smoothing) * state.change_rate + policy.smoothing * observed
+            ratio = policy.target_change_rate / max(state.change_rate, 0.01)
+            state.interval *= min(2.0, max(0.5, ratio))
+
+        state.interval = min(policy.max_interval, max(policy.min_interval, state.interval))
+        state.next_due = now + self._jittered(state.interval, policy)
+        return state.interval
+
+    def record_timeout(self, key: PollKey) -> float:
+        """บันทึก unit ที่ถูกตัดด้วย timeout ของ source (รวมที่ยังไม่ได้เริ่ม) ให้ไม่ค้างสถานะ due"""
+        self.states[key].timeouts += 1
+        return self.record_poll(key, [], failed=True)
+
+    @staticmethod
+    def _jittered(interval: float, policy: PollPolicy) -> float:
+        return interval * random.uniform(1 - policy.jitter, 1 + policy.jitter)
+
+    def metrics(self) -> Dict[str, Any]:
+        """ตัวเลขการตัดสินใจ: จำนวน poll จริงเทียบกับรอบคงที่ และความสดของข้อมูล"""
+        now = self._clock()
+        per_key = {}
+        total_polls = 0
+        total_baseline = 0.0
+
+        for (source, region), state in self.states.items():
+            elapsed = max(0.0, now - state.registered_at)
+            baseline_polls = elapsed / self.baseline_interval + 1
+            total_polls += state.polls
+            total_baseline += baseline_polls
+            per_key[f"{source}:{region}"] = {
+                'interval_seconds': round(state.interval, 1),
+                'next_due_in_seconds': round(max(0.0, state.next_due - now), 1),
+                'change_rate': round(state.change_rate, 3) if state.change_rate is not None else None,
+                'polls': state.polls,
+                'empty_polls': state.empty_polls,
+                'timeouts': state.timeouts,
+                'baseline_polls': round(baseline_polls, 1),
+                # การเปลี่ยนแปลงเกิดสุ่มระหว่างรอบ จึงช้ากว่าจริงเฉลี่ยครึ่ง interval
+                'expected_staleness_seconds': round(state.interval / 2, 1),
+                'seconds_since_last_poll': round(now - state.last_poll, 1) if state.last_poll else None
+            }
+
+        return {
+            'baseline_interval_seconds': self.baseline_interval,
+            'baseline_staleness_seconds': self.baseline_interval / 2,
+            'total_polls': total_polls,
+            'baseline_polls': round(total_baseline, 1),
+            'polls_saved': round(max(0.0, total_baseline - total_polls), 1),
+            'polls_saved_ratio': round(1 - total_polls / total_baseline, 3) if total_baseline else 0.0,
+            'schedules': per_key
+        }
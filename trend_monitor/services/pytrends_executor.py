@@ -0,0 +1,277 @@
+# ai-content-factory/trend-monitor/services/pytrends_executor.py
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Google Trends รับได้สูงสุด 5 keywords ต่อ payload
+MAX_KEYWORDS_PER_PAYLOAD = 5
+
+def is_rate_limited_error(error: Exception) -> bool:
+    """ตรวจว่า error มาจาก HTTP 429 ของ Google หรือไม่"""
+    if type(error).__name__ == "TooManyRequestsError":
+        return True
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+class AsyncRateLimiter:
+    """Rate limiter แบบ asyncio (ไม่ใช้ time.sleep จึงไม่ block event loop)
+
+    - เว้นระยะระหว่าง request แบบสุ่ม (min_interval..max_interval)
+    - จำกัดจำนวน request ต่อชั่วโมงแบบ sliding window
+    - backoff ร่วมกันทุก caller เมื่อเจอ 429 (exponential + jitter)
+    """
+
+    def __init__(self,
+                 max_requests_per_hour: int = 100,
+                 min_interval: float = 1.0,
+                 max_interval: float = 3.0,
+                 base_backoff: float = 60.0,
+                 max_backoff: float = 3600.0):
+        self.max_requests_per_hour = max_requests_per_hour
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._lock: Optional[asyncio.Lock] = None
+        self._request_times: deque = deque()
+        self._next_allowed = 0.0
+        self._backoff_until = 0.0
+        self._consecutive_throttles = 0
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def acquire(self, tokens: int = 1):
+        """รอจนกว่าจะส่ง request ได้ tokens ครั้ง (หนึ่ง token ต่อ request จริงที่ส่งไป Google)
+
+        งานที่ยิงหลาย request ติดกัน (เช่น related_queries) จะถูกนับครบทุกครั้งใน
+        โควตาต่อชั่วโมง และ request ถัดไปของ caller อื่นจะถูกเว้นระยะตามจำนวนนั้น
+        """
+        tokens = max(1, min(tokens, self.max_requests_per_hour))
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                while self._request_times and now - self._request_times[0] > 3600:
+                    self._request_times.popleft()
+
+                wait = max(self._next_allowed - now, self._backoff_until - now, 0.0)
+                excess = len(self._request_times) + tokens - self.max_requests_per_hour
+                if excess > 0:
+                    wait = max(wait, 3600 - (now - self._request_times[excess - 1]))
+
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            self._request_times.extend([now] * tokens)
+            self._next_allowed = now + sum(
+                random.uniform(self.min_interval, self.max_interval) for _ in range(tokens)
+            )
+
+    def register_throttle(self) -> float:
+        """บันทึก 429 และคืนระยะ backoff (full jitter)"""
+        self._consecutive_throttles += 1
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** (self._consecutive_throttles - 1)))
+        delay = random.uniform(ceiling / 2, ceiling)
+        self._backoff_until = max(self._backoff_until, time.monotonic() + delay)
+        logger.warning(f"Google Trends rate limited, backing off {delay:.0f}s")
+        return delay
+
+    def register_success(self):
+        self._consecutive_throttles = 0
+
+    def status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        recent = sum(1 for t in self._request_times if now - t <= 3600)
+        return {
+            "requests_last_hour": recent,
+            "requests_remaining": max(0, self.max_requests_per_hour - recent),
+            "backoff_seconds_remaining": max(0.0, self._backoff_until - now),
+            "consecutive_throttles": self._consecutive_throttles
+        }
+
+@dataclass
+class _PendingKeyword:
+    keyword: str
+    include_related: bool
+    future: asyncio.Future
+
+@dataclass
+class _Batch:
+    items: List[_PendingKeyword] = field(default_factory=list)
+    flush_handle: Optional[asyncio.TimerHandle] = None
+
+class PytrendsExecutor:
+    """
+    รัน pytrends ใน thread pool เฉพาะ โดยมี async façade
+
+    การเรียก interest() พร้อมกันหลายตัวที่ใช้ (timeframe, geo, cat) เดียวกัน
+    จะถูกรวมเป็น build_payload ละ 5 keywords ทำให้ส่ง request ไป Google
+    น้อยลงราว 5 เท่า
+    """
+
+    def __init__(self,
+                 trendreq_factory: Callable[[], Any],
+                 rate_limiter: Optional[AsyncRateLimiter] = None,
+                 max_workers: int = 1,
+                 batch_window: float = 0.05,
+                 max_retries: int = 3,
+                 normalize_per_keyword: bool = True):
+        self._factory = trendreq_factory
+        self.rate_limiter = rate_limiter or AsyncRateLimiter()
+        # TrendReq เก็บ state ของ payload จึงต้องมีหนึ่งตัวต่อ thread
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pytrends")
+        self._local = threading.local()
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.normalize_per_keyword = normalize_per_keyword
+        self._batches: Dict[Tuple, _Batch] = {}
+        # loop เก็บ task แบบ weak reference เท่านั้น: ต้องถือ reference ไว้จน batch เสร็จ
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.stats = {
+            "google_requests": 0,
+            "keywords_requested": 0,
+            "payloads_built": 0,
+            "throttled": 0
+        }
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._factory()
+            self._local.client = client
+        return client
+
+    async def run(self, func: Callable[[Any], Any], request_count: int = 1) -> Any:
+        """รัน func(trendreq) ใน thread pool ผ่าน rate limiter พร้อม retry เมื่อเจอ 429"""
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(request_count)
+            self.stats["google_requests"] += request_count
+            try:
+                result = await loop.run_in_executor(self._pool, lambda: func(self._client()))
+                self.rate_limiter.register_success()
+                return result
+            except Exception as e:
+                if not is_rate_limited_error(e) or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.stats["throttled"] += 1
+                self.rate_limiter.register_throttle()
+
+    async def interest(self,
+                       keyword: str,
+                       timeframe: str = "today 7-d",
+                       geo: str = "",
+                       cat: int = 0,
+                       include_related: bool = False) -> Dict[str, Any]:
+        """
+        ดึง interest over time (และ related queries ถ้าต้องการ) ของ keyword เดียว
+
+        Returns:
+            {"series": pandas.Series หรือ None, "related": dict หรือ None}
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (timeframe, geo, cat)
+        batch = self._batches.setdefault(key, _Batch())
+        batch.items.append(_PendingKeyword(keyword, include_related, future))
+        self.stats["keywords_requested"] += 1
+
+        if len(batch.items) >= MAX_KEYWORDS_PER_PAYLOAD:
+            self._flush(key)
+        elif batch.flush_handle is None:
+            batch.flush_handle = loop.call_later(self.batch_window, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: Tuple):
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        if batch.flush_handle is not None:
+            batch.flush_handle.cancel()
+        task = asyncio.ensure_future(self._execute_batch(key, batch.items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute_batch(self, key: Tuple, items: List[_PendingKeyword]):
+        timeframe, geo, cat = key
+        # keyword ซ้ำกันใน batch เดียวกันใช้ช่องเดียว
+        keywords = list(dict.fromkeys(item.keyword for item in items))
+        include_related = any(item.include_related for item in items)
+
+        def fetch(client):
+            client.build_payload(keywords, cat=cat, timeframe=timeframe, geo=geo, gprop='')
+            frame = client.interest_over_time()
+            related = client.related_queries() if include_related else {}
+            return frame, related
+
+        self.stats["payloads_built"] += 1
+        try:
+            # related_queries ยิงหนึ่ง request ต่อ keyword ภายใน pytrends
+            frame, related = await self.run(fetch, 1 + (len(keywords) if include_related else 0))
+        except asyncio.CancelledError:
+            for item in items:
+                item.future.cancel()
+            raise
+        except Exception as e:
+            for item in items:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        for item in items:
+            if item.future.done():
+                continue
+            series = None
+            if frame is not None and not frame.empty and item.keyword in frame.columns:
+                series = frame[item.keyword]
+                if self.normalize_per_keyword and len(keywords) > 1:
+                    # Google scale ทั้ง batch ให้ค่าสูงสุดรวม = 100; scale กลับให้แต่ละ
+                    # keyword มีค่าสูงสุด 100 เหมือนการ query เดี่ยว
+                    peak = series.max()
+                    if peak > 0:
+                        series = (series * (100.0 / peak)).round()
+            item.future.set_result({
+                "series": series,
+                "related": related.get(item.keyword) if related else None
+            })
+
+    def status(self) -> Dict[str, Any]:
+        return {**self.stats, **self.rate_limiter.status()}
+
+    async def close(self):
+        """ยกเลิก batch ที่ค้างอยู่ใน event loop ปัจจุบัน (ผู้รอได้ CancelledError แทนการค้างตลอดไป)"""
+        loop = asyncio.get_running_loop()
+        for key, batch in list(self._batches.items()):
+            if batch.items and batch.items[0].future.get_loop() is not loop:
+                continue
+            del self._batches[key]
+            if batch.flush_handle is not None:
+                batch.flush_handle.cancel()
+            for item in batch.items:
+                item.future.cancel()
+
+        tasks = [task for task in self._tasks if task.get_loop() is loop]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
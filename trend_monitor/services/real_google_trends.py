@@ -6,12 +6,15 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import pandas as pd
 from dataclasses import dataclass
-import time
-import random
 
 # ติดตั้ง: pip install pytrends
 from pytrends.request import TrendReq
 
+try:
+    from .pytrends_executor import AsyncRateLimiter, PytrendsExecutor
+except ImportError:
+    from pytrends_executor import AsyncRateLimiter, PytrendsExecutor
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -31,15 +34,18 @@ class RealGoogleTrendsService:
     def __init__(self, geo: str = "TH", timeout: int = 30):
         self.geo = geo
         self.timeout = timeout
-        self.pytrends = None
-        self.request_count = 0
         self.max_requests_per_hour = 100
-        self.last_request_time = 0
         
-    def _init_pytrends(self):
-        """Initialize pytrends with random user agent"""
+        # pytrends รันใน thread pool แยก ผ่าน asyncio rate limiter (ไม่ block event loop)
+        self.executor = PytrendsExecutor(
+            self._create_trendreq,
+            AsyncRateLimiter(max_requests_per_hour=self.max_requests_per_hour)
+        )
+        
+    def _create_trendreq(self) -> TrendReq:
+        """Create a pytrends client (one per executor thread)"""
         try:
-            self.pytrends = TrendReq(
+            pytrends = TrendReq(
                 hl='th-TH', 
                 tz=420,  # Thailand timezone
                 timeout=self.timeout,
@@ -47,40 +53,16 @@ class RealGoogleTrendsService:
                 backoff_factor=0.1
             )
             logger.info("Google Trends service initialized")
+            return pytrends
         except Exception as e:
             logger.error(f"Failed to initialize Google Trends: {e}")
             raise
     
-    def _rate_limit(self):
-        """Rate limiting to avoid being blocked"""
-        current_time = time.time()
-        
-        # Reset counter every hour
-        if current_time - self.last_request_time > 3600:
-            self.request_count = 0
-        
-        if self.request_count >= self.max_requests_per_hour:
-            logger.warning("Rate limit reached, waiting...")
-            time.sleep(3600)  # Wait 1 hour
-            self.request_count = 0
-        
-        # Random delay between requests (1-3 seconds)
-        delay = random.uniform(1, 3)
-        time.sleep(delay)
-        
-        self.request_count += 1
-        self.last_request_time = current_time
-    
     async def get_trending_searches(self, pn: str = "thailand") -> List[str]:
         """ดึง trending searches ประจำวัน"""
-        if not self.pytrends:
-            self._init_pytrends()
-        
         try:
-            self._rate_limit()
-            
             # ดึง trending searches ของวันนี้
-            trending_searches_df = self.pytrends.trending_searches(pn=pn)
+            trending_searches_df = await self.executor.run(lambda pt: pt.trending_searches(pn=pn))
             
             if not trending_searches_df.empty:
                 trending_list = trending_searches_df[0].tolist()
@@ -95,46 +77,36 @@ class RealGoogleTrendsService:
             return []
     
     async def analyze_keyword(self, keyword: str, timeframe: str = "today 7-d") -> Optional[GoogleTrendData]:
-        """วิเคราะห์ keyword เฉพาะ"""
-        if not self.pytrends:
-            self._init_pytrends()
+        """วิเคราะห์ keyword เฉพาะ
         
+        การเรียกพร้อมกันหลายตัวจะถูกรวมเป็น payload ละ 5 keywords โดย executor
+        """
         try:
-            self._rate_limit()
-            
-            # Build payload for keyword
-            self.pytrends.build_payload([keyword], 
-                                      cat=0, 
-                                      timeframe=timeframe, 
-                                      geo=self.geo, 
-                                      gprop='')
-            
-            # Get interest over time
-            interest_over_time_df = self.pytrends.interest_over_time()
+            result = await self.executor.interest(
+                keyword, timeframe=timeframe, geo=self.geo, include_related=True
+            )
+            interest_series = result["series"]
             
-            if interest_over_time_df.empty:
+            if interest_series is None or interest_series.empty:
                 logger.warning(f"No data found for keyword: {keyword}")
                 return None
             
             # Get related queries
-            related_queries_dict = self.pytrends.related_queries()
+            related = result["related"] or {}
             related_queries = []
             rising_queries = []
             
-            if keyword in related_queries_dict:
-                if related_queries_dict[keyword]['top'] is not None:
-                    related_queries = related_queries_dict[keyword]['top']['query'].tolist()[:10]
-                
-                if related_queries_dict[keyword]['rising'] is not None:
-                    rising_queries = related_queries_dict[keyword]['rising']['query'].tolist()[:10]
+            if related.get('top') is not None:
+                related_queries = related['top']['query'].tolist()[:10]
+            
+            if related.get('rising') is not None:
+                rising_queries = related['rising']['query'].tolist()[:10]
             
             # Calculate average interest score
-            avg_interest = int(interest_over_time_df[keyword].mean())
+            avg_interest = int(interest_series.mean())
             
             # Convert time series data
-            search_volume_trend = []
-            for date, row in interest_over_time_df.iterrows():
-                search_volume_trend.append((date, int(row[keyword])))
+            search_volume_trend = [(date, int(value)) for date, value in interest_series.items()]
             
             trend_data = GoogleTrendData(
                 keyword=keyword,
@@ -156,55 +128,35 @@ class RealGoogleTrendsService:
             return None
     
     async def analyze_multiple_keywords(self, keywords: List[str], timeframe: str = "today 7-d") -> List[GoogleTrendData]:
-        """วิเคราะห์หลาย keywords พร้อมกัน"""
-        results = []
+        """วิเคราะห์หลาย keywords พร้อมกัน (executor รวมเป็น batch ละ 5 keywords)"""
         
-        # Process in batches of 5 (Google Trends limit)
-        batch_size = 5
-        for i in range(0, len(keywords), batch_size):
-            batch = keywords[i:i + batch_size]
-            
+        async def analyze(keyword: str) -> Optional[GoogleTrendData]:
             try:
-                if not self.pytrends:
-                    self._init_pytrends()
-                
-                self._rate_limit()
-                
-                # Build payload for batch
-                self.pytrends.build_payload(batch, 
-                                          cat=0, 
-                                          timeframe=timeframe, 
-                                          geo=self.geo, 
-                                          gprop='')
-                
-                # Get interest over time
-                interest_over_time_df = self.pytrends.interest_over_time()
-                
-                if not interest_over_time_df.empty:
-                    for keyword in batch:
-                        if keyword in interest_over_time_df.columns:
-                            avg_interest = int(interest_over_time_df[keyword].mean())
-                            
-                            # Simple trend data for batch processing
-                            trend_data = GoogleTrendData(
-                                keyword=keyword,
-                                interest_score=avg_interest,
-                                region=self.geo,
-                                timeframe=timeframe,
-                                category=0,
-                                related_queries=[],
-                                rising_queries=[],
-                                timestamp=datetime.now(),
-                                search_volume_trend=[]
-                            )
-                            results.append(trend_data)
-                
-                logger.info(f"Processed batch {i//batch_size + 1}: {len(batch)} keywords")
-                
+                result = await self.executor.interest(keyword, timeframe=timeframe, geo=self.geo)
             except Exception as e:
-                logger.error(f"Error processing batch {i//batch_size + 1}: {e}")
-                continue
+                logger.error(f"Error analyzing keyword '{keyword}' in batch: {e}")
+                return None
+            
+            interest_series = result["series"]
+            if interest_series is None or interest_series.empty:
+                return None
+            
+            # Simple trend data for batch processing
+            return GoogleTrendData(
+                keyword=keyword,
+                interest_score=int(interest_series.mean()),
+                region=self.geo,
+                timeframe=timeframe,
+                category=0,
+                related_queries=[],
+                rising_queries=[],
+                timestamp=datetime.now(),
+                search_volume_trend=[]
+            )
         
+        analyzed = await asyncio.gather(*(analyze(keyword) for keyword in keywords))
+        results = [trend for trend in analyzed if trend is not None]
+        logger.info(f"Processed {len(keywords)} keywords, {len(results)} with data")
         return results
     
     async def get_trending_by_category(self, categories: List[int] = None) -> Dict[str, List[str]]:
@@ -232,25 +184,19 @@ class RealGoogleTrendsService:
         
         results = {}
         
+        # trending_searches ไม่รับ category จึงดึงครั้งเดียวแล้วใช้ร่วมกัน
+        try:
+            trending_searches_df = await self.executor.run(lambda pt: pt.trending_searches(pn="thailand"))
+        except Exception as e:
+            logger.error(f"Error fetching trending searches for categories: {e}")
+            return results
+        
         for cat_id in categories:
-            try:
-                if not self.pytrends:
-                    self._init_pytrends()
-                
-                self._rate_limit()
-                
-                # ใช้ realtime trends (ถ้าใช้ได้)
-                trending_searches_df = self.pytrends.trending_searches(pn="thailand")
-                
-                if not trending_searches_df.empty:
-                    category_name = category_names.get(cat_id, f"Category {cat_id}")
-                    results[category_name] = trending_searches_df[0].tolist()[:10]
-                    
-                logger.info(f"Fetched trends for category: {category_names.get(cat_id)}")
+            if not trending_searches_df.empty:
+                category_name = category_names.get(cat_id, f"Category {cat_id}")
+                results[category_name] = trending_searches_df[0].tolist()[:10]
                 
-            except Exception as e:
-                logger.error(f"Error fetching category {cat_id}: {e}")
-                continue
+            logger.info(f"Fetched trends for category: {category_names.get(cat_id)}")
         
         return results
     
@@ -275,12 +221,20 @@ class RealGoogleTrendsService:
         logger.info(f"Successfully correlated {len(trend_results)} keywords")
         return trend_results
     
+    async def close(self):
+        """ยกเลิกคำขอ pytrends ที่ค้างอยู่ใน event loop ปัจจุบัน"""
+        await self.executor.close()
+    
     def get_request_status(self) -> Dict[str, int]:
         """ตรวจสอบสถานะ requests"""
+        status = self.executor.status()
         return {
-            "requests_made": self.request_count,
-            "requests_remaining": self.max_requests_per_hour - self.request_count,
-            "hours_since_reset": (time.time() - self.last_request_time) / 3600
+            "requests_made": status["google_requests"],
+            "requests_remaining": status["requests_remaining"],
+            "requests_last_hour": status["requests_last_hour"],
+            "keywords_requested": status["keywords_requested"],
+            "payloads_built": status["payloads_built"],
+            "backoff_seconds_remaining": status["backoff_seconds_remaining"]
         }
 
 
@@ -8,6 +8,11 @@ from typing import List, Dict, Optional
 import json
 from dataclasses import dataclass
 
+try:
+    from .youtube_fetch_planner import QUOTA_COSTS, ETagCache, YouTubeChartFetcher, YouTubeFetchPlanner
+except ImportError:
+    from youtube_fetch_planner import QUOTA_COSTS, ETagCache, YouTubeChartFetcher, YouTubeFetchPlanner
+
 # ตั้งค่า logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,22 +33,52 @@ class YouTubeTrendData:
     region: str = "TH"
 
 class RealYouTubeTrendsService:
-    def __init__(self, api_key: str):
+    # YouTube category IDs ที่น่าสนใจ
+    CATEGORIES = {
+        "Entertainment": "24",
+        "Gaming": "20",
+        "Music": "10",
+        "Comedy": "23",
+        "Education": "27",
+        "Science & Technology": "28",
+        "Sports": "17"
+    }
+
+    def __init__(self, api_key: str, max_daily_quota: int = 9000,
+                 etag_cache_path: Optional[str] = None, max_concurrency: int = 8):
         self.api_key = api_key
         self.base_url = "https://www.googleapis.com/youtube/v3"
         self.session = None
-        self.daily_quota_used = 0
-        self.max_daily_quota = 9000  # ปลอดภัยต่ำกว่า limit
-        
+        self.max_daily_quota = max_daily_quota  # ปลอดภัยต่ำกว่า limit
+        self.planner = YouTubeFetchPlanner(max_daily_quota=max_daily_quota)
+        self.etag_cache = ETagCache(etag_cache_path)
+        self.max_concurrency = max_concurrency
+        self.fetcher: Optional[YouTubeChartFetcher] = None
+
+    @property
+    def daily_quota_used(self) -> int:
+        return self.planner.quota_used
+
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_concurrency * 2, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector)
+        self.fetcher = YouTubeChartFetcher(
+            self.api_key,
+            planner=self.planner,
+            etag_cache=self.etag_cache,
+            base_url=self.base_url,
+            max_concurrency=self.max_concurrency,
+            session=self.session
+        )
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.fetcher:
+            await self.fetcher.close()
         if self.session:
             await self.session.close()
     
-    def check_quota(self, estimated_cost: int = 100) -> bool:
+    def check_quota(self, estimated_cost: int = QUOTA_COSTS["videos.list"]) -> bool:
         """ตรวจสอบ quota ก่อนทำ API call"""
         if self.daily_quota_used + estimated_cost > self.max_daily_quota:
             logger.warning(f"Quota limit reached: {self.daily_quota_used}/{self.max_daily_quota}")
@@ -56,53 +91,30 @@ class RealYouTubeTrendsService:
                                 max_results: int = 50) -> List[YouTubeTrendData]:
         """ดึง trending videos จาก YouTube"""
         
-        if not self.check_quota(100):
+        if not self.check_quota():
             logger.error("API quota exceeded")
             return []
-            
-        try:
-            # Build API URL
-            url = f"{self.base_url}/videos"
-            params = {
-                "part": "snippet,statistics,contentDetails",
-                "chart": "mostPopular",
-                "regionCode": region_code,
-                "maxResults": min(max_results, 50),
-                "key": self.api_key
-            }
-            
-            if category_id:
-                params["videoCategoryId"] = category_id
-            
-            logger.info(f"Fetching trending videos for region: {region_code}")
-            
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    self.daily_quota_used += 100  # YouTube API quota cost
-                    
-                    trending_videos = []
-                    for i, item in enumerate(data.get("items", [])):
-                        try:
-                            video_data = self._parse_video_data(item, i + 1, region_code)
-                            trending_videos.append(video_data)
-                        except Exception as e:
-                            logger.error(f"Error parsing video data: {e}")
-                            continue
-                    
-                    logger.info(f"Successfully fetched {len(trending_videos)} trending videos")
-                    return trending_videos
-                    
-                elif response.status == 403:
-                    logger.error("API key invalid or quota exceeded")
-                    return []
-                else:
-                    logger.error(f"API error: {response.status}")
-                    return []
-                    
-        except Exception as e:
-            logger.error(f"Error fetching trending videos: {e}")
+
+        logger.info(f"Fetching trending videos for region: {region_code}")
+        self.planner.register([region_code], [category_id])
+        chart = (region_code, category_id)
+        items = (await self.fetcher.fetch_planned([chart], max_results)).get(chart)
+        if not items:
             return []
+
+        trending_videos = self._parse_items(items, region_code)
+        logger.info(f"Successfully fetched {len(trending_videos)} trending videos")
+        return trending_videos
+
+    def _parse_items(self, items: List[Dict], region: str) -> List[YouTubeTrendData]:
+        trending_videos = []
+        for i, item in enumerate(items):
+            try:
+                trending_videos.append(self._parse_video_data(item, i + 1, region))
+            except Exception as e:
+                logger.error(f"Error parsing video data: {e}")
+                continue
+        return trending_videos
     
     def _parse_video_data(self, item: Dict, rank: int, region: str) -> YouTubeTrendData:
         """แปลง YouTube API response เป็น YouTubeTrendData"""
@@ -132,36 +144,31 @@ class RealYouTubeTrendsService:
     async def get_trending_by_category(self, region_code: str = "TH") -> Dict[str, List[YouTubeTrendData]]:
         """ดึง trending videos แยกตาม category"""
         
-        # YouTube category IDs ที่น่าสนใจ
-        categories = {
-            "Entertainment": "24",
-            "Gaming": "20", 
-            "Music": "10",
-            "Comedy": "23",
-            "Education": "27",
-            "Science & Technology": "28",
-            "Sports": "17"
-        }
-        
+        categories = self.CATEGORIES
+        self.planner.register([region_code], categories.values())
+
+        # ไม่ส่ง category ที่ region นี้ไม่มี chart; ที่ยังไม่ถึงรอบใช้ผลจาก ETag cache
+        charts = [(region_code, category_id) for category_id in categories.values()
+                  if not self.planner.charts[(region_code, category_id)].unsupported]
+
+        logger.info(f"Fetching {len(charts)} category charts for region: {region_code}")
+        fetched = await self.fetcher.fetch_planned(charts, max_results=20)
+
         results = {}
-        
         for category_name, category_id in categories.items():
-            if not self.check_quota(100):
-                logger.warning(f"Quota limit reached, skipping category: {category_name}")
-                break
-                
-            logger.info(f"Fetching trending videos for category: {category_name}")
-            videos = await self.get_trending_videos(
-                region_code=region_code,
-                category_id=category_id,
-                max_results=20
-            )
-            results[category_name] = videos
-            
-            # Rate limiting - หน่วงเวลาระหว่าง requests
-            await asyncio.sleep(0.5)
-        
+            items = fetched.get((region_code, category_id))
+            if items is not None:
+                results[category_name] = self._parse_items(items, region_code)
         return results
+
+    async def get_due_charts(self, regions: List[str], max_results: int = 50) -> Dict[str, List[YouTubeTrendData]]:
+        """ดึงเฉพาะ charts ที่ planner กำหนดว่าถึงรอบ (ใช้กับการ poll ต่อเนื่องทั้งวัน)"""
+        self.planner.register(regions, [None, *self.CATEGORIES.values()])
+        fetched = await self.fetcher.fetch_due(max_results)
+        return {
+            f"{region}:{category_id or 'all'}": self._parse_items(items, region)
+            for (region, category_id), items in fetched.items()
+        }
     
     async def analyze_trending_keywords(self, trending_videos: List[YouTubeTrendData]) -> Dict[str, int]:
         """วิเคราะห์ keywords ที่ trending"""
@@ -186,11 +193,15 @@ class RealYouTubeTrendsService:
     
     def get_quota_status(self) -> Dict[str, int]:
         """ตรวจสอบสถานะ quota"""
-        return {
+        status = {
             "used": self.daily_quota_used,
             "remaining": self.max_daily_quota - self.daily_quota_used,
             "percentage": (self.daily_quota_used / self.max_daily_quota) * 100
         }
+        if self.fetcher:
+            status["not_modified"] = self.fetcher.stats["not_modified"]
+            status["bytes_saved"] = self.fetcher.stats["bytes_saved"]
+        return status
 
 
 # Usage example และ testing
@@ -32,11 +32,11 @@ class RedditTrendsCollector:
         
         logger.info(f"Reddit collector initialized for subreddits: {self.subreddits}")
     
-    async def collect_trends(self) -> List[TrendData]:
-        """Collect trending posts from Reddit"""
+    async def collect_trends(self, subreddits: Optional[List[str]] = None) -> List[TrendData]:
+        """Collect trending posts from Reddit (all configured subreddits unless given)"""
         all_trends = []
         
-        for subreddit in self.subreddits:
+        for subreddit in subreddits or self.subreddits:
             try:
                 logger.debug(f"Collecting Reddit trends from r/{subreddit}")
                 
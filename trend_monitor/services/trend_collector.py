@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
@@ -11,12 +12,22 @@ from .youtube_trends import YouTubeTrendsCollector
 from .google_trends import GoogleTrendsCollector
 from .twitter_trends import TwitterTrendsCollector
 from .reddit_trends import RedditTrendsCollector
+from .poll_scheduler import AdaptivePollScheduler, PollPolicy, DEFAULT_POLICIES
+from .trend_stream import StreamingTrendPipeline, TrendSink
 
 from models.trend_data import TrendData, TrendBatch, TrendSource, merge_similar_trends
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Config key listing each source's poll units; also the collect_trends() keyword
+POLL_UNIT_KEYS = {
+    'youtube': 'regions',
+    'google': 'regions',
+    'twitter': 'locations',
+    'reddit': 'subreddits'
+}
+
 @dataclass
 class CollectorConfig:
     """Configuration for trend collector"""
@@ -33,6 +44,8 @@ class TrendCollector:
         self.config_path = config_path or os.path.join(os.path.dirname(__file__), '../config/trend_sources.yaml')
         self.config = self._load_config()
         self.collectors = self._initialize_collectors()
+        self.scheduler = self._initialize_scheduler()
+        self.last_pipeline_stats: Dict[str, Any] = {}
         
         logger.info(f"TrendCollector initialized with {len(self.collectors)} active collectors")
     
@@ -138,40 +151,73 @@ class TrendCollector:
             
         return collectors
     
-    async def collect_all_trends(self) -> List[TrendData]:
-        """Collect trends from all enabled sources"""
-        logger.info("Starting comprehensive trend collection...")
-        
-        all_trends = []
-        collection_tasks = []
+    def _initialize_scheduler(self) -> AdaptivePollScheduler:
+        """Create per source x region poll schedules for the active collectors"""
+        collection_config = self.config.get('collection', {})
+        scheduling_config = self.config.get('scheduling', {})
+        baseline_minutes = collection_config.get('auto_collect_interval_minutes', 30)
+        scheduler = AdaptivePollScheduler(baseline_interval=baseline_minutes * 60)
         
-        # Create async tasks for each collector
         for source_name, collector in self.collectors.items():
-            task = asyncio.create_task(
-                self._collect_from_source(source_name, collector),
-                name=f"collect_{source_name}"
+            unit_key = POLL_UNIT_KEYS.get(source_name)
+            units = getattr(collector, unit_key, None) if unit_key else None
+            policy = PollPolicy.from_config(
+                scheduling_config.get(source_name, {}),
+                DEFAULT_POLICIES.get(source_name)
             )
-            collection_tasks.append(task)
+            scheduler.register(source_name, units or [None], policy)
         
-        # Wait for all collections to complete
-        if collection_tasks:
-            results = await asyncio.gather(*collection_tasks, return_exceptions=True)
-            
-            for i, result in enumerate(results):
-                source_name = list(self.collectors.keys())[i]
-                
-                if isinstance(result, Exception):
-                    logger.error(f"Error collecting from {source_name}: {result}")
-                elif isinstance(result, list):
-                    all_trends.extend(result)
-                    logger.info(f"Collected {len(result)} trends from {source_name}")
+        return scheduler
+    
+    async def collect_all_trends(self, sink: Optional[TrendSink] = None) -> List[TrendData]:
+        """Collect trends from all enabled sources
         
-        # Post-process trends
-        processed_trends = self._post_process_trends(all_trends)
+        Trends stream through the pipeline as each region/location finishes, so
+        filtering, merging and (when a sink such as TrendRepository.save_trends_batch
+        is given) batched DB writes happen while slower sources are still running.
+        """
+        logger.info("Starting comprehensive trend collection...")
+        
+        units_by_source = {}
+        for source_name, collector in self.collectors.items():
+            unit_key = POLL_UNIT_KEYS.get(source_name)
+            units_by_source[source_name] = (getattr(collector, unit_key, None) if unit_key else None) or [None]
+        
+        processed_trends = await self._run_pipeline(units_by_source, sink)
         
         logger.info(f"Collection completed: {len(processed_trends)} trends after processing")
         return processed_trends
     
+    async def _run_pipeline(self, units_by_source: Dict[str, List[Any]],
+                            sink: Optional[TrendSink] = None) -> List[TrendData]:
+        """Stream trends from the given source units through filter/merge/write"""
+        collection_config = self.config.get('collection', {})
+        pipeline = StreamingTrendPipeline(
+            sink=sink,
+            queue_size=collection_config.get('queue_size', 200),
+            batch_size=collection_config.get('batch_size', 50),
+            flush_interval=collection_config.get('flush_interval_seconds', 2.0),
+            min_score=collection_config.get('min_popularity_score', 10.0),
+            merge_similar=collection_config.get('merge_similar', True),
+            similarity_threshold=collection_config.get('similarity_threshold', 0.7)
+        )
+        
+        producers = {
+            source_name: functools.partial(self._poll_source_units, source_name, units)
+            for source_name, units in units_by_source.items()
+        }
+        trends = await pipeline.run(producers, timeout=collection_config.get('timeout_seconds', 30))
+        self.last_pipeline_stats = pipeline.stats
+        
+        if pipeline.stats['filtered']:
+            logger.info(f"Filtered out {pipeline.stats['filtered']} trends below score {pipeline.min_score}")
+        if pipeline.stats['merged']:
+            logger.info(f"Merged {pipeline.stats['merged']} similar trends")
+        
+        # Sort by popularity score and limit total number of trends
+        trends.sort(key=lambda t: t.popularity_score, reverse=True)
+        return trends[:collection_config.get('max_total_trends', 200)]
+    
     async def _collect_from_source(self, source_name: str, collector) -> List[TrendData]:
         """Collect trends from a specific source with error handling"""
         try:
@@ -199,6 +245,94 @@ class TrendCollector:
             logger.error(f"Error collecting trends from {source_name}: {e}")
             return []
     
+    async def collect_due_trends(self, sink: Optional[TrendSink] = None) -> List[TrendData]:
+        """Poll only the source x region pairs whose adaptive interval has elapsed"""
+        due_by_source: Dict[str, List[Any]] = {}
+        for source_name, unit in self.scheduler.due():
+            due_by_source.setdefault(source_name, []).append(unit)
+        
+        if not due_by_source:
+            return []
+        
+        logger.info(f"Polling due sources: { {s: len(u) for s, u in due_by_source.items()} }")
+        return await self._run_pipeline(due_by_source, sink)
+    
+    async def _poll_source_units(self, source_name: str, units: List[Any], emit) -> None:
+        """Poll one source unit by unit (sequential, so the collector's rate limiting still holds)
+        
+        Each unit's trends are emitted as soon as that unit finishes.
+        """
+        collector = self.collectors.get(source_name)
+        if collector is None:
+            self.scheduler.unregister(source_name)
+            return
+        unit_key = POLL_UNIT_KEYS.get(source_name)
+        
+        recorded = 0  # units before this index already have a poll result in the scheduler
+        try:
+            for unit in units:
+                key = (source_name, unit)
+                try:
+                    kwargs = {unit_key: [unit]} if unit_key and unit is not None else {}
+                    unit_trends = await collector.collect_trends(**kwargs) or []
+                except Exception as e:
+                    logger.error(f"Error polling {source_name}:{unit}: {e}")
+                    if key in self.scheduler.states:
+                        self.scheduler.record_poll(key, [], failed=True)
+                    recorded += 1
+                    continue
+                
+                if key in self.scheduler.states:
+                    interval = self.scheduler.record_poll(key, unit_trends)
+                    logger.debug(f"{source_name}:{unit} returned {len(unit_trends)} trends, next poll in {interval:.0f}s")
+                recorded += 1
+                for trend in unit_trends:
+                    await emit(trend)
+        except asyncio.CancelledError:
+            # source timeout ตัดกลางทาง: unit ที่ยังไม่มีผลต้องไม่ค้างเป็น due ไปตลอด
+            pending = units[recorded:]
+            for unit in pending:
+                if (source_name, unit) in self.scheduler.states:
+                    self.scheduler.record_timeout((source_name, unit))
+            if pending:
+                logger.warning(f"{source_name} timed out with {len(pending)} unit(s) not polled")
+            raise
+    
+    async def run_adaptive_polling(self, on_trends=None, stop_event: Optional[asyncio.Event] = None,
+                                   sink: Optional[TrendSink] = None):
+        """Poll sources forever on their adaptive schedules; on_trends receives each processed batch"""
+        stop_event = stop_event or asyncio.Event()
+        
+        while not stop_event.is_set():
+            trends = await self.collect_due_trends(sink)
+            if trends and on_trends:
+                result = on_trends(trends)
+                if asyncio.iscoroutine(result):
+                    await result
+            
+            wait = max(1.0, self.scheduler.seconds_until_next())
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def close(self):
+        """Close collector resources (pooled HTTP sessions, cached ETags) bound to the current event loop"""
+        for source_name, collector in self.collectors.items():
+            close = getattr(collector, 'close', None)
+            if close is None:
+                continue
+            try:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error closing {source_name} collector: {e}")
+    
+    def get_scheduling_metrics(self) -> Dict[str, Any]:
+        """Adaptive polling decisions: intervals, change rates, polls saved vs. fixed cadence"""
+        return self.scheduler.metrics()
+    
     def _post_process_trends(self, trends: List[TrendData]) -> List[TrendData]:
         """Post-process collected trends"""
         if not trends:
@@ -320,6 +454,8 @@ class TrendCollector:
                 'initialized': source_name in self.collectors
             }
         
+        stats['scheduling'] = self.scheduler.metrics()
+        stats['last_pipeline'] = self.last_pipeline_stats
         return stats
     
     async def health_check(self) -> Dict[str, Any]:
@@ -382,6 +518,7 @@ class TrendCollector:
             
             # Re-initialize collectors with new config
             self.collectors = self._initialize_collectors()
+            self.scheduler = self._initialize_scheduler()
             
             logger.info("Collector configuration updated successfully")
             return True
@@ -391,6 +528,7 @@ class TrendCollector:
             # Restore old configuration
             self.config = old_config
             self.collectors = self._initialize_collectors()
+            self.scheduler = self._initialize_scheduler()
             return False
     
     def save_config(self, file_path: Optional[str] = None) -> bool:
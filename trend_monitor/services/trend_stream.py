@@ -0,0 +1,225 @@
+# ai-content-factory/trend-monitor/services/trend_stream.py
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Union
+
+from models.trend_data import TrendData, merge_trend_group
+
+logger = logging.getLogger(__name__)
+
+# sink รับ batch ของ trends แล้วคืนจำนวนที่บันทึก (sync เช่น TrendRepository.save_trends_batch หรือ async)
+TrendSink = Callable[[List[TrendData]], Union[int, Awaitable[int]]]
+
+_END = object()
+
+@dataclass
+class _TrendGroup:
+    """กลุ่ม trends ที่คล้ายกัน (keywords ของตัวแรกเป็นตัวแทน เหมือน merge_similar_trends)"""
+    group_id: str
+    seq: int
+    keywords: Set[str]
+    members: List[TrendData] = field(default_factory=list)
+    merged: Optional[TrendData] = None
+
+class IncrementalTrendMerger:
+    """
+    รวม trends ที่คล้ายกันทีละตัวเมื่อมาถึง
+
+    ใช้ inverted index keyword -> groups จึงเทียบเฉพาะ group ที่มี keyword
+    ร่วมกัน (Jaccard >= threshold > 0 ต้องมี keyword ร่วมอย่างน้อยหนึ่งคำ)
+    ผลเท่ากับ merge_similar_trends ตามลำดับที่ trends มาถึง
+    """
+
+    def __init__(self, similarity_threshold: float = 0.7, enabled: bool = True):
+        self.similarity_threshold = similarity_threshold
+        self.enabled = enabled
+        self.groups: Dict[str, _TrendGroup] = {}
+        self._index: Dict[str, Set[str]] = {}
+
+    def add(self, trend: TrendData) -> TrendData:
+        """เพิ่ม trend แล้วคืน trend ที่ merge แล้วของ group (id คงที่ตลอด stream)"""
+        keywords = set(trend.keywords)
+        group = self._find_group(keywords) if self.enabled else None
+
+        if group is None:
+            group = _TrendGroup(group_id=trend.id, seq=len(self.groups), keywords=keywords,
+                                members=[trend], merged=trend)
+            self.groups[group.group_id] = group
+            for keyword in keywords:
+                self._index.setdefault(keyword, set()).add(group.group_id)
+            return trend
+
+        group.members.append(trend)
+        merged = merge_trend_group(group.members)
+        merged.id = group.group_id  # upsert แถวเดิมใน DB
+        group.merged = merged
+        return merged
+
+    def _find_group(self, keywords: Set[str]) -> Optional[_TrendGroup]:
+        if not keywords:
+            return None
+        candidates = set()
+        for keyword in keywords:
+            candidates.update(self._index.get(keyword, ()))
+
+        # เลือก group ที่สร้างก่อนสุดเหมือนการวนลำดับใน merge_similar_trends
+        for group in sorted((self.groups[gid] for gid in candidates), key=lambda g: g.seq):
+            union = len(keywords | group.keywords)
+            if union and len(keywords & group.keywords) / union >= self.similarity_threshold:
+                return group
+        return None
+
+    def results(self) -> List[TrendData]:
+        return [group.merged for group in self.groups.values()]
+
+class StreamingTrendPipeline:
+    """
+    Producer/consumer pipeline ของการเก็บ trends
+
+    collectors ใส่ TrendData ลง queue ขนาดจำกัด (backpressure) ทันทีที่แต่ละ
+    region/location เสร็จ ฝั่ง consumer กรองคะแนน รวม trends ที่คล้ายกัน และ
+    เขียน DB เป็น batch ระหว่างที่ trends ยังทยอยมา ไม่ต้องรอ source ที่ช้าที่สุด
+    """
+
+    def __init__(self,
+                 sink: Optional[TrendSink] = None,
+                 queue_size: int = 200,
+                 batch_size: int = 50,
+                 flush_interval: float = 2.0,
+                 min_score: float = 10.0,
+                 merge_similar: bool = True,
+                 similarity_threshold: float = 0.7):
+        self.sink = sink
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.min_score = min_score
+        self.merger = IncrementalTrendMerger(similarity_threshold, enabled=merge_similar)
+
+        self._dirty: Dict[str, TrendData] = {}
+        self._started = 0.0
+        self.stats = {
+            'received': 0,
+            'filtered': 0,
+            'merged': 0,
+            'stored': 0,
+            'batches_written': 0,
+            'write_errors': 0,
+            'max_queue_depth': 0,
+            'time_to_first_trend': None,
+            'time_to_first_stored': None,
+            'duration_seconds': None
+        }
+
+    async def run(self, producers: Dict[str, Callable[[Callable[[TrendData], Awaitable[None]]], Awaitable[None]]],
+                  timeout: Optional[float] = None) -> List[TrendData]:
+        """
+        รัน producers ทั้งหมดพร้อม consumer
+
+        producers: {source_name: async fn(emit)} โดย emit(trend) ใส่ trend ลง queue
+        timeout: เวลาสูงสุดต่อ source; trends ที่ส่งมาแล้วก่อนหมดเวลายังถูกเก็บ
+        """
+        self._started = time.perf_counter()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async def emit(trend: TrendData):
+            await queue.put(trend)
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], queue.qsize())
+
+        async def run_producer(source_name: str, producer):
+            try:
+                if timeout:
+                    await asyncio.wait_for(producer(emit), timeout=timeout)
+                else:
+                    await producer(emit)
+            except asyncio.TimeoutError:
+                logger.error(f"Timeout collecting trends from {source_name}")
+            except Exception as e:
+                logger.error(f"Error collecting trends from {source_name}: {e}")
+
+        consumer = asyncio.create_task(self._consume(queue))
+        await asyncio.gather(*(run_producer(name, producer) for name, producer in producers.items()))
+        await queue.put(_END)
+        await consumer
+
+        self.stats['duration_seconds'] = round(time.perf_counter() - self._started, 3)
+        return self.merger.results()
+
+    async def _consume(self, queue: asyncio.Queue):
+        last_flush = time.perf_counter()
+        pending_get = None
+        while True:
+            # เก็บ get task ข้ามรอบไว้ (ไม่ cancel) เพื่อไม่ให้ item หายตอน timeout
+            if pending_get is None:
+                pending_get = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({pending_get}, timeout=self.flush_interval)
+            item = None
+            if done:
+                item = pending_get.result()
+                pending_get = None
+
+            if item is _END:
+                break
+            if item is not None:
+                self._process(item)
+
+            if len(self._dirty) >= self.batch_size or \
+                    (self._dirty and time.perf_counter() - last_flush >= self.flush_interval):
+                await self._flush()
+                last_flush = time.perf_counter()
+
+        await self._flush()
+
+    def _process(self, trend: TrendData):
+        self.stats['received'] += 1
+        if self.stats['time_to_first_trend'] is None:
+            self.stats['time_to_first_trend'] = round(time.perf_counter() - self._started, 3)
+
+        if trend.popularity_score < self.min_score:
+            self.stats['filtered'] += 1
+            return
+
+        merged = self.merger.add(trend)
+        if merged is not trend:
+            self.stats['merged'] += 1
+        self._dirty[merged.id] = merged
+
+    async def _flush(self):
+        if not self._dirty:
+            return
+        batch = list(self._dirty.values())
+        self._dirty = {}
+
+        batch_stamp = datetime.utcnow()
+        for trend in batch:
+            if not trend.raw_data:
+                trend.raw_data = {}
+            trend.raw_data['processed_at'] = batch_stamp.isoformat()
+            trend.raw_data['collection_batch'] = batch_stamp.strftime('%Y%m%d_%H%M%S')
+
+        if self.sink is None:
+            return
+
+        try:
+            result = self.sink(batch)
+            if asyncio.iscoroutine(result):
+                saved = await result
+            else:
+                saved = result
+            self.stats['stored'] += saved or 0
+            self.stats['batches_written'] += 1
+            if self.stats['time_to_first_stored'] is None and saved:
+                self.stats['time_to_first_stored'] = round(time.perf_counter() - self._started, 3)
+        except Exception as e:
+            self.stats['write_errors'] += 1
+            logger.error(f"Error writing trend batch ({len(batch)} trends): {e}")
+
+def threaded_sink(save_batch: Callable[[List[TrendData]], int]) -> TrendSink:
+    """ห่อ sink แบบ blocking (เช่น psycopg2) ให้รันใน thread ไม่ block event loop"""
+    async def sink(batch: List[TrendData]) -> int:
+        return await asyncio.to_thread(save_batch, batch)
+    return sink
@@ -46,15 +46,15 @@ class TwitterTrendsCollector:
         
         return bearer_token
     
-    async def collect_trends(self) -> List[TrendData]:
-        """Collect trending topics from Twitter"""
+    async def collect_trends(self, locations: Optional[List[int]] = None) -> List[TrendData]:
+        """Collect trending topics from Twitter (all configured locations unless given)"""
         if not self.bearer_token and not (self.api_key and self.api_secret):
             logger.info("No Twitter API credentials available, using fallback")
             return await self._collect_trends_fallback()
         
         all_trends = []
         
-        for location in self.locations:
+        for location in locations or self.locations:
             try:
                 logger.debug(f"Collecting Twitter trends for location: {location}")
                 
@@ -0,0 +1,405 @@
+# ai-content-factory/trend-monitor/services/youtube_fetch_planner.py
+
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# ค่า quota จริงของ YouTube Data API v3 (units ต่อ call, ไม่ขึ้นกับจำนวน parts)
+QUOTA_COSTS = {
+    "videos.list": 1,
+    "videoCategories.list": 1,
+    "channels.list": 1,
+    "playlistItems.list": 1,
+    "search.list": 100,
+}
+
+ChartKey = Tuple[str, Optional[str]]  # (region, category_id)
+
+@dataclass
+class ChartState:
+    """สถานะของ chart หนึ่ง (region x category)"""
+    priority: float = 1.0
+    change_rate: float = 0.5          # EWMA ของสัดส่วนครั้งที่ chart เปลี่ยน
+    interval_seconds: float = 3600.0
+    next_due: float = 0.0
+    fetches: int = 0
+    failures: int = 0                 # ล้มเหลวติดกันกี่ครั้ง (403 / 5xx / network)
+    unsupported: bool = False         # region ไม่มี chart ของ category นี้
+
+@dataclass
+class CachedChart:
+    etag: str
+    items: List[Dict[str, Any]]
+    fetched_at: float
+    size_bytes: int = 0
+
+class ETagCache:
+    """เก็บ ETag + payload ล่าสุดของแต่ละ chart (บันทึกลงไฟล์ได้)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries: Dict[str, CachedChart] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for key, value in json.load(f).items():
+                        self._entries[key] = CachedChart(**value)
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Could not load ETag cache {path}: {e}")
+
+    @staticmethod
+    def make_key(region: str, category_id: Optional[str], max_results: int) -> str:
+        return f"{region}:{category_id or 'all'}:{max_results}"
+
+    def get(self, key: str) -> Optional[CachedChart]:
+        return self._entries.get(key)
+
+    def set(self, key: str, entry: CachedChart):
+        self._entries[key] = entry
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({k: v.__dict__ for k, v in self._entries.items()}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+class YouTubeFetchPlanner:
+    """
+    วางแผนการดึง trending charts ให้ครอบคลุมมากที่สุดภายใต้ max_daily_quota
+
+    - คิด quota ตามราคาจริงของแต่ละ endpoint (videos.list = 1 unit)
+    - ทุก chart ได้อย่างน้อยหนึ่งรอบต่อวัน (เรียงตาม priority ถ้า quota ไม่พอ)
+    - quota ที่เหลือแบ่งให้ chart ที่เปลี่ยนบ่อย (change_rate สูง) ถี่ขึ้น
+    """
+
+    def __init__(self,
+                 max_daily_quota: int = 9000,
+                 min_interval_seconds: float = 900.0,
+                 max_interval_seconds: float = 86400.0,
+                 change_rate_alpha: float = 0.3):
+        self.max_daily_quota = max_daily_quota
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.change_rate_alpha = change_rate_alpha
+        self.charts: Dict[ChartKey, ChartState] = {}
+        self.quota_used = 0
+        self._day_started = time.time()
+
+    def register(self, regions: Iterable[str], category_ids: Iterable[Optional[str]],
+                 priorities: Optional[Dict[ChartKey, float]] = None):
+        priorities = priorities or {}
+        for region in regions:
+            for category_id in category_ids:
+                key = (region, category_id)
+                state = self.charts.setdefault(key, ChartState())
+                state.priority = priorities.get(key, state.priority)
+        self.rebalance()
+
+    def _reset_day_if_needed(self, now: float):
+        if now - self._day_started >= 86400:
+            self.quota_used = 0
+            self._day_started = now
+
+    def remaining_quota(self) -> int:
+        self._reset_day_if_needed(time.time())
+        return max(0, self.max_daily_quota - self.quota_used)
+
+    def can_afford(self, method: str = "videos.list", calls: int = 1) -> bool:
+        return QUOTA_COSTS.get(method, 1) * calls <= self.remaining_quota()
+
+    def charge(self, method: str = "videos.list", calls: int = 1):
+        self.quota_used += QUOTA_COSTS.get(method, 1) * calls
+
+    def daily_allocation(self) -> Dict[ChartKey, int]:
+        """จำนวนครั้งต่อวันของแต่ละ chart ภายใต้ quota ทั้งวัน"""
+        cost = QUOTA_COSTS["videos.list"]
+        budget = self.max_daily_quota // cost
+        active = [key for key, state in self.charts.items() if not state.unsupported]
+        max_calls = int(86400 // self.min_interval_seconds)
+
+        # รอบแรก: ให้ทุก chart อย่างน้อย 1 ครั้ง เรียงตาม priority
+        ordered = sorted(active, key=lambda k: self.charts[k].priority, reverse=True)
+        allocation = {key: 0 for key in active}
+        for key in ordered:
+            if budget <= 0:
+                break
+            allocation[key] = 1
+            budget -= 1
+
+        # รอบสอง: แบ่งที่เหลือตาม priority x change_rate (water-filling ถึง max_calls)
+        while budget > 0:
+            eligible = [k for k in ordered if 0 < allocation[k] < max_calls]
+            if not eligible:
+                break
+            weights = {k: self.charts[k].priority * max(self.charts[k].change_rate, 0.01) for k in eligible}
+            total_weight = sum(weights.values())
+            distributed = 0
+            for key in eligible:
+                share = int(budget * weights[key] / total_weight)
+                extra = min(share, max_calls - allocation[key])
+                allocation[key] += extra
+                distributed += extra
+            if distributed == 0:
+                # เศษที่เหลือให้ chart ที่ weight สูงสุดทีละครั้ง
+                best = max(eligible, key=lambda k: weights[k])
+                allocation[best] += 1
+                distributed = 1
+            budget -= distributed
+
+        return allocation
+
+    def rebalance(self):
+        """คำนวณ interval ใหม่ของทุก chart จาก allocation"""
+        allocation = self.daily_allocation()
+        now = time.time()
+        for key, state in self.charts.items():
+            calls = allocation.get(key, 0)
+            if calls <= 0:
+                state.interval_seconds = math.inf
+                continue
+            interval = min(self.max_interval_seconds, max(self.min_interval_seconds, 86400 / calls))
+            state.interval_seconds = interval
+            if state.next_due == 0.0:
+                # กระจายรอบแรกไม่ให้ยิงพร้อมกันทั้งหมด
+                state.next_due = now + random.uniform(0, min(interval, 60.0))
+
+    def due_charts(self, now: Optional[float] = None) -> List[ChartKey]:
+        """charts ที่ถึงเวลาดึงและยังมี quota พอ เรียงตาม priority"""
+        now = now or time.time()
+        self._reset_day_if_needed(now)
+        due = [key for key, state in self.charts.items()
+               if not state.unsupported and state.next_due <= now]
+        due.sort(key=lambda k: self.charts[k].priority, reverse=True)
+        affordable = self.remaining_quota() // QUOTA_COSTS["videos.list"]
+        return due[:affordable]
+
+    def record_result(self, key: ChartKey, changed: bool, unsupported: bool = False):
+        state = self.charts.setdefault(key, ChartState())
+        state.fetches += 1
+        state.failures = 0
+        if unsupported:
+            state.unsupported = True
+            self.rebalance()
+            return
+        state.change_rate = (1 - self.change_rate_alpha) * state.change_rate + \
+            self.change_rate_alpha * (1.0 if changed else 0.0)
+        state.next_due = time.time() + state.interval_seconds
+
+    def record_failure(self, key: ChartKey) -> float:
+        """เลื่อนรอบถัดไปของ chart ที่ดึงไม่สำเร็จแบบ exponential backoff (คืนระยะรอเป็นวินาที)
+
+        quota ของ request ที่ล้มเหลวถูกคิดไปแล้ว จึงต้องไม่ให้ chart นี้ถึงรอบซ้ำทุก cycle
+        """
+        state = self.charts.setdefault(key, ChartState())
+        state.failures += 1
+        delay = min(self.max_interval_seconds, self.min_interval_seconds * (2 ** (state.failures - 1)))
+        delay = random.uniform(delay / 2, delay)
+        state.next_due = time.time() + delay
+        return delay
+
+    def should_fetch(self, key: ChartKey, has_cached_items: bool, now: Optional[float] = None) -> bool:
+        """chart นี้ต้องยิง API หรือไม่ (ถึงรอบ หรือยังไม่เคยมีข้อมูลและไม่ได้อยู่ใน backoff)"""
+        state = self.charts.get(key)
+        if state is None:
+            return True
+        if state.unsupported:
+            return False
+        now = now or time.time()
+        if state.next_due <= now:
+            return True
+        return not has_cached_items and state.fetches == 0 and state.failures == 0
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "quota_used": self.quota_used,
+            "quota_remaining": self.remaining_quota(),
+            "charts": len(self.charts),
+            "planned_calls_per_day": sum(self.daily_allocation().values())
+        }
+
+class YouTubeChartFetcher:
+    """
+    ดึง mostPopular charts พร้อมกันหลายตัวผ่าน session เดียว
+
+    ส่ง If-None-Match ด้วย ETag ที่ cache ไว้ ถ้า chart ไม่เปลี่ยน API ตอบ
+    304 โดยไม่มี body จึงไม่ต้องโหลดข้อมูลซ้ำ
+    """
+
+    def __init__(self,
+                 api_key: str,
+                 planner: Optional[YouTubeFetchPlanner] = None,
+                 etag_cache: Optional[ETagCache] = None,
+                 base_url: str = "https://www.googleapis.com/youtube/v3",
+                 max_concurrency: int = 8,
+                 session: Optional[aiohttp.ClientSession] = None):
+        self.api_key = api_key
+        self.planner = planner or YouTubeFetchPlanner()
+        self.etag_cache = etag_cache or ETagCache()
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        # Semaphore ผูกกับ event loop แรกที่ใช้ จึงสร้างแยกต่อ loop เหมือน session
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._session = session
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._owns_session = session is None
+
+        self.stats = {
+            "requests": 0,
+            "not_modified": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+            "errors": 0
+        }
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        stale = self._owns_session and self._session_loop is not None and self._session_loop is not loop
+        if self._session is None or self._session.closed or stale:
+            # session ผูกกับ event loop ที่สร้าง; caller ที่เปิด loop ใหม่ทุกครั้งต้องได้ session ใหม่
+            connector = aiohttp.TCPConnector(limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        if self._owns_session and self._session and not self._session.closed:
+            await self._session.close()
+        self.etag_cache.save()
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def fetch_chart(self, region: str, category_id: Optional[str] = None,
+                          max_results: int = 50) -> Optional[List[Dict[str, Any]]]:
+        """ดึง chart เดียว คืน items (จาก cache ถ้า 304) หรือ None ถ้าล้มเหลว/quota หมด"""
+        params = {
+            "part": "snippet,statistics,contentDetails",
+            "chart": "mostPopular",
+            "regionCode": region,
+            "maxResults": min(max_results, 50),
+            "key": self.api_key
+        }
+        if category_id:
+            params["videoCategoryId"] = category_id
+
+        cache_key = ETagCache.make_key(region, category_id, params["maxResults"])
+        cached = self.etag_cache.get(cache_key)
+        headers = {"If-None-Match": cached.etag} if cached else {}
+        chart_key = (region, category_id)
+
+        session = await self._get_session()
+        async with self._semaphores[asyncio.get_running_loop()]:
+            # จอง quota ก่อนส่ง เพื่อไม่ให้ request ที่วิ่งพร้อมกันใช้เกินงบ
+            if not self.planner.can_afford("videos.list"):
+                logger.warning("YouTube quota budget exhausted")
+                return None
+            self.planner.charge("videos.list")
+            self.stats["requests"] += 1
+
+            try:
+                async with session.get(f"{self.base_url}/videos", params=params, headers=headers) as response:
+
+                    if response.status == 304 and cached:
+                        self.stats["not_modified"] += 1
+                        self.stats["bytes_saved"] += cached.size_bytes
+                        self.planner.record_result(chart_key, changed=False)
+                        return cached.items
+
+                    if response.status == 200:
+                        body = await response.read()
+                        data = json.loads(body)
+                        self.stats["bytes_downloaded"] += len(body)
+                        etag = response.headers.get("ETag") or data.get("etag", "")
+                        items = data.get("items", [])
+                        changed = not cached or cached.etag != etag
+                        if etag:
+                            self.etag_cache.set(cache_key, CachedChart(etag, items, time.time(), len(body)))
+                        self.planner.record_result(chart_key, changed=changed)
+                        return items
+
+                    if response.status in (400, 404):
+                        # chart ของ category นี้ไม่มีใน region นี้ ไม่ต้องดึงอีก
+                        logger.info(f"No mostPopular chart for {region}/{category_id}")
+                        self.planner.record_result(chart_key, changed=False, unsupported=True)
+                        return []
+
+                    self.stats["errors"] += 1
+                    delay = self.planner.record_failure(chart_key)
+                    if response.status == 403:
+                        logger.warning(f"YouTube API quota exceeded or invalid key, retrying in {delay:.0f}s")
+                    else:
+                        logger.error(f"YouTube API error: {response.status}, retrying in {delay:.0f}s")
+                    return None
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.stats["errors"] += 1
+                delay = self.planner.record_failure(chart_key)
+                logger.error(f"Error fetching chart {region}/{category_id}: {e}, retrying in {delay:.0f}s")
+                return None
+
+    async def fetch_many(self, charts: Iterable[ChartKey],
+                         max_results: int = 50) -> Dict[ChartKey, List[Dict[str, Any]]]:
+        """ดึงหลาย chart พร้อมกัน (จำกัดด้วย max_concurrency)"""
+        charts = list(charts)
+        results = await asyncio.gather(
+            *(self.fetch_chart(region, category_id, max_results) for region, category_id in charts)
+        )
+        return {key: items for key, items in zip(charts, results) if items is not None}
+
+    async def fetch_due(self, max_results: int = 50) -> Dict[ChartKey, List[Dict[str, Any]]]:
+        """ดึงเฉพาะ charts ที่ planner กำหนดว่าถึงเวลา"""
+        return await self.fetch_many(self.planner.due_charts(), max_results)
+
+    async def fetch_planned(self, charts: Iterable[ChartKey],
+                            max_results: int = 50) -> Dict[ChartKey, List[Dict[str, Any]]]:
+        """ผลของทุก chart ที่ขอ: ยิง API เฉพาะ chart ที่ถึงรอบ ที่เหลือใช้ items ล่าสุดจาก ETag cache
+
+        ใช้แทน fetch_many ใน collector ที่ถูกเรียกทุก cycle เพื่อให้ planner คุม quota จริง
+        """
+        max_results = min(max_results, 50)
+        now = time.time()
+        to_fetch, results = [], {}
+        for key in charts:
+            cached = self.etag_cache.get(ETagCache.make_key(key[0], key[1], max_results))
+            if self.planner.should_fetch(key, cached is not None, now):
+                to_fetch.append(key)
+            elif cached is not None:
+                results[key] = cached.items
+        self.stats["served_from_cache"] = self.stats.get("served_from_cache", 0) + len(results)
+        if to_fetch:
+            results.update(await self.fetch_many(to_fetch, max_results))
+        return results
+
+    def status(self) -> Dict[str, Any]:
+        return {**self.stats, **self.planner.status()}
+
+if __name__ == "__main__":
+    # แสดงแผนการดึงต่อวันของ 2 regions x 7 categories ภายใต้ quota 9000
+    demo_planner = YouTubeFetchPlanner(max_daily_quota=9000)
+    demo_planner.register(["TH", "US"], [None, "10", "17", "20", "23", "24", "27", "28"])
+    for (region, category_id), calls in demo_planner.daily_allocation().items():
+        interval = demo_planner.charts[(region, category_id)].interval_seconds
+        print(f"{region}/{category_id or 'all'}: {calls} calls/day, every {interval / 60:.0f} min")
+    print(demo_planner.status())
@@ -9,6 +9,11 @@ from urllib.parse import quote
 
 from models.trend_data import TrendData, TrendSource, TrendCategory
 
+try:
+    from .youtube_fetch_planner import ETagCache, YouTubeChartFetcher, YouTubeFetchPlanner
+except ImportError:
+    from youtube_fetch_planner import ETagCache, YouTubeChartFetcher, YouTubeFetchPlanner
+
 logger = logging.getLogger(__name__)
 
 class YouTubeTrendsCollector:
@@ -23,6 +28,12 @@ class YouTubeTrendsCollector:
         self.max_trends = self.config.get('max_trends', 50)
         self.regions = self.config.get('regions', ['US', 'TH'])
         self.categories = self._get_category_ids()
+        # category ที่ดึง chart แยก (นอกเหนือจาก chart รวมของ region)
+        self.fetch_categories = self.config.get('fetch_categories', [])
+
+        self.planner = YouTubeFetchPlanner(max_daily_quota=self.config.get('max_daily_quota', 9000))
+        self.etag_cache = ETagCache(self.config.get('etag_cache_path'))
+        self._fetcher: Optional[YouTubeChartFetcher] = None
         
         logger.info(f"YouTube collector initialized for regions: {self.regions}")
     
@@ -60,31 +71,27 @@ class YouTubeTrendsCollector:
             'nonprofits_activism': '29'
         }
     
-    async def collect_trends(self) -> List[TrendData]:
-        """Collect trending videos from YouTube"""
+    async def collect_trends(self, regions: Optional[List[str]] = None) -> List[TrendData]:
+        """Collect trending videos from YouTube (all configured regions unless given)"""
+        regions = regions or self.regions
         if not self.api_key:
             logger.info("No API key available, using fallback trending collection")
-            return await self._collect_trends_fallback()
+            return await self._collect_trends_fallback(regions)
         
+        # ทุก region ดึงพร้อมกันบน session เดียว (fetcher จำกัด concurrency เอง)
+        results = await asyncio.gather(
+            *(self._collect_region_trends(region) for region in regions),
+            return_exceptions=True
+        )
+
         all_trends = []
-        
-        for region in self.regions:
-            try:
-                logger.debug(f"Collecting YouTube trends for region: {region}")
-                
-                # Collect from different categories
-                region_trends = await self._collect_region_trends(region)
-                
-                if region_trends:
-                    all_trends.extend(region_trends)
-                    logger.info(f"Collected {len(region_trends)} trends from YouTube {region}")
-                
-                # Rate limiting
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error collecting YouTube trends for region {region}: {e}")
+        for region, region_trends in zip(regions, results):
+            if isinstance(region_trends, Exception):
+                logger.error(f"Error collecting YouTube trends for region {region}: {region_trends}")
                 continue
+            if region_trends:
+                all_trends.extend(region_trends)
+                logger.info(f"Collected {len(region_trends)} trends from YouTube {region}")
         
         # Remove duplicates and process
         unique_trends = self._deduplicate_trends(all_trends)
@@ -112,29 +119,38 @@ class YouTubeTrendsCollector:
         
         return trends
     
+    def _get_fetcher(self) -> YouTubeChartFetcher:
+        if self._fetcher is None:
+            self._fetcher = YouTubeChartFetcher(
+                self.api_key,
+                planner=self.planner,
+                etag_cache=self.etag_cache,
+                base_url=self.base_url,
+                max_concurrency=self.config.get('max_concurrency', 8)
+            )
+        return self._fetcher
+
+    async def close(self):
+        """Close the pooled HTTP session and persist cached ETags"""
+        if self._fetcher is not None:
+            await self._fetcher.close()
+            self._fetcher = None
+
     async def _get_trending_videos(self, region: str) -> List[Dict[str, Any]]:
-        """Get trending videos from YouTube API"""
-        url = f"{self.base_url}/videos"
-        
-        params = {
-            'part': 'snippet,statistics,contentDetails',
-            'chart': 'mostPopular',
-            'regionCode': region,
-            'maxResults': min(50, self.max_trends),
-            'key': self.api_key
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('items', [])
-                elif response.status == 403:
-                    logger.warning(f"YouTube API quota exceeded or invalid key")
-                    return []
-                else:
-                    logger.error(f"YouTube API error: {response.status}")
-                    return []
+        """Get trending videos from YouTube API (region chart plus configured categories)"""
+        category_ids = [None] + [self.categories[name] for name in self.fetch_categories
+                                 if name in self.categories]
+        self.planner.register([region], category_ids)
+
+        charts = [(region, category_id) for category_id in category_ids
+                  if not self.planner.charts[(region, category_id)].unsupported]
+        # charts ที่ยังไม่ถึงรอบของ planner ใช้ผลล่าสุดจาก ETag cache โดยไม่เสีย quota
+        fetched = await self._get_fetcher().fetch_planned(charts, max_results=min(50, self.max_trends))
+
+        videos = []
+        for chart in charts:
+            videos.extend(fetched.get(chart, []))
+        return videos
     
     def _video_to_trend_data(self, video: Dict[str, Any], region: str) -> Optional[TrendData]:
         """Convert YouTube video data to TrendData"""
@@ -348,36 +364,34 @@ class YouTubeTrendsCollector:
         
         return intersection / union if union > 0 else 0.0
     
-    async def _collect_trends_fallback(self) -> List[TrendData]:
+    async def _collect_trends_fallback(self, regions: Optional[List[str]] = None) -> List[TrendData]:
         """Fallback method when API key is not available"""
         logger.info("Using fallback YouTube trending collection (web scraping)")
         
         # This is a simplified fallback - in a real implementation,
         # you might scrape YouTube trending page or use unofficial APIs
+        samples = [
+            ("Sample YouTube Trend 1", ["sample", "trending", "youtube"], 75.0, TrendCategory.ENTERTAINMENT),
+            ("Sample YouTube Trend 2", ["example", "viral", "video"], 65.0, TrendCategory.MUSIC),
+        ]
         
+        # ผูกผลกับ region ที่ถูกขอ เพื่อให้ adaptive scheduler ติดตามแต่ละ region ได้ถูกต้อง
         fallback_trends = [
             TrendData(
-                topic="Sample YouTube Trend 1",
+                topic=topic,
                 source=TrendSource.YOUTUBE,
-                keywords=["sample", "trending", "youtube"],
-                popularity_score=75.0,
-                category=TrendCategory.ENTERTAINMENT,
-                region="global",
-                raw_data={"fallback": True}
-            ),
-            TrendData(
-                topic="Sample YouTube Trend 2",
-                source=TrendSource.YOUTUBE,
-                keywords=["example", "viral", "video"],
-                popularity_score=65.0,
-                category=TrendCategory.MUSIC,
-                region="global",
+                keywords=list(keywords),
+                popularity_score=score,
+                category=category,
+                region=region,
                 raw_data={"fallback": True}
             )
+            for region in (regions or self.regions)
+            for topic, keywords, score, category in samples
         ]
         
         logger.warning("Returned fallback trends. Configure YouTube API key for real data.")
-        return fallback_trends
+        return fallback_trends[:self.max_trends]
     
     async def health_check(self) -> Dict[str, Any]:
         """Perform health check"""
@@ -428,5 +442,6 @@ class YouTubeTrendsCollector:
             'max_trends': self.max_trends,
             'regions': self.regions,
             'categories_supported': len(self.categories),
+            'fetch': self._fetcher.status() if self._fetcher else self.planner.status(),
             'last_collection': None  # Would be tracked in a real implementation
         }
\ No newline at end of file
@@ -3,12 +3,16 @@ import json
 from datetime import datetime, timedelta
 import sqlite3
 import os
+import sys
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Optional
 import requests
 import uuid
 import random
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from shared.utils.snapshot_cache import SnapshotCache
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 
@@ -91,6 +95,13 @@ def init_db():
         )
     ''')
     
+    # Indexes for the dashboard's date-range counts and top-N lists
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_trends_collected_at ON trends (collected_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_opportunities_created_at ON content_opportunities (created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_opportunities_status_priority '
+                 'ON content_opportunities (status, priority_score DESC)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_content_items_created_at ON content_items (created_at)')
+    
     conn.commit()
     conn.close()
     print("✅ Database initialized successfully!")
@@ -133,59 +144,79 @@ def content():
 def analytics():
     return render_template('analytics.html')
 
-# API Routes
-@app.route('/api/dashboard-stats')
-def get_dashboard_stats():
-    conn = get_db_connection()
-    
-    # Get today's stats
-    today = datetime.now().strftime('%Y-%m-%d')
-    
-    trends_today = conn.execute(
-        'SELECT COUNT(*) as count FROM trends WHERE DATE(collected_at) = ?',
-        (today,)
-    ).fetchone()['count']
-    
-    opportunities_today = conn.execute(
-        'SELECT COUNT(*) as count FROM content_opportunities WHERE DATE(created_at) = ?',
-        (today,)
-    ).fetchone()['count']
-    
-    content_created = conn.execute(
-        'SELECT COUNT(*) as count FROM content_items WHERE DATE(created_at) = ?',
-        (today,)
-    ).fetchone()['count']
-    
-    # Get recent trends
-    recent_trends = conn.execute('''
-        SELECT * FROM trends 
-        ORDER BY collected_at DESC 
-        LIMIT 5
-    ''').fetchall()
-    
-    # Get best opportunities
-    best_opportunities = conn.execute('''
-        SELECT co.*, t.topic, t.category 
-        FROM content_opportunities co
-        JOIN trends t ON co.trend_id = t.id
-        WHERE co.status = 'pending'
-        ORDER BY co.priority_score DESC
-        LIMIT 5
-    ''').fetchall()
-    
-    conn.close()
+# Dashboard snapshot
+def build_dashboard_stats():
+    """All dashboard tiles on one connection: one counts query plus the two top-5 lists"""
+    # Range predicates on the raw columns keep the created_at/collected_at indexes usable
+    today = datetime.now().date()
+    day_start = today.strftime('%Y-%m-%d')
+    day_end = (today + timedelta(days=1)).strftime('%Y-%m-%d')
     
-    return jsonify({
+    conn = get_db_connection()
+    try:
+        counts = conn.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM trends
+                 WHERE collected_at >= :start AND collected_at < :end) AS trends_collected,
+                (SELECT COUNT(*) FROM content_opportunities
+                 WHERE created_at >= :start AND created_at < :end) AS opportunities_generated,
+                (SELECT COUNT(*) FROM content_items
+                 WHERE created_at >= :start AND created_at < :end) AS content_created
+        ''', {'start': day_start, 'end': day_end}).fetchone()
+        
+        # Get recent trends
+        recent_trends = conn.execute('''
+            SELECT * FROM trends 
+            ORDER BY collected_at DESC 
+            LIMIT 5
+        ''').fetchall()
+        
+        # Get best opportunities
+        best_opportunities = conn.execute('''
+            SELECT co.*, t.topic, t.category 
+            FROM content_opportunities co
+            JOIN trends t ON co.trend_id = t.id
+            WHERE co.status = 'pending'
+            ORDER BY co.priority_score DESC
+            LIMIT 5
+        ''').fetchall()
+    finally:
+        conn.close()
+    
+    return {
         'today_stats': {
-            'trends_collected': trends_today,
-            'opportunities_generated': opportunities_today,
-            'content_created': content_created,
+            'trends_collected': counts['trends_collected'],
+            'opportunities_generated': counts['opportunities_generated'],
+            'content_created': counts['content_created'],
             'total_cost': 0,
             'estimated_revenue': 0
         },
         'recent_trends': [dict(row) for row in recent_trends],
         'best_opportunities': [dict(row) for row in best_opportunities]
-    })
+    }
+
+# Polling clients share one snapshot; it is rebuilt in the background once older than the TTL
+dashboard_snapshots = SnapshotCache(
+    build_dashboard_stats,
+    ttl=float(os.getenv('DASHBOARD_SNAPSHOT_TTL', 5)),
+    max_stale=60,
+    name="dashboard_stats"
+)
+
+def snapshot_response(snapshot):
+    """JSON response for a snapshot, or 304 when the client already has it"""
+    if snapshot.matches(request.if_none_match):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(snapshot.body, mimetype='application/json')
+    response.set_etag(snapshot.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+# API Routes
+@app.route('/api/dashboard-stats')
+def get_dashboard_stats():
+    return snapshot_response(dashboard_snapshots.get())
 
 @app.route('/api/trends')
 def get_trends():
@@ -281,6 +312,7 @@ def collect_trends():
     
     conn.commit()
     conn.close()
+    dashboard_snapshots.invalidate()
     
     return jsonify({
         'success': True,
@@ -336,6 +368,7 @@ def analyze_trend(trend_id):
     
     conn.commit()
     conn.close()
+    dashboard_snapshots.invalidate()
     
     return jsonify({
         'success': True,
@@ -393,6 +426,7 @@ def select_opportunity(opportunity_id):
     
     conn.commit()
     conn.close()
+    dashboard_snapshots.invalidate()
     
     return jsonify({
         'success': True,